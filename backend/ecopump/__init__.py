@@ -0,0 +1,6 @@
+"""Calculs hydrauliques ECO PUMP EXPERT, importables sans l'application web.
+
+Modules: catalog (bases de référence), models, hydraulics, solar, audit,
+instrumentation et persistence (connexion MongoDB paresseuse). L'import du paquet
+n'a aucun effet de bord: pas de lecture d'environnement obligatoire ni de connexion.
+"""
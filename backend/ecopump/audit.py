@@ -0,0 +1,1177 @@
+"""Audit terrain expert: modèles, diagnostics, recommandations et rapport."""
+
+from typing import List, Optional, Dict, Any
+import uuid
+from datetime import datetime
+import math
+
+from .instrumentation import StageClock
+from .models import CalculationModel
+from .hydraulics import run_stage
+
+# ========================================================================================================
+# AUDIT SYSTEM - CLASSES ET MODÈLES POUR AUDIT TERRAIN EXPERT
+# ========================================================================================================
+
+class AuditInput(CalculationModel):
+    """Input pour audit terrain professionnel - Données comparatives expert"""
+    
+    # Installation et contexte
+    installation_age: Optional[int] = None
+    installation_type: str = "surface"
+    fluid_type: str = "water"
+    fluid_temperature: float = 20.0
+    
+    # Matériaux et diamètres CRITIQUES
+    suction_material: str = "pvc"
+    discharge_material: str = "pvc"
+    suction_pipe_diameter: float = 114.3  # DN100
+    discharge_pipe_diameter: float = 88.9  # DN80
+    
+    # PERFORMANCES HYDRAULIQUES - Comparaison ACTUEL vs REQUIS vs ORIGINAL
+    current_flow_rate: Optional[float] = None      # Débit mesuré actuellement (m³/h)
+    required_flow_rate: Optional[float] = None     # Débit requis process (m³/h)
+    original_design_flow: Optional[float] = None   # Débit conception (m³/h)
+    
+    current_hmt: Optional[float] = None            # HMT mesurée actuellement (m)
+    required_hmt: Optional[float] = None           # HMT requise process (m)
+    original_design_hmt: Optional[float] = None    # HMT conception (m)
+    
+    # Pressions mesures TERRAIN
+    suction_pressure: Optional[float] = None       # Pression aspiration (bar)
+    discharge_pressure: Optional[float] = None     # Pression refoulement (bar)
+    
+    # PERFORMANCES ÉLECTRIQUES - Comparaison MESURES vs PLAQUE
+    measured_current: Optional[float] = None       # Intensité mesurée (A)
+    rated_current: Optional[float] = None          # Intensité plaque (A)
+    measured_power: Optional[float] = None         # Puissance mesurée (kW)
+    rated_power: Optional[float] = None            # Puissance plaque (kW)
+    measured_voltage: Optional[float] = None       # Tension mesurée (V)
+    rated_voltage: float = 400.0                   # Tension nominale (V)
+    measured_power_factor: Optional[float] = None  # Cos φ mesuré
+    
+    # ÉTAT MÉCANIQUE - Observations terrain
+    vibration_level: Optional[float] = None        # Vibrations (mm/s)
+    noise_level: Optional[float] = None            # Bruit (dB(A))
+    motor_temperature: Optional[float] = None      # Température moteur (°C)
+    bearing_temperature: Optional[float] = None    # Température paliers (°C)
+    
+    # États visuels
+    leakage_present: bool = False
+    corrosion_level: str = "none"  # none, light, moderate, severe
+    alignment_status: str = "good"  # excellent, good, fair, poor
+    coupling_condition: str = "good"  # excellent, good, fair, poor
+    foundation_status: str = "good"  # excellent, good, fair, poor
+    
+    # EXPLOITATION
+    operating_hours_daily: Optional[float] = None
+    operating_days_yearly: Optional[float] = None
+    last_maintenance: Optional[str] = None
+    maintenance_frequency: str = "monthly"
+    
+    # Problématiques
+    reported_issues: List[str] = []
+    performance_degradation: bool = False
+    energy_consumption_increase: bool = False
+    
+    # CONTEXTE ÉNERGÉTIQUE
+    electricity_cost_per_kwh: float = 0.12
+    load_factor: float = 0.75
+    has_vfd: bool = False
+    has_soft_starter: bool = False
+    has_automation: bool = False
+
+class AuditComparisonAnalysis(CalculationModel):
+    """Analyse comparative des performances"""
+    parameter_name: str
+    current_value: Optional[float]
+    required_value: Optional[float] 
+    original_design_value: Optional[float]
+    deviation_from_required: Optional[float]  # % d'écart vs requis
+    deviation_from_design: Optional[float]    # % d'écart vs conception
+    status: str  # "optimal", "acceptable", "problematic", "critical"
+    interpretation: str
+    impact: str
+
+class AuditDiagnostic(CalculationModel):
+    """Diagnostic détaillé d'un aspect"""
+    category: str  # "hydraulic", "electrical", "mechanical", "operational"
+    issue: str
+    severity: str  # "critical", "high", "medium", "low"
+    root_cause: str
+    symptoms: List[str]
+    consequences: List[str]
+    urgency: str  # "immediate", "short_term", "medium_term", "long_term"
+
+class AuditRecommendation(CalculationModel):
+    """Recommandation d'amélioration détaillée"""
+    priority: str  # "critical", "high", "medium", "low"
+    category: str  # "safety", "efficiency", "reliability", "maintenance"
+    action: str
+    description: str
+    technical_details: List[str]
+    cost_estimate_min: float
+    cost_estimate_max: float
+    timeline: str
+    expected_benefits: List[str]
+    roi_months: Optional[int]
+    risk_if_not_done: str
+
+class AuditResult(CalculationModel):
+    """Résultat complet d'audit expert"""
+    audit_id: str
+    audit_date: str
+    
+    # Scores globaux
+    overall_score: int  # /100
+    hydraulic_score: int  # /100
+    electrical_score: int  # /100
+    mechanical_score: int  # /100
+    operational_score: int  # /100
+    
+    # Analyses comparatives détaillées
+    performance_comparisons: List[AuditComparisonAnalysis]
+    
+    # Diagnostics par catégorie
+    diagnostics: List[AuditDiagnostic]
+    
+    # Recommandations priorisées
+    recommendations: List[AuditRecommendation]
+    
+    # Synthèse executive
+    executive_summary: Dict[str, Any]
+    
+    # Analyse économique
+    economic_analysis: Dict[str, Any]
+    
+    # Plan d'action prioritaire
+    action_plan: Dict[str, Any]
+    
+    # Rapport d'expertise exhaustif avec analyse croisée
+    expert_installation_report: Optional[Dict[str, Any]] = None
+
+# ========================================================================================================
+# AUDIT SYSTEM - FONCTIONS SUPPORT POUR ANALYSE EXPERT
+# ========================================================================================================
+
+def generate_expert_diagnostics(input_data: AuditInput, performance_comparisons: List[AuditComparisonAnalysis]) -> List[AuditDiagnostic]:
+    """Génère des diagnostics experts basés sur les données d'audit"""
+    diagnostics = []
+    
+    # Diagnostic hydraulique
+    if input_data.current_flow_rate and input_data.required_flow_rate:
+        deviation = ((input_data.current_flow_rate - input_data.required_flow_rate) / input_data.required_flow_rate) * 100
+        if abs(deviation) > 20:
+            severity = "critical" if abs(deviation) > 50 else "high"
+            diagnostics.append(AuditDiagnostic(
+                category="hydraulic",
+                issue=f"Débit inadéquat: {deviation:+.1f}% vs requis",
+                severity=severity,
+                root_cause="Dimensionnement incorrect ou dégradation performance",
+                symptoms=["Performance process insuffisante", "Consommation énergétique excessive"],
+                consequences=["Perte de productivité", "Surcoût énergétique", "Usure prématurée"],
+                urgency="immediate" if severity == "critical" else "short_term"
+            ))
+    
+    # Diagnostic électrique
+    if input_data.measured_current and input_data.rated_current:
+        deviation = ((input_data.measured_current - input_data.rated_current) / input_data.rated_current) * 100
+        if deviation > 20:
+            diagnostics.append(AuditDiagnostic(
+                category="electrical",
+                issue=f"Surcharge moteur: {deviation:+.1f}% vs nominal",
+                severity="critical",
+                root_cause="Point de fonctionnement inadapté ou défaut moteur",
+                symptoms=["Échauffement moteur", "Consommation excessive", "Déclenchements protection"],
+                consequences=["Risque de grillage moteur", "Arrêts production", "Coûts maintenance"],
+                urgency="immediate"
+            ))
+    
+    # Diagnostic mécanique
+    if input_data.vibration_level and input_data.vibration_level > 4.5:
+        severity = "critical" if input_data.vibration_level > 7.1 else "high"
+        diagnostics.append(AuditDiagnostic(
+            category="mechanical",
+            issue=f"Vibrations excessives: {input_data.vibration_level} mm/s",
+            severity=severity,
+            root_cause="Défaut d'alignement, balourd, ou usure roulements",
+            symptoms=["Bruit anormal", "Usure accélérée", "Desserrage boulonnerie"],
+            consequences=["Défaillance catastrophique", "Arrêt production", "Dommages collatéraux"],
+            urgency="immediate" if severity == "critical" else "short_term"
+        ))
+    
+    return diagnostics
+
+def generate_expert_recommendations(input_data: AuditInput, diagnostics: List[AuditDiagnostic], 
+                                  performance_comparisons: List[AuditComparisonAnalysis]) -> List[AuditRecommendation]:
+    """Génère des recommandations d'amélioration priorisées"""
+    recommendations = []
+    
+    # Recommandations basées sur les diagnostics
+    for diagnostic in diagnostics:
+        if diagnostic.severity == "critical":
+            if diagnostic.category == "hydraulic":
+                recommendations.append(AuditRecommendation(
+                    priority="critical",
+                    category="efficiency",
+                    action="Redimensionnement hydraulique urgent",
+                    description="Modification du système pour atteindre les performances requises",
+                    technical_details=[
+                        "Calcul nouveau point de fonctionnement",
+                        "Modification diamètres tuyauteries",
+                        "Remplacement pompe si nécessaire",
+                        "Optimisation circuit hydraulique"
+                    ],
+                    cost_estimate_min=5000,
+                    cost_estimate_max=25000,
+                    timeline="2-4 semaines",
+                    expected_benefits=[
+                        "Performance process optimale",
+                        "Réduction consommation 15-30%",
+                        "Fiabilité accrue"
+                    ],
+                    roi_months=12,
+                    risk_if_not_done="Perte de productivité continue, surcoût énergétique"
+                ))
+            
+            elif diagnostic.category == "electrical":
+                recommendations.append(AuditRecommendation(
+                    priority="critical",
+                    category="safety",
+                    action="Intervention électrique immédiate",
+                    description="Correction surcharge moteur et protection électrique",
+                    technical_details=[
+                        "Vérification protection moteur",
+                        "Contrôle isolement bobinages",
+                        "Mesure déséquilibre phases",
+                        "Réglage point de fonctionnement"
+                    ],
+                    cost_estimate_min=1500,
+                    cost_estimate_max=8000,
+                    timeline="1-2 semaines",
+                    expected_benefits=[
+                        "Sécurité électrique assurée",
+                        "Durée de vie moteur préservée",
+                        "Stabilité fonctionnement"
+                    ],
+                    roi_months=6,
+                    risk_if_not_done="Risque de grillage moteur, arrêt production"
+                ))
+    
+    # Recommandations d'amélioration énergétique
+    if input_data.has_vfd == False and input_data.current_flow_rate and input_data.required_flow_rate:
+        if input_data.current_flow_rate > input_data.required_flow_rate * 1.2:
+            recommendations.append(AuditRecommendation(
+                priority="high",
+                category="efficiency",
+                action="Installation variateur de fréquence",
+                description="Optimisation consommation par variation de vitesse",
+                technical_details=[
+                    "Dimensionnement variateur adapté",
+                    "Installation armoire électrique",
+                    "Programmation courbes optimales",
+                    "Système de régulation automatique"
+                ],
+                cost_estimate_min=3000,
+                cost_estimate_max=12000,
+                timeline="3-6 semaines",
+                expected_benefits=[
+                    "Économie énergétique 20-40%",
+                    "Démarrage progressif",
+                    "Régulation automatique",
+                    "Réduction usure mécanique"
+                ],
+                roi_months=18,
+                risk_if_not_done="Gaspillage énergétique continu"
+            ))
+    
+    return recommendations
+
+def calculate_audit_scores(input_data: AuditInput, performance_comparisons: List[AuditComparisonAnalysis], 
+                          diagnostics: List[AuditDiagnostic]) -> Dict[str, int]:
+    """Calcule les scores d'audit par catégorie"""
+    scores = {
+        "hydraulic": 100,
+        "electrical": 100,
+        "mechanical": 100,
+        "operational": 100,
+        "overall": 100
+    }
+    
+    # Pénalités basées sur les diagnostics
+    for diagnostic in diagnostics:
+        penalty = 0
+        if diagnostic.severity == "critical":
+            penalty = 40
+        elif diagnostic.severity == "high":
+            penalty = 25
+        elif diagnostic.severity == "medium":
+            penalty = 15
+        elif diagnostic.severity == "low":
+            penalty = 5
+        
+        if diagnostic.category in scores:
+            scores[diagnostic.category] = max(0, scores[diagnostic.category] - penalty)
+    
+    # Pénalités basées sur les comparaisons de performance
+    for comparison in performance_comparisons:
+        if comparison.status == "critical":
+            penalty = 30
+        elif comparison.status == "problematic":
+            penalty = 20
+        elif comparison.status == "acceptable":
+            penalty = 10
+        else:
+            penalty = 0
+        
+        if "débit" in comparison.parameter_name.lower():
+            scores["hydraulic"] = max(0, scores["hydraulic"] - penalty)
+        elif "intensité" in comparison.parameter_name.lower():
+            scores["electrical"] = max(0, scores["electrical"] - penalty)
+    
+    # Score global
+    scores["overall"] = int(sum(scores[k] for k in ["hydraulic", "electrical", "mechanical", "operational"]) / 4)
+    
+    return scores
+
+def generate_executive_summary(input_data: AuditInput, scores: Dict[str, int], 
+                             diagnostics: List[AuditDiagnostic], 
+                             recommendations: List[AuditRecommendation]) -> Dict[str, Any]:
+    """Génère la synthèse executive"""
+    critical_issues = [d for d in diagnostics if d.severity == "critical"]
+    high_priority_recs = [r for r in recommendations if r.priority in ["critical", "high"]]
+    
+    return {
+        "overall_status": "critical" if scores["overall"] < 50 else ("warning" if scores["overall"] < 75 else "good"),
+        "key_findings": [
+            f"Score global: {scores['overall']}/100",
+            f"{len(critical_issues)} problème(s) critique(s) identifié(s)",
+            f"{len(high_priority_recs)} action(s) prioritaire(s) recommandée(s)"
+        ],
+        "immediate_actions": len([r for r in recommendations if r.priority == "critical"]),
+        "estimated_savings_annual": sum(r.cost_estimate_min * 12 / (r.roi_months or 12) for r in recommendations if r.roi_months),
+        "risk_level": "high" if critical_issues else ("medium" if len(diagnostics) > 2 else "low")
+    }
+
+def generate_expert_installation_report(input_data: AuditInput, performance_comparisons: List[AuditComparisonAnalysis]) -> Dict[str, Any]:
+    """
+    Génère un rapport d'expertise exhaustif basé sur l'analyse croisée des données hydrauliques et électriques
+    Identifie les problèmes d'installation et donne des recommandations précises d'amélioration
+    """
+    
+    # ========================================================================================================
+    # ANALYSE CROISÉE HYDRAULIQUE-ÉLECTRIQUE
+    # ========================================================================================================
+    
+    installation_issues = []
+    critical_problems = []
+    equipment_to_replace = []
+    equipment_to_add = []
+    immediate_actions = []
+    
+    # Analyse de la cohérence hydraulique-électrique
+    power_analysis = {}
+    if input_data.measured_power and input_data.current_flow_rate and input_data.current_hmt:
+        # Calcul puissance hydraulique théorique
+        theoretical_hydraulic_power = (input_data.current_flow_rate * input_data.current_hmt * 1000 * 9.81) / (3600 * 1000)  # kW
+        
+        # Estimation rendement global actuel
+        if theoretical_hydraulic_power > 0:
+            actual_global_efficiency = (theoretical_hydraulic_power / input_data.measured_power) * 100
+            power_analysis = {
+                "theoretical_hydraulic_power": theoretical_hydraulic_power,
+                "measured_electrical_power": input_data.measured_power,
+                "actual_global_efficiency": actual_global_efficiency,
+                "expected_efficiency": 65.0,  # Rendement global attendu pour une installation standard
+                "efficiency_gap": actual_global_efficiency - 65.0
+            }
+    
+    # ========================================================================================================
+    # DIAGNOSTIC DES PROBLÈMES MAJEURS
+    # ========================================================================================================
+    
+    # 1. PROBLÈMES HYDRAULIQUES CRITIQUES
+    if input_data.current_flow_rate and input_data.required_flow_rate:
+        flow_deviation = ((input_data.current_flow_rate - input_data.required_flow_rate) / input_data.required_flow_rate) * 100
+        
+        if flow_deviation < -20:
+            critical_problems.append({
+                "type": "DÉBIT INSUFFISANT CRITIQUE",
+                "severity": "URGENT",
+                "description": f"Débit actuel {input_data.current_flow_rate} m³/h insuffisant de {abs(flow_deviation):.1f}% par rapport au besoin ({input_data.required_flow_rate} m³/h)",
+                "causes_probables": [
+                    "Pompe sous-dimensionnée ou usée",
+                    "Colmatage des conduites ou filtres",
+                    "Fuites importantes dans le réseau",
+                    "Vanne partiellement fermée",
+                    "Cavitation pompe (aspiration insuffisante)"
+                ],
+                "consequences": [
+                    "Process industriel dégradé ou arrêté",
+                    "Surconsommation énergétique pour compenser",
+                    "Usure prématurée des équipements"
+                ]
+            })
+            
+        elif flow_deviation > 25:
+            installation_issues.append({
+                "type": "SURDIMENSIONNEMENT HYDRAULIQUE",
+                "severity": "IMPORTANT", 
+                "description": f"Débit actuel {input_data.current_flow_rate} m³/h excessif de {flow_deviation:.1f}% (gaspillage énergétique)",
+                "causes_probables": [
+                    "Pompe surdimensionnée",
+                    "Régulation débit absente ou défaillante",
+                    "Point de fonctionnement inadapté"
+                ],
+                "consequences": [
+                    "Gaspillage énergétique permanent", 
+                    "Usure accélérée par fonctionnement hors courbe",
+                    "Coûts exploitation majorés"
+                ]
+            })
+    
+    # 2. PROBLÈMES ÉLECTRIQUES CRITIQUES
+    if input_data.measured_current and input_data.rated_current:
+        current_ratio = input_data.measured_current / input_data.rated_current
+        
+        if current_ratio > 1.15:
+            critical_problems.append({
+                "type": "SURCHARGE ÉLECTRIQUE CRITIQUE",
+                "severity": "URGENT",
+                "description": f"Intensité mesurée {input_data.measured_current}A dépasse de {(current_ratio-1)*100:.1f}% l'intensité nominale ({input_data.rated_current}A)",
+                "causes_probables": [
+                    "Pompe en surcharge hydraulique permanente",
+                    "Problème d'alignement moteur-pompe",
+                    "Défaillance roulements ou paliers",
+                    "Tension d'alimentation inadéquate",
+                    "Bobinage moteur dégradé"
+                ],
+                "consequences": [
+                    "RISQUE DE DESTRUCTION MOTEUR IMMINENT",
+                    "Déclenchement protections thermiques",
+                    "Surconsommation énergétique majeure",
+                    "Risque d'incendie électrique"
+                ]
+            })
+            
+            equipment_to_replace.extend([
+                "Moteur électrique (vérifier bobinage et isolement)",
+                "Protections électriques (relais thermique adapté)",
+                "Câblage et contacteurs (vérifier échauffement)"
+            ])
+            
+            immediate_actions.extend([
+                "ARRÊT IMMÉDIAT si température moteur > 80°C",
+                "Contrôle isolement moteur (>1MΩ/phase)",
+                "Vérification serrages connexions électriques",
+                "Mesure tension triphasée (équilibrage)"
+            ])
+    
+    # 3. ANALYSE RENDEMENT ÉNERGÉTIQUE
+    if power_analysis and power_analysis["actual_global_efficiency"] < 45:
+        critical_problems.append({
+            "type": "RENDEMENT ÉNERGÉTIQUE CATASTROPHIQUE",
+            "severity": "URGENT",
+            "description": f"Rendement global mesuré {power_analysis['actual_global_efficiency']:.1f}% très inférieur aux standards (65%)",
+            "causes_probables": [
+                "Pompe complètement inadaptée au point de fonctionnement",
+                "Usure interne pompe (jeux hydrauliques)",
+                "Cavitation permanente",
+                "Moteur électrique défaillant",
+                "Pertes hydrauliques majeures (conduites)"
+            ],
+            "consequences": [
+                "Gaspillage énergétique de plus de 40%",
+                "Coûts électricité majorés x2 à x3",
+                "Empreinte carbone excessive"
+            ]
+        })
+    
+    # 4. PROBLÈMES MÉCANIQUES
+    vibration_issues = []
+    if input_data.vibration_level and input_data.vibration_level > 7.1:  # ISO 10816
+        vibration_issues.append({
+            "type": "VIBRATIONS EXCESSIVES CRITIQUES",
+            "severity": "URGENT", 
+            "description": f"Niveau vibratoire {input_data.vibration_level} mm/s dépasse largement les limites ISO 10816 (< 2.8 mm/s)",
+            "causes_probables": [
+                "Défaut d'alignement pompe-moteur majeur",
+                "Déséquilibrage rotor",
+                "Usure roulements/paliers avancée",
+                "Défaut fixation socle béton",
+                "Résonance mécanique"
+            ],
+            "consequences": [
+                "DESTRUCTION IMMINENTE ROULEMENTS",
+                "Fissuration conduites par fatigue",
+                "Desserrage boulonnerie",
+                "Nuisances sonores importantes"
+            ]
+        })
+        
+        equipment_to_replace.extend([
+            "Roulements pompe et moteur",
+            "Accouplement (vérifier usure)",
+            "Joints d'étanchéité",
+            "Plots antivibratoires"
+        ])
+    
+    # 5. PROBLÈMES THERMIQUES
+    thermal_issues = []
+    if input_data.motor_temperature and input_data.motor_temperature > 80:
+        thermal_issues.append({
+            "type": "SURCHAUFFE MOTEUR CRITIQUE",
+            "severity": "URGENT",
+            "description": f"Température moteur {input_data.motor_temperature}°C excessive (limite 80°C classe F)",
+            "causes_probables": [
+                "Surcharge électrique permanente",
+                "Ventilation moteur obstruée",
+                "Température ambiante excessive",
+                "Défaut isolement bobinage"
+            ]
+        })
+    
+    # ========================================================================================================
+    # GÉNÉRATION RECOMMANDATIONS ÉQUIPEMENTS
+    # ========================================================================================================
+    
+    # Équipements à ajouter selon l'analyse
+    if not input_data.has_vfd and power_analysis and power_analysis["efficiency_gap"] < -15:
+        equipment_to_add.append({
+            "equipment": "Variateur de fréquence (VFD)",
+            "justification": "Optimisation énergétique et régulation débit",
+            "expected_savings": "15-30% économies énergie",
+            "cost_estimate": "800-2500€",
+            "priority": "HIGH"
+        })
+    
+    if input_data.vibration_level and input_data.vibration_level > 4.5:
+        equipment_to_add.append({
+            "equipment": "Système surveillance vibratoire",
+            "justification": "Maintenance prédictive et alerte défaillance",
+            "expected_savings": "Éviter arrêt production imprévu",
+            "cost_estimate": "300-800€",
+            "priority": "MEDIUM"
+        })
+    
+    # Conduite et hydraulique
+    hydraulic_improvements = []
+    if input_data.suction_pipe_diameter and input_data.current_flow_rate:
+        # Calcul vitesse aspiration
+        diameter_m = input_data.suction_pipe_diameter / 1000
+        area = math.pi * (diameter_m/2)**2
+        velocity = (input_data.current_flow_rate / 3600) / area
+        
+        if velocity > 1.5:  # Vitesse aspiration excessive
+            hydraulic_improvements.append({
+                "type": "CONDUITE ASPIRATION SOUS-DIMENSIONNÉE", 
+                "current_diameter": f"DN{int(input_data.suction_pipe_diameter)}",
+                "current_velocity": f"{velocity:.1f} m/s",
+                "recommended_diameter": f"DN{int(input_data.suction_pipe_diameter * 1.3)}",
+                "justification": "Réduction pertes charge et risque cavitation",
+                "priority": "HIGH"
+            })
+    
+    # ========================================================================================================
+    # PLAN D'ACTION PRIORITAIRE
+    # ========================================================================================================
+    
+    action_plan = {
+        "phase_immediate": {
+            "timeline": "0-48h",
+            "actions": immediate_actions + [
+                "Vérification niveau huile réducteur",
+                "Contrôle température roulements au toucher",
+                "Test fonctionnement protections électriques"
+            ]
+        },
+        "phase_urgente": {
+            "timeline": "1-2 semaines", 
+            "actions": [action for problem in critical_problems for action in [
+                f"Résoudre: {problem['type']}",
+                f"Causes à vérifier: {', '.join(problem['causes_probables'][:2])}"
+            ]]
+        },
+        "phase_amelioration": {
+            "timeline": "1-3 mois",
+            "actions": [f"Installer: {eq['equipment']}" for eq in equipment_to_add]
+        }
+    }
+    
+    return {
+        "installation_analysis": {
+            "overall_condition": "CRITIQUE" if critical_problems else ("DÉGRADÉE" if installation_issues else "ACCEPTABLE"),
+            "critical_problems_count": len(critical_problems),
+            "issues_count": len(installation_issues),
+            "power_analysis": power_analysis
+        },
+        "detailed_problems": critical_problems + installation_issues + vibration_issues + thermal_issues,
+        "hydraulic_improvements": hydraulic_improvements,
+        "equipment_replacement_list": equipment_to_replace,
+        "equipment_addition_list": equipment_to_add,
+        "immediate_actions": immediate_actions,
+        "action_plan": action_plan,
+        "energy_waste_analysis": {
+            "current_efficiency": power_analysis.get("actual_global_efficiency", 0) if power_analysis else 0,
+            "potential_savings_percent": max(0, 65 - power_analysis.get("actual_global_efficiency", 65)) if power_analysis else 0,
+            "annual_waste_kwh": 0,  # À calculer selon heures fonctionnement
+            "financial_impact": "Surconsommation estimée 20-40% vs installation optimale"
+        }
+    }
+
+def generate_action_plan(recommendations: List[AuditRecommendation], economic_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Génère le plan d'action prioritaire"""
+    critical_actions = [r for r in recommendations if r.priority == "critical"]
+    high_actions = [r for r in recommendations if r.priority == "high"]
+    
+    return {
+        "phase_1_immediate": {
+            "actions": [r.action for r in critical_actions],
+            "timeline": "0-4 semaines",
+            "budget": sum(r.cost_estimate_max for r in critical_actions),
+            "expected_roi": min(r.roi_months for r in critical_actions) if critical_actions else 12
+        },
+        "phase_2_short_term": {
+            "actions": [r.action for r in high_actions],
+            "timeline": "1-6 mois",
+            "budget": sum(r.cost_estimate_max for r in high_actions),
+            "expected_roi": min(r.roi_months for r in high_actions) if high_actions else 18
+        },
+        "total_program": {
+            "duration_months": 12,
+            "total_investment": economic_analysis["total_investment_required"],
+            "annual_savings": economic_analysis["annual_energy_savings"] + economic_analysis["annual_maintenance_savings"],
+            "payback_months": economic_analysis["payback_period_months"]
+        }
+    }
+
+def calculate_audit_analysis(input_data: AuditInput) -> AuditResult:
+    """
+    Effectue une analyse d'audit complète et intelligente d'une installation de pompage
+    Comparaisons ACTUEL vs REQUIS vs CONCEPTION avec diagnostic expert terrain
+    """
+    
+    audit_id = str(uuid.uuid4())[:8]
+    audit_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    clock = StageClock()
+    
+    # ========================================================================================================
+    # 1. ANALYSES COMPARATIVES DÉTAILLÉES
+    # ========================================================================================================
+    
+    performance_comparisons = []
+    
+    # Analyse débit
+    if input_data.current_flow_rate and input_data.required_flow_rate:
+        deviation_required = ((input_data.current_flow_rate - input_data.required_flow_rate) / input_data.required_flow_rate) * 100
+        status = "optimal" if abs(deviation_required) <= 5 else ("acceptable" if abs(deviation_required) <= 15 else "problematic")
+        
+        interpretation = f"Débit actuel: {deviation_required:+.1f}% vs requis"
+        if deviation_required > 15:
+            interpretation += " - SURDIMENSIONNEMENT ÉNERGÉTIQUE"
+        elif deviation_required < -15:
+            interpretation += " - SOUS-DIMENSIONNEMENT CRITIQUE"
+        
+        performance_comparisons.append(AuditComparisonAnalysis(
+            parameter_name="Débit",
+            current_value=input_data.current_flow_rate,
+            required_value=input_data.required_flow_rate,
+            original_design_value=input_data.original_design_flow,
+            deviation_from_required=deviation_required,
+            deviation_from_design=((input_data.current_flow_rate - input_data.original_design_flow) / input_data.original_design_flow * 100) if input_data.original_design_flow else None,
+            status=status,
+            interpretation=interpretation,
+            impact="Consommation énergétique, usure équipement, performance process"
+        ))
+    
+    # Analyse HMT
+    if input_data.current_hmt and input_data.required_hmt:
+        deviation_required = ((input_data.current_hmt - input_data.required_hmt) / input_data.required_hmt) * 100
+        status = "optimal" if abs(deviation_required) <= 10 else ("acceptable" if abs(deviation_required) <= 25 else "critical")
+        
+        interpretation = f"HMT actuelle: {deviation_required:+.1f}% vs requise"
+        if deviation_required > 25:
+            interpretation += " - GASPILLAGE ÉNERGÉTIQUE MAJEUR"
+        elif deviation_required < -25:
+            interpretation += " - PERFORMANCE INSUFFISANTE CRITIQUE"
+            
+        performance_comparisons.append(AuditComparisonAnalysis(
+            parameter_name="HMT",
+            current_value=input_data.current_hmt,
+            required_value=input_data.required_hmt,
+            original_design_value=input_data.original_design_hmt,
+            deviation_from_required=deviation_required,
+            deviation_from_design=((input_data.current_hmt - input_data.original_design_hmt) / input_data.original_design_hmt * 100) if input_data.original_design_hmt else None,
+            status=status,
+            interpretation=interpretation,
+            impact="Efficacité énergétique globale, pression process, durée de vie pompe"
+        ))
+    
+    # Analyse intensité
+    if input_data.measured_current and input_data.rated_current:
+        deviation_rated = ((input_data.measured_current - input_data.rated_current) / input_data.rated_current) * 100
+        status = "optimal" if abs(deviation_rated) <= 10 else ("acceptable" if abs(deviation_rated) <= 20 else "critical")
+        
+        interpretation = f"Intensité mesurée: {deviation_rated:+.1f}% vs plaque"
+        if deviation_rated > 20:
+            interpretation += " - SURCHARGE MOTEUR DANGEREUSE"
+        elif deviation_rated < -30:
+            interpretation += " - SOUS-UTILISATION MAJEURE"
+            
+        performance_comparisons.append(AuditComparisonAnalysis(
+            parameter_name="Intensité",
+            current_value=input_data.measured_current,
+            required_value=input_data.rated_current,
+            original_design_value=input_data.rated_current,
+            deviation_from_required=deviation_rated,
+            deviation_from_design=deviation_rated,
+            status=status,
+            interpretation=interpretation,
+            impact="Sécurité électrique, durée de vie moteur, efficacité énergétique"
+        ))
+    
+    # ========================================================================================================
+    # 2. DIAGNOSTICS EXPERTS PAR CATÉGORIE
+    # ========================================================================================================
+    
+    clock.lap("audit_comparisons")
+    diagnostics = run_stage(None, "audit_diagnostics", generate_expert_diagnostics, input_data, performance_comparisons)
+    
+    # ========================================================================================================
+    # 3. RECOMMANDATIONS PRIORISÉES
+    # ========================================================================================================
+    
+    recommendations = run_stage(None, "audit_recommendations", generate_expert_recommendations, input_data, diagnostics, performance_comparisons)
+    
+    # ========================================================================================================
+    # 4. CALCULS SCORES INTELLIGENTS
+    # ========================================================================================================
+    
+    scores = run_stage(None, "audit_scores", calculate_audit_scores, input_data, performance_comparisons, diagnostics)
+    
+    # ========================================================================================================
+    # 5. SYNTHÈSE EXECUTIVE
+    # ========================================================================================================
+    
+    executive_summary = run_stage(None, "audit_executive_summary", generate_executive_summary, input_data, scores, diagnostics, recommendations)
+    
+    # ========================================================================================================
+    # 6. ANALYSE ÉCONOMIQUE
+    # ========================================================================================================
+    
+    economic_analysis = run_stage(None, "audit_economics", generate_economic_analysis, input_data, recommendations)
+    
+    # ========================================================================================================
+    # 7. PLAN D'ACTION PRIORITAIRE
+    # ========================================================================================================
+    
+    action_plan = run_stage(None, "audit_action_plan", generate_action_plan, recommendations, economic_analysis)
+    
+    # ========================================================================================================
+    # 8. RAPPORT D'EXPERTISE EXHAUSTIF
+    # ========================================================================================================
+    
+    expert_installation_report = run_stage(None, "audit_installation_report", generate_expert_installation_report, input_data, performance_comparisons)
+    
+    return AuditResult(
+        audit_id=audit_id,
+        audit_date=audit_date,
+        overall_score=scores["overall"],
+        hydraulic_score=scores["hydraulic"],
+        electrical_score=scores["electrical"],
+        mechanical_score=scores["mechanical"],
+        operational_score=scores["operational"],
+        performance_comparisons=performance_comparisons,
+        diagnostics=diagnostics,
+        recommendations=recommendations,
+        executive_summary=executive_summary,
+        economic_analysis=economic_analysis,
+        action_plan=action_plan,
+        expert_installation_report=expert_installation_report
+    )
+
+# ========================================================================================================
+# AUDIT SYSTEM - FONCTIONS SUPPORT POUR ANALYSE EXPERT
+# ========================================================================================================
+
+def generate_expert_diagnostics(input_data: AuditInput, performance_comparisons: List[AuditComparisonAnalysis]) -> List[AuditDiagnostic]:
+    """Génère des diagnostics experts basés sur les données d'audit"""
+    diagnostics = []
+    
+    # Diagnostic hydraulique
+    if input_data.current_flow_rate and input_data.required_flow_rate:
+        deviation = ((input_data.current_flow_rate - input_data.required_flow_rate) / input_data.required_flow_rate) * 100
+        if abs(deviation) > 20:
+            severity = "critical" if abs(deviation) > 50 else "high"
+            diagnostics.append(AuditDiagnostic(
+                category="hydraulic",
+                issue=f"Débit inadéquat: {deviation:+.1f}% vs requis",
+                severity=severity,
+                root_cause="Dimensionnement incorrect ou dégradation performance",
+                symptoms=["Performance process insuffisante", "Consommation énergétique excessive"],
+                consequences=["Perte de productivité", "Surcoût énergétique", "Usure prématurée"],
+                urgency="immediate" if severity == "critical" else "short_term"
+            ))
+    
+    # Diagnostic électrique
+    if input_data.measured_current and input_data.rated_current:
+        deviation = ((input_data.measured_current - input_data.rated_current) / input_data.rated_current) * 100
+        if deviation > 20:
+            diagnostics.append(AuditDiagnostic(
+                category="electrical",
+                issue=f"Surcharge moteur: {deviation:+.1f}% vs nominal",
+                severity="critical",
+                root_cause="Point de fonctionnement inadapté ou défaut moteur",
+                symptoms=["Échauffement moteur", "Consommation excessive", "Déclenchements protection"],
+                consequences=["Risque de grillage moteur", "Arrêts production", "Coûts maintenance"],
+                urgency="immediate"
+            ))
+    
+    # Diagnostic mécanique
+    if input_data.vibration_level and input_data.vibration_level > 4.5:
+        severity = "critical" if input_data.vibration_level > 7.1 else "high"
+        diagnostics.append(AuditDiagnostic(
+            category="mechanical",
+            issue=f"Vibrations excessives: {input_data.vibration_level} mm/s",
+            severity=severity,
+            root_cause="Défaut d'alignement, balourd, ou usure roulements",
+            symptoms=["Bruit anormal", "Usure accélérée", "Desserrage boulonnerie"],
+            consequences=["Défaillance catastrophique", "Arrêt production", "Dommages collatéraux"],
+            urgency="immediate" if severity == "critical" else "short_term"
+        ))
+    
+    return diagnostics
+
+def generate_expert_recommendations(input_data: AuditInput, diagnostics: List[AuditDiagnostic], 
+                                  performance_comparisons: List[AuditComparisonAnalysis]) -> List[AuditRecommendation]:
+    """Génère des recommandations d'amélioration priorisées"""
+    recommendations = []
+    
+    # Recommandations basées sur les diagnostics
+    for diagnostic in diagnostics:
+        if diagnostic.severity == "critical":
+            if diagnostic.category == "hydraulic":
+                recommendations.append(AuditRecommendation(
+                    priority="critical",
+                    category="efficiency",
+                    action="Redimensionnement hydraulique urgent",
+                    description="Modification système pour atteindre performances requises",
+                    technical_details=[
+                        "Analyse complète courbes pompe vs point fonctionnement",
+                        "Redimensionnement diamètres selon vitesses optimales",
+                        "Ajustement caractéristiques hydrauliques"
+                    ],
+                    cost_estimate_min=15000,
+                    cost_estimate_max=50000,
+                    timeline="2-6 semaines",
+                    expected_benefits=[
+                        "Performances process optimales",
+                        "Réduction consommation 20-40%",
+                        "Fiabilité équipement améliorée"
+                    ],
+                    roi_months=18,
+                    risk_if_not_done="Perte productivité continue, surcoûts énergétiques majeurs"
+                ))
+            elif diagnostic.category == "electrical":
+                recommendations.append(AuditRecommendation(
+                    priority="critical",
+                    category="safety",
+                    action="Correction surcharge moteur immédiate",
+                    description="Intervention urgente pour éviter grillage moteur",
+                    technical_details=[
+                        "Vérification point de fonctionnement pompe",
+                        "Contrôle protection thermique moteur",
+                        "Ajustement paramètres électriques"
+                    ],
+                    cost_estimate_min=2000,
+                    cost_estimate_max=8000,
+                    timeline="1-2 semaines",
+                    expected_benefits=[
+                        "Sécurité électrique restaurée",
+                        "Prévention panne moteur",
+                        "Durée de vie équipement préservée"
+                    ],
+                    roi_months=6,
+                    risk_if_not_done="Risque de grillage moteur et arrêt production"
+                ))
+            elif diagnostic.category == "mechanical":
+                recommendations.append(AuditRecommendation(
+                    priority="critical",
+                    category="reliability",
+                    action="Intervention mécanique d'urgence",
+                    description="Correction défauts mécaniques critiques",
+                    technical_details=[
+                        "Alignement pompe-moteur",
+                        "Équilibrage rotor",
+                        "Remplacement roulements si nécessaire"
+                    ],
+                    cost_estimate_min=3000,
+                    cost_estimate_max=12000,
+                    timeline="1-3 semaines",
+                    expected_benefits=[
+                        "Élimination vibrations excessives",
+                        "Réduction bruit",
+                        "Fiabilité mécanique restaurée"
+                    ],
+                    roi_months=8,
+                    risk_if_not_done="Défaillance catastrophique imminente"
+                ))
+    
+    # Recommandations maintenance préventive
+    if input_data.vibration_level and input_data.vibration_level > 2.8:
+        recommendations.append(AuditRecommendation(
+            priority="high",
+            category="maintenance",
+            action="Programme maintenance prédictive",
+            description="Mise en place suivi vibratoire et thermique",
+            technical_details=[
+                "Installation capteurs vibration permanents",
+                "Surveillance thermique paliers et moteur",
+                "Planning maintenance conditionnelle"
+            ],
+            cost_estimate_min=5000,
+            cost_estimate_max=15000,
+            timeline="1-2 semaines",
+            expected_benefits=[
+                "Prévention pannes 90%",
+                "Réduction coûts maintenance 30%",
+                "Disponibilité équipement >95%"
+            ],
+            roi_months=12,
+            risk_if_not_done="Pannes imprévisibles, coûts maintenance correctifs élevés"
+        ))
+    
+    # Recommandations basées sur les écarts de performance
+    for comparison in performance_comparisons:
+        if comparison.status in ["problematic", "critical"]:
+            if comparison.parameter_name == "Débit" and comparison.deviation_from_required and comparison.deviation_from_required < -20:
+                recommendations.append(AuditRecommendation(
+                    priority="high",
+                    category="efficiency",
+                    action="Optimisation débit système",
+                    description="Amélioration performances hydrauliques pour atteindre débit requis",
+                    technical_details=[
+                        "Vérification état impulseur pompe",
+                        "Nettoyage circuit hydraulique",
+                        "Optimisation diamètres conduites"
+                    ],
+                    cost_estimate_min=8000,
+                    cost_estimate_max=25000,
+                    timeline="2-4 semaines",
+                    expected_benefits=[
+                        "Débit nominal restauré",
+                        "Performance process optimisée",
+                        "Efficacité énergétique améliorée"
+                    ],
+                    roi_months=15,
+                    risk_if_not_done="Sous-performance continue du process"
+                ))
+            elif comparison.parameter_name == "HMT" and comparison.deviation_from_required and comparison.deviation_from_required > 30:
+                recommendations.append(AuditRecommendation(
+                    priority="high",
+                    category="efficiency",
+                    action="Réduction HMT excessive",
+                    description="Optimisation système pour éliminer gaspillage énergétique",
+                    technical_details=[
+                        "Révision point de fonctionnement",
+                        "Installation variateur de vitesse",
+                        "Optimisation réseau hydraulique"
+                    ],
+                    cost_estimate_min=12000,
+                    cost_estimate_max=35000,
+                    timeline="3-6 semaines",
+                    expected_benefits=[
+                        "Réduction consommation 25-40%",
+                        "HMT adaptée aux besoins réels",
+                        "Durée de vie équipement prolongée"
+                    ],
+                    roi_months=20,
+                    risk_if_not_done="Gaspillage énergétique majeur continu"
+                ))
+    
+    # Recommandations énergétiques
+    if input_data.energy_consumption_increase:
+        recommendations.append(AuditRecommendation(
+            priority="medium",
+            category="efficiency",
+            action="Audit énergétique approfondi",
+            description="Analyse détaillée consommation et optimisation énergétique",
+            technical_details=[
+                "Mesures énergétiques détaillées",
+                "Analyse rendements globaux",
+                "Étude variateur de vitesse"
+            ],
+            cost_estimate_min=3000,
+            cost_estimate_max=8000,
+            timeline="2-3 semaines",
+            expected_benefits=[
+                "Identification gisements d'économie",
+                "Plan d'optimisation énergétique",
+                "ROI projets d'amélioration"
+            ],
+            roi_months=24,
+            risk_if_not_done="Surcoûts énergétiques non maîtrisés"
+        ))
+    
+    return recommendations
+
+def calculate_audit_scores(input_data: AuditInput, performance_comparisons: List[AuditComparisonAnalysis], 
+                          diagnostics: List[AuditDiagnostic]) -> Dict[str, int]:
+    """Calcule les scores d'audit par catégorie"""
+    
+    # Score hydraulique
+    hydraulic_score = 100
+    for comp in performance_comparisons:
+        if comp.parameter_name in ["Débit", "HMT"] and comp.status == "problematic":
+            hydraulic_score -= 30
+        elif comp.parameter_name in ["Débit", "HMT"] and comp.status == "critical":
+            hydraulic_score -= 50
+    
+    # Score électrique  
+    electrical_score = 100
+    for comp in performance_comparisons:
+        if comp.parameter_name == "Intensité" and comp.status == "critical":
+            electrical_score -= 40
+    
+    # Score mécanique
+    mechanical_score = 100
+    if input_data.vibration_level:
+        if input_data.vibration_level > 7.1:
+            mechanical_score -= 50
+        elif input_data.vibration_level > 4.5:
+            mechanical_score -= 30
+        elif input_data.vibration_level > 2.8:
+            mechanical_score -= 15
+    
+    if input_data.corrosion_level == "severe":
+        mechanical_score -= 30
+    elif input_data.corrosion_level == "moderate":
+        mechanical_score -= 20
+    
+    # Score opérationnel
+    operational_score = 100
+    if input_data.performance_degradation:
+        operational_score -= 25
+    if input_data.energy_consumption_increase:
+        operational_score -= 20
+    
+    # Score global
+    overall_score = (hydraulic_score + electrical_score + mechanical_score + operational_score) // 4
+    
+    return {
+        "overall": max(0, overall_score),
+        "hydraulic": max(0, hydraulic_score),
+        "electrical": max(0, electrical_score), 
+        "mechanical": max(0, mechanical_score),
+        "operational": max(0, operational_score)
+    }
+
+def generate_executive_summary(input_data: AuditInput, scores: Dict[str, int], 
+                              diagnostics: List[AuditDiagnostic], 
+                              recommendations: List[AuditRecommendation]) -> Dict[str, Any]:
+    """Génère la synthèse executive"""
+    
+    critical_issues = len([d for d in diagnostics if d.severity == "critical"])
+    high_issues = len([d for d in diagnostics if d.severity == "high"])
+    
+    overall_status = "Excellent" if scores["overall"] >= 90 else (
+        "Bon" if scores["overall"] >= 75 else (
+        "Acceptable" if scores["overall"] >= 60 else (
+        "Problématique" if scores["overall"] >= 40 else "Critique")))
+    
+    return {
+        "overall_status": overall_status,
+        "overall_score": scores["overall"],
+        "critical_issues_count": critical_issues,
+        "high_issues_count": high_issues,
+        "total_recommendations": len(recommendations),
+        "immediate_actions_required": critical_issues > 0,
+        "key_findings": [d.issue for d in diagnostics[:3]],  # Top 3 issues
+        "priority_investments": sum([r.cost_estimate_max for r in recommendations if r.priority in ["critical", "high"]]),
+        "estimated_annual_savings": 50000 if scores["overall"] < 60 else 25000  # Estimation
+    }
+
+def generate_economic_analysis(input_data: AuditInput, recommendations: List[AuditRecommendation]) -> Dict[str, Any]:
+    """Génère l'analyse économique"""
+    
+    total_investment = sum([r.cost_estimate_max for r in recommendations])
+    annual_energy_cost = (input_data.rated_power or 15) * (input_data.operating_hours_daily or 8) * (input_data.operating_days_yearly or 300) * input_data.electricity_cost_per_kwh
+    
+    potential_savings = annual_energy_cost * 0.3 if total_investment > 20000 else annual_energy_cost * 0.15
+    
+    payback_years = total_investment / potential_savings if potential_savings > 0 else 10
+    
+    return {
+        "current_annual_energy_cost": annual_energy_cost,
+        "total_investment_cost": total_investment,  # Changed field name
+        "annual_savings": potential_savings,  # Changed field name
+        "payback_months": int(min(payback_years, 10) * 12),  # Changed field name and converted to months
+        "payback_period_years": min(payback_years, 10),
+        "roi_5_years": (potential_savings * 5 - total_investment) / total_investment * 100 if total_investment > 0 else 0,
+        "co2_reduction_tons_year": potential_savings * 0.5 / 1000,  # Estimation
+        "investment_breakdown": [
+            {"category": "Hydraulique", "amount": sum([r.cost_estimate_max for r in recommendations if r.category == "efficiency"])},
+            {"category": "Maintenance", "amount": sum([r.cost_estimate_max for r in recommendations if r.category == "maintenance"])},
+            {"category": "Sécurité", "amount": sum([r.cost_estimate_max for r in recommendations if r.category == "safety"])}
+        ]
+    }
+
+def generate_action_plan(recommendations: List[AuditRecommendation], economic_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Génère le plan d'action prioritaire"""
+    
+    # Tri par priorité et ROI
+    critical_actions = [r for r in recommendations if r.priority == "critical"]
+    high_actions = [r for r in recommendations if r.priority == "high"]
+    medium_actions = [r for r in recommendations if r.priority == "medium"]
+    
+    phases = [
+        {
+            "phase": "Phase 1 - Immédiate",
+            "timeline": "0-3 mois",
+            "actions": [r.action for r in critical_actions],
+            "investment": sum([r.cost_estimate_max for r in critical_actions]),
+            "expected_impact": "Sécurité, conformité, arrêt dégradation"
+        },
+        {
+            "phase": "Phase 2 - Court terme",
+            "timeline": "3-12 mois", 
+            "actions": [r.action for r in high_actions],
+            "investment": sum([r.cost_estimate_max for r in high_actions]),
+            "expected_impact": "Efficacité énergétique, fiabilité"
+        },
+        {
+            "phase": "Phase 3 - Moyen terme",
+            "timeline": "12-24 mois",
+            "actions": [r.action for r in medium_actions],
+            "investment": sum([r.cost_estimate_max for r in medium_actions]),
+            "expected_impact": "Optimisation performance, ROI"
+        }
+    ]
+    
+    return {
+        "phases": phases,  # Added phases field for test compatibility
+        "phase_1_immediate": {
+            "timeline": "0-3 mois",
+            "actions": [r.action for r in critical_actions],
+            "investment": sum([r.cost_estimate_max for r in critical_actions]),
+            "expected_impact": "Sécurité, conformité, arrêt dégradation"
+        },
+        "phase_2_short_term": {
+            "timeline": "3-12 mois", 
+            "actions": [r.action for r in high_actions],
+            "investment": sum([r.cost_estimate_max for r in high_actions]),
+            "expected_impact": "Efficacité énergétique, fiabilité"
+        },
+        "phase_3_medium_term": {
+            "timeline": "12-24 mois",
+            "actions": [r.action for r in medium_actions],
+            "investment": sum([r.cost_estimate_max for r in medium_actions]),
+            "expected_impact": "Optimisation performance, ROI"
+        },
+        "total_program": {
+            "duration_months": 24,
+            "total_investment": economic_analysis["total_investment_cost"],
+            "expected_savings": economic_analysis["annual_savings"],
+            "payback_years": economic_analysis["payback_period_years"]
+        }
+    }
@@ -0,0 +1,1166 @@
+"""Bases de données de référence: matériaux, raccords, fluides, diamètres normalisés et
+équipements solaires, ainsi que les catalogues servis par l'API."""
+
+from typing import Dict, Any
+import math
+import bisect
+
+# ============================================================================
+# PIPE MATERIALS AND FITTINGS DATABASE
+# ============================================================================
+
+PIPE_MATERIALS = {
+    "pvc": {
+        "name": "PVC",
+        "roughness": 0.0015,  # mm
+        "description": "Polychlorure de vinyle"
+    },
+    "pehd": {
+        "name": "PEHD",
+        "roughness": 0.007,  # mm
+        "description": "Polyéthylène haute densité"
+    },
+    "steel": {
+        "name": "Acier",
+        "roughness": 0.045,  # mm
+        "description": "Acier commercial"
+    },
+    "steel_galvanized": {
+        "name": "Acier galvanisé",
+        "roughness": 0.15,  # mm
+        "description": "Acier galvanisé"
+    },
+    "cast_iron": {
+        "name": "Fonte",
+        "roughness": 0.25,  # mm
+        "description": "Fonte"
+    },
+    "concrete": {
+        "name": "Béton",
+        "roughness": 0.3,  # mm
+        "description": "Béton lissé"
+    }
+}
+
+FITTING_COEFFICIENTS = {
+    "elbow_90": {"name": "Coude 90°", "k": 0.9},
+    "elbow_45": {"name": "Coude 45°", "k": 0.4},
+    "tee_through": {"name": "Té passage direct", "k": 0.6},
+    "tee_branch": {"name": "Té dérivation", "k": 1.8},
+    "gate_valve_open": {"name": "Vanne guillotine ouverte", "k": 0.15},
+    "gate_valve_half": {"name": "Vanne guillotine mi-ouverte", "k": 5.6},
+    "ball_valve": {"name": "Vanne à boule", "k": 0.05},
+    "check_valve": {"name": "Clapet anti-retour", "k": 2.0},
+    "reducer": {"name": "Réducteur", "k": 0.5},
+    "enlarger": {"name": "Élargisseur", "k": 1.0},
+    "entrance_sharp": {"name": "Entrée vive", "k": 0.5},
+    "entrance_smooth": {"name": "Entrée arrondie", "k": 0.1},
+    "exit": {"name": "Sortie", "k": 1.0}
+}
+
+# Table des DN normalisés (diamètres nominaux ISO)
+DN_STANDARDS = [15, 20, 25, 32, 40, 50, 65, 80, 100, 125, 150, 200, 250, 300, 350, 400, 450, 500, 600, 700, 800, 900, 1000]
+
+# Table de correspondance DN vers diamètres extérieurs réels (mm)
+DN_TO_DIAMETER = {
+    20: 26.9,
+    25: 33.7,
+    32: 42.4,
+    40: 48.3,
+    50: 60.3,
+    65: 76.1,
+    80: 88.9,
+    100: 114.3,
+    125: 139.7,
+    150: 168.3,
+    200: 219.1,
+    250: 273.1,
+    300: 323.9,
+    350: 355.6,
+    400: 406.4,
+    450: 457.2,
+    500: 508.0
+}
+
+# DN triés et diamètres correspondants (croissants) pour les recherches par bisection
+DN_SORTED = tuple(sorted(DN_TO_DIAMETER))
+DN_DIAMETERS = tuple(DN_TO_DIAMETER[dn] for dn in DN_SORTED)
+
+def get_dn_from_diameter(diameter_mm):
+    """Convertit un diamètre en mm vers le DN correspondant le plus proche"""
+    if diameter_mm <= 0:
+        return 20
+    
+    # Le DN le plus proche, remplacé par le DN supérieur si le diamètre calculé le dépasse:
+    # c'est le premier DN dont le diamètre réel est >= au diamètre demandé (plafonné au plus grand)
+    index = bisect.bisect_left(DN_DIAMETERS, diameter_mm)
+    return DN_SORTED[min(index, len(DN_SORTED) - 1)]
+
+def get_closest_dn(diameter_mm):
+    """Convertit un diamètre en mm vers le DN normalisé le plus proche"""
+    if diameter_mm <= 0:
+        return DN_STANDARDS[0]
+    
+    # Trouver le DN le plus proche (à égalité, le plus petit)
+    index = bisect.bisect_left(DN_STANDARDS, diameter_mm)
+    if index == len(DN_STANDARDS) or (index > 0 and diameter_mm - DN_STANDARDS[index - 1] <= DN_STANDARDS[index] - diameter_mm):
+        index -= 1
+    closest_dn = DN_STANDARDS[index]
+    
+    # Si le diamètre calculé est supérieur au DN trouvé et qu'il y a une différence significative,
+    # prendre le DN supérieur pour être sûr
+    if diameter_mm > closest_dn and diameter_mm - closest_dn > closest_dn * 0.1:
+        if index < len(DN_STANDARDS) - 1:
+            closest_dn = DN_STANDARDS[index + 1]
+    
+    return closest_dn
+
+def calculate_graduated_diameter_recommendations(current_diameter_mm, flow_rate_m3h, current_velocity, pipe_length_m, is_suction_pipe=False):
+    """
+    Calcule des recommandations graduées d'augmentation de diamètre avec analyse coût-bénéfice
+    respectant les vitesses hydrauliques normalisées selon le type de conduite
+    """
+    recommendations = []
+    
+    # Obtenir le DN actuel
+    current_dn = get_dn_from_diameter(current_diameter_mm)
+    
+    # Vitesses recommandées selon les normes hydrauliques professionnelles
+    # Basé sur la documentation technique fournie
+    velocity_limits = {
+        "aspiration": {
+            "optimal": 1.2,      # Vitesse optimale aspiration
+            "max_safe": 1.5,     # Maximum pour éviter cavitation
+            "description": "Aspiration (éviter cavitation)"
+        },
+        "refoulement": {
+            "optimal": 2.0,      # Vitesse optimale refoulement
+            "max_safe": 2.5,     # Maximum recommandé
+            "description": "Refoulement standard"
+        },
+        "longue_distance": {
+            "optimal": 1.5,      # Vitesse optimale longues distances
+            "max_safe": 2.0,     # Maximum pour limiter pertes
+            "description": "Conduites principales"
+        },
+        "circuits_fermes": {
+            "optimal": 2.0,      # Vitesse optimale circuits fermés
+            "max_safe": 3.0,     # Maximum tolérable
+            "description": "Réseaux sous pression"
+        },
+        "metallique_court": {
+            "optimal": 3.0,      # Vitesse acceptable tuyauteries résistantes
+            "max_safe": 4.0,     # Maximum absolu (cas spéciaux)
+            "description": "Tuyauteries métalliques courtes"
+        }
+    }
+    
+    # Déterminer le type de conduite selon la longueur, la vitesse actuelle et le type de pipe
+    if is_suction_pipe:
+        # Pour les conduites d'aspiration, priorité aux limites d'aspiration
+        if pipe_length_m < 20:
+            conduite_type = "aspiration"
+        elif pipe_length_m > 100:
+            conduite_type = "longue_distance"
+        else:
+            conduite_type = "aspiration"  # Par défaut aspiration pour les conduites de succion
+    else:
+        # Pour les conduites de refoulement, logique existante
+        if pipe_length_m > 100:
+            conduite_type = "longue_distance"
+        elif current_velocity > 3.0:
+            conduite_type = "metallique_court"
+        elif pipe_length_m < 20:
+            conduite_type = "circuits_fermes"
+        else:
+            conduite_type = "refoulement"
+    
+    target_velocity = velocity_limits[conduite_type]["optimal"]
+    max_velocity = velocity_limits[conduite_type]["max_safe"]
+    conduite_description = velocity_limits[conduite_type]["description"]
+    
+    # Liste des DN disponibles triés
+    available_dns = DN_SORTED
+    current_index = bisect.bisect_left(DN_SORTED, current_dn)
+    
+    # Si la vitesse actuelle est acceptable, pas de recommandations
+    if current_velocity <= max_velocity:
+        return []
+    
+    # Calculer le diamètre requis pour atteindre la vitesse cible
+    required_area = (flow_rate_m3h / 3600) / target_velocity
+    required_diameter_mm = math.sqrt(4 * required_area / math.pi) * 1000
+    target_dn = get_dn_from_diameter(required_diameter_mm)
+    
+    # Ajouter un en-tête explicatif
+    recommendations.append(f"⚠️ VITESSE EXCESSIVE ({current_velocity:.1f} m/s) - {conduite_description.upper()}")
+    recommendations.append(f"🎯 VITESSE CIBLE: {target_velocity:.1f} m/s (MAX: {max_velocity:.1f} m/s)")
+    
+    # Calculer les options graduées jusqu'à atteindre la vitesse cible
+    options_count = 0
+    for i in range(1, len(available_dns) - current_index):
+        if options_count >= 3:  # Limiter à 3 options maximum
+            break
+            
+        next_dn = available_dns[current_index + i]
+        next_diameter = DN_TO_DIAMETER[next_dn]
+        
+        # Calculer la nouvelle vitesse
+        new_area = math.pi * (next_diameter / 1000 / 2) ** 2
+        new_velocity = (flow_rate_m3h / 3600) / new_area
+        
+        # Ne pas proposer d'options qui dépassent encore les limites
+        if new_velocity > max_velocity:
+            continue
+            
+        # Calculer la réduction de vitesse et l'augmentation de coût
+        velocity_reduction = ((current_velocity - new_velocity) / current_velocity) * 100
+        cost_increase = ((next_diameter / current_diameter_mm) ** 2 - 1) * 100
+        
+        # Efficacité (réduction vitesse / augmentation coût)
+        efficiency_ratio = velocity_reduction / cost_increase if cost_increase > 0 else 0
+        
+        # Déterminer la priorité selon la vitesse atteinte
+        if new_velocity <= target_velocity:
+            priority = "🟢 OPTIMAL"
+        elif new_velocity <= target_velocity * 1.2:
+            priority = "🟡 RECOMMANDÉ"
+        else:
+            priority = "🔴 LIMITE"
+        
+        # Formatage de la recommandation avec conformité aux normes
+        norm_status = "✅ CONFORME" if new_velocity <= target_velocity else "⚠️ ACCEPTABLE"
+        recommendation = f"{priority} DN{current_dn}→DN{next_dn}: {new_velocity:.1f}m/s {norm_status} (réduction -{velocity_reduction:.0f}%, coût +{cost_increase:.0f}%)"
+        recommendations.append(recommendation)
+        
+        options_count += 1
+        
+        # Arrêter si on a atteint une vitesse optimale
+        if new_velocity <= target_velocity:
+            break
+    
+    # Si aucune option n'est proposée, calculer directement le DN nécessaire
+    if options_count == 0:
+        recommendations.append(f"🔧 SOLUTION DIRECTE: DN{current_dn}→DN{target_dn} pour atteindre {target_velocity:.1f} m/s")
+    
+    return recommendations
+
+FLUID_PROPERTIES = {
+    "water": {
+        "name": "Eau",
+        "density_20c": 1000,  # kg/m³
+        "viscosity_20c": 0.001,  # Pa·s
+        "vapor_pressure_20c": 2340,  # Pa
+        "temp_coeffs": {
+            "density": -0.2,  # kg/m³/°C
+            "viscosity": -0.00005,  # Pa·s/°C
+            "vapor_pressure": 100  # Pa/°C
+        }
+    },
+    "oil": {
+        "name": "Huile Hydraulique",
+        "density_20c": 850,
+        "viscosity_20c": 0.05,
+        "vapor_pressure_20c": 100,
+        "temp_coeffs": {
+            "density": -0.7,
+            "viscosity": -0.002,
+            "vapor_pressure": 20
+        }
+    },
+    "acid": {
+        "name": "Solution Acide",
+        "density_20c": 1200,
+        "viscosity_20c": 0.002,
+        "vapor_pressure_20c": 3000,
+        "temp_coeffs": {
+            "density": -0.3,
+            "viscosity": -0.0001,
+            "vapor_pressure": 150
+        }
+    },
+    "glycol": {
+        "name": "Éthylène Glycol",
+        "density_20c": 1113,
+        "viscosity_20c": 0.0161,
+        "vapor_pressure_20c": 10,
+        "temp_coeffs": {
+            "density": -0.8,
+            "viscosity": -0.0008,
+            "vapor_pressure": 5
+        }
+    },
+    # NOUVEAUX FLUIDES INDUSTRIELS - Extension Expertise Hydraulique
+    "palm_oil": {
+        "name": "Huile de Palme",
+        "density_20c": 915,  # kg/m³ (ASTM D1298)
+        "viscosity_20c": 0.045,  # Pa·s (à 20°C)
+        "vapor_pressure_20c": 0.001,  # Pa (très faible)
+        "temp_coeffs": {
+            "density": -0.65,  # Coefficient thermique typique huiles végétales
+            "viscosity": -0.0018,  # Forte variation avec température
+            "vapor_pressure": 0.0001
+        },
+        "technical_specs": {
+            "flash_point": 315,  # °C
+            "pour_point": 2,  # °C
+            "saponification_value": 199,  # mg KOH/g
+            "iodine_value": 53,  # g I2/100g
+            "compatibility": ["stainless_steel", "bronze", "pvc"],
+            "incompatibility": ["galvanized_steel", "copper_alloys"]
+        }
+    },
+    "gasoline": {
+        "name": "Essence (Octane 95)",
+        "density_20c": 740,  # kg/m³ (ASTM D4052)
+        "viscosity_20c": 0.00055,  # Pa·s (très faible)
+        "vapor_pressure_20c": 13000,  # Pa (très volatile)
+        "temp_coeffs": {
+            "density": -0.9,  # Fort coefficient pour hydrocarbures légers
+            "viscosity": -0.000015,  # Très faible viscosité
+            "vapor_pressure": 850  # Augmentation rapide avec température
+        },
+        "technical_specs": {
+            "flash_point": -43,  # °C (très inflammable)
+            "autoignition_temp": 280,  # °C
+            "octane_rating": 95,
+            "reid_vapor_pressure": 90,  # kPa
+            "compatibility": ["stainless_steel", "ptfe", "viton"],
+            "incompatibility": ["rubber", "pvc", "copper"]
+        }
+    },
+    "diesel": {
+        "name": "Gazole (Diesel)",
+        "density_20c": 840,  # kg/m³ (EN 590)
+        "viscosity_20c": 0.0035,  # Pa·s (à 20°C)
+        "vapor_pressure_20c": 300,  # Pa
+        "temp_coeffs": {
+            "density": -0.75,  # Coefficient pour gazole
+            "viscosity": -0.00012,
+            "vapor_pressure": 25
+        },
+        "technical_specs": {
+            "flash_point": 65,  # °C minimum (EN 590)
+            "cetane_number": 51,  # minimum
+            "sulfur_content": 10,  # mg/kg maximum
+            "cold_filter_plugging_point": -5,  # °C
+            "compatibility": ["carbon_steel", "stainless_steel", "aluminum"],
+            "incompatibility": ["zinc", "copper"]
+        }
+    },
+    "hydraulic_oil": {
+        "name": "Huile Hydraulique ISO VG 46",
+        "density_20c": 875,  # kg/m³ (ISO 3675)
+        "viscosity_20c": 0.046,  # Pa·s (équivalent à 46 cSt)
+        "vapor_pressure_20c": 0.1,  # Pa (très faible)
+        "temp_coeffs": {
+            "density": -0.65,
+            "viscosity": -0.0019,  # Indice de viscosité ~100
+            "vapor_pressure": 0.02
+        },
+        "technical_specs": {
+            "iso_grade": "VG 46",
+            "viscosity_index": 100,  # Minimum selon ISO 11158
+            "flash_point": 220,  # °C minimum
+            "pour_point": -30,  # °C maximum
+            "anti_wear_additives": True,
+            "compatibility": ["steel", "cast_iron", "bronze", "nitrile"],
+            "incompatibility": ["zinc", "natural_rubber"]
+        }
+    },
+    "ethanol": {
+        "name": "Éthanol (95%)",
+        "density_20c": 810,  # kg/m³
+        "viscosity_20c": 0.0012,  # Pa·s
+        "vapor_pressure_20c": 5870,  # Pa (volatile)
+        "temp_coeffs": {
+            "density": -1.05,  # Fort coefficient pour alcool
+            "viscosity": -0.00004,
+            "vapor_pressure": 420
+        },
+        "technical_specs": {
+            "flash_point": 17,  # °C (inflammable)
+            "boiling_point": 78,  # °C
+            "concentration": 95,  # % vol
+            "ph": 7.0,  # Neutre
+            "compatibility": ["stainless_steel", "ptfe", "epdm"],
+            "incompatibility": ["aluminum", "zinc", "natural_rubber"]
+        }
+    },
+    "seawater": {
+        "name": "Eau de Mer",
+        "density_20c": 1025,  # kg/m³ (salinité 35‰)
+        "viscosity_20c": 0.00107,  # Pa·s (légèrement supérieure à l'eau douce)
+        "vapor_pressure_20c": 2280,  # Pa (légèrement inférieure à l'eau pure)
+        "temp_coeffs": {
+            "density": -0.25,  # Légèrement différent de l'eau pure
+            "viscosity": -0.000052,
+            "vapor_pressure": 95
+        },
+        "technical_specs": {
+            "salinity": 35,  # g/L (‰)
+            "chloride_content": 19000,  # mg/L
+            "ph": 8.1,  # Légèrement basique
+            "electrical_conductivity": 50000,  # µS/cm
+            "compatibility": ["316L_stainless", "duplex_steel", "bronze_naval"],
+            "incompatibility": ["carbon_steel", "aluminum", "zinc"]
+        }
+    },
+    "methanol": {
+        "name": "Méthanol (99.5%)",
+        "density_20c": 792,  # kg/m³
+        "viscosity_20c": 0.00059,  # Pa·s
+        "vapor_pressure_20c": 12800,  # Pa (très volatile)
+        "temp_coeffs": {
+            "density": -1.2,
+            "viscosity": -0.000025,
+            "vapor_pressure": 780
+        },
+        "technical_specs": {
+            "flash_point": 12,  # °C (très inflammable)
+            "boiling_point": 64.7,  # °C
+            "purity": 99.5,  # % vol
+            "water_content": 0.1,  # % max
+            "compatibility": ["stainless_steel", "ptfe", "viton"],
+            "incompatibility": ["natural_rubber", "pvc", "aluminum"]
+        }
+    },
+    "glycerol": {
+        "name": "Glycérine (99%)",
+        "density_20c": 1260,  # kg/m³
+        "viscosity_20c": 1.48,  # Pa·s (très visqueux)
+        "vapor_pressure_20c": 0.001,  # Pa (négligeable)
+        "temp_coeffs": {
+            "density": -0.65,
+            "viscosity": -0.058,  # Forte variation avec température
+            "vapor_pressure": 0.0002
+        },
+        "technical_specs": {
+            "purity": 99.0,  # % minimum
+            "water_content": 0.5,  # % max
+            "ash_content": 0.01,  # % max
+            "ph": 7.0,  # Neutre
+            "compatibility": ["stainless_steel", "pvc", "ptfe", "epdm"],
+            "incompatibility": ["natural_rubber", "neoprene"]
+        }
+    },
+    # NOUVEAUX FLUIDES ALIMENTAIRES ET DOMESTIQUES - Extension Complète
+    "milk": {
+        "name": "Lait (3.5% MG)",
+        "density_20c": 1030,  # kg/m³ (légèrement plus dense que l'eau)
+        "viscosity_20c": 0.0015,  # Pa·s (légèrement plus visqueux que l'eau)
+        "vapor_pressure_20c": 2200,  # Pa (proche de l'eau)
+        "temp_coeffs": {
+            "density": -0.3,  # Coefficient similaire à l'eau
+            "viscosity": -0.00006,
+            "vapor_pressure": 95
+        },
+        "technical_specs": {
+            "fat_content": 3.5,  # % matière grasse
+            "ph": 6.7,  # pH légèrement acide
+            "total_solids": 12.5,  # % matières sèches
+            "protein_content": 3.2,  # % protéines
+            "compatibility": ["stainless_steel", "ptfe", "epdm_food", "silicone"],
+            "incompatibility": ["copper", "brass", "pvc_food"]
+        }
+    },
+    "honey": {
+        "name": "Miel (Naturel)",
+        "density_20c": 1400,  # kg/m³ (très dense)
+        "viscosity_20c": 8.5,  # Pa·s (très visqueux)
+        "vapor_pressure_20c": 0.1,  # Pa (négligeable)
+        "temp_coeffs": {
+            "density": -0.8,
+            "viscosity": -0.25,  # Forte variation avec température
+            "vapor_pressure": 0.02
+        },
+        "technical_specs": {
+            "sugar_content": 82,  # % sucres
+            "water_content": 17,  # % eau
+            "ph": 3.9,  # Acide
+            "viscosity_index": "Newtonien à faible cisaillement",
+            "compatibility": ["316L_stainless", "glass", "ptfe", "food_grade_silicone"],
+            "incompatibility": ["iron", "copper", "aluminum_contact"]
+        }
+    },
+    "wine": {
+        "name": "Vin Rouge (12° alcool)",
+        "density_20c": 990,  # kg/m³ (moins dense que l'eau à cause de l'alcool)
+        "viscosity_20c": 0.0012,  # Pa·s (légèrement plus visqueux que l'eau)
+        "vapor_pressure_20c": 2800,  # Pa (plus élevé à cause de l'alcool)
+        "temp_coeffs": {
+            "density": -0.9,  # Fort coefficient à cause de l'alcool
+            "viscosity": -0.00004,
+            "vapor_pressure": 120
+        },
+        "technical_specs": {
+            "alcohol_content": 12,  # % vol
+            "ph": 3.4,  # Acide
+            "sulfites": 150,  # mg/L
+            "total_acidity": 6.0,  # g/L
+            "compatibility": ["316L_stainless", "glass", "ptfe", "epdm_wine"],
+            "incompatibility": ["iron", "lead", "pvc_standard"]
+        }
+    },
+    "bleach": {
+        "name": "Eau de Javel (5% NaClO)",
+        "density_20c": 1050,  # kg/m³
+        "viscosity_20c": 0.0011,  # Pa·s (proche de l'eau)
+        "vapor_pressure_20c": 2100,  # Pa
+        "temp_coeffs": {
+            "density": -0.25,
+            "viscosity": -0.000045,
+            "vapor_pressure": 90
+        },
+        "technical_specs": {
+            "active_chlorine": 5.0,  # % NaClO
+            "ph": 12.5,  # Très basique
+            "stability": "Dégradation UV et température",
+            "concentration_available": "5-6% chlore actif",
+            "compatibility": ["pvc", "cpvc", "ptfe", "viton_chlorine"],
+            "incompatibility": ["stainless_steel_prolonged", "rubber", "metal_fittings"]
+        }
+    },
+    "yogurt": {
+        "name": "Yaourt Nature",
+        "density_20c": 1050,  # kg/m³
+        "viscosity_20c": 0.15,  # Pa·s (consistance crémeuse)
+        "vapor_pressure_20c": 2150,  # Pa (proche de l'eau)
+        "temp_coeffs": {
+            "density": -0.35,
+            "viscosity": -0.008,  # Forte variation avec température
+            "vapor_pressure": 92
+        },
+        "technical_specs": {
+            "protein_content": 3.5,  # % protéines
+            "fat_content": 3.2,  # % matière grasse
+            "ph": 4.2,  # Acide lactique
+            "lactic_acid": 0.8,  # % acide lactique
+            "compatibility": ["316L_stainless", "glass", "ptfe", "silicone_food"],
+            "incompatibility": ["copper_alloys", "aluminum_direct"]
+        }
+    },
+    "tomato_sauce": {
+        "name": "Sauce Tomate Concentrée",
+        "density_20c": 1100,  # kg/m³ (concentrée)
+        "viscosity_20c": 2.5,  # Pa·s (épaisse)
+        "vapor_pressure_20c": 1800,  # Pa
+        "temp_coeffs": {
+            "density": -0.4,
+            "viscosity": -0.12,
+            "vapor_pressure": 75
+        },
+        "technical_specs": {
+            "concentration": 28,  # % matière sèche
+            "ph": 4.1,  # Acide
+            "salt_content": 2.5,  # % NaCl
+            "lycopene_content": 150,  # mg/kg
+            "compatibility": ["316L_stainless", "glass", "ptfe", "epdm_food"],
+            "incompatibility": ["iron", "copper", "tin_prolonged"]
+        }
+    },
+    "soap_solution": {
+        "name": "Solution Savonneuse (2%)",
+        "density_20c": 1010,  # kg/m³
+        "viscosity_20c": 0.0013,  # Pa·s
+        "vapor_pressure_20c": 2250,  # Pa
+        "temp_coeffs": {
+            "density": -0.28,
+            "viscosity": -0.00005,
+            "vapor_pressure": 95
+        },
+        "technical_specs": {
+            "surfactant_content": 2.0,  # % agents actifs
+            "ph": 10.5,  # Basique
+            "foam_tendency": "Élevée",
+            "biodegradability": "Biodégradable",
+            "compatibility": ["stainless_steel", "pvc", "pp", "ptfe"],
+            "incompatibility": ["aluminum_prolonged", "zinc"]
+        }
+    },
+    "fruit_juice": {
+        "name": "Jus de Fruits (Orange)",
+        "density_20c": 1045,  # kg/m³ (sucres naturels)
+        "viscosity_20c": 0.0018,  # Pa·s
+        "vapor_pressure_20c": 2100,  # Pa
+        "temp_coeffs": {
+            "density": -0.35,
+            "viscosity": -0.00007,
+            "vapor_pressure": 88
+        },
+        "technical_specs": {
+            "sugar_content": 11,  # % Brix
+            "ph": 3.7,  # Acide citrique
+            "vitamin_c": 50,  # mg/100ml
+            "pulp_content": 8,  # % pulpe
+            "compatibility": ["316L_stainless", "glass", "ptfe", "silicone_food"],
+            "incompatibility": ["iron", "copper", "tin_uncoated"]
+        }
+    }
+}
+
+# Base de données complète de compatibilité fluide-matériau pour recommandations expertes
+FLUID_MATERIAL_COMPATIBILITY = {
+    # Structure: fluide -> matériau -> {niveau, recommandations, joints, alertes}
+    "water": {
+        "stainless_steel_316l": {
+            "level": "excellent",
+            "description": "Compatibilité parfaite pour installations eau potable",
+            "recommended_gaskets": ["EPDM", "Viton", "PTFE"],
+            "maintenance": "Maintenance standard - Contrôle annuel",
+            "lifespan": "25+ ans",
+            "special_notes": "Idéal pour applications alimentaires et sanitaires"
+        },
+        "pvc": {
+            "level": "excellent", 
+            "description": "Excellent pour eau froide, bon marché",
+            "recommended_gaskets": ["EPDM", "NBR"],
+            "maintenance": "Faible maintenance requise",
+            "lifespan": "20+ ans",
+            "special_notes": "Limiter à 60°C maximum"
+        },
+        "carbon_steel": {
+            "level": "poor",
+            "description": "Risque de corrosion importante",
+            "recommended_gaskets": ["NBR"],
+            "maintenance": "Maintenance préventive intensive - Inspection trimestrielle",
+            "lifespan": "5-10 ans avec traitement",
+            "special_notes": "ATTENTION: Traitement anticorrosion obligatoire",
+            "alternatives": ["316L Stainless Steel", "PVC", "Fonte Ductile revêtue"]
+        }
+    },
+    
+    "seawater": {
+        "duplex_2205": {
+            "level": "excellent",
+            "description": "Spécialement conçu pour milieux marins",
+            "recommended_gaskets": ["Viton", "PTFE"],
+            "maintenance": "Inspection semestrielle - Nettoyage chimique",
+            "lifespan": "20+ ans",
+            "special_notes": "Résistance optimale aux chlorures"
+        },
+        "bronze_naval": {
+            "level": "excellent",
+            "description": "Alliage marin traditionnel éprouvé",
+            "recommended_gaskets": ["Viton", "EPDM Naval"],
+            "maintenance": "Polissage annuel - Contrôle galvanique",
+            "lifespan": "15+ ans",
+            "special_notes": "Éviter contact avec acier carbone (corrosion galvanique)"
+        },
+        "stainless_steel_316l": {
+            "level": "good",
+            "description": "Acceptable avec surveillance renforcée",
+            "recommended_gaskets": ["Viton", "PTFE"],
+            "maintenance": "Inspection trimestrielle - Contrôle piqûres",
+            "lifespan": "10-15 ans",
+            "special_notes": "ATTENTION: Risque de corrosion par piqûres à long terme",
+            "alternatives": ["Duplex 2205", "Super Duplex 2507", "Bronze Naval"]
+        },
+        "carbon_steel": {
+            "level": "incompatible",
+            "description": "INTERDIT - Corrosion massive assurée",
+            "maintenance": "NON APPLICABLE",
+            "lifespan": "Défaillance en quelques mois",
+            "special_notes": "DANGER: Défaillance catastrophique prévue",
+            "alternatives": ["Duplex 2205", "Bronze Naval", "Super Duplex 2507"]
+        }
+    },
+
+    "diesel": {
+        "carbon_steel": {
+            "level": "excellent",
+            "description": "Standard de l'industrie pétrolière",
+            "recommended_gaskets": ["Viton FKM", "NBR Carburant"],
+            "maintenance": "Inspection annuelle - Test étanchéité",
+            "lifespan": "20+ ans",
+            "special_notes": "Solution économique et éprouvée"
+        },
+        "stainless_steel_316l": {
+            "level": "excellent",
+            "description": "Qualité premium - Résistance maximale",
+            "recommended_gaskets": ["Viton FKM", "PTFE"],
+            "maintenance": "Maintenance minimale",
+            "lifespan": "25+ ans",
+            "special_notes": "Investissement à long terme"
+        },
+        "pvc": {
+            "level": "poor",
+            "description": "Non recommandé - Gonflement et fragilisation",
+            "maintenance": "Remplacement fréquent nécessaire",
+            "lifespan": "2-5 ans maximum",
+            "special_notes": "ATTENTION: Risque de fuite à terme",
+            "alternatives": ["Acier Carbone", "316L Stainless Steel", "HDPE Carburant"]
+        }
+    },
+
+    "gasoline": {
+        "stainless_steel_316l": {
+            "level": "excellent",
+            "description": "Sécurité maximale pour carburant volatile",
+            "recommended_gaskets": ["Viton FKM", "PTFE"],
+            "maintenance": "Inspection stricte semestrielle",
+            "lifespan": "20+ ans",
+            "special_notes": "Conforme réglementation carburants"
+        },
+        "aluminum_5052": {
+            "level": "excellent",
+            "description": "Léger et résistant - Standard aviation",
+            "recommended_gaskets": ["Viton FKM"],
+            "maintenance": "Contrôle corrosion annuel",
+            "lifespan": "15+ ans",
+            "special_notes": "Excellent rapport poids/résistance"
+        },
+        "pvc": {
+            "level": "incompatible",
+            "description": "INTERDIT - Dissolution du plastique",
+            "maintenance": "NON APPLICABLE",
+            "lifespan": "Défaillance immédiate",
+            "special_notes": "DANGER: Risque de fuite majeure et incendie",
+            "alternatives": ["316L Stainless Steel", "Aluminum 5052", "Acier Revêtu PTFE"]
+        }
+    },
+
+    "milk": {
+        "stainless_steel_316l": {
+            "level": "excellent",
+            "description": "Standard alimentaire - Hygiène maximale",
+            "recommended_gaskets": ["EPDM Food Grade", "Silicone Alimentaire"],
+            "maintenance": "Nettoyage CIP quotidien - Stérilisation périodique",
+            "lifespan": "20+ ans",
+            "special_notes": "Certification FDA/CE alimentaire"
+        },
+        "pvc_food": {
+            "level": "good",
+            "description": "Acceptable pour circuits froids",
+            "recommended_gaskets": ["EPDM Food Grade"],
+            "maintenance": "Nettoyage manuel quotidien",
+            "lifespan": "10+ ans",
+            "special_notes": "Limiter à 40°C - Certification alimentaire obligatoire"
+        },
+        "copper": {
+            "level": "incompatible",
+            "description": "INTERDIT - Contamination métallique",
+            "maintenance": "NON APPLICABLE",
+            "special_notes": "DANGER: Contamination du lait - Non conforme normes alimentaires",
+            "alternatives": ["316L Stainless Steel", "PVC Food Grade", "Verre Borosilicate"]
+        }
+    },
+
+    "honey": {
+        "stainless_steel_316l": {
+            "level": "excellent",
+            "description": "Idéal pour produits sucrés acides",
+            "recommended_gaskets": ["Silicone Food Grade", "EPDM Alimentaire"],
+            "maintenance": "Nettoyage à l'eau chaude - Pas de détergent agressif",
+            "lifespan": "25+ ans",
+            "special_notes": "Résistance parfaite aux acides naturels du miel"
+        },
+        "copper": {
+            "level": "incompatible", 
+            "description": "INTERDIT - Catalyse fermentation",
+            "special_notes": "DANGER: Accélération fermentation - Altération qualité miel",
+            "alternatives": ["316L Stainless Steel", "Verre", "Céramique Alimentaire"]
+        }
+    },
+
+    "bleach": {
+        "pvc": {
+            "level": "excellent",
+            "description": "Matériau de référence pour hypochlorite",
+            "recommended_gaskets": ["Viton Chlore", "EPDM Résistant Chlore"],
+            "maintenance": "Rinçage après usage - Contrôle visuel mensuel",
+            "lifespan": "10+ ans",
+            "special_notes": "Spécialement formulé pour résister au chlore"
+        },
+        "cpvc": {
+            "level": "excellent",
+            "description": "Haute résistance chimique et thermique",
+            "recommended_gaskets": ["Viton Chlore", "PTFE"],
+            "maintenance": "Inspection trimestrielle",
+            "lifespan": "15+ ans",
+            "special_notes": "Supérieur au PVC pour applications chaudes"
+        },
+        "stainless_steel_316l": {
+            "level": "incompatible",
+            "description": "INTERDIT - Corrosion par piqûres rapide",
+            "special_notes": "DANGER: Défaillance structurelle assurée avec hypochlorite",
+            "alternatives": ["PVC", "CPVC", "PVDF", "PTFE"]
+        }
+    }
+}
+
+# Catalogues servis par l'API (sérialisés une seule fois au démarrage du serveur)
+def build_fluids_catalog() -> Dict[str, Any]:
+    return {
+        "fluids": [
+            {"id": key, "name": value["name"]} 
+            for key, value in FLUID_PROPERTIES.items()
+        ]
+    }
+
+def build_pipe_materials_catalog() -> Dict[str, Any]:
+    return {
+        "materials": [
+            {
+                "id": key, 
+                "name": value["name"], 
+                "description": value["description"],
+                "roughness": value["roughness"]
+            }
+            for key, value in PIPE_MATERIALS.items()
+        ]
+    }
+
+def build_fittings_catalog() -> Dict[str, Any]:
+    return {
+        "fittings": [
+            {"id": key, "name": value["name"], "k_coefficient": value["k"]}
+            for key, value in FITTING_COEFFICIENTS.items()
+        ]
+    }
+
+# ============================================================================
+# SOLAR EQUIPMENT DATABASE
+# ============================================================================
+
+# Base de données d'irradiation solaire par région (kWh/m²/jour)
+SOLAR_IRRADIATION_DATABASE = {
+    "france": {
+        "nord": {"name": "Nord de la France", "irradiation_annual": 3.2, "peak_month": 5.8, "min_month": 1.1},
+        "centre": {"name": "Centre de la France", "irradiation_annual": 3.8, "peak_month": 6.5, "min_month": 1.4},
+        "sud": {"name": "Sud de la France", "irradiation_annual": 4.6, "peak_month": 7.2, "min_month": 2.1},
+        "corse": {"name": "Corse", "irradiation_annual": 4.9, "peak_month": 7.5, "min_month": 2.4}
+    },
+    "afrique": {
+        "maroc_nord": {"name": "Maroc Nord", "irradiation_annual": 5.2, "peak_month": 8.1, "min_month": 2.8},
+        "maroc_sud": {"name": "Maroc Sud", "irradiation_annual": 6.8, "peak_month": 9.2, "min_month": 4.1},
+        "algerie": {"name": "Algérie", "irradiation_annual": 5.8, "peak_month": 8.5, "min_month": 3.2},
+        "tunisie": {"name": "Tunisie", "irradiation_annual": 5.4, "peak_month": 8.0, "min_month": 2.9},
+        "senegal": {"name": "Sénégal", "irradiation_annual": 6.2, "peak_month": 7.8, "min_month": 4.8},
+        "burkina": {"name": "Burkina Faso", "irradiation_annual": 6.5, "peak_month": 7.2, "min_month": 5.1},
+        "mali": {"name": "Mali", "irradiation_annual": 6.8, "peak_month": 7.5, "min_month": 5.4},
+        "niger": {"name": "Niger", "irradiation_annual": 7.1, "peak_month": 7.8, "min_month": 5.8},
+        "tchad": {"name": "Tchad", "irradiation_annual": 6.9, "peak_month": 7.4, "min_month": 5.2},
+        "cote_ivoire": {"name": "Côte d'Ivoire", "irradiation_annual": 5.1, "peak_month": 6.8, "min_month": 3.9},
+        "egypte": {"name": "Égypte", "irradiation_annual": 6.4, "peak_month": 8.9, "min_month": 3.8}
+    },
+    "moyen_orient": {
+        "arabie": {"name": "Arabie Saoudite", "irradiation_annual": 6.2, "peak_month": 8.7, "min_month": 3.9},
+        "emirats": {"name": "Émirats Arabes Unis", "irradiation_annual": 5.9, "peak_month": 8.2, "min_month": 3.6},
+        "jordanie": {"name": "Jordanie", "irradiation_annual": 5.8, "peak_month": 8.5, "min_month": 3.1}
+    },
+    "asie": {
+        "inde_nord": {"name": "Inde Nord", "irradiation_annual": 5.1, "peak_month": 7.8, "min_month": 2.9},
+        "inde_sud": {"name": "Inde Sud", "irradiation_annual": 5.8, "peak_month": 6.9, "min_month": 4.2},
+        "chine": {"name": "Chine", "irradiation_annual": 4.2, "peak_month": 6.8, "min_month": 1.8},
+        "vietnam": {"name": "Vietnam", "irradiation_annual": 4.6, "peak_month": 6.1, "min_month": 2.8}
+    }
+}
+
+# Base de données des pompes solaires - APPROCHE GRUNDFOS RÉALISTE
+SOLAR_PUMP_DATABASE = {
+    # ===== POMPES SQF (Solar avec convertisseur intégré) - Petits débits =====
+    "sqf_0_6": {
+        "name": "Grundfos SQF 0.6-2",
+        "power_range": [90, 280],  # Watts
+        "flow_range": [0.1, 2.5],  # m³/h
+        "head_range": [15, 75],  # mètres
+        "efficiency": 0.38,
+        "voltage": [24],  # DC volts
+        "price_eur": 890,
+        "type": "submersible",
+        "category": "sqf_integrated"
+    },
+    "sqf_2_5": {
+        "name": "Grundfos SQF 2.5-2",
+        "power_range": [180, 450],  # Watts
+        "flow_range": [0.5, 6],  # m³/h
+        "head_range": [20, 110],  # mètres
+        "efficiency": 0.42,
+        "voltage": [24, 48],  # DC volts
+        "price_eur": 1250,
+        "type": "submersible",
+        "category": "sqf_integrated"
+    },
+    "sqf_5_7": {
+        "name": "Grundfos SQF 5-7",
+        "power_range": [350, 850],  # Watts
+        "flow_range": [1, 12],  # m³/h
+        "head_range": [25, 140],  # mètres
+        "efficiency": 0.48,
+        "voltage": [48, 96],  # DC volts
+        "price_eur": 1890,
+        "type": "submersible",
+        "category": "sqf_integrated"
+    },
+    "sqf_8_5": {
+        "name": "Grundfos SQF 8.5-5",
+        "power_range": [500, 1200],  # Watts
+        "flow_range": [2, 18],  # m³/h
+        "head_range": [30, 120],  # mètres
+        "efficiency": 0.52,
+        "voltage": [48, 96],  # DC volts
+        "price_eur": 2350,
+        "type": "submersible",
+        "category": "sqf_integrated"
+    },
+    
+    # ===== POMPES SP + RSI (Standard + Convertisseur externe) - Gros débits =====
+    "sp_3a_15_rsi": {
+        "name": "Grundfos SP 3A-15 + RSI",
+        "power_range": [1000, 2200],  # Watts
+        "flow_range": [8, 25],  # m³/h
+        "head_range": [40, 180],  # mètres
+        "efficiency": 0.58,
+        "voltage": [96, 192],  # DC volts
+        "price_eur": 3450,  # SP (1850€) + RSI (1600€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 1850,
+        "rsi_cost": 1600
+    },
+    "sp_5a_18_rsi": {
+        "name": "Grundfos SP 5A-18 + RSI",
+        "power_range": [1500, 3200],  # Watts
+        "flow_range": [12, 40],  # m³/h
+        "head_range": [50, 220],  # mètres
+        "efficiency": 0.62,
+        "voltage": [192, 384],  # DC volts
+        "price_eur": 4850,  # SP (2650€) + RSI (2200€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 2650,
+        "rsi_cost": 2200
+    },
+    "sp_8a_22_rsi": {
+        "name": "Grundfos SP 8A-22 + RSI",
+        "power_range": [2500, 5500],  # Watts
+        "flow_range": [20, 65],  # m³/h
+        "head_range": [60, 280],  # mètres
+        "efficiency": 0.65,
+        "voltage": [192, 384],  # DC volts
+        "price_eur": 7200,  # SP (3800€) + RSI (3400€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 3800,
+        "rsi_cost": 3400
+    },
+    "sp_11a_25_rsi": {
+        "name": "Grundfos SP 11A-25 + RSI",
+        "power_range": [4000, 8500],  # Watts
+        "flow_range": [35, 95],  # m³/h
+        "head_range": [70, 350],  # mètres
+        "efficiency": 0.68,
+        "voltage": [384, 600],  # DC volts
+        "price_eur": 11500,  # SP (6200€) + RSI (5300€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 6200,
+        "rsi_cost": 5300
+    },
+    "sp_17a_30_rsi": {
+        "name": "Grundfos SP 17A-30 + RSI",
+        "power_range": [6000, 12000],  # Watts
+        "flow_range": [60, 150],  # m³/h
+        "head_range": [80, 400],  # mètres
+        "efficiency": 0.72,
+        "voltage": [384, 800],  # DC volts
+        "price_eur": 16800,  # SP (9200€) + RSI (7600€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 9200,
+        "rsi_cost": 7600
+    },
+    "sp_25a_35_rsi": {
+        "name": "Grundfos SP 25A-35 + RSI",
+        "power_range": [8000, 18000],  # Watts
+        "flow_range": [100, 220],  # m³/h
+        "head_range": [90, 480],  # mètres
+        "efficiency": 0.75,
+        "voltage": [600, 1000],  # DC volts
+        "price_eur": 24500,  # SP (14200€) + RSI (10300€)
+        "type": "submersible",
+        "category": "sp_rsi",
+        "pump_cost": 14200,
+        "rsi_cost": 10300
+    },
+    
+    # ===== POMPES SP TRÈS GROSSES + RSI INDUSTRIEL - Applications industrielles =====
+    "sp_46a_40_rsi": {
+        "name": "Grundfos SP 46A-40 + RSI Industriel",
+        "power_range": [15000, 30000],  # Watts
+        "flow_range": [180, 350],  # m³/h
+        "head_range": [100, 600],  # mètres
+        "efficiency": 0.78,
+        "voltage": [800, 1200],  # DC volts
+        "price_eur": 42000,  # SP (26000€) + RSI Industriel (16000€)
+        "type": "submersible",
+        "category": "sp_rsi_industrial",
+        "pump_cost": 26000,
+        "rsi_cost": 16000
+    },
+    
+    # ===== POMPES DE SURFACE POUR APPLICATIONS SPÉCIALES =====
+    "cr_3_rsi": {
+        "name": "Grundfos CR 3 + RSI Surface",
+        "power_range": [750, 2200],  # Watts
+        "flow_range": [5, 30],  # m³/h
+        "head_range": [20, 120],  # mètres
+        "efficiency": 0.55,
+        "voltage": [96, 384],  # DC volts
+        "price_eur": 3200,  # CR (1800€) + RSI (1400€)
+        "type": "surface",
+        "category": "cr_rsi_surface",
+        "pump_cost": 1800,
+        "rsi_cost": 1400
+    },
+    "cr_10_rsi": {
+        "name": "Grundfos CR 10 + RSI Surface",
+        "power_range": [2200, 5500],  # Watts
+        "flow_range": [20, 85],  # m³/h
+        "head_range": [25, 180],  # mètres
+        "efficiency": 0.62,
+        "voltage": [384, 600],  # DC volts
+        "price_eur": 6800,  # CR (3800€) + RSI (3000€)
+        "type": "surface",
+        "category": "cr_rsi_surface",
+        "pump_cost": 3800,
+        "rsi_cost": 3000
+    }
+}
+
+# Base de données des panneaux solaires
+SOLAR_PANEL_DATABASE = {
+    "polycristallin_270w": {
+        "name": "Panneau Polycristallin 270W",
+        "power_nominal": 270,  # Watts
+        "voltage_nominal": 24,  # Volts
+        "current_nominal": 11.25,  # Ampères
+        "efficiency": 0.17,  # 17%
+        "size": [1.65, 0.99],  # mètres [longueur, largeur]
+        "price_eur": 175,
+        "warranty": 20,  # années
+        "temperature_coefficient": -0.43  # %/°C
+    },
+    "polycristallin_320w": {
+        "name": "Panneau Polycristallin 320W",
+        "power_nominal": 320,  # Watts
+        "voltage_nominal": 24,  # Volts
+        "current_nominal": 13.33,  # Ampères
+        "efficiency": 0.18,  # 18%
+        "size": [1.96, 0.99],  # mètres [longueur, largeur]
+        "price_eur": 195,
+        "warranty": 20,  # années
+        "temperature_coefficient": -0.42  # %/°C
+    },
+    "monocristallin_400w": {
+        "name": "Panneau Monocristallin 400W",
+        "power_nominal": 400,  # Watts
+        "voltage_nominal": 24,  # Volts
+        "current_nominal": 16.67,  # Ampères
+        "efficiency": 0.21,  # 21%
+        "size": [2.0, 1.0],  # mètres [longueur, largeur]
+        "price_eur": 280,
+        "warranty": 25,  # années
+        "temperature_coefficient": -0.38  # %/°C
+    },
+    "monocristallin_550w": {
+        "name": "Panneau Monocristallin 550W",
+        "power_nominal": 550,  # Watts
+        "voltage_nominal": 48,  # Volts
+        "current_nominal": 11.46,  # Ampères
+        "efficiency": 0.22,  # 22%
+        "size": [2.3, 1.1],  # mètres [longueur, largeur]
+        "price_eur": 380,
+        "warranty": 25,  # années
+        "temperature_coefficient": -0.35  # %/°C
+    }
+}
+
+# Base de données des batteries solaires
+SOLAR_BATTERY_DATABASE = {
+    "lithium_100ah": {
+        "name": "Batterie Lithium LiFePO4 100Ah",
+        "capacity": 100,  # Ah
+        "voltage": 12,  # Volts
+        "energy": 1.2,  # kWh
+        "efficiency": 0.95,  # 95%
+        "cycles": 6000,
+        "price_eur": 450,
+        "weight": 13,  # kg
+        "discharge_depth": 0.95  # 95% DOD
+    },
+    "lithium_200ah": {
+        "name": "Batterie Lithium LiFePO4 200Ah",
+        "capacity": 200,  # Ah
+        "voltage": 12,  # Volts
+        "energy": 2.4,  # kWh
+        "efficiency": 0.96,  # 96%
+        "cycles": 6000,
+        "price_eur": 850,
+        "weight": 24,  # kg
+        "discharge_depth": 0.95  # 95% DOD
+    },
+    "gel_150ah": {
+        "name": "Batterie Gel 150Ah",
+        "capacity": 150,  # Ah
+        "voltage": 12,  # Volts
+        "energy": 1.8,  # kWh
+        "efficiency": 0.85,  # 85%
+        "cycles": 1500,
+        "price_eur": 320,
+        "weight": 45,  # kg
+        "discharge_depth": 0.50  # 50% DOD pour longévité
+    }
+}
+
+# Base de données des régulateurs MPPT
+MPPT_CONTROLLER_DATABASE = {
+    "victron_75_15": {
+        "name": "Victron MPPT 75/15",
+        "max_pv_voltage": 75,  # Volts
+        "max_current": 15,  # Ampères
+        "max_power": 220,  # Watts (12V)
+        "efficiency": 0.98,  # 98%
+        "price_eur": 95,
+        "bluetooth": True
+    },
+    "victron_100_30": {
+        "name": "Victron MPPT 100/30",
+        "max_pv_voltage": 100,  # Volts
+        "max_current": 30,  # Ampères
+        "max_power": 440,  # Watts (12V)
+        "efficiency": 0.98,  # 98%
+        "price_eur": 180,
+        "bluetooth": True
+    },
+    "victron_150_45": {
+        "name": "Victron MPPT 150/45",
+        "max_pv_voltage": 150,  # Volts
+        "max_current": 45,  # Ampères
+        "max_power": 650,  # Watts (12V)
+        "efficiency": 0.98,  # 98%
+        "price_eur": 285,
+        "bluetooth": True
+    }
+}
+
+def build_solar_regions_catalog() -> Dict[str, Any]:
+    regions = []
+    for region_key, region_data in SOLAR_IRRADIATION_DATABASE.items():
+        for subregion_key, subregion_data in region_data.items():
+            regions.append({
+                "region": region_key,
+                "subregion": subregion_key,
+                "name": subregion_data["name"],
+                "irradiation_annual": subregion_data["irradiation_annual"]
+            })
+    return {"regions": regions}
+
+def build_solar_equipment_catalog() -> Dict[str, Any]:
+    return {
+        "pumps": SOLAR_PUMP_DATABASE,
+        "panels": SOLAR_PANEL_DATABASE,
+        "batteries": SOLAR_BATTERY_DATABASE,
+        "mppt_controllers": MPPT_CONTROLLER_DATABASE
+    }
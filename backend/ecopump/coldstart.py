@@ -0,0 +1,61 @@
+"""Mesure du temps d'import à froid du noyau de calcul.
+
+    python -m ecopump.coldstart [module ...]
+
+Chaque import est mesuré dans un interpréteur neuf, sans MONGO_URL ni DB_NAME. Le
+budget (COLD_START_BUDGET_MS, 150 ms par défaut) porte sur le temps absolu médian de
+l'import, pydantic compris; NumPy est chargé au premier calcul et ne compte pas. Le
+plancher pydantic seul est affiché pour information. Code de sortie 1 si le budget est
+dépassé ou si l'import charge NumPy, la pile web ou MongoDB.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", 150))
+COLD_START_RUNS = int(os.environ.get("COLD_START_RUNS", 7))
+COLD_START_MODULES = ("ecopump.hydraulics", "ecopump.solar", "ecopump.audit")
+COLD_START_FLOOR = "from pydantic import BaseModel, Field"
+COLD_START_FORBIDDEN = ("numpy", "fastapi", "starlette", "motor", "pymongo", "dotenv")
+
+# Un module enregistré par importlib.util.LazyLoader mais jamais utilisé n'est pas chargé
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in {forbidden!r}
+                if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule")
+print(elapsed, ",".join(loaded))
+"""
+
+def measure_import(statement: str, runs: int = COLD_START_RUNS):
+    """Median wall time (ms) of statement in fresh interpreters, and the forbidden modules it loaded"""
+    env = {key: value for key, value in os.environ.items() if key not in ("MONGO_URL", "DB_NAME")}
+    probe = _PROBE.format(statement=statement, forbidden=COLD_START_FORBIDDEN)
+    timings, loaded = [], set()
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                                   cwd=Path(__file__).resolve().parent.parent, env=env, check=True)
+        elapsed, _, modules = completed.stdout.strip().partition(" ")
+        timings.append(float(elapsed) * 1000)
+        loaded.update(filter(None, modules.split(",")))
+    return statistics.median(timings), sorted(loaded)
+
+def main(modules=COLD_START_MODULES) -> int:
+    floor_ms, _ = measure_import(COLD_START_FLOOR)
+    print(f"plancher pydantic: {floor_ms:.1f} ms")
+    failed = False
+    for module in modules:
+        total_ms, loaded = measure_import(f"import {module}")
+        ok = total_ms <= COLD_START_BUDGET_MS and not loaded
+        failed |= not ok
+        print(f"{module}: {total_ms:.1f} ms (budget {COLD_START_BUDGET_MS:g} ms)"
+              + (f" - modules interdits chargés: {', '.join(loaded)}" if loaded else "")
+              + ("" if ok else " ÉCHEC"))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] or COLD_START_MODULES))
@@ -0,0 +1,5094 @@
+"""Noyau de calcul hydraulique: pertes de charge vectorisées, NPSHd, HMT, performances,
+analyse expert, balayages, Monte Carlo, coup de bélier, point de fonctionnement,
+simulation en période étendue, réseaux maillés et optimisation des DN."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import os
+from typing import List, Optional, Dict, Any, Iterator
+import math
+import json
+import time
+import bisect
+from functools import lru_cache
+import sys
+from types import MappingProxyType
+
+from .catalog import (
+    PIPE_MATERIALS, FITTING_COEFFICIENTS, DN_TO_DIAMETER, DN_SORTED, get_dn_from_diameter,
+    get_closest_dn, calculate_graduated_diameter_recommendations, FLUID_PROPERTIES,
+    FLUID_MATERIAL_COMPATIBILITY
+)
+from .models import (
+    FluidProperties, FittingInput, NPSHdCalculationInput, HMTCalculationInput,
+    PerformanceAnalysisInput, NPSHdResult, HMTResult, NPSHdBatchItem, NPSHdBatchResult,
+    HMTBatchItem, HMTBatchResult, SWEEP_MAX_POINTS, SWEEP_MAX_CHUNK_SIZE, SweepRange,
+    SweepInput, MONTE_CARLO_MAX_SAMPLES, DistributionInput, UncertaintyAnalysisInput,
+    UncertaintyStatistics, UncertaintyAnalysisResult, WaterHammerInput, WaterHammerResult,
+    PumpCurveInput, SystemCurveInput, OperatingPointInput, OperatingPointResult,
+    OperatingPointBatchResult, ExtendedPeriodInput, ExtendedPeriodResult, PipeNetworkInput,
+    NetworkNodeResult, NetworkPipeResult, PipeNetworkResult, DiameterOptimizationInput,
+    DiameterOption, DiameterOptimizationResult, ExpertAnalysisInput, ExpertAnalysisResult,
+    PerformanceAnalysisResult, CalculationInput, CalculationResult
+)
+from .instrumentation import record_stage
+
+logger = logging.getLogger(__name__)
+
+def _lazy_import(name: str):
+    """Module imported on first attribute access (importlib LazyLoader), already loaded ones as is"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# NumPy n'est chargé qu'au premier calcul: importer le noyau reste sous le budget de
+# démarrage à froid (voir coldstart) pour les scripts qui n'utilisent qu'une partie du paquet
+np = _lazy_import("numpy")
+
+# ============================================================================
+# VECTORIZED HYDRAULIC KERNEL
+# ============================================================================
+# Toutes les fonctions ci-dessous acceptent des scalaires ou des tableaux NumPy
+# (diffusion/broadcasting) et évaluent un lot complet de points de fonctionnement
+# en une seule passe. Les fonctions scalaires historiques en sont des enveloppes.
+
+LAMINAR_REYNOLDS_LIMIT = 2300
+DEFAULT_PIPE_ROUGHNESS = 0.045  # mm - acier commercial
+
+def get_pipe_roughness(pipe_material: str) -> float:
+    """Return the absolute roughness (mm) of a pipe material, steel by default"""
+    if pipe_material not in PIPE_MATERIALS:
+        return DEFAULT_PIPE_ROUGHNESS
+    return PIPE_MATERIALS[pipe_material]["roughness"]
+
+def get_pipe_roughness_array(pipe_materials: List[str]) -> np.ndarray:
+    """Vectorized roughness lookup (mm) for a list of pipe materials"""
+    return np.array([get_pipe_roughness(material) for material in pipe_materials], dtype=float)
+
+def pipe_velocity_array(flow_rate, pipe_diameter) -> np.ndarray:
+    """Mean velocity (m/s) from flow rate (m³/h) and inner diameter (mm)"""
+    flow_rate = np.asarray(flow_rate, dtype=float)
+    pipe_diameter = np.asarray(pipe_diameter, dtype=float)
+    pipe_area = math.pi * (pipe_diameter / 1000 / 2) ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = (flow_rate / 3600) / pipe_area
+    return np.where(pipe_area > 0, velocity, 0.0)
+
+def reynolds_number_array(velocity, diameter, density, viscosity) -> np.ndarray:
+    """Reynolds number for arrays of velocity (m/s), diameter (m), density and viscosity"""
+    return (np.asarray(density, dtype=float) * np.asarray(velocity, dtype=float)
+            * np.asarray(diameter, dtype=float)) / np.asarray(viscosity, dtype=float)
+
+# Moteur unique de coefficient de frottement (Darcy), trois modes sélectionnables:
+#   "swamee_jain" (défaut) : approximation explicite historique de Colebrook-White
+#   "fast"                 : lecture directe d'une table Colebrook-White précalculée
+#                            (cellule la plus proche, écart < 1 %) - balayages/lots, plus
+#                            rapide que le défaut; Colebrook-White exact hors de la table
+#   "precise"              : itération vectorisée de Colebrook-White, amorcée par
+#                            Swamee-Jain, convergée à la précision machine
+FRICTION_FACTOR_MODES = ("swamee_jain", "fast", "precise")
+DEFAULT_FRICTION_FACTOR_MODE = "swamee_jain"
+COLEBROOK_TOLERANCE = 1e-12
+COLEBROOK_MAX_ITERATIONS = 50
+# Grille de la table "fast": 2^FRICTION_TABLE_OCTAVE_BITS cellules par octave. L'indice
+# d'une cellule se lit directement dans les bits du float64 (exposant + bits de tête de
+# la mantisse), ce qui donne une grille quasi log-uniforme sans aucun log10 par appel.
+FRICTION_TABLE_OCTAVE_BITS = 5
+FRICTION_TABLE_SHIFT = 52 - FRICTION_TABLE_OCTAVE_BITS
+FRICTION_TABLE_RE_RANGE = (2.0 ** 11, 2.0 ** 30)  # englobe 2300 - 1e9
+FRICTION_TABLE_ROUGHNESS_RANGE = (2.0 ** -27, 2.0 ** -3)  # ε/D ~7e-9 (tube lisse) - 0.125
+
+def validate_friction_factor_mode(mode: str) -> str:
+    """Return the mode unchanged, or raise ValueError for an unknown friction factor mode"""
+    if mode not in FRICTION_FACTOR_MODES:
+        raise ValueError(f"Mode de coefficient de frottement inconnu: {mode} "
+                         f"(modes disponibles: {', '.join(FRICTION_FACTOR_MODES)})")
+    return mode
+
+def _swamee_jain_turbulent(reynolds_number: np.ndarray, relative_roughness: np.ndarray) -> np.ndarray:
+    """Historical explicit approximation used by the application (turbulent range)"""
+    term1 = (relative_roughness / 3.7) ** 1.11
+    term2 = 6.9 / reynolds_number
+    return 0.25 / (np.log10(term1 + term2) ** 2)
+
+def _colebrook_turbulent(reynolds_number: np.ndarray, relative_roughness: np.ndarray) -> np.ndarray:
+    """
+    Colebrook-White solved for all points at once by Newton iteration on x = 1/√f:
+    x = -2·log10(ε/3.7D + 2.51·x/Re), warm-started from the Swamee-Jain formula.
+    """
+    roughness_term = relative_roughness / 3.7
+    x = -2 * np.log10(roughness_term + 5.74 / reynolds_number ** 0.9)
+    for _ in range(COLEBROOK_MAX_ITERATIONS):
+        argument = roughness_term + 2.51 * x / reynolds_number
+        residual = x + 2 * np.log10(argument)
+        derivative = 1 + (2 / math.log(10)) * (2.51 / reynolds_number) / argument
+        step = residual / derivative
+        x = x - step
+        if np.all(np.abs(step) <= COLEBROOK_TOLERANCE * np.abs(x)):
+            break
+    return 1 / x ** 2
+
+def _friction_table_cell(value: float) -> int:
+    """Table cell index of a positive float (exponent and leading mantissa bits)"""
+    return int(np.array(value, dtype=float).view(np.int64)) >> FRICTION_TABLE_SHIFT
+
+def _friction_table_centers(value_range) -> np.ndarray:
+    """Value at the centre of every cell covering value_range"""
+    cells = np.arange(_friction_table_cell(value_range[0]), _friction_table_cell(value_range[1]) + 1, dtype=np.int64)
+    return ((cells << FRICTION_TABLE_SHIFT) + (1 << (FRICTION_TABLE_SHIFT - 1))).view(np.float64)
+
+@lru_cache(maxsize=1)
+def friction_factor_table() -> Dict[str, Any]:
+    """Colebrook-White factors at the cell centres, flattened Re-major (built on first use)"""
+    re_centers = _friction_table_centers(FRICTION_TABLE_RE_RANGE)
+    roughness_centers = _friction_table_centers(FRICTION_TABLE_ROUGHNESS_RANGE)
+    table = _colebrook_turbulent(*np.meshgrid(re_centers, roughness_centers, indexing="ij"))
+    columns = len(roughness_centers)
+    return {
+        "values": table.ravel(),
+        "columns": columns,
+        "offset": (_friction_table_cell(FRICTION_TABLE_RE_RANGE[0]) * columns
+                   + _friction_table_cell(FRICTION_TABLE_ROUGHNESS_RANGE[0]))
+    }
+
+def _tabulated_turbulent(reynolds_number: np.ndarray, relative_roughness: np.ndarray) -> np.ndarray:
+    """
+    Nearest cell of the precomputed Colebrook-White table: clip, shift and one gather per
+    point. Turbulent points outside the table (ε/D < 7e-9 ou > 0,125, Re > 1e9) are
+    solved exactly instead of being read at the table edge.
+    """
+    table = friction_factor_table()
+    index = np.clip(reynolds_number, *FRICTION_TABLE_RE_RANGE).view(np.int64) >> FRICTION_TABLE_SHIFT
+    index *= table["columns"]
+    index += np.clip(relative_roughness, *FRICTION_TABLE_ROUGHNESS_RANGE).view(np.int64) >> FRICTION_TABLE_SHIFT
+    index -= table["offset"]
+    friction_factor = np.take(table["values"], index, mode="clip")
+    if reynolds_number.size and (reynolds_number.max() > FRICTION_TABLE_RE_RANGE[1]
+                                 or relative_roughness.min() < FRICTION_TABLE_ROUGHNESS_RANGE[0]
+                                 or relative_roughness.max() > FRICTION_TABLE_ROUGHNESS_RANGE[1]):
+        outside = ((reynolds_number > FRICTION_TABLE_RE_RANGE[1])
+                   | (relative_roughness < FRICTION_TABLE_ROUGHNESS_RANGE[0])
+                   | (relative_roughness > FRICTION_TABLE_ROUGHNESS_RANGE[1]))
+        outside &= reynolds_number >= LAMINAR_REYNOLDS_LIMIT
+        friction_factor[outside] = _colebrook_turbulent(reynolds_number[outside], relative_roughness[outside])
+    return friction_factor
+
+_TURBULENT_FRICTION_MODELS = {
+    "swamee_jain": _swamee_jain_turbulent,
+    "fast": _tabulated_turbulent,
+    "precise": _colebrook_turbulent,
+}
+
+def friction_factor_array(reynolds_number, relative_roughness, mode=DEFAULT_FRICTION_FACTOR_MODE) -> np.ndarray:
+    """
+    Darcy friction factor: 64/Re in laminar flow, turbulent model selected by `mode`
+    (see FRICTION_FACTOR_MODES). Zero flow (Re = 0) gives a zero factor.
+    `mode` may also be an array of modes (one per point) for mixed batches.
+    """
+    reynolds_number = np.asarray(reynolds_number, dtype=float)
+    relative_roughness = np.asarray(relative_roughness, dtype=float)
+    reynolds_number, relative_roughness = np.broadcast_arrays(reynolds_number, relative_roughness)
+
+    if isinstance(mode, str):
+        validate_friction_factor_mode(mode)
+
+    is_turbulent = reynolds_number >= LAMINAR_REYNOLDS_LIMIT
+    if isinstance(mode, str) and mode == "fast":
+        # la lecture de table coûte moins cher que l'extraction des points turbulents
+        turbulent = _tabulated_turbulent(reynolds_number, relative_roughness)
+    elif isinstance(mode, str):
+        turbulent = np.zeros(reynolds_number.shape)
+        turbulent[is_turbulent] = _TURBULENT_FRICTION_MODELS[mode](
+            reynolds_number[is_turbulent], relative_roughness[is_turbulent]
+        )
+    else:
+        turbulent = np.zeros(reynolds_number.shape)
+        modes = np.broadcast_to(np.asarray(mode), reynolds_number.shape)
+        for model_name in np.unique(modes[is_turbulent]):
+            mask = is_turbulent & (modes == model_name)
+            turbulent[mask] = _TURBULENT_FRICTION_MODELS[validate_friction_factor_mode(str(model_name))](
+                reynolds_number[mask], relative_roughness[mask]
+            )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        laminar = 64 / reynolds_number
+    friction_factor = np.where(is_turbulent, turbulent, laminar)
+    return np.where(reynolds_number > 0, friction_factor, 0.0)
+
+def linear_head_loss_array(friction_factor, pipe_length, diameter, velocity) -> np.ndarray:
+    """Darcy-Weisbach linear head loss (m): f × (L/D) × V²/2g, with D in metres"""
+    diameter = np.asarray(diameter, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        head_loss = (np.asarray(friction_factor, dtype=float) * (np.asarray(pipe_length, dtype=float) / diameter)
+                     * (np.asarray(velocity, dtype=float) ** 2) / (2 * 9.81))
+    return np.where(diameter > 0, head_loss, 0.0)
+
+def singular_head_loss_array(velocity, k_total) -> np.ndarray:
+    """Singular head loss (m) for a total fitting coefficient ΣK"""
+    return np.asarray(k_total, dtype=float) * (np.asarray(velocity, dtype=float) ** 2) / (2 * 9.81)
+
+def compute_pipe_hydraulics(flow_rate, pipe_diameter, pipe_length, roughness,
+                            density, viscosity, k_total=0.0,
+                            friction_mode=DEFAULT_FRICTION_FACTOR_MODE) -> Dict[str, np.ndarray]:
+    """
+    Noyau hydraulique vectorisé pour un lot de conduites / points de fonctionnement.
+
+    Unités: débit m³/h, diamètre intérieur mm, longueur m, rugosité absolue mm,
+    masse volumique kg/m³, viscosité dynamique Pa·s, ΣK sans dimension.
+    Les arguments sont diffusés entre eux (scalaires ou tableaux de même forme).
+    friction_mode: mode du coefficient de frottement (un mode ou un tableau de modes).
+    """
+    pipe_diameter = np.asarray(pipe_diameter, dtype=float)
+    diameter_m = pipe_diameter / 1000
+
+    velocity = pipe_velocity_array(flow_rate, pipe_diameter)
+    reynolds_number = reynolds_number_array(velocity, diameter_m, density, viscosity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_roughness = np.where(pipe_diameter > 0, np.asarray(roughness, dtype=float) / pipe_diameter, 0.0)
+    friction_factor = friction_factor_array(reynolds_number, relative_roughness, friction_mode)
+
+    linear_head_loss = linear_head_loss_array(friction_factor, pipe_length, diameter_m, velocity)
+    singular_head_loss = singular_head_loss_array(velocity, k_total)
+
+    return {
+        "velocity": velocity,
+        "reynolds_number": reynolds_number,
+        "friction_factor": friction_factor,
+        "linear_head_loss": linear_head_loss,
+        "singular_head_loss": singular_head_loss,
+        "total_head_loss": linear_head_loss + singular_head_loss
+    }
+
+NPSH_ATMOSPHERIC_PRESSURE = 101325  # Pa - pression atmosphérique au niveau de la mer
+
+def compute_npshd_array(suction_flooded, hasp, total_head_loss, density, vapor_pressure,
+                        atmospheric_pressure=NPSH_ATMOSPHERIC_PRESSURE) -> np.ndarray:
+    """
+    NPSHd (m) for arrays of suction configurations.
+
+    En charge:      NPSHd = Patm/ρg + |Hasp| - Pertes - Pv/ρg
+    En aspiration:  NPSHd = Patm/ρg - |Hasp| - Pertes - Pv/ρg
+    """
+    density = np.asarray(density, dtype=float)
+    patm_head = atmospheric_pressure / (density * 9.81)
+    vapor_pressure_head = np.asarray(vapor_pressure, dtype=float) / (density * 9.81)
+    hasp = np.abs(np.asarray(hasp, dtype=float))
+    total_head_loss = np.asarray(total_head_loss, dtype=float)
+    return np.where(
+        suction_flooded,
+        patm_head + hasp - total_head_loss - vapor_pressure_head,
+        patm_head - hasp - total_head_loss - vapor_pressure_head
+    )
+
+def calculate_fittings_k_total(fittings: List[FittingInput]) -> float:
+    """Sum of singular loss coefficients ΣK for a list of fittings (unknown types ignored)"""
+    total_k = 0
+    for fitting in fittings:
+        if fitting.fitting_type in FITTING_COEFFICIENTS:
+            total_k += FITTING_COEFFICIENTS[fitting.fitting_type]["k"] * fitting.quantity
+    return total_k
+
+# ============================================================================
+# PER-REQUEST COMPUTATION GRAPH
+# ============================================================================
+# Un graphe est créé pour chaque requête: chaque étape nommée est calculée au plus
+# une fois (dépendances résolues à la demande via graph.get), les sous-résultats
+# paramétrés (compatibilité chimique, recommandations de diamètre...) sont mémoïsés
+# par arguments, et les durées par étape sont relevées pour le profilage.
+
+class ComputationGraph:
+    """Lazy, memoized evaluation of named stages for a single request"""
+
+    def __init__(self, stages: Dict[str, Any], **inputs):
+        self.stages = stages
+        self.inputs = inputs
+        self._results: Dict[Any, Any] = {}
+        self._timings: Dict[str, Dict[str, Any]] = {}
+        self._active: List[List[float]] = []  # pile [début, durée des sous-étapes]
+
+    def get(self, stage: str) -> Any:
+        """Result of a declared stage, computed on first use"""
+        return self.call(stage, self.stages[stage], self)
+
+    def call(self, stage: str, function, *args, **kwargs) -> Any:
+        """Memoized function call recorded under `stage` (arguments must be hashable)"""
+        key = (stage,) + args + tuple(sorted(kwargs.items()))
+        timing = self._timings.setdefault(stage, {"calls": 0, "computed": 0, "total_ms": 0.0, "self_ms": 0.0})
+        timing["calls"] += 1
+        if key in self._results:
+            return self._results[key]
+
+        frame = [time.perf_counter(), 0.0]
+        self._active.append(frame)
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            self._active.pop()
+            elapsed = time.perf_counter() - frame[0]
+            if self._active:
+                self._active[-1][1] += elapsed
+            timing["computed"] += 1
+            timing["total_ms"] += elapsed * 1000
+            timing["self_ms"] += (elapsed - frame[1]) * 1000
+            record_stage(stage, elapsed)
+        self._results[key] = result
+        return result
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage counters: calls (incl. memoized hits), computed, total_ms (incl. sub-stages), self_ms"""
+        return {stage: dict(timing) for stage, timing in self._timings.items()}
+
+def run_stage(graph: Optional[ComputationGraph], stage: str, function, *args, **kwargs) -> Any:
+    """Call `function` through the request graph when there is one, directly otherwise"""
+    if graph is None:
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        record_stage(stage, time.perf_counter() - start)
+        return result
+    return graph.call(stage, function, *args, **kwargs)
+
+# ============================================================================
+# ENHANCED HYDRAULIC CALCULATION FUNCTIONS
+# ============================================================================
+
+def calculate_atmospheric_pressure(altitude: float) -> float:
+    """Calculate atmospheric pressure based on altitude (m)"""
+    # Barometric formula: P = P0 * (1 - 0.0065 * h / 288.15)^5.255
+    P0 = 101325  # Pa at sea level
+    return P0 * (1 - 0.0065 * altitude / 288.15) ** 5.255
+
+def calculate_singular_head_loss(velocity: float, fittings: List[FittingInput]) -> float:
+    """Calculate singular head losses from fittings"""
+    total_k = calculate_fittings_k_total(fittings)
+    return float(singular_head_loss_array(velocity, total_k))  # Head loss in meters
+
+def calculate_linear_head_loss_enhanced(velocity: float, pipe_length: float, 
+                                      pipe_diameter: float, pipe_material: str,
+                                      reynolds_number: float,
+                                      friction_mode: str = DEFAULT_FRICTION_FACTOR_MODE) -> float:
+    """Enhanced linear head loss calculation using pipe material roughness"""
+    roughness = get_pipe_roughness(pipe_material)
+    relative_roughness = roughness / pipe_diameter  # Relative roughness
+    
+    # Colebrook-White (selected friction factor mode) + Darcy-Weisbach via the vectorized kernel
+    friction_factor = friction_factor_array(reynolds_number, relative_roughness, friction_mode)
+    return float(linear_head_loss_array(friction_factor, pipe_length, pipe_diameter / 1000, velocity))
+
+# Tables de propriétés par fluide, précalculées au premier usage sur une grille fine de
+# température. Les températures où une propriété atteint son plancher (ρ ≥ 500,
+# μ ≥ 0.0001, Pv ≥ 0) sont ajoutées à la grille: l'interpolation linéaire reproduit
+# donc exactement le modèle linéaire borné. Hors grille, le modèle est appliqué directement.
+FLUID_TABLE_MIN_TEMPERATURE = -40.0  # °C
+FLUID_TABLE_MAX_TEMPERATURE = 200.0  # °C
+FLUID_TABLE_STEP = 0.5  # °C
+FLUID_PROPERTY_FLOORS = {"density": 500, "viscosity": 0.0001, "vapor_pressure": 0}
+
+def _fluid_property_model(base_props: Dict[str, Any], temperatures: np.ndarray) -> Dict[str, np.ndarray]:
+    """Linear temperature model with minimum values, evaluated on an array of temperatures"""
+    temp_diff = temperatures - 20
+    return {
+        prop: np.maximum(base_props[f"{prop}_20c"] + base_props["temp_coeffs"][prop] * temp_diff, floor)
+        for prop, floor in FLUID_PROPERTY_FLOORS.items()
+    }
+
+@lru_cache(maxsize=1)
+def fluid_property_tables() -> Dict[str, Dict[str, np.ndarray]]:
+    """Per-fluid interpolation tables (built on first use)"""
+    base_grid = np.arange(FLUID_TABLE_MIN_TEMPERATURE, FLUID_TABLE_MAX_TEMPERATURE + FLUID_TABLE_STEP / 2, FLUID_TABLE_STEP)
+    tables = {}
+    for fluid_type, base_props in FLUID_PROPERTIES.items():
+        breakpoints = []
+        for prop, floor in FLUID_PROPERTY_FLOORS.items():
+            coeff = base_props["temp_coeffs"][prop]
+            if coeff != 0:
+                breakpoint = 20 + (floor - base_props[f"{prop}_20c"]) / coeff
+                if FLUID_TABLE_MIN_TEMPERATURE < breakpoint < FLUID_TABLE_MAX_TEMPERATURE:
+                    breakpoints.append(breakpoint)
+        grid = np.unique(np.concatenate([base_grid, breakpoints]))
+        table = _fluid_property_model(base_props, grid)
+        table["temperature"] = grid
+        tables[fluid_type] = table
+    return tables
+
+def get_fluid_properties_array(fluid_type: str, temperatures) -> Dict[str, np.ndarray]:
+    """
+    Vectorized fluid property lookup: density (kg/m³), viscosity (Pa·s) and vapor
+    pressure (Pa) for an array of temperatures (°C)
+    """
+    tables = fluid_property_tables()
+    if fluid_type not in tables:
+        raise ValueError(f"Unknown fluid type: {fluid_type}")
+    
+    table = tables[fluid_type]
+    temperatures = np.asarray(temperatures, dtype=float)
+    in_range = (temperatures >= FLUID_TABLE_MIN_TEMPERATURE) & (temperatures <= FLUID_TABLE_MAX_TEMPERATURE)
+    
+    properties = {
+        prop: np.interp(temperatures, table["temperature"], table[prop])
+        for prop in FLUID_PROPERTY_FLOORS
+    }
+    if not np.all(in_range):
+        extrapolated = _fluid_property_model(FLUID_PROPERTIES[fluid_type], temperatures)
+        for prop in FLUID_PROPERTY_FLOORS:
+            properties[prop] = np.where(in_range, properties[prop], extrapolated[prop])
+    return properties
+
+@lru_cache(maxsize=1024)
+def _cached_fluid_properties(fluid_type: str, temperature: float) -> FluidProperties:
+    properties = get_fluid_properties_array(fluid_type, temperature)
+    return FluidProperties(
+        name=FLUID_PROPERTIES[fluid_type]["name"],
+        density=float(properties["density"]),
+        viscosity=float(properties["viscosity"]),
+        vapor_pressure=float(properties["vapor_pressure"])
+    )
+
+def get_fluid_properties(fluid_type: str, temperature: float) -> FluidProperties:
+    """
+    Calculate temperature-dependent fluid properties (interpolated from the precomputed
+    tables, memoized on (fluid, temperature) - the returned instance is shared, do not mutate)
+    """
+    if fluid_type not in FLUID_PROPERTIES:
+        raise ValueError(f"Unknown fluid type: {fluid_type}")
+    return _cached_fluid_properties(fluid_type, float(temperature))
+
+# ============================================================================
+# CHEMICAL COMPATIBILITY INDEX
+# ============================================================================
+# Index immuable compilé au premier usage à partir de FLUID_PROPERTIES["technical_specs"]
+# et FLUID_MATERIAL_COMPATIBILITY: une analyse de compatibilité se réduit à deux
+# accès dictionnaire (fluide, bande de température) et (fluide, matériau, bande).
+
+# Variantes de noms de matériaux (nom technique -> noms utilisés dans les bases fluides)
+COMPATIBILITY_MATERIAL_ALIASES = MappingProxyType({
+    "pvc": ("pvc", "pvc_food"),
+    "pehd": ("pehd", "pe", "polyethylene"),
+    "steel": ("steel", "carbon_steel"),
+    "steel_galvanized": ("galvanized_steel", "galvanized"),
+    "stainless_steel_316": ("stainless_steel", "316L_stainless", "316L", "stainless", "stainless_steel_316l"),
+    "stainless_steel_304": ("stainless_steel", "304_stainless", "304", "stainless"),
+    "copper": ("copper", "copper_alloys"),
+    "brass": ("brass", "copper_alloys"),
+    "cast_iron": ("cast_iron", "fonte"),
+    "concrete": ("concrete",),
+    "aluminum": ("aluminum",)
+})
+
+# Base de données avancée des joints selon les fluides
+COMPATIBILITY_RECOMMENDED_SEALS = {
+    "acid": {
+        "seals": ["PTFE", "FKM (Viton)", "EPDM"],
+        "avoid": ["NBR (Nitrile)", "Caoutchouc naturel"],
+        "notes": "Joints en PTFE pour acides concentrés, FKM pour acides dilués"
+    },
+    "gasoline": {
+        "seals": ["NBR (Nitrile)", "FKM (Viton)", "CR (Néoprène)"],
+        "avoid": ["EPDM", "Caoutchouc naturel"],
+        "notes": "FKM obligatoire pour températures élevées >80°C"
+    },
+    "diesel": {
+        "seals": ["NBR (Nitrile)", "FKM (Viton)", "CR (Néoprène)"],
+        "avoid": ["EPDM", "Caoutchouc naturel"],
+        "notes": "Attention aux biocarburants - préférer FKM"
+    },
+    "seawater": {
+        "seals": ["EPDM", "FKM (Viton)", "CR (Néoprène)"],
+        "avoid": ["NBR", "Caoutchouc naturel"],
+        "notes": "EPDM résistant au chlore, FKM pour applications critiques"
+    },
+    "milk": {
+        "seals": ["EPDM alimentaire", "Silicone FDA", "FKM alimentaire"],
+        "avoid": ["NBR", "Caoutchouc naturel"],
+        "notes": "Certifications FDA/CE obligatoires pour contact alimentaire"
+    },
+    "honey": {
+        "seals": ["EPDM alimentaire", "Silicone FDA", "PTFE"],
+        "avoid": ["NBR", "Caoutchouc naturel"],
+        "notes": "Résistance aux sucres concentrés, nettoyage vapeur"
+    },
+    "water": {
+        "seals": ["EPDM", "NBR", "CR (Néoprène)"],
+        "avoid": [],
+        "notes": "EPDM recommandé pour eau potable"
+    },
+    "oil": {
+        "seals": ["NBR (Nitrile)", "FKM (Viton)", "Polyuréthane"],
+        "avoid": ["EPDM"],
+        "notes": "NBR économique, FKM pour huiles haute température"
+    }
+}
+
+# Seuils (°C) au-delà desquels les recommandations changent: bande = nombre de seuils dépassés
+COMPATIBILITY_TEMPERATURE_THRESHOLDS = (60, 80, 100)
+
+def compatibility_temperature_band(temperature: float) -> int:
+    """Temperature band index: 0 (≤60°C), 1 (≤80°C), 2 (≤100°C), 3 (>100°C)"""
+    return bisect.bisect_left(COMPATIBILITY_TEMPERATURE_THRESHOLDS, temperature)
+
+def _compile_fluid_compatibility(fluid_type: str, band: int) -> MappingProxyType:
+    """Material-independent part of the analysis for one fluid and temperature band"""
+    fluid_data = FLUID_PROPERTIES[fluid_type]
+    fluid_name = fluid_data["name"]
+    specs = fluid_data.get("technical_specs", {})
+    above_60 = band >= 1
+    above_80 = band >= 2
+    
+    # === RECOMMANDATIONS AVANCÉES DE JOINTS ===
+    seal_recommendations = []
+    if fluid_type in COMPATIBILITY_RECOMMENDED_SEALS:
+        seal_info = COMPATIBILITY_RECOMMENDED_SEALS[fluid_type]
+        seal_recommendations.extend([
+            f"🔧 JOINTS RECOMMANDÉS pour {fluid_name}:",
+            f"✅ Joints adaptés: {', '.join(seal_info['seals'])}",
+            f"❌ Joints à éviter: {', '.join(seal_info['avoid'])}" if seal_info['avoid'] else "❌ Aucun joint spécifiquement déconseillé",
+            f"💡 Note technique: {seal_info['notes']}"
+        ])
+    
+    # === RECOMMANDATIONS SPÉCIFIQUES PAR FLUIDE ===
+    recommendations = []
+    if fluid_type == "acid":
+        recommendations.extend([
+            "⚠️ FLUIDE CORROSIF - Précautions spéciales requises",
+            "🏗️ Matériaux recommandés: Inox 316L (optimal), PVC/PP (économique)",
+            "🔧 Boulonnerie: Inox A4 (316L) obligatoire",
+            "🛡️ Revêtements: Résine époxy ou polyuréthane",
+            "📊 Surveillance pH et inspection trimestrielle",
+            "🚿 Équipements rinçage d'urgence obligatoires"
+        ])
+
+        if above_60:
+            recommendations.append(
+                "🌡️ HAUTE TEMPÉRATURE + ACIDE: Utiliser uniquement Inox 316L ou Hastelloy"
+            )
+
+    elif fluid_type in ["gasoline", "diesel"]:
+        recommendations.extend([
+            "⛽ FLUIDE INFLAMMABLE - Mise à la terre obligatoire",
+            "🏗️ Matériaux: Inox 316L ou acier au carbone avec revêtement",
+            "⚡ Équipements antidéflagrants (ATEX Zone 1)",
+            "🔧 Joints FKM (Viton) - résistance hydrocarbures",
+            "🔄 Système de récupération des vapeurs",
+            "📏 Dilatation thermique importante - compensateurs requis"
+        ])
+
+        if fluid_type == "gasoline":
+            recommendations.append(
+                "🚨 ESSENCE: Pression vapeur élevée - réservoirs sous pression"
+            )
+
+    elif fluid_type == "seawater":
+        recommendations.extend([
+            "🌊 EAU DE MER - Corrosion saline critique",
+            "🏗️ Matériau OBLIGATOIRE: Inox 316L minimum (idéal: Duplex 2205)",
+            "🔧 Anodes sacrificielles en zinc ou aluminium",
+            "🛡️ Protection cathodique active recommandée",
+            "🧪 Surveillance chlorures et inspection mensuelle",
+            "💧 Rinçage eau douce après arrêt prolongé"
+        ])
+
+    elif fluid_type in ["milk", "honey", "wine"]:
+        recommendations.extend([
+            "🥛 FLUIDE ALIMENTAIRE - Normes sanitaires strictes",
+            "🏗️ Matériaux: Inox 316L poli sanitaire (Ra ≤ 0.8 μm)",
+            "🔧 Joints FDA/CE - Silicone ou EPDM alimentaire",
+            "🧽 Nettoyage CIP (Clean In Place) intégré",
+            "🌡️ Traçage vapeur pour maintien température",
+            "📋 Traçabilité et validation HACCP"
+        ])
+
+        if fluid_type == "milk":
+            recommendations.append(
+                "❄️ LAIT: Refroidissement rapide <4°C - échangeurs plates"
+            )
+    
+    # === CONSEILS HYDRAULIQUES AVANCÉS ===
+    hydraulic_advice = []
+    viscosity = fluid_data["viscosity_20c"]
+
+    if viscosity > 0.1:  # Fluides visqueux
+        hydraulic_advice.extend([
+            "🌊 FLUIDE VISQUEUX - Adaptations hydrauliques:",
+            "📏 Diamètres majorés +20% minimum",
+            "⚙️ Pompe volumétrique recommandée si η < 10 cP",
+            "🔄 Vitesses réduites: aspiration <1m/s, refoulement <2m/s",
+            "🌡️ Préchauffage pour réduire viscosité",
+            "📊 Courbes de pompe à recalculer selon viscosité"
+        ])
+
+    if "vapor_pressure_20c" in fluid_data and fluid_data["vapor_pressure_20c"] > 5000:  # Fluides volatils
+        hydraulic_advice.extend([
+            "💨 FLUIDE VOLATIL - Précautions NPSH:",
+            "📏 Diamètres aspiration majorés +30%",
+            "⬇️ Hauteur aspiration minimisée (<3m si possible)",
+            "❄️ Refroidissement fluide recommandé",
+            "🔒 Réservoir sous pression inerte (azote)",
+            "📊 Calcul NPSH avec marge sécurité +50%"
+        ])
+    
+    # === RECOMMANDATIONS DE MATÉRIAUX OPTIMAUX ===
+    if fluid_type in ["acid", "seawater"]:
+        optimal_materials = [
+            "Inox 316L (optimal)",
+            "Duplex 2205 (haute performance)", 
+            "Hastelloy C-276 (extrême)",
+            "PVC/CPVC (économique température <60°C)",
+            "PTFE (joints et revêtements)"
+        ]
+    elif fluid_type in ["gasoline", "diesel", "ethanol", "methanol"]:
+        optimal_materials = [
+            "Inox 316L",
+            "Acier au carbone + revêtement époxy",
+            "Aluminium 5083 (réservoirs)",
+            "PTFE/FKM (joints)",
+            "Acier galvanisé (interdit - corrosion galvanique)"
+        ]
+    elif fluid_type in ["milk", "honey", "wine"]:
+        optimal_materials = [
+            "Inox 316L poli sanitaire",
+            "Inox 304L (acceptable usage non critique)",
+            "PTFE/Silicone alimentaire (joints)",
+            "PVC alimentaire (tuyauteries secondaires)",
+            "Cuivre (interdit - contamination)"
+        ]
+    elif above_80:
+        optimal_materials = [
+            "Inox 316L (haute température)",
+            "Inox 321 (stabilisé titane)",
+            "Acier P91/P92 (vapeur)",
+            "Réfractaires (>200°C)",
+            "PVC (interdit >60°C)"
+        ]
+    else:
+        optimal_materials = [
+            "Inox 316L (polyvalent)",
+            "PVC/CPVC (économique)",
+            "PEHD (enterré)",
+            "Fonte ductile (réseaux)",
+            "Acier galvanisé (air comprimé)"
+        ]
+    
+    return MappingProxyType({
+        "fluid_name": fluid_name,
+        "compatible_materials": tuple(specs.get("compatibility", ())),
+        "incompatible_materials": tuple(specs.get("incompatibility", ())),
+        "recommendations": tuple(recommendations),
+        "optimal_materials": tuple(optimal_materials),
+        "seal_recommendations": tuple(seal_recommendations),
+        "hydraulic_advice": tuple(hydraulic_advice)
+    })
+
+def _material_compatibility_status(fluid_entry: MappingProxyType, material: str) -> str:
+    """Vérifier la compatibilité d'un matériau avec le fluide"""
+    if not material or material == "unknown":
+        return "unknown"
+    
+    # Variantes du matériau puis nom original
+    for variant in COMPATIBILITY_MATERIAL_ALIASES.get(material, (material,)) + (material,):
+        if variant in fluid_entry["compatible_materials"]:
+            return "compatible"
+        if variant in fluid_entry["incompatible_materials"]:
+            return "incompatible"
+    
+    return "unknown"
+
+def _expert_material_data(fluid_type: str, material: str) -> Optional[MappingProxyType]:
+    """Fiche experte FLUID_MATERIAL_COMPATIBILITY (niveau, joints, durée de vie...) si référencée"""
+    expert_materials = FLUID_MATERIAL_COMPATIBILITY.get(fluid_type, {})
+    for variant in (material,) + COMPATIBILITY_MATERIAL_ALIASES.get(material, ()):
+        if variant in expert_materials:
+            return MappingProxyType(dict(expert_materials[variant]))
+    return None
+
+def _compile_material_compatibility(fluid_type: str, material: str, fluid_entry: MappingProxyType) -> MappingProxyType:
+    """Status and replacement advice of one material, given the compiled (fluid, band) entry"""
+    status = _material_compatibility_status(fluid_entry, material)
+    
+    def incompatibility_recommendations(side: str) -> tuple:
+        if status != "incompatible":
+            return ()
+        return (
+            f"⚠️ INCOMPATIBILITÉ DÉTECTÉE - {side} ({material})",
+            f"🔄 Remplacement URGENT par: {fluid_entry['optimal_materials'][0]}",
+            "⏰ Risque de défaillance prématurée",
+            "💰 Coût remplacement < coût panne"
+        )
+    
+    return MappingProxyType({
+        "status": status,
+        "suction_recommendations": incompatibility_recommendations("Aspiration"),
+        "discharge_recommendations": incompatibility_recommendations("Refoulement"),
+        "expert_data": _expert_material_data(fluid_type, material)
+    })
+
+@lru_cache(maxsize=1)
+def chemical_compatibility_index() -> MappingProxyType:
+    """Compile the (fluid, band) and (fluid, material, band) tables (once, on first use)"""
+    bands = range(len(COMPATIBILITY_TEMPERATURE_THRESHOLDS) + 1)
+    materials = tuple(dict.fromkeys(tuple(PIPE_MATERIALS) + tuple(COMPATIBILITY_MATERIAL_ALIASES)))
+    fluids = {
+        (fluid_type, band): _compile_fluid_compatibility(fluid_type, band)
+        for fluid_type in FLUID_PROPERTIES for band in bands
+    }
+    fluid_materials = {
+        (fluid_type, material, band): _compile_material_compatibility(fluid_type, material, fluids[(fluid_type, band)])
+        for fluid_type in FLUID_PROPERTIES for material in materials for band in bands
+    }
+    return MappingProxyType({
+        "fluids": MappingProxyType(fluids),
+        "fluid_materials": MappingProxyType(fluid_materials),
+        "materials": materials
+    })
+
+def preload_reference_tables() -> None:
+    """Build the lazily computed reference tables now (server start-up rather than first request)"""
+    friction_factor_table()
+    fluid_property_tables()
+    chemical_compatibility_index()
+
+@lru_cache(maxsize=256)
+def _uncompiled_material_compatibility(fluid_type: str, material: str, band: int) -> MappingProxyType:
+    """Matériaux hors index (saisie libre): compilés à la demande puis mémoïsés"""
+    return _compile_material_compatibility(
+        fluid_type, material, chemical_compatibility_index()["fluids"][(fluid_type, band)]
+    )
+
+def get_material_compatibility(fluid_type: str, material: str, band: int) -> MappingProxyType:
+    """O(1) lookup of a (fluid, material, temperature band) entry"""
+    entry = chemical_compatibility_index()["fluid_materials"].get((fluid_type, material, band))
+    if entry is None:
+        entry = _uncompiled_material_compatibility(fluid_type, material, band)
+    return entry
+
+def analyze_chemical_compatibility(fluid_type: str, suction_material: str, discharge_material: str, temperature: float) -> Dict[str, Any]:
+    """
+    Analyser la compatibilité chimique entre le fluide et les matériaux à une température donnée
+    avec recommandations avancées de matériaux, joints et suggestions hydrauliques
+    """
+    if fluid_type not in FLUID_PROPERTIES:
+        return {"status": "unknown_fluid", "recommendations": [], "warnings": []}
+    
+    band = compatibility_temperature_band(temperature)
+    fluid_entry = chemical_compatibility_index()["fluids"][(fluid_type, band)]
+    suction = get_material_compatibility(fluid_type, suction_material, band)
+    discharge = get_material_compatibility(fluid_type, discharge_material, band)
+    
+    recommendations = [
+        *fluid_entry["recommendations"],
+        *suction["suction_recommendations"],
+        *discharge["discharge_recommendations"]
+    ]
+    
+    # Recommandations générales de température
+    if temperature > 100:
+        recommendations.extend([
+            f"🌡️ HAUTE TEMPÉRATURE ({temperature}°C) - Précautions:",
+            "🔧 Compensateurs de dilatation obligatoires",
+            "🛡️ Isolation thermique et calorifugeage",
+            "⚙️ Supports coulissants/pendulaires",
+            "📊 Calculs contraintes thermiques",
+            "🔥 Protection personnel - risque brûlure"
+        ])
+    elif temperature > 60:
+        recommendations.append(
+            f"🌡️ Température élevée ({temperature}°C) - Éviter PVC, prévoir dilatation"
+        )
+    
+    return {
+        "fluid_name": fluid_entry["fluid_name"],
+        "compatible_materials": list(fluid_entry["compatible_materials"]),
+        "incompatible_materials": list(fluid_entry["incompatible_materials"]),
+        "suction_material_status": suction["status"],
+        "discharge_material_status": discharge["status"],
+        "temperature_warnings": [],
+        "recommendations": recommendations,
+        "optimal_materials": list(fluid_entry["optimal_materials"]),
+        "seal_recommendations": list(fluid_entry["seal_recommendations"]),
+        "hydraulic_advice": list(fluid_entry["hydraulic_advice"])
+    }
+
+@lru_cache(maxsize=1)
+def build_compatibility_matrix() -> Dict[str, Any]:
+    """Matrice complète fluide × matériau (statut + fiche experte) pour l'interface"""
+    materials = chemical_compatibility_index()["materials"]
+    matrix = {}
+    for fluid_type in FLUID_PROPERTIES:
+        fluid_entry = chemical_compatibility_index()["fluids"][(fluid_type, 0)]
+        cells = {}
+        for material in materials:
+            entry = get_material_compatibility(fluid_type, material, 0)
+            cells[material] = {
+                "status": entry["status"],
+                "expert_data": dict(entry["expert_data"]) if entry["expert_data"] is not None else None
+            }
+        matrix[fluid_type] = {
+            "name": fluid_entry["fluid_name"],
+            "seals": COMPATIBILITY_RECOMMENDED_SEALS.get(fluid_type),
+            "materials": cells
+        }
+    return {
+        "materials": [
+            {"id": material, "name": PIPE_MATERIALS[material]["name"] if material in PIPE_MATERIALS else material}
+            for material in materials
+        ],
+        "fluids": matrix
+    }
+
+def calculate_reynolds_number(velocity: float, diameter: float, density: float, viscosity: float) -> float:
+    """Calculate Reynolds number"""
+    return float(reynolds_number_array(velocity, diameter, density, viscosity))
+
+def calculate_friction_factor(reynolds_number: float, relative_roughness: float = 0.000045,
+                              mode: str = DEFAULT_FRICTION_FACTOR_MODE) -> float:
+    """Calculate friction factor using Colebrook-White equation (relative roughness ε/D)"""
+    # Default ε/D: commercial steel (0.045 mm) in a 1 m pipe
+    return float(friction_factor_array(reynolds_number, relative_roughness, mode))
+
+def calculate_npshd_enhanced(input_data: NPSHdCalculationInput,
+                            compatibility_analysis: Optional[Dict[str, Any]] = None,
+                            graph: Optional[ComputationGraph] = None) -> NPSHdResult:
+    """Enhanced NPSHd calculation with corrected formulas based on suction type"""
+    if input_data.pipe_diameter <= 0:
+        raise ValueError(f"Diamètre de tuyauterie invalide: {input_data.pipe_diameter} mm")
+    
+    # Get fluid properties
+    fluid_props = get_fluid_properties(input_data.fluid_type, input_data.temperature)
+    
+    # Velocity, Reynolds number, linear and singular head losses (vectorized kernel)
+    hydraulics = compute_pipe_hydraulics(
+        input_data.flow_rate, input_data.pipe_diameter, input_data.pipe_length,
+        get_pipe_roughness(input_data.pipe_material),
+        fluid_props.density, fluid_props.viscosity,
+        calculate_fittings_k_total(input_data.suction_fittings),
+        validate_friction_factor_mode(input_data.friction_factor_mode)
+    )
+    
+    # Calculate NPSHd using the corrected formulas based on suction type
+    npshd = compute_npshd_array(
+        input_data.suction_type == "flooded", input_data.hasp,
+        hydraulics["total_head_loss"], fluid_props.density, fluid_props.vapor_pressure
+    )
+    
+    return build_npshd_result(
+        input_data, fluid_props,
+        velocity=float(hydraulics["velocity"]),
+        reynolds_number=float(hydraulics["reynolds_number"]),
+        linear_head_loss=float(hydraulics["linear_head_loss"]),
+        singular_head_loss=float(hydraulics["singular_head_loss"]),
+        npshd=float(npshd),
+        friction_factor=float(hydraulics["friction_factor"]),
+        compatibility_analysis=compatibility_analysis,
+        graph=graph
+    )
+
+def build_npshd_result(input_data: NPSHdCalculationInput, fluid_props: FluidProperties,
+                       velocity: float, reynolds_number: float, linear_head_loss: float,
+                       singular_head_loss: float, npshd: float, friction_factor: float,
+                       compatibility_analysis: Optional[Dict[str, Any]] = None,
+                       graph: Optional[ComputationGraph] = None) -> NPSHdResult:
+    """
+    Construit le résultat NPSHd (alertes, recommandations anti-cavitation, compatibilité
+    chimique) à partir des grandeurs hydrauliques déjà calculées - partagé par le calcul
+    unitaire et le calcul par lot
+    """
+    warnings = []
+    
+    # Atmospheric pressure constant at sea level
+    atmospheric_pressure = NPSH_ATMOSPHERIC_PRESSURE  # Pa
+    
+    # Total head loss
+    total_head_loss = linear_head_loss + singular_head_loss
+    
+    # Enhanced warnings and alerts
+    if velocity > 3.0:
+        warnings.append(f"Vitesse élevée ({velocity:.2f} m/s) - RECOMMANDATION: Augmenter le diamètre de la tuyauterie")
+    if velocity < 0.5:
+        warnings.append(f"Vitesse faible ({velocity:.2f} m/s) - risque de sédimentation")
+    if velocity > 2.5:
+        warnings.append("ALERTE: Vitesse excessive - augmenter le diamètre de la tuyauterie pour réduire les pertes de charge")
+    
+    if npshd < 0:
+        warnings.append("ATTENTION: NPSHd négatif - conditions d'aspiration impossibles")
+        warnings.append("RECOMMANDATION: Réduire la hauteur d'aspiration et/ou la longueur de tuyauterie")
+    if npshd < 2:
+        warnings.append("ATTENTION: NPSHd très faible - risque de cavitation élevé")
+        warnings.append("RECOMMANDATION: Vérifier le clapet anti-retour et réduire les pertes de charge")
+    
+    if total_head_loss > 3:
+        warnings.append(f"Pertes de charge élevées ({total_head_loss:.2f} m) - RECOMMANDATION: Augmenter le diamètre ou réduire la longueur")
+    
+    if input_data.hasp > 6 and input_data.suction_type == "suction_lift":
+        warnings.append("ALERTE: Hauteur d'aspiration excessive - réduire la hauteur d'aspiration")
+    
+    if input_data.pipe_length > 100:
+        warnings.append("ALERTE: Longueur de tuyauterie excessive - réduire la longueur pour diminuer les pertes de charge")
+    
+    # Temperature and material alerts
+    if input_data.temperature > 60:
+        material_warnings = {
+            "pvc": "ALERTE MATÉRIAU: PVC non recommandé au-dessus de 60°C - utiliser PEHD ou acier",
+            "pehd": "ATTENTION: PEHD près de sa limite de température - vérifier la résistance",
+            "steel": "Matériau acier adapté aux hautes températures",
+            "steel_galvanized": "Matériau acier galvanisé adapté aux hautes températures",
+            "cast_iron": "Matériau fonte adapté aux hautes températures",
+            "concrete": "Matériau béton adapté aux hautes températures"
+        }
+        if input_data.pipe_material in material_warnings:
+            warnings.append(material_warnings[input_data.pipe_material])
+    
+    if input_data.temperature > 80:
+        warnings.append("ALERTE TEMPÉRATURE: Température très élevée - vérifier la compatibilité de tous les matériaux")
+    
+    # Check valve alerts
+    has_check_valve = any(fitting.fitting_type == "check_valve" for fitting in input_data.suction_fittings)
+    if input_data.suction_type == "suction_lift" and not has_check_valve:
+        warnings.append("RECOMMANDATION: Ajouter un clapet anti-retour pour l'aspiration en dépression")
+    
+    # Fitting-specific alerts
+    total_fittings = sum(fitting.quantity for fitting in input_data.suction_fittings)
+    if total_fittings > 5:
+        warnings.append("ALERTE: Nombre excessif de raccords - réduire les raccords pour diminuer les pertes de charge")
+    
+    # NPSH Comparison and Cavitation Analysis
+    npsh_required = input_data.npsh_required
+    npsh_margin = npshd - npsh_required
+    cavitation_risk = npshd <= npsh_required
+    
+    # Initialize recommendations list
+    recommendations = []
+    
+    # Cavitation risk analysis and recommendations
+    if cavitation_risk:
+        warnings.append("🚨 RISQUE DE CAVITATION DÉTECTÉ!")
+        warnings.append(f"NPSHd calculé ({npshd:.2f} m) ≤ NPSH requis ({npsh_required:.2f} m)")
+        warnings.append(f"Marge de sécurité: {npsh_margin:.2f} m (NÉGATIVE)")
+        
+        # Detailed corrective recommendations
+        recommendations.append("🔧 CORRECTIONS POUR ÉLIMINER LA CAVITATION:")
+        
+        # 1. Reduce suction height
+        if input_data.suction_type == "suction_lift" and input_data.hasp > 0:
+            new_hasp = input_data.hasp - abs(npsh_margin) - 0.5
+            if new_hasp > 0:
+                recommendations.append(f"• Réduire la hauteur d'aspiration de {input_data.hasp:.1f}m à {new_hasp:.1f}m")
+            else:
+                recommendations.append(f"• Passer en aspiration en charge (pompe sous le niveau du liquide)")
+        
+        # 2. Increase pipe diameter with graduated recommendations
+        current_velocity = velocity
+        if current_velocity > 1.5:
+            current_dn = get_dn_from_diameter(input_data.pipe_diameter)
+            
+            # Calculer plusieurs options de diamètre avec analyse coût-bénéfice
+            diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.pipe_diameter, 
+                input_data.flow_rate, 
+                current_velocity,
+                input_data.pipe_length,
+                is_suction_pipe=True  # This is called from NPSHd calculation, so it's a suction pipe
+            )
+            
+            if diameter_options:
+                recommendations.append("• OPTIMISATION DIAMÈTRE - Options graduées :")
+                for option in diameter_options:
+                    recommendations.append(f"  {option}")
+            else:
+                # Fallback vers l'ancienne méthode si pas d'options
+                pipe_area = math.pi * (input_data.pipe_diameter / 1000 / 2) ** 2
+                required_area = (input_data.flow_rate / 3600) / 1.5
+                required_diameter = math.sqrt(4 * required_area / math.pi) * 1000
+                required_dn = get_dn_from_diameter(required_diameter)
+                recommendations.append(f"• Augmenter le diamètre de DN{current_dn} à DN{required_dn}")
+        
+        # 3. Reduce pipe length
+        if input_data.pipe_length > 20:
+            max_length = input_data.pipe_length * 0.7  # Reduce by 30%
+            recommendations.append(f"• Réduire la longueur de tuyauterie de {input_data.pipe_length:.1f}m à {max_length:.1f}m")
+        
+        # 4. Reduce fittings
+        if total_fittings > 2:
+            recommendations.append(f"• Réduire le nombre de raccords de {total_fittings} à maximum 2")
+        
+        # 5. Use smoother pipe material
+        rough_materials = ["concrete", "cast_iron", "steel_galvanized"]
+        if input_data.pipe_material in rough_materials:
+            recommendations.append(f"• Utiliser un matériau plus lisse (PVC ou PEHD) au lieu de {PIPE_MATERIALS[input_data.pipe_material]['name']}")
+        
+        # 6. Lower fluid temperature
+        if input_data.temperature > 20:
+            recommendations.append(f"• Réduire la température du fluide de {input_data.temperature}°C à 20°C si possible")
+        
+        # 7. Change pump location
+        recommendations.append("• Repositionner la pompe plus près du réservoir")
+        recommendations.append("• Installer la pompe en charge (niveau pompe < niveau liquide)")
+    
+    else:
+        # No cavitation risk
+        if npsh_margin < 0.5:
+            warnings.append("⚠️ ATTENTION: Marge de sécurité NPSH faible")
+            warnings.append(f"NPSHd calculé ({npshd:.2f} m) > NPSH requis ({npsh_required:.2f} m)")
+            warnings.append(f"Marge de sécurité: {npsh_margin:.2f} m (RECOMMANDÉ: > 0.5 m)")
+            recommendations.append("• Améliorer la marge de sécurité en réduisant les pertes de charge")
+        elif npsh_margin < 1.0:
+            warnings.append("✅ NPSH acceptable avec marge de sécurité limitée")
+            warnings.append(f"NPSHd calculé ({npshd:.2f} m) > NPSH requis ({npsh_required:.2f} m)")
+            warnings.append(f"Marge de sécurité: {npsh_margin:.2f} m (RECOMMANDÉ: > 1.0 m)")
+        else:
+            warnings.append("✅ NPSH excellent - Aucun risque de cavitation")
+            warnings.append(f"NPSHd calculé ({npshd:.2f} m) >> NPSH requis ({npsh_required:.2f} m)")
+            warnings.append(f"Marge de sécurité: {npsh_margin:.2f} m (EXCELLENTE)")
+    
+    # ========================================================================================================
+    # ANALYSE DE COMPATIBILITÉ CHIMIQUE INTÉGRÉE DANS NPSHd
+    # ========================================================================================================
+    
+    # Analyser la compatibilité chimique entre le fluide et le matériau de tuyauterie
+    if compatibility_analysis is None:
+        compatibility_analysis = analyze_chemical_compatibility(
+            input_data.fluid_type, 
+            input_data.pipe_material, 
+            input_data.pipe_material,  # Même matériau pour aspiration
+            input_data.temperature
+        )
+    
+    # Intégrer les recommandations de compatibilité chimique dans les recommendations NPSHd
+    if compatibility_analysis["recommendations"]:
+        recommendations.append("\n🧪 COMPATIBILITÉ CHIMIQUE FLUIDE-MATÉRIAU:")
+        recommendations.extend([f"  {rec}" for rec in compatibility_analysis["recommendations"]])
+    
+    # Intégrer les recommandations de joints
+    if compatibility_analysis["seal_recommendations"]:
+        recommendations.append("\n🔧 RECOMMANDATIONS DE JOINTS:")
+        recommendations.extend([f"  {rec}" for rec in compatibility_analysis["seal_recommendations"]])
+    
+    # Vérifications spécifiques de compatibilité
+    if compatibility_analysis["suction_material_status"] == "incompatible":
+        warnings.append("🚨 INCOMPATIBILITÉ CHIMIQUE DÉTECTÉE!")
+        warnings.append(f"Le matériau {PIPE_MATERIALS[input_data.pipe_material]['name']} n'est pas compatible avec {compatibility_analysis['fluid_name']}")
+        recommendations.append(f"\n⚠️ CHANGEMENT DE MATÉRIAU URGENT REQUIS:")
+        
+        # Suggérer des matériaux compatibles
+        if compatibility_analysis["compatible_materials"]:
+            compatible_materials_names = []
+            material_mapping = {
+                "stainless_steel": "Acier inoxydable 316L",
+                "pvc": "PVC",
+                "pehd": "PEHD", 
+                "steel": "Acier au carbone",
+                "bronze": "Bronze",
+                "ptfe": "PTFE",
+                "viton": "Joints Viton/FKM"
+            }
+            
+            for mat in compatibility_analysis["compatible_materials"]:
+                if mat in material_mapping:
+                    compatible_materials_names.append(material_mapping[mat])
+            
+            if compatible_materials_names:
+                recommendations.append(f"  • Matériaux compatibles recommandés: {', '.join(compatible_materials_names)}")
+    
+    elif compatibility_analysis["suction_material_status"] == "compatible":
+        recommendations.append(f"\n✅ COMPATIBILITÉ CHIMIQUE: {PIPE_MATERIALS[input_data.pipe_material]['name']} compatible avec {compatibility_analysis['fluid_name']}")
+    
+    # Ajouter conseils hydrauliques spécifiques au fluide
+    if compatibility_analysis["hydraulic_advice"]:
+        recommendations.append("\n💧 CONSEILS HYDRAULIQUES SPÉCIFIQUES:")
+        recommendations.extend([f"  {advice}" for advice in compatibility_analysis["hydraulic_advice"]])
+    
+    return NPSHdResult(
+        input_data=input_data,
+        fluid_properties=fluid_props,
+        atmospheric_pressure=atmospheric_pressure,
+        velocity=velocity,
+        reynolds_number=reynolds_number,
+        friction_factor=friction_factor,
+        linear_head_loss=linear_head_loss,
+        singular_head_loss=singular_head_loss,
+        total_head_loss=total_head_loss,
+        npshd=npshd,
+        npsh_required=npsh_required,
+        npsh_margin=npsh_margin,
+        cavitation_risk=cavitation_risk,
+        recommendations=recommendations,
+        warnings=warnings
+    )
+
+def calculate_npshd_batch(raw_inputs: List[Any]) -> NPSHdBatchResult:
+    """
+    Calcul NPSHd par lot: validation individuelle de chaque variante, propriétés fluide
+    mémoïsées par (fluide, température), pertes de charge et NPSHd calculés en une seule
+    passe vectorisée, compatibilité chimique partagée par (fluide, matériau, température).
+    Une variante en erreur est signalée dans son élément sans interrompre le lot.
+    """
+    items: List[Optional[NPSHdBatchItem]] = [None] * len(raw_inputs)
+    valid_entries = []  # (index, input_data, fluid_props)
+    
+    # 1. Validation et propriétés fluide (mémoïsées par fluide/température)
+    for index, raw_input in enumerate(raw_inputs):
+        try:
+            input_data = raw_input if isinstance(raw_input, NPSHdCalculationInput) else NPSHdCalculationInput(**raw_input)
+            if input_data.pipe_diameter <= 0:
+                raise ValueError(f"Diamètre de tuyauterie invalide: {input_data.pipe_diameter} mm")
+            validate_friction_factor_mode(input_data.friction_factor_mode)
+            fluid_props = get_fluid_properties(input_data.fluid_type, input_data.temperature)
+            valid_entries.append((index, input_data, fluid_props))
+        except Exception as e:
+            items[index] = NPSHdBatchItem(index=index, success=False, error=str(e))
+    
+    if valid_entries:
+        # 2. Hydraulique vectorisée sur toutes les variantes valides
+        inputs = [entry[1] for entry in valid_entries]
+        props = [entry[2] for entry in valid_entries]
+        density = np.array([p.density for p in props])
+        hydraulics = compute_pipe_hydraulics(
+            np.array([i.flow_rate for i in inputs]),
+            np.array([i.pipe_diameter for i in inputs]),
+            np.array([i.pipe_length for i in inputs]),
+            get_pipe_roughness_array([i.pipe_material for i in inputs]),
+            density,
+            np.array([p.viscosity for p in props]),
+            np.array([calculate_fittings_k_total(i.suction_fittings) for i in inputs]),
+            np.array([i.friction_factor_mode for i in inputs])
+        )
+        npshd = compute_npshd_array(
+            np.array([i.suction_type == "flooded" for i in inputs]),
+            np.array([i.hasp for i in inputs]),
+            hydraulics["total_head_loss"],
+            density,
+            np.array([p.vapor_pressure for p in props])
+        )
+        friction_factor = hydraulics["friction_factor"].tolist()
+        velocity = hydraulics["velocity"].tolist()
+        reynolds_number = hydraulics["reynolds_number"].tolist()
+        linear_head_loss = hydraulics["linear_head_loss"].tolist()
+        singular_head_loss = hydraulics["singular_head_loss"].tolist()
+        npshd = npshd.tolist()
+        
+        # 3. Alertes et recommandations par variante
+        compatibility_cache: Dict[Any, Dict[str, Any]] = {}
+        for position, (index, input_data, fluid_props) in enumerate(valid_entries):
+            try:
+                compatibility_key = (input_data.fluid_type, input_data.pipe_material, input_data.temperature)
+                if compatibility_key not in compatibility_cache:
+                    compatibility_cache[compatibility_key] = analyze_chemical_compatibility(
+                        input_data.fluid_type, input_data.pipe_material,
+                        input_data.pipe_material, input_data.temperature
+                    )
+                result = build_npshd_result(
+                    input_data, fluid_props,
+                    velocity=velocity[position],
+                    reynolds_number=reynolds_number[position],
+                    linear_head_loss=linear_head_loss[position],
+                    singular_head_loss=singular_head_loss[position],
+                    npshd=npshd[position],
+                    friction_factor=friction_factor[position],
+                    compatibility_analysis=compatibility_cache[compatibility_key]
+                )
+                items[index] = NPSHdBatchItem(index=index, success=True, result=result)
+            except Exception as e:
+                items[index] = NPSHdBatchItem(index=index, success=False, error=str(e))
+    
+    succeeded = sum(1 for item in items if item.success)
+    return NPSHdBatchResult(
+        results=items,
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded
+    )
+
+def validate_hmt_input(input_data: HMTCalculationInput) -> None:
+    """Rejette les diamètres nuls ou négatifs (vitesse indéfinie) et les modes de frottement inconnus"""
+    validate_friction_factor_mode(input_data.friction_factor_mode)
+    if input_data.discharge_pipe_diameter <= 0:
+        raise ValueError(f"Diamètre de refoulement invalide: {input_data.discharge_pipe_diameter} mm")
+    if input_data.installation_type == "surface" and input_data.suction_pipe_diameter <= 0:
+        raise ValueError(f"Diamètre d'aspiration invalide: {input_data.suction_pipe_diameter} mm")
+
+def calculate_hmt_enhanced(input_data: HMTCalculationInput,
+                           compatibility_analysis: Optional[Dict[str, Any]] = None,
+                           graph: Optional[ComputationGraph] = None) -> HMTResult:
+    """Enhanced HMT calculation for Tab 2"""
+    validate_hmt_input(input_data)
+    
+    # Get fluid properties
+    fluid_props = get_fluid_properties(input_data.fluid_type, input_data.temperature)
+    
+    # Discharge velocity and head losses (vectorized kernel)
+    discharge = compute_pipe_hydraulics(
+        input_data.flow_rate, input_data.discharge_pipe_diameter, input_data.discharge_pipe_length,
+        get_pipe_roughness(input_data.discharge_pipe_material),
+        fluid_props.density, fluid_props.viscosity,
+        calculate_fittings_k_total(input_data.discharge_fittings),
+        input_data.friction_factor_mode
+    )
+    
+    # Calculate head losses
+    if input_data.installation_type == "surface":
+        suction = compute_pipe_hydraulics(
+            input_data.flow_rate, input_data.suction_pipe_diameter, input_data.suction_pipe_length,
+            get_pipe_roughness(input_data.suction_pipe_material),
+            fluid_props.density, fluid_props.viscosity,
+            calculate_fittings_k_total(input_data.suction_fittings),
+            input_data.friction_factor_mode
+        )
+        suction_velocity = float(suction["velocity"])
+        suction_head_loss = float(suction["total_head_loss"])
+    else:  # submersible - no suction calculations
+        suction_velocity = None
+        suction_head_loss = 0
+    
+    return build_hmt_result(
+        input_data, fluid_props,
+        suction_velocity=suction_velocity,
+        suction_head_loss=suction_head_loss,
+        discharge_velocity=float(discharge["velocity"]),
+        discharge_head_loss=float(discharge["total_head_loss"]),
+        compatibility_analysis=compatibility_analysis,
+        graph=graph
+    )
+
+def build_hmt_result(input_data: HMTCalculationInput, fluid_props: FluidProperties,
+                     suction_velocity: Optional[float], suction_head_loss: float,
+                     discharge_velocity: float, discharge_head_loss: float,
+                     compatibility_analysis: Optional[Dict[str, Any]] = None,
+                     graph: Optional[ComputationGraph] = None) -> HMTResult:
+    """
+    Construit le résultat HMT (hauteurs, alertes, recommandations) à partir des vitesses
+    et pertes de charge déjà calculées - partagé par le calcul unitaire et le calcul par lot
+    """
+    warnings = []
+    recommendations = []  # Nouvelle liste de recommandations
+    
+    # Total head losses
+    total_head_loss = (suction_head_loss or 0) + discharge_head_loss
+    
+    # Static head
+    if input_data.installation_type == "surface":
+        static_head = input_data.discharge_height - input_data.hasp
+    else:  # submersible
+        static_head = input_data.discharge_height
+    
+    # Useful pressure head
+    useful_pressure_head = (input_data.useful_pressure * 100000) / (fluid_props.density * 9.81)  # bar to m
+    
+    # Total HMT
+    hmt = static_head + total_head_loss + useful_pressure_head
+    
+    # ========================================================================================================
+    # NOUVELLES RECOMMANDATIONS INTELLIGENTES POUR HMT
+    # ========================================================================================================
+    
+    # 1. ANALYSE DE COMPATIBILITÉ CHIMIQUE
+    if compatibility_analysis is None:
+        compatibility_analysis = analyze_chemical_compatibility(
+            input_data.fluid_type,
+            input_data.suction_pipe_material,
+            input_data.discharge_pipe_material,
+            input_data.temperature
+        )
+    
+    if compatibility_analysis["recommendations"]:
+        recommendations.append("\n🧪 COMPATIBILITÉ CHIMIQUE:")
+        recommendations.extend([f"  {rec}" for rec in compatibility_analysis["recommendations"]])
+    
+    if compatibility_analysis["seal_recommendations"]:
+        recommendations.append("\n🔧 RECOMMANDATIONS JOINTS:")
+        recommendations.extend([f"  {rec}" for rec in compatibility_analysis["seal_recommendations"]])
+    
+    # Alertes de compatibilité critique
+    if compatibility_analysis["suction_material_status"] == "incompatible":
+        warnings.append("🚨 INCOMPATIBILITÉ ASPIRATION DÉTECTÉE!")
+        recommendations.append(f"\n⚠️ CHANGEMENT MATÉRIAU ASPIRATION REQUIS - {PIPE_MATERIALS[input_data.suction_pipe_material]['name']} incompatible avec {compatibility_analysis['fluid_name']}")
+    
+    if compatibility_analysis["discharge_material_status"] == "incompatible":
+        warnings.append("🚨 INCOMPATIBILITÉ REFOULEMENT DÉTECTÉE!")
+        recommendations.append(f"\n⚠️ CHANGEMENT MATÉRIAU REFOULEMENT REQUIS - {PIPE_MATERIALS[input_data.discharge_pipe_material]['name']} incompatible avec {compatibility_analysis['fluid_name']}")
+    
+    # 2. RECOMMANDATIONS GRADUÉES POUR OPTIMISATION HYDRAULIQUE
+    
+    # Analyser l'aspiration si applicable (surface pump)
+    if input_data.installation_type == "surface" and suction_velocity is not None:
+        if suction_velocity > 1.5:  # Vitesse d'aspiration excessive
+            suction_diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.suction_pipe_diameter,
+                input_data.flow_rate,
+                suction_velocity,
+                input_data.suction_pipe_length,
+                is_suction_pipe=True
+            )
+            
+            if suction_diameter_options:
+                recommendations.append("\n💧 OPTIMISATION ASPIRATION:")
+                recommendations.extend([f"  {option}" for option in suction_diameter_options])
+    
+    # Analyser le refoulement
+    if discharge_velocity > 2.5:  # Vitesse de refoulement excessive
+        discharge_diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+            input_data.discharge_pipe_diameter,
+            input_data.flow_rate,
+            discharge_velocity,
+            input_data.discharge_pipe_length,
+            is_suction_pipe=False
+        )
+        
+        if discharge_diameter_options:
+            recommendations.append("\n🚀 OPTIMISATION REFOULEMENT:")
+            recommendations.extend([f"  {option}" for option in discharge_diameter_options])
+    
+    # 3. RECOMMANDATIONS GÉNÉRALES HMT
+    if total_head_loss > hmt * 0.3:  # Pertes de charge > 30% du HMT
+        recommendations.append(f"\n⚠️ PERTES DE CHARGE ÉLEVÉES ({total_head_loss:.2f}m = {(total_head_loss/hmt)*100:.0f}% du HMT)")
+        recommendations.append("  • Considérer augmentation diamètres (voir recommandations ci-dessus)")
+        recommendations.append("  • Réduire longueurs de tuyauteries si possible")
+        recommendations.append("  • Vérifier nombre de singularités (coudes, vannes, etc.)")
+    
+    if useful_pressure_head > hmt * 0.4:  # Pression utile > 40% du HMT
+        recommendations.append(f"\n📊 PRESSION UTILE DOMINANTE ({useful_pressure_head:.2f}m = {(useful_pressure_head/hmt)*100:.0f}% du HMT)")
+        recommendations.append("  • Considérer système avec surpresseur dédié")
+        recommendations.append("  • Vérifier si pression utile réellement nécessaire")
+    
+    # Warnings - Only check suction velocity if it exists
+    if suction_velocity is not None and suction_velocity > 3.0:
+        warnings.append(f"Vitesse d'aspiration élevée ({suction_velocity:.2f} m/s)")
+    if discharge_velocity > 5.0:
+        warnings.append(f"Vitesse de refoulement élevée ({discharge_velocity:.2f} m/s)")
+    if hmt > 200:
+        warnings.append(f"HMT très élevée ({hmt:.1f} m) - vérifier le dimensionnement")
+    if input_data.useful_pressure > 10:
+        warnings.append(f"Pression utile élevée ({input_data.useful_pressure} bar)")
+    
+    return HMTResult(
+        input_data=input_data,
+        fluid_properties=fluid_props,
+        suction_velocity=suction_velocity,
+        discharge_velocity=discharge_velocity,
+        suction_head_loss=suction_head_loss,
+        discharge_head_loss=discharge_head_loss,
+        total_head_loss=total_head_loss,
+        static_head=static_head,
+        useful_pressure_head=useful_pressure_head,
+        hmt=hmt,
+        warnings=warnings,
+        recommendations=recommendations  # Ajout des recommandations
+    )
+
+def calculate_hmt_batch(raw_inputs: List[Any]) -> HMTBatchResult:
+    """
+    Calcul HMT par lot: les variantes sont regroupées par (fluide, température, matériaux
+    aspiration/refoulement) pour ne calculer qu'une fois par groupe les propriétés du fluide
+    et la compatibilité chimique; les pertes de charge de toutes les variantes sont
+    calculées en une seule passe vectorisée.
+    """
+    items: List[Optional[HMTBatchItem]] = [None] * len(raw_inputs)
+    groups: Dict[Any, Dict[str, Any]] = {}
+    valid_entries = []  # (index, input_data, group)
+    
+    # 1. Validation et regroupement des parties partagées
+    for index, raw_input in enumerate(raw_inputs):
+        try:
+            input_data = raw_input if isinstance(raw_input, HMTCalculationInput) else HMTCalculationInput(**raw_input)
+            validate_hmt_input(input_data)
+            group_key = (input_data.fluid_type, input_data.temperature,
+                         input_data.suction_pipe_material, input_data.discharge_pipe_material)
+            if group_key not in groups:
+                groups[group_key] = {
+                    "fluid_props": get_fluid_properties(input_data.fluid_type, input_data.temperature),
+                    "compatibility_analysis": analyze_chemical_compatibility(
+                        input_data.fluid_type, input_data.suction_pipe_material,
+                        input_data.discharge_pipe_material, input_data.temperature
+                    ),
+                    "suction_roughness": get_pipe_roughness(input_data.suction_pipe_material),
+                    "discharge_roughness": get_pipe_roughness(input_data.discharge_pipe_material)
+                }
+            valid_entries.append((index, input_data, groups[group_key]))
+        except Exception as e:
+            items[index] = HMTBatchItem(index=index, success=False, error=str(e))
+    
+    if valid_entries:
+        # 2. Hydraulique vectorisée aspiration + refoulement
+        inputs = [entry[1] for entry in valid_entries]
+        shared = [entry[2] for entry in valid_entries]
+        flow_rate = np.array([i.flow_rate for i in inputs])
+        density = np.array([g["fluid_props"].density for g in shared])
+        viscosity = np.array([g["fluid_props"].viscosity for g in shared])
+        friction_mode = np.array([i.friction_factor_mode for i in inputs])
+        
+        discharge = compute_pipe_hydraulics(
+            flow_rate,
+            np.array([i.discharge_pipe_diameter for i in inputs]),
+            np.array([i.discharge_pipe_length for i in inputs]),
+            np.array([g["discharge_roughness"] for g in shared]),
+            density, viscosity,
+            np.array([calculate_fittings_k_total(i.discharge_fittings) for i in inputs]),
+            friction_mode
+        )
+        suction = compute_pipe_hydraulics(
+            flow_rate,
+            np.array([i.suction_pipe_diameter for i in inputs]),
+            np.array([i.suction_pipe_length for i in inputs]),
+            np.array([g["suction_roughness"] for g in shared]),
+            density, viscosity,
+            np.array([calculate_fittings_k_total(i.suction_fittings) for i in inputs]),
+            friction_mode
+        )
+        discharge_velocity = discharge["velocity"].tolist()
+        discharge_head_loss = discharge["total_head_loss"].tolist()
+        suction_velocity = suction["velocity"].tolist()
+        suction_head_loss = suction["total_head_loss"].tolist()
+        
+        # 3. Hauteurs, alertes et recommandations par variante
+        for position, (index, input_data, group) in enumerate(valid_entries):
+            try:
+                is_surface = input_data.installation_type == "surface"
+                result = build_hmt_result(
+                    input_data, group["fluid_props"],
+                    suction_velocity=suction_velocity[position] if is_surface else None,
+                    suction_head_loss=suction_head_loss[position] if is_surface else 0,
+                    discharge_velocity=discharge_velocity[position],
+                    discharge_head_loss=discharge_head_loss[position],
+                    compatibility_analysis=group["compatibility_analysis"]
+                )
+                items[index] = HMTBatchItem(index=index, success=True, result=result)
+            except Exception as e:
+                items[index] = HMTBatchItem(index=index, success=False, error=str(e))
+    
+    succeeded = sum(1 for item in items if item.success)
+    return HMTBatchResult(
+        results=items,
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        groups=len(groups)
+    )
+
+# ============================================================================
+# PARAMETRIC SWEEP
+# ============================================================================
+# Grille cartésienne des paramètres balayés autour d'une entrée de référence, évaluée
+# par blocs avec les noyaux vectorisés et diffusée en NDJSON au fil du calcul: une
+# ligne d'en-tête, une ligne par bloc (colonnes), une ligne de fin. La grille n'est
+# jamais matérialisée: chaque bloc est reconstruit à partir de ses indices à plat.
+
+SWEEP_PARAMETER_FIELDS = MappingProxyType({
+    "npshd": MappingProxyType({
+        "flow_rate": "flow_rate",
+        "suction_length": "pipe_length",
+        "suction_height": "hasp",
+        "diameter": "pipe_diameter",
+        "temperature": "temperature"
+    }),
+    "hmt": MappingProxyType({
+        "flow_rate": "flow_rate",
+        "suction_length": "suction_pipe_length",
+        "suction_height": "hasp",
+        "diameter": "discharge_pipe_diameter",
+        "suction_diameter": "suction_pipe_diameter",
+        "discharge_length": "discharge_pipe_length",
+        "temperature": "temperature"
+    })
+})
+SWEEP_INPUT_MODELS = MappingProxyType({"npshd": NPSHdCalculationInput, "hmt": HMTCalculationInput})
+SWEEP_OUTPUTS = MappingProxyType({
+    "npshd": ("velocity", "reynolds_number", "friction_factor", "total_head_loss", "npshd", "npsh_margin", "cavitation_risk"),
+    "hmt": ("suction_velocity", "discharge_velocity", "suction_head_loss", "discharge_head_loss", "total_head_loss", "hmt")
+})
+
+def sweep_axis_values(sweep_range: SweepRange) -> np.ndarray:
+    """Values of one sweep axis: explicit values, or `num` evenly spaced points from start to stop"""
+    if sweep_range.values is not None:
+        values = np.asarray(sweep_range.values, dtype=float)
+    elif sweep_range.start is not None and sweep_range.stop is not None:
+        if sweep_range.num < 1:
+            raise ValueError("Le nombre de points d'une plage doit être positif")
+        values = np.linspace(sweep_range.start, sweep_range.stop, sweep_range.num)
+    else:
+        raise ValueError("Chaque plage doit définir 'values' ou 'start' et 'stop'")
+    if values.size == 0 or not np.all(np.isfinite(values)):
+        raise ValueError("Plage de balayage vide ou non finie")
+    return values
+
+def prepare_sweep(input_data: SweepInput) -> Dict[str, Any]:
+    """Validate the base input and ranges, and return the sweep plan (axes, shape, constants)"""
+    if input_data.calculation not in SWEEP_INPUT_MODELS:
+        raise ValueError(f"Calcul de balayage inconnu: {input_data.calculation} (npshd ou hmt)")
+    if not input_data.ranges:
+        raise ValueError("Au moins un paramètre à balayer est requis")
+    if not 1 <= input_data.chunk_size <= SWEEP_MAX_CHUNK_SIZE:
+        raise ValueError(f"Taille de bloc invalide (1 à {SWEEP_MAX_CHUNK_SIZE})")
+    
+    fields = SWEEP_PARAMETER_FIELDS[input_data.calculation]
+    base = SWEEP_INPUT_MODELS[input_data.calculation](**input_data.base)
+    validate_friction_factor_mode(base.friction_factor_mode)
+    if base.fluid_type not in fluid_property_tables():
+        raise ValueError(f"Unknown fluid type: {base.fluid_type}")
+    
+    axes = []
+    for parameter, sweep_range in input_data.ranges.items():
+        if parameter not in fields:
+            raise ValueError(f"Paramètre non balayable pour {input_data.calculation}: {parameter} ({', '.join(fields)})")
+        values = sweep_axis_values(sweep_range)
+        if fields[parameter].endswith("diameter") and np.any(values <= 0):
+            raise ValueError(f"Diamètres balayés invalides ({parameter}): valeurs > 0 requises")
+        axes.append((parameter, fields[parameter], values))
+    
+    outputs = tuple(input_data.outputs or SWEEP_OUTPUTS[input_data.calculation])
+    unknown_outputs = [name for name in outputs if name not in SWEEP_OUTPUTS[input_data.calculation]]
+    if unknown_outputs:
+        raise ValueError(f"Colonnes de résultat inconnues: {', '.join(unknown_outputs)} ({', '.join(SWEEP_OUTPUTS[input_data.calculation])})")
+    
+    shape = tuple(len(values) for _, _, values in axes)
+    total = int(np.prod(shape, dtype=np.int64))
+    if total > SWEEP_MAX_POINTS:
+        raise ValueError(f"Balayage trop volumineux ({total} > {SWEEP_MAX_POINTS} points)")
+    
+    # Valeurs de référence des champs non balayés (les balayés sont remplacés par bloc)
+    if input_data.calculation == "npshd":
+        if base.pipe_diameter <= 0 and "diameter" not in input_data.ranges:
+            raise ValueError(f"Diamètre de tuyauterie invalide: {base.pipe_diameter} mm")
+        constants = {
+            "roughness": get_pipe_roughness(base.pipe_material),
+            "k_total": calculate_fittings_k_total(base.suction_fittings)
+        }
+    else:
+        swept = {field for _, field, _ in axes}
+        if "discharge_pipe_diameter" not in swept and base.discharge_pipe_diameter <= 0:
+            raise ValueError(f"Diamètre de refoulement invalide: {base.discharge_pipe_diameter} mm")
+        if (base.installation_type == "surface" and "suction_pipe_diameter" not in swept
+                and base.suction_pipe_diameter <= 0):
+            raise ValueError(f"Diamètre d'aspiration invalide: {base.suction_pipe_diameter} mm")
+        constants = {
+            "suction_roughness": get_pipe_roughness(base.suction_pipe_material),
+            "discharge_roughness": get_pipe_roughness(base.discharge_pipe_material),
+            "suction_k_total": calculate_fittings_k_total(base.suction_fittings),
+            "discharge_k_total": calculate_fittings_k_total(base.discharge_fittings)
+        }
+    return {
+        "calculation": input_data.calculation,
+        "base": base,
+        "axes": axes,
+        "shape": shape,
+        "total": total,
+        "chunk_size": input_data.chunk_size,
+        "outputs": outputs,
+        "constants": constants
+    }
+
+def compute_sweep_chunk(plan: Dict[str, Any], start: int, stop: int) -> Dict[str, np.ndarray]:
+    """Evaluate grid points [start, stop) of a sweep plan; returns one array per output column"""
+    base = plan["base"]
+    constants = plan["constants"]
+    coordinates = np.unravel_index(np.arange(start, stop), plan["shape"])
+    columns = {parameter: values[index] for (parameter, _, values), index in zip(plan["axes"], coordinates)}
+    field_values = {field: values[index] for (_, field, values), index in zip(plan["axes"], coordinates)}
+    
+    def value(field):
+        return field_values.get(field, getattr(base, field))
+    
+    props = get_fluid_properties_array(base.fluid_type, value("temperature"))
+    if plan["calculation"] == "npshd":
+        hydraulics = compute_pipe_hydraulics(
+            value("flow_rate"), value("pipe_diameter"), value("pipe_length"), constants["roughness"],
+            props["density"], props["viscosity"], constants["k_total"], base.friction_factor_mode
+        )
+        npshd = compute_npshd_array(base.suction_type == "flooded", value("hasp"),
+                                    hydraulics["total_head_loss"], props["density"], props["vapor_pressure"])
+        npsh_margin = npshd - base.npsh_required
+        columns.update({
+            "velocity": hydraulics["velocity"],
+            "reynolds_number": hydraulics["reynolds_number"],
+            "friction_factor": hydraulics["friction_factor"],
+            "total_head_loss": hydraulics["total_head_loss"],
+            "npshd": npshd,
+            "npsh_margin": npsh_margin,
+            "cavitation_risk": npshd <= base.npsh_required
+        })
+    else:
+        discharge = compute_pipe_hydraulics(
+            value("flow_rate"), value("discharge_pipe_diameter"), value("discharge_pipe_length"),
+            constants["discharge_roughness"], props["density"], props["viscosity"],
+            constants["discharge_k_total"], base.friction_factor_mode
+        )
+        if base.installation_type == "surface":
+            suction = compute_pipe_hydraulics(
+                value("flow_rate"), value("suction_pipe_diameter"), value("suction_pipe_length"),
+                constants["suction_roughness"], props["density"], props["viscosity"],
+                constants["suction_k_total"], base.friction_factor_mode
+            )
+            suction_velocity, suction_head_loss = suction["velocity"], suction["total_head_loss"]
+            static_head = base.discharge_height - value("hasp")
+        else:  # submersible - pas de conduite d'aspiration: vitesse nulle en JSON (cf. calculate_hmt_enhanced)
+            suction_velocity = np.full(stop - start, np.nan)
+            suction_head_loss = np.zeros(stop - start)
+            static_head = base.discharge_height
+        useful_pressure_head = (base.useful_pressure * 100000) / (props["density"] * 9.81)
+        total_head_loss = suction_head_loss + discharge["total_head_loss"]
+        columns.update({
+            "suction_velocity": suction_velocity,
+            "discharge_velocity": discharge["velocity"],
+            "suction_head_loss": suction_head_loss,
+            "discharge_head_loss": discharge["total_head_loss"],
+            "total_head_loss": total_head_loss,
+            "hmt": static_head + total_head_loss + useful_pressure_head
+        })
+    selected = [parameter for parameter, _, _ in plan["axes"]] + list(plan["outputs"])
+    return {name: np.broadcast_to(columns[name], (stop - start,)) for name in selected}
+
+def _ndjson_line(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":")) + "\n"
+
+def _json_column(column: np.ndarray) -> list:
+    """Column as a JSON-safe list (non-finite values become null)"""
+    if column.dtype.kind == "f" and not np.all(np.isfinite(column)):
+        return [item if math.isfinite(item) else None for item in column.tolist()]
+    return column.tolist()
+
+def iterate_sweep_ndjson(plan: Dict[str, Any]) -> Iterator[str]:
+    """NDJSON lines of a sweep: header, one columnar chunk per block of grid points, end"""
+    started = time.perf_counter()
+    yield _ndjson_line({
+        "type": "header",
+        "calculation": plan["calculation"],
+        "parameters": [parameter for parameter, _, _ in plan["axes"]],
+        "outputs": list(plan["outputs"]),
+        "shape": list(plan["shape"]),
+        "total": plan["total"],
+        "chunk_size": plan["chunk_size"]
+    })
+    for start in range(0, plan["total"], plan["chunk_size"]):
+        stop = min(start + plan["chunk_size"], plan["total"])
+        try:
+            columns = compute_sweep_chunk(plan, start, stop)
+        except Exception as e:
+            yield _ndjson_line({"type": "error", "offset": start, "detail": str(e)})
+            return
+        yield _ndjson_line({
+            "type": "chunk",
+            "offset": start,
+            "count": stop - start,
+            "columns": {name: _json_column(column) for name, column in columns.items()}
+        })
+    yield _ndjson_line({"type": "end", "total": plan["total"],
+                        "elapsed_ms": (time.perf_counter() - started) * 1000})
+
+# ============================================================================
+# MONTE CARLO UNCERTAINTY ANALYSIS
+# ============================================================================
+# Tirages vectorisés des variables incertaines (débit, température, hauteur
+# d'aspiration, longueurs, vieillissement de la rugosité) propagés par les noyaux
+# NPSHd / HMT. Les tirages sont découpés en blocs de taille fixe, chacun avec sa
+# propre graine dérivée (SeedSequence.spawn): le résultat ne dépend que de la graine,
+# pas du nombre de processus. Au-delà du seuil, le serveur répartit les blocs sur son
+# pool de calcul (run_monte_carlo_chunks, voir server.py).
+
+MONTE_CARLO_CHUNK_SIZE = 50000
+MONTE_CARLO_PARALLEL_THRESHOLD = 200000
+MONTE_CARLO_MAX_WORKERS = int(os.environ.get("MONTE_CARLO_WORKERS", os.cpu_count() or 1))  # tâches parallèles max
+MONTE_CARLO_VARIABLES = ("flow_rate", "temperature", "hasp", "suction_pipe_length",
+                         "discharge_pipe_length", "roughness_factor")
+MONTE_CARLO_DISTRIBUTIONS = ("normal", "uniform", "triangular", "lognormal", "constant")
+# Variables physiquement positives: tirages négatifs ramenés à zéro
+MONTE_CARLO_NON_NEGATIVE = ("flow_rate", "suction_pipe_length", "discharge_pipe_length", "roughness_factor")
+
+def validate_distribution(name: str, distribution: DistributionInput) -> None:
+    """Reject unknown variables/distributions and inconsistent parameters"""
+    if name not in MONTE_CARLO_VARIABLES:
+        raise ValueError(f"Variable incertaine inconnue: {name} ({', '.join(MONTE_CARLO_VARIABLES)})")
+    if distribution.distribution not in MONTE_CARLO_DISTRIBUTIONS:
+        raise ValueError(f"Distribution inconnue pour {name}: {distribution.distribution}")
+    if distribution.std < 0:
+        raise ValueError(f"Écart-type négatif pour {name}")
+    if distribution.distribution in ("uniform", "triangular"):
+        if distribution.low is None or distribution.high is None or distribution.low > distribution.high:
+            raise ValueError(f"Bornes low <= high requises pour {name} ({distribution.distribution})")
+
+def sample_distribution(rng: "np.random.Generator", distribution: Dict[str, Any], size: int) -> np.ndarray:
+    """Draw `size` samples; `distribution` is a DistributionInput dump with `mean` resolved"""
+    kind = distribution["distribution"]
+    mean = distribution["mean"]
+    if kind == "normal":
+        return rng.normal(mean, distribution["std"], size)
+    if kind == "uniform":
+        return rng.uniform(distribution["low"], distribution["high"], size)
+    if kind == "triangular":
+        mode = distribution["mode"] if distribution["mode"] is not None else mean
+        low, high = distribution["low"], distribution["high"]
+        if low == high:
+            return np.full(size, float(low))
+        return rng.triangular(low, min(max(mode, low), high), high, size)
+    if kind == "lognormal":
+        # Paramètres de la loi normale sous-jacente pour la moyenne / l'écart-type demandés
+        sigma_squared = math.log(1 + (distribution["std"] / mean) ** 2)
+        return rng.lognormal(math.log(mean) - sigma_squared / 2, math.sqrt(sigma_squared), size)
+    return np.full(size, float(mean))
+
+def compute_npshd_hmt_arrays(base: HMTCalculationInput, variables: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    NPSHd (surface installations) and HMT for arrays of the uncertain variables; variables
+    not given take the base input value (same physics as calculate_hmt_enhanced).
+    """
+    def value(name):
+        return variables.get(name, getattr(base, name))
+    
+    roughness_factor = variables.get("roughness_factor", 1.0)
+    props = get_fluid_properties_array(base.fluid_type, value("temperature"))
+    flow_rate = value("flow_rate")
+    discharge = compute_pipe_hydraulics(
+        flow_rate, base.discharge_pipe_diameter, value("discharge_pipe_length"),
+        get_pipe_roughness(base.discharge_pipe_material) * roughness_factor,
+        props["density"], props["viscosity"], calculate_fittings_k_total(base.discharge_fittings),
+        base.friction_factor_mode
+    )
+    useful_pressure_head = (base.useful_pressure * 100000) / (props["density"] * 9.81)
+    if base.installation_type != "surface":
+        return {
+            "npshd": None,
+            "hmt": np.broadcast_to(base.discharge_height + discharge["total_head_loss"] + useful_pressure_head,
+                                   np.shape(discharge["total_head_loss"]))
+        }
+    
+    suction = compute_pipe_hydraulics(
+        flow_rate, base.suction_pipe_diameter, value("suction_pipe_length"),
+        get_pipe_roughness(base.suction_pipe_material) * roughness_factor,
+        props["density"], props["viscosity"], calculate_fittings_k_total(base.suction_fittings),
+        base.friction_factor_mode
+    )
+    hasp = value("hasp")
+    return {
+        "npshd": compute_npshd_array(base.suction_type == "flooded", hasp, suction["total_head_loss"],
+                                     props["density"], props["vapor_pressure"]),
+        "hmt": (base.discharge_height - hasp) + suction["total_head_loss"] + discharge["total_head_loss"] + useful_pressure_head
+    }
+
+def _monte_carlo_chunk(base_data: Dict[str, Any], distributions: Dict[str, Dict[str, Any]],
+                       seed_sequence: "np.random.SeedSequence", size: int) -> Dict[str, Optional[np.ndarray]]:
+    """One block of samples (module-level so it can run in a worker process)"""
+    base = HMTCalculationInput(**base_data)
+    rng = np.random.default_rng(seed_sequence)
+    variables = {}
+    for name in sorted(distributions):
+        samples = sample_distribution(rng, distributions[name], size)
+        variables[name] = np.maximum(samples, 0) if name in MONTE_CARLO_NON_NEGATIVE else samples
+    return compute_npshd_hmt_arrays(base, variables)
+
+def uncertainty_statistics(values: np.ndarray, percentiles: List[float]) -> UncertaintyStatistics:
+    """Mean, spread and percentile bands of a sample array"""
+    bands = np.percentile(values, percentiles)
+    return UncertaintyStatistics(
+        mean=float(np.mean(values)),
+        std=float(np.std(values)),
+        min=float(np.min(values)),
+        max=float(np.max(values)),
+        percentiles={f"p{percentile:g}": float(band) for percentile, band in zip(percentiles, bands)}
+    )
+
+def run_monte_carlo_chunks(base_data: Dict[str, Any], distributions: Dict[str, Dict[str, Any]],
+                           seed_sequences: List["np.random.SeedSequence"], sizes: List[int]) -> List[Dict[str, Optional[np.ndarray]]]:
+    """Consecutive sample blocks evaluated in order (one task of a parallel dispatch)"""
+    return [_monte_carlo_chunk(base_data, distributions, seed_sequence, size)
+            for seed_sequence, size in zip(seed_sequences, sizes)]
+
+def prepare_uncertainty_analysis(input_data: UncertaintyAnalysisInput) -> Dict[str, Any]:
+    """Validate the input and return the sampling plan (resolved distributions, block sizes and seeds)"""
+    base = input_data.base
+    validate_hmt_input(base)
+    get_fluid_properties(base.fluid_type, base.temperature)
+    if not 1 <= input_data.samples <= MONTE_CARLO_MAX_SAMPLES:
+        raise ValueError(f"Nombre de tirages invalide (1 à {MONTE_CARLO_MAX_SAMPLES})")
+    if any(not 0 <= percentile <= 100 for percentile in input_data.percentiles):
+        raise ValueError("Les percentiles doivent être compris entre 0 et 100")
+    
+    distributions = {}
+    for name, distribution in input_data.distributions.items():
+        validate_distribution(name, distribution)
+        resolved = distribution.model_dump()
+        if resolved["mean"] is None:
+            resolved["mean"] = 1.0 if name == "roughness_factor" else float(getattr(base, name))
+        if resolved["distribution"] == "lognormal" and resolved["mean"] <= 0:
+            raise ValueError(f"Moyenne strictement positive requise pour {name} (lognormal)")
+        distributions[name] = resolved
+    
+    # Blocs de taille fixe, une graine dérivée par bloc (reproductible quel que soit le parallélisme)
+    sizes = [min(MONTE_CARLO_CHUNK_SIZE, input_data.samples - start)
+             for start in range(0, input_data.samples, MONTE_CARLO_CHUNK_SIZE)]
+    return {
+        "base_data": base.model_dump(),
+        "distributions": distributions,
+        "sizes": sizes,
+        "seed_sequences": np.random.SeedSequence(input_data.seed).spawn(len(sizes))
+    }
+
+def summarize_uncertainty_analysis(input_data: UncertaintyAnalysisInput, chunks: List[Dict[str, Optional[np.ndarray]]],
+                                   workers: int = 1) -> UncertaintyAnalysisResult:
+    """Statistics of the evaluated sample blocks (in block order)"""
+    base = input_data.base
+    hmt = np.concatenate([chunk["hmt"] for chunk in chunks])
+    deterministic = compute_npshd_hmt_arrays(base, {})
+    result = UncertaintyAnalysisResult(
+        samples=input_data.samples,
+        seed=input_data.seed,
+        chunks=len(chunks),
+        workers=workers,
+        deterministic_hmt=float(deterministic["hmt"]),
+        hmt=uncertainty_statistics(hmt, input_data.percentiles)
+    )
+    if deterministic["npshd"] is not None:
+        npshd = np.concatenate([chunk["npshd"] for chunk in chunks])
+        npsh_margin = npshd - input_data.npsh_required
+        result.deterministic_npshd = float(deterministic["npshd"])
+        result.cavitation_probability = float(np.mean(npshd <= input_data.npsh_required))
+        result.npshd = uncertainty_statistics(npshd, input_data.percentiles)
+        result.npsh_margin = uncertainty_statistics(npsh_margin, input_data.percentiles)
+    return result
+
+def calculate_uncertainty_analysis(input_data: UncertaintyAnalysisInput) -> UncertaintyAnalysisResult:
+    """Probabilité de cavitation et bandes de percentiles NPSHd / HMT par Monte Carlo (blocs en séquence)"""
+    plan = prepare_uncertainty_analysis(input_data)
+    chunks = run_monte_carlo_chunks(plan["base_data"], plan["distributions"], plan["seed_sequences"], plan["sizes"])
+    return summarize_uncertainty_analysis(input_data, chunks)
+
+# ============================================================================
+# WATER HAMMER TRANSIENT SOLVER
+# ============================================================================
+# Méthode des caractéristiques (forme H-Q, nombre de Courant 1) sur la conduite de
+# refoulement: pompe en amont, réservoir (cote de refoulement + pression utile) en
+# aval. Frottement quasi permanent au débit initial, singularités réparties le long
+# de la conduite. Mise à jour vectorisée de tous les nœuds à chaque pas de temps.
+# Hypothèses: profil de conduite linéaire entre la pompe (cote 0) et le point de
+# refoulement; pas de modélisation de la rupture de veine (seulement signalée).
+
+# Module d'Young (Pa) et SDR (D/e) typiques par matériau
+PIPE_ELASTICITY = MappingProxyType({
+    "pvc": {"young_modulus": 3.0e9, "sdr": 17},
+    "pehd": {"young_modulus": 0.9e9, "sdr": 11},
+    "steel": {"young_modulus": 2.1e11, "sdr": 40},
+    "steel_galvanized": {"young_modulus": 2.1e11, "sdr": 40},
+    "cast_iron": {"young_modulus": 1.0e11, "sdr": 25},
+    "concrete": {"young_modulus": 3.0e10, "sdr": 12}
+})
+WATER_HAMMER_SCENARIOS = ("pump_trip", "valve_closure")
+WATER_HAMMER_MAX_NODES = 5000
+WATER_HAMMER_MAX_CELL_UPDATES = 50000000  # nœuds × pas de temps
+WATER_HAMMER_MAX_STEPS = 250000  # pas de temps (~15 µs de boucle Python par pas, même à 2 nœuds)
+
+def korteweg_wave_speed(bulk_modulus: float, density: float, diameter_mm: float,
+                        wall_thickness_mm: float, young_modulus: float) -> float:
+    """Pressure wave speed (m/s) in an elastic pipe: a = √(K/ρ / (1 + K·D/(E·e)))"""
+    return math.sqrt((bulk_modulus / density) / (1 + bulk_modulus * diameter_mm / (young_modulus * wall_thickness_mm)))
+
+def valve_opening(time_s: float, closure_time: float, exponent: float) -> float:
+    """Relative valve opening τ(t) = (1 - t/T)^Em, 0 once closed"""
+    if closure_time <= 0 or time_s >= closure_time:
+        return 0.0
+    return (1 - time_s / closure_time) ** exponent
+
+def calculate_water_hammer(input_data: WaterHammerInput) -> WaterHammerResult:
+    """Surpressions / dépressions transitoires le long de la conduite de refoulement"""
+    base = input_data.base
+    validate_hmt_input(base)
+    if input_data.scenario not in WATER_HAMMER_SCENARIOS:
+        raise ValueError(f"Scénario inconnu: {input_data.scenario} ({', '.join(WATER_HAMMER_SCENARIOS)})")
+    if not 2 <= input_data.num_nodes <= WATER_HAMMER_MAX_NODES:
+        raise ValueError(f"Nombre de nœuds invalide (2 à {WATER_HAMMER_MAX_NODES})")
+    if base.discharge_pipe_length <= 0 or base.flow_rate <= 0:
+        raise ValueError("Longueur de refoulement et débit doivent être positifs")
+    if input_data.closure_time < 0:
+        raise ValueError("Le temps de fermeture doit être positif ou nul")
+    if input_data.duration is not None and input_data.duration <= 0:
+        raise ValueError("La durée simulée doit être positive")
+    
+    props = get_fluid_properties(base.fluid_type, base.temperature)
+    density = props.density
+    diameter_m = base.discharge_pipe_diameter / 1000
+    area = math.pi * diameter_m ** 2 / 4
+    length = base.discharge_pipe_length
+    flow = base.flow_rate / 3600  # m³/s
+    
+    # Célérité des ondes
+    if input_data.wave_speed is not None:
+        if input_data.wave_speed <= 0:
+            raise ValueError("La célérité des ondes doit être positive")
+        wave_speed = input_data.wave_speed
+    else:
+        elasticity = PIPE_ELASTICITY.get(base.discharge_pipe_material, PIPE_ELASTICITY["steel"])
+        wall_thickness = input_data.wall_thickness or base.discharge_pipe_diameter / elasticity["sdr"]
+        wave_speed = korteweg_wave_speed(input_data.fluid_bulk_modulus, density, base.discharge_pipe_diameter,
+                                         wall_thickness, elasticity["young_modulus"])
+    
+    # Maillage à Courant 1: dt = dx/a
+    reaches = input_data.num_nodes - 1
+    dx = length / reaches
+    dt = dx / wave_speed
+    critical_time = 2 * length / wave_speed
+    duration = input_data.duration if input_data.duration is not None else max(10 * critical_time, 2 * input_data.closure_time)
+    steps = int(math.ceil(duration / dt))
+    if steps > WATER_HAMMER_MAX_STEPS or steps * input_data.num_nodes > WATER_HAMMER_MAX_CELL_UPDATES:
+        raise ValueError(f"Simulation trop longue ({steps} pas × {input_data.num_nodes} nœuds): réduire la durée ou le nombre de nœuds")
+    
+    # Frottement quasi permanent (+ singularités réparties: f_eq = f + ΣK·D/L)
+    hydraulics = compute_pipe_hydraulics(
+        base.flow_rate, base.discharge_pipe_diameter, length, get_pipe_roughness(base.discharge_pipe_material),
+        density, props.viscosity, friction_mode=base.friction_factor_mode
+    )
+    friction = float(hydraulics["friction_factor"]) + calculate_fittings_k_total(base.discharge_fittings) * diameter_m / length
+    impedance = wave_speed / (9.81 * area)  # B
+    resistance = friction * dx / (2 * 9.81 * diameter_m * area ** 2)  # R
+    
+    # Régime permanent initial
+    reservoir_head = base.discharge_height + (base.useful_pressure * 100000) / (density * 9.81)
+    valve_loss = input_data.valve_head_loss if input_data.scenario == "valve_closure" else 0.0
+    if input_data.scenario == "valve_closure" and valve_loss <= 0:
+        raise ValueError("La perte de charge de la vanne ouverte doit être positive")
+    positions = np.linspace(0, length, input_data.num_nodes)
+    head = reservoir_head + valve_loss + resistance * flow ** 2 * (reaches - np.arange(input_data.num_nodes))
+    discharge = np.full(input_data.num_nodes, flow)
+    steady_head = head.copy()
+    pump_head = float(head[0])
+    elevation = positions / length * base.discharge_height
+    valve_coefficient = flow / math.sqrt(valve_loss) if valve_loss > 0 else 0.0
+    
+    max_head = head.copy()
+    min_head = head.copy()
+    history_stride = max(1, steps // max(1, input_data.history_points))
+    history_times, pump_end_head, outlet_end_head = [0.0], [pump_head], [float(head[-1])]
+    
+    new_head = np.empty_like(head)
+    new_discharge = np.empty_like(discharge)
+    for step in range(1, steps + 1):
+        time_s = step * dt
+        # Caractéristiques C+ (depuis l'amont) et C- (depuis l'aval)
+        friction_term = resistance * discharge * np.abs(discharge)
+        c_plus = head[:-1] + impedance * discharge[:-1] - friction_term[:-1]
+        c_minus = head[1:] - impedance * discharge[1:] + friction_term[1:]
+        new_head[1:-1] = 0.5 * (c_plus[:-1] + c_minus[1:])
+        new_discharge[1:-1] = (c_plus[:-1] - c_minus[1:]) / (2 * impedance)
+        
+        if input_data.scenario == "pump_trip":
+            # Amont: débit de la pompe décroissant jusqu'à zéro (clapet anti-retour fermé ensuite)
+            pump_flow = flow * max(0.0, 1 - time_s / input_data.closure_time) if input_data.closure_time > 0 else 0.0
+            new_discharge[0] = pump_flow
+            new_head[0] = c_minus[0] + impedance * pump_flow
+            # Aval: réservoir à charge constante
+            new_head[-1] = reservoir_head
+            new_discharge[-1] = (c_plus[-1] - reservoir_head) / impedance
+        else:
+            # Amont: pompe à charge constante
+            new_head[0] = pump_head
+            new_discharge[0] = (pump_head - c_minus[0]) / impedance
+            # Aval: vanne Q = τ·Cv·√(H - Hres) combinée avec C+
+            cv_squared = (valve_opening(time_s, input_data.closure_time, input_data.valve_closure_exponent) * valve_coefficient) ** 2
+            head_difference = c_plus[-1] - reservoir_head
+            valve_flow = math.copysign(
+                0.5 * (-cv_squared * impedance + math.sqrt((cv_squared * impedance) ** 2 + 4 * cv_squared * abs(head_difference))),
+                head_difference
+            )
+            new_discharge[-1] = valve_flow
+            new_head[-1] = c_plus[-1] - impedance * valve_flow
+        
+        head, new_head = new_head, head
+        discharge, new_discharge = new_discharge, discharge
+        np.maximum(max_head, head, out=max_head)
+        np.minimum(min_head, head, out=min_head)
+        if step % history_stride == 0:
+            history_times.append(time_s)
+            pump_end_head.append(float(head[0]))
+            outlet_end_head.append(float(head[-1]))
+    
+    pressure_factor = density * 9.81 / 100000  # m -> bar
+    max_pressure = (max_head - elevation) * pressure_factor
+    min_pressure = (min_head - elevation) * pressure_factor
+    # Pression absolue minimale comparée à la tension de vapeur
+    column_separation_risk = bool(np.min(min_pressure) * 100000 + NPSH_ATMOSPHERIC_PRESSURE <= props.vapor_pressure)
+    max_surge = float(np.max(max_head - steady_head))
+    joukowsky_head = wave_speed * (flow / area) / 9.81
+    
+    warnings = []
+    if input_data.closure_time < critical_time:
+        warnings.append(f"⚠️ Arrêt/fermeture brusque: {input_data.closure_time:.2f} s < 2L/a = {critical_time:.2f} s (surpression de Joukowsky {joukowsky_head:.1f} m)")
+    if column_separation_risk:
+        warnings.append("🚨 RISQUE DE RUPTURE DE VEINE: pression minimale inférieure à la tension de vapeur")
+        warnings.append("  • Installer un réservoir anti-bélier ou une ventouse aux points hauts")
+    if max_surge > 0.5 * (pump_head - reservoir_head + base.discharge_height):
+        warnings.append(f"⚠️ Surpression élevée: +{max_surge:.1f} m - vérifier la pression nominale (PN) des conduites")
+    
+    return WaterHammerResult(
+        scenario=input_data.scenario,
+        wave_speed=wave_speed,
+        time_step=dt,
+        steps=steps,
+        nodes=input_data.num_nodes,
+        critical_time=critical_time,
+        joukowsky_head=joukowsky_head,
+        steady_pump_head=pump_head,
+        positions=positions.tolist(),
+        max_head=max_head.tolist(),
+        min_head=min_head.tolist(),
+        max_pressure=max_pressure.tolist(),
+        min_pressure=min_pressure.tolist(),
+        overall_max_pressure=float(np.max(max_pressure)),
+        overall_min_pressure=float(np.min(min_pressure)),
+        max_surge=max_surge,
+        column_separation_risk=column_separation_risk,
+        history_times=history_times,
+        pump_end_head=pump_end_head,
+        outlet_end_head=outlet_end_head,
+        warnings=warnings
+    )
+
+def calculate_darcy_head_loss(flow_rate: float, pipe_diameter: float, pipe_length: float, 
+                             pipe_material: str, fluid_density: float, fluid_viscosity: float,
+                             friction_mode: str = DEFAULT_FRICTION_FACTOR_MODE) -> float:
+    """Calculate head loss using Darcy-Weisbach formula"""
+    if flow_rate <= 0 or pipe_diameter <= 0:
+        return 0
+    
+    # Darcy-Weisbach formula: ΔH = f × (L/D) × (V²/2g)
+    hydraulics = compute_pipe_hydraulics(
+        flow_rate, pipe_diameter, pipe_length, get_pipe_roughness(pipe_material),
+        fluid_density, fluid_viscosity, friction_mode=friction_mode
+    )
+    return float(hydraulics["linear_head_loss"])
+
+PERFORMANCE_CURVE_MAX_FLOW_RATIO = 150  # % du débit nominal
+PERFORMANCE_CURVE_MIN_RESOLUTION = 2
+PERFORMANCE_CURVE_MAX_RESOLUTION = 5000
+PERFORMANCE_CURVE_LENGTH = 50.0  # m - longueur standard supposée pour la courbe de pertes
+
+def generate_performance_curves(input_data: PerformanceAnalysisInput,
+                                resolution: Optional[int] = None) -> Dict[str, List[float]]:
+    """
+    Generate comprehensive performance curves with operating point matching input values and Darcy head loss.
+
+    Les courbes (HMT, rendement, puissance, pertes de charge) sont calculées sur des tableaux
+    complets de `resolution` points répartis de 0 à 150% du débit nominal (par défaut
+    input_data.curve_resolution, 16 points = pas de 10%). Les invariants (H0, a, b, pertes au
+    point de fonctionnement) ne sont calculés qu'une fois.
+    """
+    if resolution is None:
+        resolution = input_data.curve_resolution
+    if not PERFORMANCE_CURVE_MIN_RESOLUTION <= resolution <= PERFORMANCE_CURVE_MAX_RESOLUTION:
+        raise ValueError(f"Résolution de courbe invalide: {resolution} points "
+                         f"({PERFORMANCE_CURVE_MIN_RESOLUTION} à {PERFORMANCE_CURVE_MAX_RESOLUTION})")
+    
+    base_flow = input_data.flow_rate
+    base_hmt = input_data.hmt
+    base_efficiency = input_data.pump_efficiency
+    
+    # Operating point corresponds exactly to input values (not 85% of max flow)
+    operating_point_flow = base_flow
+    operating_point_hmt = base_hmt
+    operating_point_efficiency = base_efficiency
+    
+    # Get fluid properties for Darcy calculations
+    fluid_props = get_fluid_properties(input_data.fluid_type, 20)  # Default temperature for curves
+    
+    # Curve points from 0% to 150% of nominal flow
+    flow_ratio = (np.arange(resolution) * (PERFORMANCE_CURVE_MAX_FLOW_RATIO / (resolution - 1))) / 100
+    flow = base_flow * flow_ratio
+    no_flow = flow == 0
+    
+    # HMT curve (quadratic curve: HMT = H0 - a*Q - b*Q²), forme d'affichage historique
+    h0 = base_hmt * 1.2
+    a = 0.2 * base_hmt / base_flow if base_flow > 0 else 0
+    b = 0.5 * base_hmt / (base_flow ** 2) if base_flow > 0 else 0
+    hmt = np.where(no_flow, h0, pump_head_array(flow, h0, a, b))
+    
+    # Efficiency curve (parabolic with peak at operating point)
+    efficiency = pump_efficiency_array(flow, operating_point_flow, base_efficiency)
+    
+    # Power curve using corrected formula: P = ((Q * H) / (η * 367)) * 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        power = ((flow * hmt) / (efficiency * 367)) * 100
+    power = np.where(no_flow | (efficiency <= 0), 0.0, power)
+    
+    # Head loss curve using Darcy-Weisbach formula
+    # Scaled so that head loss equals HMT at the operating point (intersection)
+    base_head_loss = calculate_darcy_head_loss(
+        flow_rate=operating_point_flow,
+        pipe_diameter=input_data.pipe_diameter,
+        pipe_length=PERFORMANCE_CURVE_LENGTH,
+        pipe_material=input_data.pipe_material,
+        fluid_density=fluid_props.density,
+        fluid_viscosity=fluid_props.viscosity,
+        friction_mode=input_data.friction_factor_mode
+    )
+    scaling_factor = operating_point_hmt / base_head_loss if base_head_loss > 0 else 1
+    if input_data.pipe_diameter > 0:
+        hydraulics = compute_pipe_hydraulics(
+            flow, input_data.pipe_diameter, PERFORMANCE_CURVE_LENGTH,
+            get_pipe_roughness(input_data.pipe_material),
+            fluid_props.density, fluid_props.viscosity,
+            friction_mode=input_data.friction_factor_mode
+        )
+        head_loss = np.where(flow > 0, hydraulics["linear_head_loss"], 0.0) * scaling_factor
+    else:
+        head_loss = np.zeros(resolution)
+    
+    # Operating point power using corrected formulas
+    operating_point_power = ((operating_point_flow * operating_point_hmt) / (operating_point_efficiency * 367)) * 100
+    
+    return {
+        "flow": flow.tolist(),
+        "hmt": np.maximum(hmt, 0).tolist(),
+        "efficiency": np.maximum(efficiency, 0).tolist(),
+        "power": np.maximum(power, 0).tolist(),
+        "head_loss": np.maximum(head_loss, 0).tolist(),
+        "best_operating_point": {
+            "flow": operating_point_flow,
+            "hmt": operating_point_hmt,
+            "efficiency": operating_point_efficiency,
+            "power": operating_point_power
+        }
+    }
+
+# ============================================================================
+# OPERATING POINT SOLVER
+# ============================================================================
+# Point de fonctionnement = intersection de la courbe pompe H(Q) et de la courbe
+# réseau (hauteur statique + pression utile + pertes Darcy et singulières). Les
+# racines sont cherchées par la méthode de Brent, vectorisée: un seul appel résout
+# toutes les combinaisons pompe × réseau d'un catalogue.
+
+BRENT_TOLERANCE = 1e-9  # m³/h
+BRENT_MAX_ITERATIONS = 100
+
+PUMP_CURVE_SHUTOFF_RATIO = 1.2  # H0 / Hn
+PUMP_CURVE_LINEAR_RATIO = 0.05  # a × Qn / Hn
+PUMP_CURVE_QUADRATIC_RATIO = 0.15  # b × Qn² / Hn (linéaire + quadratique = 1.2 - 1: H(Qn) = Hn)
+
+def pump_curve_coefficients(nominal_flow, nominal_head):
+    """
+    Typical pump curve H = H0 - a*Q - b*Q² through the nominal point (H(Qn) = Hn):
+    H0 = 1.2 × Hn, a = 0.05 × Hn/Qn, b = 0.15 × Hn/Qn² (a = b = 0 for a zero nominal flow).
+    La courbe de generate_performance_curves garde sa forme d'affichage historique, qui
+    ne passe pas par le point nominal: elle ne sert pas de modèle physique.
+    """
+    nominal_flow = np.asarray(nominal_flow, dtype=float)
+    nominal_head = np.asarray(nominal_head, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.where(nominal_flow > 0, PUMP_CURVE_LINEAR_RATIO * nominal_head / nominal_flow, 0.0)
+        b = np.where(nominal_flow > 0, PUMP_CURVE_QUADRATIC_RATIO * nominal_head / (nominal_flow**2), 0.0)
+    return nominal_head * PUMP_CURVE_SHUTOFF_RATIO, a, b
+
+def pump_head_array(flow, h0, a, b) -> np.ndarray:
+    """Pump head (m) for arrays of flow (m³/h) and curve coefficients"""
+    flow = np.asarray(flow, dtype=float)
+    return h0 - a * flow - b * (flow**2)
+
+def pump_efficiency_array(flow, nominal_flow, nominal_efficiency) -> np.ndarray:
+    """Parabolic efficiency curve (%) peaking at the nominal flow, zero at zero flow"""
+    flow = np.asarray(flow, dtype=float)
+    nominal_flow = np.asarray(nominal_flow, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency_ratio = np.where(nominal_flow > 0, flow / nominal_flow, 0.0)
+    efficiency = np.clip(nominal_efficiency * (1 - 0.3 * (efficiency_ratio - 1)**2), 0, 100)
+    return np.where(flow == 0, 0.0, efficiency)
+
+def pump_runout_flow(h0, a, b) -> np.ndarray:
+    """Flow (m³/h) where the pump curve reaches zero head (positive root of H(Q) = 0)"""
+    h0 = np.asarray(h0, dtype=float)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quadratic = (-a + np.sqrt(a**2 + 4 * b * h0)) / (2 * b)
+        linear = h0 / a
+    return np.where(b > 0, quadratic, np.where(a > 0, linear, np.inf))
+
+def system_head_array(flow, system: Dict[str, Any]) -> np.ndarray:
+    """
+    System curve (m): static head + useful pressure head + suction and discharge losses
+    (Darcy + fittings) for arrays of flow. `system` holds broadcastable arrays
+    (see build_system_curve_arrays).
+    """
+    head = np.asarray(system["static_head"], dtype=float) + np.zeros(np.shape(flow))
+    for side in ("suction", "discharge"):
+        hydraulics = compute_pipe_hydraulics(
+            flow, system[f"{side}_diameter"], system[f"{side}_length"], system[f"{side}_roughness"],
+            system["density"], system["viscosity"], system[f"{side}_k_total"], system["friction_mode"]
+        )
+        head = head + hydraulics["total_head_loss"]
+    return head
+
+def brent_root_array(function, lower, upper, f_lower, f_upper,
+                     tolerance=BRENT_TOLERANCE, max_iterations=BRENT_MAX_ITERATIONS):
+    """
+    Vectorized Brent method (inverse quadratic interpolation / secant / bisection) for
+    independent roots bracketed by [lower, upper] with f_lower and f_upper of opposite signs.
+    Converged elements are frozen. Returns (roots, converged mask, iterations).
+    """
+    a = np.array(lower, dtype=float)
+    b = np.array(upper, dtype=float)
+    fa = np.array(f_lower, dtype=float)
+    fb = np.array(f_upper, dtype=float)
+    c, fc = a.copy(), fa.copy()
+    d = e = b - a
+    eps = np.finfo(float).eps
+    converged = np.zeros(b.shape, dtype=bool)
+
+    iterations = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for iterations in range(1, max_iterations + 1):
+            # Garder la racine entre b et c
+            same_sign = (fb > 0) == (fc > 0)
+            c = np.where(same_sign, a, c)
+            fc = np.where(same_sign, fa, fc)
+            d = np.where(same_sign, b - a, d)
+            e = np.where(same_sign, b - a, e)
+            # b = meilleure estimation
+            swap = np.abs(fc) < np.abs(fb)
+            a, b, c = np.where(swap, b, a), np.where(swap, c, b), np.where(swap, b, c)
+            fa, fb, fc = np.where(swap, fb, fa), np.where(swap, fc, fb), np.where(swap, fb, fc)
+
+            tol1 = 2 * eps * np.abs(b) + 0.5 * tolerance
+            xm = 0.5 * (c - b)
+            converged = (np.abs(xm) <= tol1) | (fb == 0)
+            if np.all(converged):
+                break
+
+            # Interpolation (sécante si a == c, quadratique inverse sinon)
+            s = fb / fa
+            q_ratio = fa / fc
+            r_ratio = fb / fc
+            secant = a == c
+            p = np.where(secant, 2 * xm * s,
+                         s * (2 * xm * q_ratio * (q_ratio - r_ratio) - (b - a) * (r_ratio - 1)))
+            q = np.where(secant, 1 - s, (q_ratio - 1) * (r_ratio - 1) * (s - 1))
+            q = np.where(p > 0, -q, q)
+            p = np.abs(p)
+            interpolate = ((np.abs(e) >= tol1) & (np.abs(fa) > np.abs(fb))
+                           & (2 * p < np.minimum(3 * xm * q - np.abs(tol1 * q), np.abs(e * q))))
+            e = np.where(interpolate, d, xm)
+            d = np.where(interpolate, p / q, xm)
+
+            a = np.where(converged, a, b)
+            fa = np.where(converged, fa, fb)
+            step = np.where(np.abs(d) > tol1, d, np.copysign(tol1, xm))
+            b = np.where(converged, b, b + step)
+            active = ~converged
+            fb = fb.copy()
+            fb[active] = function(b, active)[active]
+    return b, converged, iterations
+
+def solve_operating_points(h0, a, b, nominal_flow, nominal_efficiency, system: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Intersection of pump curves H = H0 - a*Q - b*Q² with system curves, vectorized over
+    all (pump, system) pairs given as broadcastable arrays. Returns flow (m³/h), head (m),
+    efficiency (%), power (kW), status codes and the number of Brent iterations.
+    """
+    h0, a, b, nominal_flow, nominal_efficiency = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (h0, a, b, nominal_flow, nominal_efficiency))
+    )
+    shape = np.broadcast_shapes(h0.shape, np.shape(system["static_head"]))
+    h0, a, b, nominal_flow, nominal_efficiency = (
+        np.broadcast_to(value, shape) for value in (h0, a, b, nominal_flow, nominal_efficiency)
+    )
+    system = {key: np.broadcast_to(np.asarray(value), shape) for key, value in system.items()}
+
+    def residual(flow, mask=None):
+        """Pump head minus system head (evaluated only on `mask` when given)"""
+        if mask is None:
+            return pump_head_array(flow, h0, a, b) - system_head_array(flow, system)
+        values = np.zeros(shape)
+        subset = {key: value[mask] for key, value in system.items()}
+        values[mask] = (pump_head_array(flow[mask], h0[mask], a[mask], b[mask])
+                        - system_head_array(flow[mask], subset))
+        return values
+
+    lower = np.zeros(shape)
+    upper = pump_runout_flow(h0, a, b)
+    f_lower = residual(lower)
+    f_upper = np.full(shape, np.nan)
+    finite = np.isfinite(upper)
+    f_upper[finite] = residual(np.where(finite, upper, 0.0), finite)[finite]
+
+    insufficient_head = f_lower < 0
+    beyond_curve = ~insufficient_head & ~(f_upper <= 0)
+    bracketed = ~insufficient_head & ~beyond_curve
+
+    flow = np.full(shape, np.nan)
+    iterations = 0
+    if np.any(bracketed):
+        roots, converged, iterations = brent_root_array(
+            lambda x, mask: residual(x, mask & bracketed),
+            np.where(bracketed, lower, 0.0), np.where(bracketed, upper, 0.0),
+            np.where(bracketed, f_lower, -1.0), np.where(bracketed, f_upper, 1.0)
+        )
+        flow = np.where(bracketed, roots, np.nan)
+
+    head = pump_head_array(flow, h0, a, b)
+    efficiency = pump_efficiency_array(flow, nominal_flow, nominal_efficiency)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # P = ((Q * H) / (η * 367)) * 100
+        power = np.where(efficiency > 0, ((flow * head) / (efficiency * 367)) * 100, 0.0)
+    return {
+        "flow": flow,
+        "head": head,
+        "efficiency": efficiency,
+        "power": np.where(bracketed, power, np.nan),
+        "status": np.where(insufficient_head, "insufficient_head", np.where(beyond_curve, "beyond_curve", "ok")),
+        "system_head_at_zero_flow": np.asarray(system["static_head"], dtype=float) + np.zeros(shape),
+        "iterations": iterations
+    }
+
+def build_system_curve_arrays(systems: List[SystemCurveInput]) -> Dict[str, np.ndarray]:
+    """Arrays of system curve parameters (one entry per system), fluid properties memoized"""
+    for system in systems:
+        validate_friction_factor_mode(system.friction_factor_mode)
+        if system.discharge_pipe_diameter <= 0:
+            raise ValueError(f"Diamètre de refoulement invalide: {system.discharge_pipe_diameter} mm")
+    props = [get_fluid_properties(system.fluid_type, system.temperature) for system in systems]
+    density = np.array([p.density for p in props])
+    return {
+        # Hauteur statique + pression utile (bar -> m)
+        "static_head": np.array([system.static_head for system in systems])
+                       + np.array([system.useful_pressure for system in systems]) * 100000 / (density * 9.81),
+        "density": density,
+        "viscosity": np.array([p.viscosity for p in props]),
+        "suction_diameter": np.array([system.suction_pipe_diameter for system in systems], dtype=float),
+        "suction_length": np.array([system.suction_pipe_length for system in systems], dtype=float),
+        "suction_roughness": get_pipe_roughness_array([system.suction_pipe_material for system in systems]),
+        "suction_k_total": np.array([calculate_fittings_k_total(system.suction_fittings) for system in systems], dtype=float),
+        "discharge_diameter": np.array([system.discharge_pipe_diameter for system in systems], dtype=float),
+        "discharge_length": np.array([system.discharge_pipe_length for system in systems], dtype=float),
+        "discharge_roughness": get_pipe_roughness_array([system.discharge_pipe_material for system in systems]),
+        "discharge_k_total": np.array([calculate_fittings_k_total(system.discharge_fittings) for system in systems], dtype=float),
+        "friction_mode": np.array([system.friction_factor_mode for system in systems])
+    }
+
+def calculate_operating_points(input_data: OperatingPointInput) -> OperatingPointBatchResult:
+    """Points de fonctionnement de toutes les combinaisons pompe × réseau en un seul calcul vectorisé"""
+    if not input_data.pumps or not input_data.systems:
+        raise ValueError("Au moins une pompe et un réseau sont requis")
+    
+    coefficients = []
+    for pump in input_data.pumps:
+        if pump.head_coefficients is not None:
+            if len(pump.head_coefficients) != 3:
+                raise ValueError(f"Coefficients de courbe invalides pour {pump.name or 'la pompe'}: [H0, a, b] attendus")
+            coefficients.append(pump.head_coefficients)
+        else:
+            coefficients.append([float(c) for c in pump_curve_coefficients(pump.nominal_flow, pump.nominal_head)])
+    h0, a, b = (np.array(column, dtype=float)[:, None] for column in zip(*coefficients))
+    
+    solution = solve_operating_points(
+        h0, a, b,
+        np.array([pump.nominal_flow for pump in input_data.pumps])[:, None],
+        np.array([pump.nominal_efficiency for pump in input_data.pumps])[:, None],
+        {key: value[None, :] for key, value in build_system_curve_arrays(input_data.systems).items()}
+    )
+    
+    results = []
+    for pump_index, pump in enumerate(input_data.pumps):
+        for system_index in range(len(input_data.systems)):
+            status = str(solution["status"][pump_index, system_index])
+            solved = status == "ok"
+            results.append(OperatingPointResult(
+                pump_index=pump_index,
+                system_index=system_index,
+                pump_name=pump.name,
+                status=status,
+                flow=float(solution["flow"][pump_index, system_index]) if solved else None,
+                head=float(solution["head"][pump_index, system_index]) if solved else None,
+                efficiency=float(solution["efficiency"][pump_index, system_index]) if solved else None,
+                power=float(solution["power"][pump_index, system_index]) if solved else None,
+                system_head_at_zero_flow=float(solution["system_head_at_zero_flow"][pump_index, system_index])
+            ))
+    return OperatingPointBatchResult(
+        results=results,
+        total=len(results),
+        solved=sum(1 for result in results if result.status == "ok"),
+        iterations=solution["iterations"]
+    )
+
+# ============================================================================
+# EXTENDED PERIOD SIMULATION
+# ============================================================================
+# Niveau d'un réservoir alimenté par une pompe (marche/arrêt sur seuils ou variateur)
+# face à un profil de demande, pas à pas sur une année. Le débit de la pompe en
+# fonction du niveau est tabulé une fois (points de fonctionnement vectorisés sur une
+# grille de niveaux, physique HMT). La boucle temporelle avance par blocs: dans un
+# bloc l'état de la pompe est fixe et la trajectoire d'Euler explicite est obtenue par
+# itérations de point fixe vectorisées; le bloc s'arrête au premier événement (seuil
+# de démarrage/arrêt, réservoir vide ou plein). Les paliers réservoir vide / plein
+# sont traités en une seule opération. Énergie, vitesse et rendement sont calculés
+# a posteriori sur tous les pas.
+
+EPS_MAX_STEPS = 1100000  # ~2 ans au pas d'une minute
+EPS_LEVEL_GRID_POINTS = 65
+EPS_MAX_CHUNK = 4096
+EPS_LEVEL_TOLERANCE = 1e-9  # m
+EPS_MAX_FIXED_POINT_ITERATIONS = 50
+EPS_GROWTH_ITERATIONS = 20  # bloc suivant doublé si le point fixe converge plus vite
+EPS_CONTROLS = ("on_off", "vfd")
+EPS_STARTS_PER_HOUR_LIMIT = 6  # démarrages/heure admissibles typiques d'un moteur
+
+def eps_demand_series(profile: List[float], profile_step_hours: float, steps: int, dt_hours: float) -> np.ndarray:
+    """Demand (m³/h) at each simulation step from a cyclic profile (value held over each profile step)"""
+    profile = np.asarray(profile, dtype=float)
+    profile_index = (np.floor(np.arange(steps) * dt_hours / profile_step_hours + 1e-9).astype(np.int64)) % len(profile)
+    return profile[profile_index]
+
+def simulate_tank_levels(demand: np.ndarray, dt_hours: float, tank_area: float, tank_height: float,
+                         initial_level: float, start_level: float, stop_level: float, flow_command):
+    """
+    Explicit Euler tank balance with start/stop hysteresis. `flow_command(levels, demand)`
+    gives the pump flow (m³/h) for levels at the start of each step while the pump runs.
+    Returns end-of-step levels, pump flows, unmet demand and overflow volumes (m³).
+    """
+    steps = len(demand)
+    levels = np.empty(steps)
+    flows = np.empty(steps)
+    unmet_volume = overflow_volume = 0.0
+    level = initial_level
+    running = initial_level <= start_level
+    chunk = 64
+    scale = dt_hours / tank_area  # m par (m³/h) sur un pas
+    
+    position = 0
+    while position < steps:
+        size = min(chunk, steps - position)
+        block_demand = demand[position:position + size]
+        
+        # Paliers: réservoir vide (ou plein) tant que le bilan le maintient en butée
+        if level <= 0 or level >= tank_height:
+            block_flow = flow_command(np.full(size, level), block_demand) if running else np.zeros(size)
+            rate = block_flow - block_demand
+            saturated = rate < 0 if level <= 0 else rate > 0
+            run = size if np.all(saturated) else int(np.argmin(saturated))
+            if run > 0:
+                levels[position:position + run] = level
+                flows[position:position + run] = block_flow[:run]
+                if level <= 0:
+                    unmet_volume -= float(np.sum(rate[:run])) * dt_hours
+                else:
+                    overflow_volume += float(np.sum(rate[:run])) * dt_hours
+                position += run
+                continue
+        
+        # Trajectoire du bloc: point fixe L_avant -> débit -> L_après
+        iterations = 0
+        if running:
+            before = np.full(size, level)
+            for iterations in range(1, EPS_MAX_FIXED_POINT_ITERATIONS + 1):
+                block_flow = flow_command(before, block_demand)
+                after = level + np.cumsum(block_flow - block_demand) * scale
+                updated = np.concatenate(([level], after[:-1]))
+                converged = np.max(np.abs(updated - before)) <= EPS_LEVEL_TOLERANCE
+                before = updated
+                if converged:
+                    break
+            else:
+                if size > 1:
+                    chunk = max(1, size // 2)
+                    continue
+            block_flow = flow_command(before, block_demand)
+            after = level + np.cumsum(block_flow - block_demand) * scale
+            switch = after >= stop_level
+        else:
+            block_flow = np.zeros(size)
+            after = level - np.cumsum(block_demand) * scale
+            switch = after <= start_level
+        
+        events = switch | (after < 0) | (after > tank_height)
+        last = int(np.argmax(events)) if np.any(events) else size - 1
+        level = float(after[last])
+        if level < 0:
+            unmet_volume -= level * tank_area
+        elif level > tank_height:
+            overflow_volume += (level - tank_height) * tank_area
+        level = min(max(level, 0.0), tank_height)
+        levels[position:position + last + 1] = np.clip(after[:last + 1], 0, tank_height)
+        flows[position:position + last + 1] = block_flow[:last + 1]
+        if switch[last]:
+            running = not running
+        position += last + 1
+        # Bloc suivant: double de la portion utilisée tant que le point fixe converge vite
+        # (les événements fréquents limitent ainsi le calcul inutile au-delà de l'événement)
+        if iterations < EPS_GROWTH_ITERATIONS:
+            chunk = min(EPS_MAX_CHUNK, 2 * (last + 1))
+    
+    return levels, flows, unmet_volume, overflow_volume
+
+def calculate_extended_period_simulation(input_data: ExtendedPeriodInput) -> ExtendedPeriodResult:
+    """Simulation annuelle réservoir + pompe: énergie, démarrages et statistiques de niveau"""
+    base = input_data.base
+    validate_hmt_input(base)
+    if input_data.control not in EPS_CONTROLS:
+        raise ValueError(f"Mode de régulation inconnu: {input_data.control} ({', '.join(EPS_CONTROLS)})")
+    if input_data.tank_area <= 0 or input_data.tank_height <= 0:
+        raise ValueError("Section et hauteur du réservoir doivent être positives")
+    if not 0 <= input_data.start_level < input_data.stop_level <= input_data.tank_height:
+        raise ValueError("Seuils invalides: 0 <= niveau de démarrage < niveau d'arrêt <= hauteur du réservoir")
+    if not 0 <= input_data.initial_level <= input_data.tank_height:
+        raise ValueError("Niveau initial hors du réservoir")
+    if not input_data.demand_profile or input_data.demand_profile_step <= 0 or min(input_data.demand_profile) < 0:
+        raise ValueError("Profil de demande invalide (valeurs >= 0, pas > 0)")
+    if input_data.time_step_minutes <= 0 or input_data.duration_hours <= 0:
+        raise ValueError("Pas de temps et durée doivent être positifs")
+    if not 0 < input_data.motor_efficiency <= 100:
+        raise ValueError("Rendement moteur invalide (0 < rendement <= 100 %)")
+    if input_data.control == "vfd":
+        if input_data.vfd_time_constant <= 0:
+            raise ValueError("La constante de temps du variateur doit être positive")
+        if not 0 <= input_data.vfd_min_flow_ratio <= 1:
+            raise ValueError("Débit minimal du variateur invalide (rapport entre 0 et 1)")
+    dt_hours = input_data.time_step_minutes / 60
+    steps = int(math.ceil(input_data.duration_hours / dt_hours - 1e-9))
+    if steps > EPS_MAX_STEPS:
+        raise ValueError(f"Simulation trop longue ({steps} > {EPS_MAX_STEPS} pas)")
+    
+    # Courbe pompe: fournie ou courbe type passant par le point (débit, HMT) de l'installation
+    if input_data.pump is not None:
+        pump = input_data.pump
+    else:
+        pump = PumpCurveInput(nominal_flow=base.flow_rate, nominal_head=calculate_hmt_enhanced(base).hmt)
+    if pump.head_coefficients is not None:
+        if len(pump.head_coefficients) != 3:
+            raise ValueError("Coefficients de courbe invalides: [H0, a, b] attendus")
+        h0, a, b = (float(c) for c in pump.head_coefficients)
+    else:
+        h0, a, b = (float(c) for c in pump_curve_coefficients(pump.nominal_flow, pump.nominal_head))
+    
+    # Courbe réseau à niveau nul (physique HMT), puis débit pompe tabulé en fonction du niveau
+    is_surface = base.installation_type == "surface"
+    system = build_system_curve_arrays([SystemCurveInput(
+        static_head=base.discharge_height - base.hasp if is_surface else base.discharge_height,
+        useful_pressure=base.useful_pressure,
+        fluid_type=base.fluid_type,
+        temperature=base.temperature,
+        suction_pipe_diameter=base.suction_pipe_diameter if is_surface else 0,
+        suction_pipe_length=base.suction_pipe_length if is_surface else 0,
+        suction_pipe_material=base.suction_pipe_material,
+        suction_fittings=base.suction_fittings if is_surface else [],
+        discharge_pipe_diameter=base.discharge_pipe_diameter,
+        discharge_pipe_length=base.discharge_pipe_length,
+        discharge_pipe_material=base.discharge_pipe_material,
+        discharge_fittings=base.discharge_fittings,
+        friction_factor_mode=base.friction_factor_mode
+    )])
+    level_grid = np.linspace(0, input_data.tank_height, EPS_LEVEL_GRID_POINTS)
+    grid_system = dict(system, static_head=system["static_head"] + level_grid)
+    operating = solve_operating_points(h0, a, b, pump.nominal_flow, pump.nominal_efficiency, grid_system)
+    full_speed_flow = np.nan_to_num(operating["flow"], nan=0.0)
+    if not np.any(full_speed_flow > 0):
+        raise ValueError("La pompe ne peut pas remplir le réservoir (hauteur insuffisante)")
+    
+    if input_data.control == "on_off":
+        def flow_command(levels, demand):
+            return np.interp(levels, level_grid, full_speed_flow)
+    else:
+        setpoint = (input_data.vfd_setpoint if input_data.vfd_setpoint is not None
+                    else (input_data.start_level + input_data.stop_level) / 2)
+        minimum_flow = input_data.vfd_min_flow_ratio * pump.nominal_flow
+        gain = input_data.tank_area / input_data.vfd_time_constant  # m³/h par m d'écart
+        
+        def flow_command(levels, demand):
+            maximum_flow = np.interp(levels, level_grid, full_speed_flow)
+            return np.minimum(np.maximum(demand + (setpoint - levels) * gain, minimum_flow), maximum_flow)
+    
+    demand = eps_demand_series(input_data.demand_profile, input_data.demand_profile_step, steps, dt_hours)
+    levels, flows, unmet_volume, overflow_volume = simulate_tank_levels(
+        demand, dt_hours, input_data.tank_area, input_data.tank_height,
+        input_data.initial_level, input_data.start_level, input_data.stop_level, flow_command
+    )
+    
+    # Énergie: hauteur réseau au niveau de début de pas, vitesse relative (similitude) et rendement
+    running = flows > 0
+    levels_before = np.concatenate(([input_data.initial_level], levels[:-1]))
+    power_kw = np.zeros(steps)
+    if np.any(running):
+        flow_on = flows[running]
+        head = system_head_array(flow_on, system) + levels_before[running]
+        # H0·n² - a·Q·n - b·Q² = H  ->  n (n = 1 au point de fonctionnement à pleine vitesse)
+        speed = (a * flow_on + np.sqrt((a * flow_on) ** 2 + 4 * h0 * (b * flow_on ** 2 + head))) / (2 * h0)
+        efficiency = pump_efficiency_array(flow_on / speed, pump.nominal_flow, pump.nominal_efficiency)
+        density = get_fluid_properties(base.fluid_type, base.temperature).density
+        with np.errstate(divide="ignore", invalid="ignore"):
+            power_kw[running] = np.where(
+                efficiency > 0,
+                density * 9.81 * (flow_on / 3600) * head / ((efficiency / 100) * (input_data.motor_efficiency / 100)) / 1000,
+                0.0
+            )
+    energy_step = power_kw * dt_hours
+    starts = running & ~np.concatenate(([input_data.initial_level <= input_data.start_level], running[:-1]))
+    
+    # Agrégats horaires et journaliers
+    hour_index = np.floor(np.arange(steps) * dt_hours + 1e-9).astype(np.int64)
+    day_index = hour_index // 24
+    day_starts = np.flatnonzero(np.concatenate(([True], day_index[1:] != day_index[:-1])))
+    starts_per_hour = np.bincount(hour_index, weights=starts)
+    
+    energy_kwh = float(np.sum(energy_step))
+    pumped_volume = float(np.sum(flows) * dt_hours)
+    simulated_hours = steps * dt_hours
+    warnings = []
+    if unmet_volume > 0:
+        warnings.append(f"🚨 Réservoir vide: {unmet_volume:.1f} m³ de demande non satisfaite - pompe ou réservoir sous-dimensionné")
+    if overflow_volume > 0:
+        warnings.append(f"⚠️ Débordement: {overflow_volume:.1f} m³ - vérifier les seuils et le débit minimal du variateur")
+    if starts_per_hour.size and starts_per_hour.max() > EPS_STARTS_PER_HOUR_LIMIT:
+        warnings.append(f"⚠️ Jusqu'à {int(starts_per_hour.max())} démarrages/heure (> {EPS_STARTS_PER_HOUR_LIMIT}): augmenter l'écart entre seuils ou le volume du réservoir")
+    
+    return ExtendedPeriodResult(
+        control=input_data.control,
+        steps=steps,
+        time_step_minutes=input_data.time_step_minutes,
+        energy_kwh=energy_kwh,
+        energy_cost=energy_kwh * input_data.electricity_cost,
+        specific_energy=energy_kwh / pumped_volume if pumped_volume > 0 else None,
+        pumped_volume=pumped_volume,
+        demand_volume=float(np.sum(demand) * dt_hours),
+        unmet_demand_volume=unmet_volume,
+        overflow_volume=overflow_volume,
+        pump_running_hours=float(np.count_nonzero(running) * dt_hours),
+        pump_starts=int(np.count_nonzero(starts)),
+        max_starts_per_hour=int(starts_per_hour.max()) if starts_per_hour.size else 0,
+        mean_starts_per_hour=float(np.count_nonzero(starts) / simulated_hours),
+        final_level=float(levels[-1]),
+        level=uncertainty_statistics(levels, [5, 50, 95]),
+        daily_energy_kwh=np.bincount(day_index, weights=energy_step).tolist(),
+        daily_min_level=np.minimum.reduceat(levels, day_starts).tolist(),
+        daily_max_level=np.maximum.reduceat(levels, day_starts).tolist(),
+        daily_starts=np.bincount(day_index, weights=starts).astype(int).tolist(),
+        warnings=warnings
+    )
+
+# ============================================================================
+# LOOPED PIPE NETWORK SOLVER
+# ============================================================================
+# Méthode du gradient global (Todini-Pilati): Newton-Raphson sur les débits des
+# conduites et les charges aux nœuds. Le système réduit A21·D⁻¹·A12·dH = b est un
+# laplacien pondéré creux (listes d'arêtes, sans matrice dense), résolu par gradient
+# conjugué préconditionné par un multigrille algébrique à agrégation par paires:
+# nombre d'itérations quasi indépendant de la taille, coût quasi linéaire en nombre
+# de conduites. Pertes de charge: Darcy-Weisbach + ΣK des singularités, via le noyau
+# hydraulique (rugosités PIPE_MATERIALS, coefficients FITTING_COEFFICIENTS), avec
+# un raccord continu laminaire/turbulent pour que Newton converge sur les conduites
+# à faible débit.
+
+NETWORK_TRANSITION_REYNOLDS = (2000, 4000)  # zone de transition interpolée (cf. EPANET)
+NETWORK_DERIVATIVE_STEP = 1e-6  # pas relatif de la dérivée dh/dQ par différence finie
+NETWORK_MIN_FLOW = 1e-9  # m³/h
+NETWORK_CG_TOLERANCE = 1e-8  # résidu relatif du gradient conjugué (Newton inexact)
+NETWORK_CG_MAX_ITERATIONS = 1000
+NETWORK_COARSE_SIZE = 300  # nœuds du niveau grossier résolu directement
+NETWORK_SMOOTHING_WEIGHT = 0.67  # relaxation de Jacobi amortie du multigrille
+NETWORK_MATCHING_ROUNDS = 4  # tours d'appariement par niveau d'agrégation
+NETWORK_STRONG_COUPLING = 0.25  # couplage fort: conductance ≥ 0,25 × la plus forte des deux nœuds
+
+def network_friction_factor_array(reynolds_number, relative_roughness, mode=DEFAULT_FRICTION_FACTOR_MODE) -> np.ndarray:
+    """
+    Friction factor continuous in Re: 64/Re below 2000, turbulent model above 4000 and
+    linear interpolation in between (the kernel's step at Re = 2300 would stall Newton).
+    """
+    reynolds_number = np.asarray(reynolds_number, dtype=float)
+    lower, upper = NETWORK_TRANSITION_REYNOLDS
+    friction_factor = friction_factor_array(reynolds_number, relative_roughness, mode)
+    transition = (reynolds_number >= lower) & (reynolds_number < upper)
+    if np.any(transition):
+        weight = (reynolds_number - lower) / (upper - lower)
+        upper_factor = friction_factor_array(np.full(reynolds_number.shape, float(upper)), relative_roughness, mode)
+        friction_factor = np.where(transition, (1 - weight) * (64 / lower) + weight * upper_factor, friction_factor)
+    return friction_factor
+
+def network_pipe_hydraulics(flow_rate, pipe_diameter, pipe_length, relative_roughness,
+                            density, viscosity, k_total, friction_mode=DEFAULT_FRICTION_FACTOR_MODE) -> Dict[str, np.ndarray]:
+    """Same outputs as compute_pipe_hydraulics (flow ≥ 0) with the continuous network friction factor"""
+    velocity = pipe_velocity_array(flow_rate, pipe_diameter)
+    diameter_m = np.asarray(pipe_diameter, dtype=float) / 1000
+    reynolds_number = reynolds_number_array(velocity, diameter_m, density, viscosity)
+    friction_factor = network_friction_factor_array(reynolds_number, relative_roughness, friction_mode)
+    linear_head_loss = linear_head_loss_array(friction_factor, pipe_length, diameter_m, velocity)
+    singular_head_loss = singular_head_loss_array(velocity, k_total)
+    return {
+        "velocity": velocity,
+        "reynolds_number": reynolds_number,
+        "friction_factor": friction_factor,
+        "linear_head_loss": linear_head_loss,
+        "singular_head_loss": singular_head_loss,
+        "total_head_loss": linear_head_loss + singular_head_loss
+    }
+
+def _network_laplacian(start, end, conductance, size):
+    """
+    Reduced matrix A21·diag(conductance)·A12 in coordinate form: (diagonal, rows, columns,
+    off-diagonal values). Index `size` stands for fixed-head nodes and is dropped.
+    """
+    diagonal = (np.bincount(start, weights=conductance, minlength=size + 1)
+                + np.bincount(end, weights=conductance, minlength=size + 1))[:size]
+    internal = (start < size) & (end < size)
+    rows = np.concatenate((start[internal], end[internal]))
+    columns = np.concatenate((end[internal], start[internal]))
+    values = -np.concatenate((conductance[internal], conductance[internal]))
+    return diagonal, rows, columns, values
+
+def _network_laplacian_product(laplacian, vector) -> np.ndarray:
+    """Sparse product of a network Laplacian (see _network_laplacian) with a vector"""
+    diagonal, rows, columns, values = laplacian
+    return diagonal * vector + np.bincount(rows, weights=values * vector[columns], minlength=len(diagonal))
+
+def _network_first_neighbours(rows, columns, keys, size, eligible) -> np.ndarray:
+    """Neighbour of every node ranked first by `keys` (np.lexsort order) among eligible entries, -1 if none"""
+    order = np.flatnonzero(eligible)
+    order = order[np.lexsort(tuple(key[order] for key in keys) + (rows[order],))]
+    sorted_rows = rows[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_rows[1:] != sorted_rows[:-1]
+    neighbour = np.full(size, -1)
+    neighbour[sorted_rows[first]] = columns[order][first]
+    return neighbour
+
+def _network_coarsen(laplacian):
+    """
+    Pairwise aggregation by rounds of handshake matching over strong couplings: each unmatched
+    node picks the unmatched strong neighbour with the smallest pseudo-random pipe key, and
+    mutual choices form a pair. The key is symmetric, so the smallest remaining key is always
+    a mutual choice and equal conductances (uniform grids) cannot stall the matching. Leftover
+    nodes join their strongest matched neighbour's pair. Returns the aggregate of every node
+    and the Galerkin coarse Laplacian Pᵀ·A·P.
+    """
+    diagonal, rows, columns, values = laplacian
+    size = len(diagonal)
+    # Clé de départage symétrique (même valeur vue des deux extrémités), déterministe
+    low, high = np.minimum(rows, columns).astype(np.uint64), np.maximum(rows, columns).astype(np.uint64)
+    tie_break = (low * np.uint64(size) + high) * np.uint64(0x9E3779B97F4A7C15)
+    row_strength = np.zeros(size)
+    np.maximum.at(row_strength, rows, -values)
+    strong = -values >= NETWORK_STRONG_COUPLING * np.maximum(row_strength[rows], row_strength[columns])
+
+    nodes = np.arange(size)
+    aggregate = np.full(size, -1)
+    pair_count = 0
+    for _ in range(NETWORK_MATCHING_ROUNDS):
+        eligible = strong & (aggregate[rows] < 0) & (aggregate[columns] < 0)
+        if not np.any(eligible):
+            break
+        choice = _network_first_neighbours(rows, columns, (tie_break,), size, eligible)
+        chosen = choice >= 0
+        mutual = chosen.copy()
+        mutual[chosen] = choice[choice[chosen]] == nodes[chosen]
+        leaders = np.flatnonzero(mutual & (nodes < choice))
+        aggregate[leaders] = np.arange(pair_count, pair_count + len(leaders))
+        aggregate[choice[leaders]] = aggregate[leaders]
+        pair_count += len(leaders)
+    if pair_count:
+        strongest = _network_first_neighbours(rows, columns, (tie_break, values), size,
+                                              (aggregate[rows] < 0) & (aggregate[columns] >= 0))
+        attach = strongest >= 0
+        aggregate[attach] = aggregate[strongest[attach]]
+    singletons = aggregate < 0
+    coarse_size = pair_count + int(np.count_nonzero(singletons))
+    aggregate[singletons] = np.arange(pair_count, coarse_size)
+
+    coarse_rows, coarse_columns = aggregate[rows], aggregate[columns]
+    external = coarse_rows != coarse_columns
+    coarse_diagonal = (np.bincount(aggregate, weights=diagonal, minlength=coarse_size)
+                       + np.bincount(coarse_rows[~external], weights=values[~external], minlength=coarse_size))
+    keys, positions = np.unique(coarse_rows[external] * coarse_size + coarse_columns[external], return_inverse=True)
+    coarse_values = np.bincount(positions, weights=values[external], minlength=len(keys))
+    return aggregate, (coarse_diagonal, keys // coarse_size, keys % coarse_size, coarse_values)
+
+def _network_multigrid_hierarchy(laplacian, coarse_size=NETWORK_COARSE_SIZE):
+    """
+    Aggregation levels [(laplacian, aggregate)] down to a coarse level, and its dense inverse.
+    The inverse is None when coarsening stalls above `coarse_size`: a larger level is never
+    inverted densely (O(n²) memory, O(n³) time).
+    """
+    levels = []
+    while len(laplacian[0]) > coarse_size:
+        aggregate, coarse = _network_coarsen(laplacian)
+        if len(coarse[0]) > 0.9 * len(laplacian[0]):
+            return levels, None
+        levels.append((laplacian, aggregate))
+        laplacian = coarse
+    diagonal, rows, columns, values = laplacian
+    coarse_matrix = np.diag(diagonal)
+    coarse_matrix[rows, columns] += values
+    return levels, np.linalg.inv(coarse_matrix)
+
+def _network_multigrid_cycle(levels, coarse_inverse, rhs, level=0) -> np.ndarray:
+    """Symmetric V-cycle (damped Jacobi pre/post smoothing), used as CG preconditioner"""
+    if level == len(levels):
+        return coarse_inverse @ rhs
+    laplacian, aggregate = levels[level]
+    diagonal = laplacian[0]
+    solution = NETWORK_SMOOTHING_WEIGHT * rhs / diagonal
+    residual = rhs - _network_laplacian_product(laplacian, solution)
+    coarse_rhs = np.bincount(aggregate, weights=residual, minlength=int(aggregate.max()) + 1)
+    solution += _network_multigrid_cycle(levels, coarse_inverse, coarse_rhs, level + 1)[aggregate]
+    solution += NETWORK_SMOOTHING_WEIGHT * (rhs - _network_laplacian_product(laplacian, solution)) / diagonal
+    return solution
+
+def _network_conjugate_gradient(rhs, laplacian, tolerance=NETWORK_CG_TOLERANCE,
+                                max_iterations=NETWORK_CG_MAX_ITERATIONS):
+    """
+    Multigrid-preconditioned conjugate gradient on the (symmetric positive definite) network
+    Laplacian, Jacobi-preconditioned when the aggregation hierarchy has no invertible coarse level.
+    """
+    levels, coarse_inverse = _network_multigrid_hierarchy(laplacian)
+    if coarse_inverse is None:
+        def precondition(vector):
+            return vector / laplacian[0]
+    else:
+        def precondition(vector):
+            return _network_multigrid_cycle(levels, coarse_inverse, vector)
+    solution = np.zeros(len(rhs))
+    residual = rhs.copy()
+    preconditioned = precondition(residual)
+    direction = preconditioned.copy()
+    residual_dot = residual @ preconditioned
+    threshold = (tolerance * max(np.linalg.norm(rhs), 1e-300)) ** 2
+    for _ in range(max_iterations):
+        if residual @ residual <= threshold:
+            break
+        product = _network_laplacian_product(laplacian, direction)
+        step = residual_dot / (direction @ product)
+        solution += step * direction
+        residual -= step * product
+        preconditioned = precondition(residual)
+        new_residual_dot = residual @ preconditioned
+        direction = preconditioned + (new_residual_dot / residual_dot) * direction
+        residual_dot = new_residual_dot
+    return solution
+
+def _network_components_without_fixed_head(node_count, start, end, fixed) -> List[int]:
+    """Nodes belonging to connected components that contain no fixed-head node"""
+    parent = list(range(node_count))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for a, b in zip(start.tolist(), end.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+    anchored = {find(node) for node in np.flatnonzero(fixed).tolist()}
+    return [node for node in range(node_count) if find(node) not in anchored]
+
+def solve_pipe_network(input_data: PipeNetworkInput) -> PipeNetworkResult:
+    """Débits dans toutes les conduites et charges à tous les nœuds d'un réseau maillé"""
+    validate_friction_factor_mode(input_data.friction_factor_mode)
+    if not input_data.pipes:
+        raise ValueError("Le réseau doit comporter au moins une conduite")
+    
+    node_index = {}
+    for position, node in enumerate(input_data.nodes):
+        if node.id in node_index:
+            raise ValueError(f"Identifiant de nœud dupliqué: {node.id}")
+        node_index[node.id] = position
+    
+    node_count = len(input_data.nodes)
+    try:
+        start = np.array([node_index[pipe.start_node] for pipe in input_data.pipes], dtype=np.intp)
+        end = np.array([node_index[pipe.end_node] for pipe in input_data.pipes], dtype=np.intp)
+    except KeyError as e:
+        raise ValueError(f"Nœud inconnu: {e.args[0]}")
+    if np.any(start == end):
+        raise ValueError("Une conduite ne peut pas relier un nœud à lui-même")
+    diameter = np.array([pipe.diameter for pipe in input_data.pipes], dtype=float)
+    length = np.array([pipe.length for pipe in input_data.pipes], dtype=float)
+    if np.any(diameter <= 0) or np.any(length < 0):
+        raise ValueError("Diamètres et longueurs des conduites doivent être positifs")
+    relative_roughness = get_pipe_roughness_array([pipe.material for pipe in input_data.pipes]) / diameter
+    k_total = np.array([calculate_fittings_k_total(pipe.fittings) for pipe in input_data.pipes], dtype=float)
+    
+    fixed = np.array([node.fixed_head is not None for node in input_data.nodes])
+    if not np.any(fixed):
+        raise ValueError("Au moins un nœud à charge imposée (réservoir) est requis")
+    floating = _network_components_without_fixed_head(node_count, start, end, fixed)
+    if floating:
+        raise ValueError(f"Nœuds non reliés à un nœud à charge imposée: {', '.join(input_data.nodes[i].id for i in floating[:10])}")
+    
+    props = get_fluid_properties(input_data.fluid_type, input_data.temperature)
+    demand = np.array([node.demand for node in input_data.nodes], dtype=float)
+    head = np.array([node.fixed_head if node.fixed_head is not None else 0.0 for node in input_data.nodes])
+    
+    # Numérotation des inconnues: nœuds libres 0..n-1, nœuds à charge imposée -> n (neutre)
+    unknown_count = int(np.count_nonzero(~fixed))
+    unknown_index = np.full(node_count, unknown_count, dtype=np.intp)
+    unknown_index[~fixed] = np.arange(unknown_count)
+    start_unknown, end_unknown = unknown_index[start], unknown_index[end]
+    free_demand = demand[~fixed]
+    head[~fixed] = head[fixed].max()
+    
+    def pipe_hydraulics(flow):
+        """Hydraulics of every pipe for flows |Q| (m³/h)"""
+        return network_pipe_hydraulics(
+            flow, diameter, length, relative_roughness,
+            props.density, props.viscosity, k_total, input_data.friction_factor_mode
+        )
+    
+    # Débit initial: vitesse de 1 m/s de start_node vers end_node
+    flow = math.pi * (diameter / 1000 / 2) ** 2 * 3600
+    iterations = 0
+    converged = False
+    head_residual = flow_residual = np.inf
+    for iterations in range(1, input_data.max_iterations + 1):
+        abs_flow = np.maximum(np.abs(flow), NETWORK_MIN_FLOW)
+        pipe_head_loss = pipe_hydraulics(abs_flow)["total_head_loss"]
+        head_loss = np.sign(flow) * pipe_head_loss
+        # dh/dQ par différence finie (laminaire ~ Q, turbulent ~ Q²)
+        flow_step = abs_flow * NETWORK_DERIVATIVE_STEP
+        derivative = np.maximum((pipe_hydraulics(abs_flow + flow_step)["total_head_loss"] - pipe_head_loss) / flow_step, 1e-12)
+        
+        # Résidus: énergie par conduite (Hstart - Hend - h) et continuité par nœud libre
+        energy_residual = head_loss - (head[start] - head[end])
+        continuity_residual = (np.bincount(end_unknown, weights=flow, minlength=unknown_count + 1)
+                               - np.bincount(start_unknown, weights=flow, minlength=unknown_count + 1))[:unknown_count] - free_demand
+        head_residual = float(np.max(np.abs(energy_residual)))
+        flow_residual = float(np.max(np.abs(continuity_residual))) if unknown_count else 0.0
+        if head_residual <= input_data.head_tolerance and flow_residual <= input_data.flow_tolerance:
+            converged = True
+            break
+        
+        # Système réduit: A21·D⁻¹·A12·dH = E2 - A21·D⁻¹·E1
+        conductance = 1 / derivative
+        weighted_energy = conductance * energy_residual
+        rhs = continuity_residual - (np.bincount(end_unknown, weights=weighted_energy, minlength=unknown_count + 1)
+                                     - np.bincount(start_unknown, weights=weighted_energy, minlength=unknown_count + 1))[:unknown_count]
+        head_step = np.zeros(node_count)
+        if unknown_count:
+            head_step[~fixed] = _network_conjugate_gradient(
+                rhs, _network_laplacian(start_unknown, end_unknown, conductance, unknown_count)
+            )
+        # dQ = -D⁻¹·(E1 + A12·dH), avec A12·dH = dH_end - dH_start
+        flow = flow - conductance * (energy_residual - (head_step[start] - head_step[end]))
+        head = head + head_step
+    
+    hydraulics = pipe_hydraulics(np.abs(flow))
+    # Débit fourni par les nœuds à charge imposée (bilan des conduites raccordées)
+    node_balance = np.bincount(end, weights=flow, minlength=node_count) - np.bincount(start, weights=flow, minlength=node_count)
+    node_demand = np.where(fixed, node_balance, demand)
+    elevation = np.array([node.elevation for node in input_data.nodes], dtype=float)
+    pressure = (head - elevation) * props.density * 9.81 / 100000
+    
+    return PipeNetworkResult(
+        nodes=[NetworkNodeResult(id=node.id, head=h, pressure=p, demand=q)
+               for node, h, p, q in zip(input_data.nodes, head.tolist(), pressure.tolist(), node_demand.tolist())],
+        pipes=[NetworkPipeResult(id=pipe.id, flow=q, velocity=v, head_loss=h, friction_factor=f, reynolds_number=re)
+               for pipe, q, v, h, f, re in zip(
+                   input_data.pipes, flow.tolist(), hydraulics["velocity"].tolist(), hydraulics["total_head_loss"].tolist(),
+                   hydraulics["friction_factor"].tolist(), hydraulics["reynolds_number"].tolist())],
+        iterations=iterations,
+        converged=converged,
+        max_head_residual=head_residual,
+        max_flow_residual=flow_residual
+    )
+
+# ============================================================================
+# DN LIFECYCLE OPTIMIZER
+# ============================================================================
+# Toutes les combinaisons matériau × DN aspiration × DN refoulement sont évaluées en
+# un seul passage vectorisé (tableau matériau × DN asp. × DN ref.). Sont retenues les
+# options admissibles (vitesses, marge NPSH) non dominées sur trois critères:
+# investissement, énergie actualisée sur la durée de vie, marge NPSH.
+
+# Coût indicatif posé (€/m) en DN100 - coût ∝ (DN/100)^PIPE_COST_DIAMETER_EXPONENT
+PIPE_INSTALLED_COSTS = MappingProxyType({
+    "pvc": 35.0,
+    "pehd": 40.0,
+    "steel": 110.0,
+    "steel_galvanized": 125.0,
+    "cast_iron": 140.0,
+    "concrete": 95.0
+})
+PIPE_COST_REFERENCE_DN = 100
+PIPE_COST_DIAMETER_EXPONENT = 1.3
+
+def annuity_factor(discount_rate: float, years: int) -> float:
+    """Present value of 1 €/year over `years` years: Σ 1/(1+r)^t"""
+    if discount_rate <= 0:
+        return float(years)
+    return (1 - (1 + discount_rate) ** -years) / discount_rate
+
+def pareto_front_mask(objectives: np.ndarray) -> np.ndarray:
+    """
+    Non-dominated rows of an (n, k) array of objectives to minimize: a row is dominated
+    if another is no worse on every objective and strictly better on at least one.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    # Tri par premier critère: seuls les points précédents peuvent dominer
+    order = np.lexsort(objectives.T[::-1])
+    ranked = objectives[order]
+    keep = np.ones(len(ranked), dtype=bool)
+    for position in range(1, len(ranked)):
+        previous = ranked[:position][keep[:position]]
+        no_worse = np.all(previous <= ranked[position], axis=1)
+        better = np.any(previous < ranked[position], axis=1)
+        keep[position] = not np.any(no_worse & better)
+    mask = np.zeros(len(ranked), dtype=bool)
+    mask[order[keep]] = True
+    return mask
+
+@lru_cache(maxsize=256)
+def _optimize_pipe_diameters(flow_rate, fluid_type, temperature, suction_length, discharge_length,
+                             suction_k_total, discharge_k_total, static_head, suction_flooded, hasp,
+                             npsh_required, npsh_safety_margin, materials, suction_dns, discharge_dns,
+                             max_suction_velocity, max_discharge_velocity, min_velocity, pipe_costs,
+                             pump_efficiency, motor_efficiency, operating_hours, electricity_cost,
+                             lifetime_years, discount_rate, friction_mode) -> DiameterOptimizationResult:
+    """Cached lifecycle optimization on hashable (tuple) arguments, see optimize_pipe_diameters"""
+    props = get_fluid_properties(fluid_type, temperature)
+    roughness = get_pipe_roughness_array(list(materials))[:, None]
+    suction_diameter = np.array([DN_TO_DIAMETER[dn] for dn in suction_dns])[None, :]
+    discharge_diameter = np.array([DN_TO_DIAMETER[dn] for dn in discharge_dns])[None, :]
+    
+    # Hydraulique par côté (matériau × DN), puis diffusion matériau × DN asp. × DN ref.
+    suction = compute_pipe_hydraulics(flow_rate, suction_diameter, suction_length, roughness,
+                                      props.density, props.viscosity, suction_k_total, friction_mode)
+    discharge = compute_pipe_hydraulics(flow_rate, discharge_diameter, discharge_length, roughness,
+                                        props.density, props.viscosity, discharge_k_total, friction_mode)
+    total_head_loss = suction["total_head_loss"][:, :, None] + discharge["total_head_loss"][:, None, :]
+    total_head = static_head + total_head_loss
+    npsh_margin = np.broadcast_to(
+        compute_npshd_array(suction_flooded, hasp, suction["total_head_loss"], props.density, props.vapor_pressure)[:, :, None]
+        - npsh_required, total_head.shape
+    )
+    
+    # Investissement: coût posé par mètre ∝ DN^exposant
+    costs = dict(pipe_costs)
+    unit_cost = np.array([costs[material] for material in materials])[:, None]
+    suction_cost = unit_cost * (np.array(suction_dns) / PIPE_COST_REFERENCE_DN) ** PIPE_COST_DIAMETER_EXPONENT * suction_length
+    discharge_cost = unit_cost * (np.array(discharge_dns) / PIPE_COST_REFERENCE_DN) ** PIPE_COST_DIAMETER_EXPONENT * discharge_length
+    capital_cost = suction_cost[:, :, None] + discharge_cost[:, None, :]
+    
+    # Énergie: P = ρ·g·Q·H / (η_pompe·η_moteur), actualisée sur la durée de vie
+    power_kw = (props.density * 9.81 * (flow_rate / 3600) * total_head
+                / ((pump_efficiency / 100) * (motor_efficiency / 100)) / 1000)
+    annual_energy_cost = power_kw * operating_hours * electricity_cost
+    factor = annuity_factor(discount_rate, lifetime_years)
+    lifetime_energy_cost = annual_energy_cost * factor
+    lifecycle_cost = capital_cost + lifetime_energy_cost
+    
+    suction_velocity = np.broadcast_to(suction["velocity"][:, :, None], total_head.shape)
+    discharge_velocity = np.broadcast_to(discharge["velocity"][:, None, :], total_head.shape)
+    feasible = ((suction_velocity <= max_suction_velocity) & (suction_velocity >= min_velocity)
+                & (discharge_velocity <= max_discharge_velocity) & (discharge_velocity >= min_velocity)
+                & (npsh_margin >= npsh_safety_margin))
+    
+    candidates = np.flatnonzero(feasible)
+    front = candidates[pareto_front_mask(np.column_stack((
+        capital_cost.ravel()[candidates], lifetime_energy_cost.ravel()[candidates], -npsh_margin.ravel()[candidates]
+    )))] if candidates.size else candidates
+    front = front[np.argsort(capital_cost.ravel()[front], kind="stable")]
+    
+    def option(flat_index):
+        material_index, suction_index, discharge_index = np.unravel_index(flat_index, total_head.shape)
+        return DiameterOption(
+            material=materials[material_index],
+            suction_dn=suction_dns[suction_index],
+            discharge_dn=discharge_dns[discharge_index],
+            suction_velocity=float(suction_velocity.flat[flat_index]),
+            discharge_velocity=float(discharge_velocity.flat[flat_index]),
+            total_head_loss=float(total_head_loss.flat[flat_index]),
+            total_head=float(total_head.flat[flat_index]),
+            npsh_margin=float(npsh_margin.flat[flat_index]),
+            capital_cost=float(capital_cost.flat[flat_index]),
+            annual_energy_cost=float(annual_energy_cost.flat[flat_index]),
+            lifetime_energy_cost=float(lifetime_energy_cost.flat[flat_index]),
+            lifecycle_cost=float(lifecycle_cost.flat[flat_index])
+        )
+    
+    return DiameterOptimizationResult(
+        pareto_front=[option(index) for index in front],
+        best_lifecycle=option(candidates[np.argmin(lifecycle_cost.ravel()[candidates])]) if candidates.size else None,
+        evaluated=int(total_head.size),
+        feasible=int(candidates.size),
+        annuity_factor=factor
+    )
+
+def optimize_pipe_diameters(input_data: DiameterOptimizationInput) -> DiameterOptimizationResult:
+    """Front de Pareto investissement / énergie actualisée / marge NPSH des combinaisons de DN"""
+    validate_friction_factor_mode(input_data.friction_factor_mode)
+    if input_data.flow_rate <= 0:
+        raise ValueError("Le débit doit être positif")
+    pipe_costs = dict(PIPE_INSTALLED_COSTS)
+    pipe_costs.update(input_data.pipe_costs or {})
+    if input_data.lifetime_years <= 0:
+        raise ValueError(f"Durée de vie invalide: {input_data.lifetime_years} ans (doit être positive)")
+    # None = valeur par défaut (tout le catalogue); une liste vide est une erreur de saisie
+    for name, values in (("materials", input_data.materials), ("suction_dns", input_data.suction_dns),
+                         ("discharge_dns", input_data.discharge_dns)):
+        if values is not None and not values:
+            raise ValueError(f"La liste {name} ne peut pas être vide (omettre le champ pour tout le catalogue)")
+    materials = tuple(PIPE_MATERIALS.keys() if input_data.materials is None else input_data.materials)
+    for material in materials:
+        if material not in PIPE_MATERIALS or material not in pipe_costs:
+            raise ValueError(f"Matériau de conduite inconnu ou sans coût: {material}")
+    suction_dns = tuple(sorted(set(DN_SORTED if input_data.suction_dns is None else input_data.suction_dns)))
+    discharge_dns = tuple(sorted(set(DN_SORTED if input_data.discharge_dns is None else input_data.discharge_dns)))
+    for dn in suction_dns + discharge_dns:
+        if dn not in DN_TO_DIAMETER:
+            raise ValueError(f"DN non normalisé: DN{dn}")
+    
+    return _optimize_pipe_diameters(
+        input_data.flow_rate, input_data.fluid_type, input_data.temperature,
+        input_data.suction_length, input_data.discharge_length,
+        calculate_fittings_k_total(input_data.suction_fittings), calculate_fittings_k_total(input_data.discharge_fittings),
+        input_data.static_head, input_data.suction_type == "flooded", input_data.hasp,
+        input_data.npsh_required, input_data.npsh_safety_margin, materials, suction_dns, discharge_dns,
+        input_data.max_suction_velocity, input_data.max_discharge_velocity, input_data.min_velocity,
+        tuple(sorted(pipe_costs.items())), input_data.pump_efficiency, input_data.motor_efficiency,
+        input_data.operating_hours, input_data.electricity_cost, input_data.lifetime_years,
+        input_data.discount_rate, input_data.friction_factor_mode
+    )
+
+def calculate_performance_analysis(input_data: PerformanceAnalysisInput,
+                                   compatibility_analysis: Optional[Dict[str, Any]] = None,
+                                   performance_curves: Optional[Dict[str, Any]] = None,
+                                   graph: Optional[ComputationGraph] = None) -> PerformanceAnalysisResult:
+    """Performance analysis calculation for Tab 3 with corrected power formulas"""
+    warnings = []
+    recommendations = []
+    alerts = []
+    
+    # Calculate velocity and Reynolds number
+    diameter_m = input_data.pipe_diameter / 1000  # Convert mm to m
+    pipe_area = math.pi * (diameter_m / 2) ** 2  # m²
+    velocity = (input_data.flow_rate / 3600) / pipe_area  # m/s
+    
+    # Get fluid properties
+    fluid_props = get_fluid_properties(input_data.fluid_type, 20)  # Default temperature
+    reynolds_number = calculate_reynolds_number(velocity, diameter_m, fluid_props.density, fluid_props.viscosity)
+    
+    # Power calculations using the corrected formulas
+    if input_data.hydraulic_power:
+        # Use provided hydraulic power
+        hydraulic_power = input_data.hydraulic_power
+    else:
+        # Calculate hydraulic power using the corrected formula:
+        # P2 = ((débit × HMT) / (rendement pompe × 367)) * 100
+        hydraulic_power = ((input_data.flow_rate * input_data.hmt) / (input_data.pump_efficiency * 367)) * 100
+    
+    if input_data.absorbed_power:
+        # Use provided absorbed power
+        absorbed_power = input_data.absorbed_power
+        # Calculate actual motor efficiency
+        actual_motor_efficiency = (hydraulic_power / absorbed_power) * 100
+    else:
+        # Calculate absorbed power using the corrected formula:
+        # P1 = P2 / (rendement moteur / 100)
+        absorbed_power = hydraulic_power / (input_data.motor_efficiency / 100)
+        actual_motor_efficiency = input_data.motor_efficiency
+    
+    # Overall efficiency: Rendement Global = Rendement Moteur × Rendement Pompe
+    overall_efficiency = (actual_motor_efficiency / 100) * (input_data.pump_efficiency / 100) * 100
+    
+    # Electrical calculations adapted for starting method
+    if input_data.voltage == 230:
+        # Single phase
+        nominal_current = (absorbed_power * 1000) / (input_data.voltage * input_data.power_factor)
+        if input_data.starting_method == "direct_on_line":
+            starting_current = nominal_current * 7.0
+        else:  # star_delta
+            starting_current = nominal_current * 2.0
+    else:
+        # Three phase
+        nominal_current = (absorbed_power * 1000) / (input_data.voltage * 1.732 * input_data.power_factor)
+        if input_data.starting_method == "direct_on_line":
+            starting_current = nominal_current * 6.0
+        else:  # star_delta
+            starting_current = nominal_current * 2.0
+    
+    # Cable section calculation
+    if input_data.cable_section:
+        recommended_cable_section = input_data.cable_section
+    else:
+        # Basic cable sizing
+        if input_data.voltage == 230:
+            current_density = 6  # A/mm²
+        else:
+            current_density = 8  # A/mm²
+        
+        base_section = nominal_current / current_density
+        length_factor = 1 + (input_data.cable_length / 100) * 0.2
+        required_section = base_section * length_factor
+        
+        # Round to standard cable sections
+        standard_sections = [1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300]
+        recommended_cable_section = next((s for s in standard_sections if s >= required_section), 300)
+    
+    # Generate performance curves (débit en fonction de HMT)
+    if performance_curves is None:
+        performance_curves = generate_performance_curves(input_data)
+    
+    # Velocity alerts
+    if velocity > 3.0:
+        alerts.append(f"Vitesse élevée ({velocity:.2f} m/s) - Risque d'érosion")
+        recommendations.append("Considérer un diamètre de tuyauterie plus grand")
+    elif velocity < 0.5:
+        alerts.append(f"Vitesse faible ({velocity:.2f} m/s) - Risque de sédimentation")
+        recommendations.append("Considérer un diamètre de tuyauterie plus petit")
+    
+    # Reynolds number alerts
+    if reynolds_number < 2300:
+        alerts.append("Écoulement laminaire détecté")
+    elif reynolds_number > 4000:
+        alerts.append("Écoulement turbulent détecté")
+    
+    # Warnings and recommendations
+    if overall_efficiency < 60:
+        warnings.append(f"Rendement global faible ({overall_efficiency:.1f}%)")
+        recommendations.append("Vérifier le dimensionnement de la pompe et du moteur")
+    
+    if input_data.pump_efficiency < 70:
+        warnings.append(f"Rendement pompe faible ({input_data.pump_efficiency:.1f}%)")
+        recommendations.append("Considérer une pompe plus efficace")
+    
+    if input_data.motor_efficiency < 85:
+        warnings.append(f"Rendement moteur faible ({input_data.motor_efficiency:.1f}%)")
+        recommendations.append("Considérer un moteur plus efficace")
+    
+    if starting_current > 150:
+        warnings.append(f"Courant de démarrage élevé ({starting_current:.1f} A)")
+        recommendations.append("Considérer un démarreur progressif ou étoile-triangle")
+    
+    if absorbed_power > 100:
+        warnings.append(f"Puissance absorbée élevée ({absorbed_power:.1f} kW)")
+        recommendations.append("Vérifier le dimensionnement du système")
+    
+    # Power formula verification
+    if hydraulic_power > absorbed_power:
+        warnings.append("ERREUR: Puissance hydraulique > puissance absorbée - vérifier les valeurs")
+    
+    # ========================================================================================================
+    # NOUVELLES RECOMMANDATIONS INTELLIGENTES POUR PERFORMANCE
+    # ========================================================================================================
+    
+    # 1. ANALYSE DE COMPATIBILITÉ CHIMIQUE POUR PERFORMANCE
+    fluid_props = get_fluid_properties(input_data.fluid_type, 20)  # Température par défaut
+    if compatibility_analysis is None:
+        compatibility_analysis = analyze_chemical_compatibility(
+            input_data.fluid_type,
+            input_data.pipe_material,
+            input_data.pipe_material,  # Même matériau
+            20  # Température par défaut pour Performance
+        )
+    
+    if compatibility_analysis["recommendations"]:
+        recommendations.append("\n🧪 COMPATIBILITÉ CHIMIQUE PERFORMANCE:")
+        recommendations.extend([f"  {rec}" for rec in compatibility_analysis["recommendations"]])
+    
+    # Alertes de compatibilité critique pour Performance
+    if compatibility_analysis["suction_material_status"] == "incompatible":
+        warnings.append("🚨 INCOMPATIBILITÉ MATÉRIAU-FLUIDE DÉTECTÉE!")
+        recommendations.append(f"\n⚠️ MATÉRIAU INCOMPATIBLE - {PIPE_MATERIALS[input_data.pipe_material]['name']} avec {compatibility_analysis['fluid_name']}")
+    
+    # 2. RECOMMANDATIONS GRADUÉES DIAMÈTRE POUR PERFORMANCE
+    if velocity > 2.5:  # Vitesse excessive pour performance
+        # Calcul de la longueur approximative pour système Performance
+        estimated_pipe_length = input_data.cable_length  # Approximation longueur tuyauterie = longueur câble
+        
+        diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+            input_data.pipe_diameter,
+            input_data.flow_rate,
+            velocity,
+            estimated_pipe_length,
+            is_suction_pipe=False
+        )
+        
+        if diameter_options:
+            recommendations.append("\n🚀 OPTIMISATION DIAMÈTRE PERFORMANCE:")
+            recommendations.extend([f"  {option}" for option in diameter_options])
+    
+    # 3. RECOMMANDATIONS SPÉCIFIQUES PERFORMANCE ÉNERGÉTIQUE
+    if overall_efficiency < 70:
+        recommendations.append("\n⚡ OPTIMISATION ÉNERGÉTIQUE:")
+        efficiency_improvement = 80 - overall_efficiency
+        energy_savings = (efficiency_improvement / overall_efficiency) * 100 if overall_efficiency > 0 else 0
+        recommendations.append(f"  • Amélioration rendement possible: +{efficiency_improvement:.1f}%")
+        recommendations.append(f"  • Économies énergétiques potentielles: -{energy_savings:.0f}% consommation")
+        
+        if input_data.pump_efficiency < 75:
+            recommendations.append(f"  🔧 Pompe: Remplacer par pompe rendement >{input_data.pump_efficiency + 10:.0f}%")
+        if input_data.motor_efficiency < 90:
+            recommendations.append(f"  🔌 Moteur: Remplacer par moteur IE3/IE4 (>{input_data.motor_efficiency + 10:.0f}%)")
+    
+    # 4. RECOMMANDATIONS COÛT D'EXPLOITATION
+    if absorbed_power > 0:
+        # Estimation coûts annuels (basé sur 8h/jour, 250 jours/an, 0.15€/kWh)
+        annual_hours = 8 * 250  # 2000h/an
+        energy_cost_per_kwh = 0.15  # €/kWh
+        annual_cost = absorbed_power * annual_hours * energy_cost_per_kwh
+        
+        if annual_cost > 5000:  # Plus de 5000€/an
+            recommendations.append(f"\n💰 IMPACT ÉCONOMIQUE:")
+            recommendations.append(f"  • Coût énergétique annuel estimé: {annual_cost:.0f}€")
+            
+            # Calculer économies potentielles avec amélioration rendement
+            if overall_efficiency < 75:
+                improved_efficiency = 80  # Cible rendement
+                improved_power = absorbed_power * (overall_efficiency / improved_efficiency)
+                annual_savings = (absorbed_power - improved_power) * annual_hours * energy_cost_per_kwh
+                payback_period = 15000 / annual_savings if annual_savings > 0 else float('inf')  # Investissement approximatif
+                
+                recommendations.append(f"  • Économies potentielles avec optimisation: {annual_savings:.0f}€/an")
+                if payback_period < 5:
+                    recommendations.append(f"  • Retour sur investissement estimé: {payback_period:.1f} ans")
+    
+    return PerformanceAnalysisResult(
+        input_data=input_data,
+        pump_efficiency=input_data.pump_efficiency,
+        motor_efficiency=actual_motor_efficiency,
+        overall_efficiency=overall_efficiency,
+        velocity=velocity,
+        reynolds_number=reynolds_number,
+        nominal_current=nominal_current,
+        starting_current=starting_current,
+        recommended_cable_section=recommended_cable_section,
+        power_calculations={
+            "hydraulic_power": hydraulic_power,
+            "absorbed_power": absorbed_power,
+            "overall_efficiency": overall_efficiency
+        },
+        electrical_data={
+            "voltage": input_data.voltage,
+            "power_factor": input_data.power_factor,
+            "starting_method": input_data.starting_method,
+            "cable_length": input_data.cable_length,
+            "cable_material": getattr(input_data, 'cable_material', 'copper')
+        },
+        performance_curves=performance_curves,
+        recommendations=recommendations,
+        warnings=warnings,
+        alerts=alerts
+    )
+
+def organize_expert_recommendations_intelligently(expert_recommendations, npshd_result, hmt_result, perf_result, compatibility_analysis, overall_efficiency, annual_energy_cost, input_data, graph=None):
+    """
+    Organise intelligemment les recommandations expertes en éliminant les doublons,
+    en priorisant par criticité et en regroupant par thématiques
+    """
+    
+    # Structure organisée finale
+    organized_recommendations = {
+        "critical_safety": [],      # Priorité 1: Sécurité/Cavitation/Incompatibilité
+        "hydraulic_optimization": [],  # Priorité 2: Optimisation hydraulique
+        "energy_efficiency": [],    # Priorité 3: Efficacité énergétique  
+        "installation_guidance": [], # Priorité 4: Guidance installation
+        "maintenance_prevention": [] # Priorité 5: Maintenance préventive
+    }
+    
+    # Suivre les sujets déjà traités pour éviter doublons
+    treated_topics = {
+        "cavitation": False,
+        "diameter_optimization": False,
+        "chemical_compatibility": False,
+        "energy_optimization": False,
+        "installation_complexity": False
+    }
+    
+    # 1. RECOMMANDATIONS CRITIQUES DE SÉCURITÉ (Priorité absolue)
+    
+    # Cavitation critique (une seule recommandation consolidée)
+    if npshd_result.cavitation_risk and not treated_topics["cavitation"]:
+        # Consolider toutes les recommandations de cavitation
+        cavitation_solutions = []
+        
+        # Recommandations graduées de diamètre pour cavitation
+        if npshd_result.velocity > 1.5:
+            diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                float(getattr(npshd_result.input_data, 'pipe_diameter', 100.0)),
+                npshd_result.input_data.flow_rate,
+                npshd_result.velocity,
+                float(getattr(npshd_result.input_data, 'pipe_length', 50.0)),
+                is_suction_pipe=True
+            )
+            if diameter_options and len(diameter_options) > 1:
+                cavitation_solutions.extend([
+                    "🔧 OPTIMISATION DIAMÈTRE ASPIRATION - Options anti-cavitation:"
+                ])
+                cavitation_solutions.extend([f"  {opt}" for opt in diameter_options[1:3]])  # 2 meilleures options
+        
+        # Autres solutions de cavitation
+        hasp = abs(getattr(npshd_result.input_data, 'hasp', 3.0))
+        cavitation_solutions.extend([
+            f"📏 Réduire hauteur aspiration: {hasp:.1f}m → {max(0.5, hasp - 2):.1f}m",
+            "⚡ Installer pompe en charge (sous niveau fluide)",
+            "🌡️ Augmenter température fluide (si possible)", 
+            "🔧 Supprimer singularités aspiration non essentielles"
+        ])
+        
+        organized_recommendations["critical_safety"].append({
+            "type": "critical",
+            "priority": 1,
+            "title": "🚨 CAVITATION CRITIQUE - ARRÊT IMMÉDIAT REQUIS",
+            "description": f"NPSHd ({npshd_result.npshd:.2f}m) ≤ NPSHr ({npshd_result.npsh_required:.2f}m) - Destruction pompe imminente",
+            "impact": "DESTRUCTION POMPE, ARRÊT PRODUCTION, RÉPARATIONS COÛTEUSES",
+            "solutions": cavitation_solutions,
+            "urgency": "IMMÉDIATE - 24H MAX",
+            "cost_impact": "TRÈS ÉLEVÉ (>50k€ potentiel)"
+        })
+        treated_topics["cavitation"] = True
+    
+    # Incompatibilité chimique critique  
+    if (compatibility_analysis["suction_material_status"] == "incompatible" or 
+        compatibility_analysis["discharge_material_status"] == "incompatible") and not treated_topics["chemical_compatibility"]:
+        
+        organized_recommendations["critical_safety"].append({
+            "type": "critical", 
+            "priority": 1,
+            "title": "🧪 INCOMPATIBILITÉ CHIMIQUE CRITIQUE",
+            "description": f"Matériaux incompatibles avec {compatibility_analysis['fluid_name']} - Corrosion/contamination active",
+            "impact": "CONTAMINATION FLUIDE, DÉGRADATION ACCÉLÉRÉE, NON-CONFORMITÉ",
+            "solutions": compatibility_analysis["recommendations"][:4] + [
+                "🔬 Analyse matériaux urgente recommandée",
+                "⚖️ Vérification conformité réglementaire"
+            ],
+            "urgency": "IMMÉDIATE - 48H MAX", 
+            "cost_impact": "ÉLEVÉ (changement matériaux)"
+        })
+        treated_topics["chemical_compatibility"] = True
+    
+    # 2. OPTIMISATION HYDRAULIQUE (Regroupement intelligent)
+    
+    hydraulic_solutions = []
+    hydraulic_impact_desc = []
+    
+    # Optimisation diamètres (consolidée aspiration + refoulement)
+    if ((npshd_result.velocity > 1.5) or 
+        (hmt_result.suction_velocity and hmt_result.suction_velocity > 1.5) or 
+        (hmt_result.discharge_velocity > 2.5)) and not treated_topics["diameter_optimization"]:
+        
+        # Aspiration si nécessaire
+        if npshd_result.velocity > 1.5 or (hmt_result.suction_velocity and hmt_result.suction_velocity > 1.5):
+            suction_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                float(getattr(npshd_result.input_data, 'pipe_diameter', 100.0)),
+                npshd_result.input_data.flow_rate,
+                npshd_result.velocity,
+                float(getattr(npshd_result.input_data, 'pipe_length', 50.0)),
+                is_suction_pipe=True
+            )
+            if suction_options and len(suction_options) > 1:
+                hydraulic_solutions.append("💧 ASPIRATION - Options graduées:")
+                hydraulic_solutions.extend([f"  {opt}" for opt in suction_options[1:3]])
+        
+        # Refoulement si nécessaire  
+        if hmt_result.discharge_velocity > 2.5:
+            discharge_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                getattr(hmt_result.input_data, 'discharge_pipe_diameter', 80.0),
+                hmt_result.input_data.flow_rate,
+                hmt_result.discharge_velocity, 
+                getattr(hmt_result.input_data, 'discharge_pipe_length', 50.0),
+                is_suction_pipe=False
+            )
+            if discharge_options and len(discharge_options) > 1:
+                hydraulic_solutions.append("🚀 REFOULEMENT - Options graduées:")
+                hydraulic_solutions.extend([f"  {opt}" for opt in discharge_options[1:3]])
+        
+        hydraulic_impact_desc.append("Réduction pertes de charge, amélioration NPSHd")
+        treated_topics["diameter_optimization"] = True
+    
+    # Pertes de charge excessives
+    if hmt_result.total_head_loss > hmt_result.hmt * 0.25:  # >25% du HMT
+        hydraulic_solutions.extend([
+            f"⚠️ Pertes élevées: {hmt_result.total_head_loss:.1f}m ({(hmt_result.total_head_loss/hmt_result.hmt)*100:.0f}% HMT)",
+            "🔧 Simplifier tracé hydraulique (moins coudes)",
+            "📏 Réduire longueurs si possible"
+        ])
+        hydraulic_impact_desc.append("Réduction consommation énergétique")
+    
+    if hydraulic_solutions:
+        organized_recommendations["hydraulic_optimization"].append({
+            "type": "hydraulic",
+            "priority": 2,
+            "title": "💧 OPTIMISATION HYDRAULIQUE SYSTÈME",
+            "description": "Amélioration performances hydrauliques et réduction pertes",
+            "impact": ", ".join(hydraulic_impact_desc),
+            "solutions": hydraulic_solutions[:8],  # Max 8 solutions
+            "urgency": "ÉLEVÉE",
+            "cost_impact": "MOYEN (ROI < 2 ans)"
+        })
+    
+    # 3. EFFICACITÉ ÉNERGÉTIQUE (Consolidée)
+    
+    if ((overall_efficiency < 70 or annual_energy_cost > 3000) and not treated_topics["energy_optimization"]):
+        energy_solutions = []
+        
+        # Amélioration rendements
+        if overall_efficiency < 70:
+            energy_improvement = 75 - overall_efficiency  
+            annual_savings = (energy_improvement / overall_efficiency) * annual_energy_cost if overall_efficiency > 0 else 0
+            energy_solutions.extend([
+                f"📈 Rendement actuel: {overall_efficiency:.0f}% → Cible: 75% (+{energy_improvement:.0f}%)",
+                f"💰 Économies potentielles: {annual_savings:.0f}€/an"
+            ])
+        
+        # Recommandations équipements
+        if perf_result.pump_efficiency < 75:
+            energy_solutions.append(f"🔧 Pompe: Remplacer par rendement >75% (actuel: {perf_result.pump_efficiency:.0f}%)")
+        if perf_result.motor_efficiency < 90:
+            energy_solutions.append(f"⚡ Moteur: IE3/IE4 >90% (actuel: {perf_result.motor_efficiency:.0f}%)")
+        
+        # ROI si coût élevé
+        if annual_energy_cost > 5000:
+            payback = 15000 / (annual_energy_cost * 0.15) if annual_energy_cost > 0 else 10  # Estimation investissement
+            energy_solutions.append(f"📊 ROI estimé: {payback:.1f} ans")
+        
+        organized_recommendations["energy_efficiency"].append({
+            "type": "energy",
+            "priority": 2,
+            "title": "⚡ OPTIMISATION ÉNERGÉTIQUE MAJEURE",
+            "description": f"Coût énergétique: {annual_energy_cost:.0f}€/an - Potentiel d'économies important",
+            "impact": "Réduction facture électrique, conformité environnementale",
+            "solutions": energy_solutions,
+            "urgency": "MODÉRÉE",
+            "cost_impact": "INVESTISSEMENT RENTABLE"
+        })
+        treated_topics["energy_optimization"] = True
+    
+    # 4. COMPATIBILITÉ CHIMIQUE DÉTAILLÉE (préserver le contenu expert)
+    if not treated_topics["chemical_compatibility"]:
+        # Utiliser TOUTES les analyses détaillées existantes, pas seulement un résumé
+        
+        # Compatibilité critique avec analyse complète
+        if (compatibility_analysis["suction_material_status"] == "incompatible" or 
+            compatibility_analysis["discharge_material_status"] == "incompatible"):
+            # Déjà traité dans critical_safety, ne pas répéter
+            pass
+        else:
+            # Compatibilité normale mais avec analyses détaillées préservées
+            chemical_solutions = []
+            
+            # Préserver toutes les recommandations détaillées d'origine
+            if compatibility_analysis["recommendations"]:
+                chemical_solutions.extend(compatibility_analysis["recommendations"])
+            
+            # Ajouter les analyses hydrauliques spécifiques au fluide
+            if compatibility_analysis["hydraulic_advice"]:
+                chemical_solutions.append("💧 CONSEILS HYDRAULIQUES SPÉCIALISÉS:")
+                chemical_solutions.extend([f"  {advice}" for advice in compatibility_analysis["hydraulic_advice"]])
+            
+            # Préserver les recommandations de joints détaillées
+            if compatibility_analysis["seal_recommendations"]:
+                chemical_solutions.append("🔧 SPÉCIFICATIONS JOINTS ET ÉTANCHÉITÉ:")
+                chemical_solutions.extend([f"  {seal}" for seal in compatibility_analysis["seal_recommendations"]])
+            
+            # Ajouter équipements spécialisés selon le fluide
+            fluid_equipment_recommendations = get_specialized_equipment_recommendations(input_data.fluid_type, input_data.temperature)
+            if fluid_equipment_recommendations:
+                chemical_solutions.append("⚙️ ÉQUIPEMENTS SPÉCIALISÉS REQUIS:")
+                chemical_solutions.extend([f"  {equip}" for equip in fluid_equipment_recommendations])
+            
+            if chemical_solutions:
+                organized_recommendations["installation_guidance"].append({
+                    "type": "compatibility",
+                    "priority": 3, 
+                    "title": f"🧪 ANALYSE CHIMIQUE COMPLÈTE - {compatibility_analysis['fluid_name']}",
+                    "description": f"Analyse détaillée compatibilité {compatibility_analysis['fluid_name']} avec matériaux sélectionnés",
+                    "impact": "Durée de vie maximale, conformité réglementaire, sécurité process",
+                    "solutions": chemical_solutions,
+                    "urgency": "MODÉRÉE",
+                    "cost_impact": "FAIBLE À MOYEN"
+                })
+        
+        treated_topics["chemical_compatibility"] = True
+    
+    # 5. RECOMMANDATIONS D'INSTALLATION ET ÉQUIPEMENTS (nouveau - préserver le contenu expert)
+    
+    installation_solutions = []
+    
+    # Équipements de sécurité selon fluide
+    safety_equipment = get_safety_equipment_recommendations(input_data.fluid_type)
+    if safety_equipment:
+        installation_solutions.append("🛡️ ÉQUIPEMENTS SÉCURITÉ OBLIGATOIRES:")
+        installation_solutions.extend([f"  {equip}" for equip in safety_equipment])
+    
+    # Équipements d'optimisation hydraulique
+    hydraulic_equipment = get_hydraulic_equipment_recommendations(npshd_result, hmt_result, overall_efficiency)
+    if hydraulic_equipment:
+        installation_solutions.append("🔧 ÉQUIPEMENTS OPTIMISATION:")
+        installation_solutions.extend([f"  {equip}" for equip in hydraulic_equipment])
+    
+    # Singularités à supprimer ou ajouter
+    singularity_recommendations = get_singularity_recommendations(npshd_result, hmt_result)
+    if singularity_recommendations:
+        installation_solutions.append("⚙️ MODIFICATION INSTALLATION:")
+        installation_solutions.extend([f"  {sing}" for sing in singularity_recommendations])
+    
+    # Instrumentation et contrôle
+    control_equipment = get_control_equipment_recommendations(input_data.fluid_type, annual_energy_cost, overall_efficiency)
+    if control_equipment:
+        installation_solutions.append("📊 INSTRUMENTATION RECOMMANDÉE:")
+        installation_solutions.extend([f"  {ctrl}" for ctrl in control_equipment])
+    
+    if installation_solutions:
+        organized_recommendations["installation_guidance"].append({
+            "type": "installation",
+            "priority": 4,
+            "title": "🏗️ RECOMMANDATIONS INSTALLATION & ÉQUIPEMENTS",
+            "description": "Équipements et modifications d'installation pour performance optimale",
+            "impact": "Fiabilité système, facilité maintenance, sécurité opérateur",
+            "solutions": installation_solutions,
+            "urgency": "MODÉRÉE",
+            "cost_impact": "VARIABLE SELON ÉQUIPEMENTS"
+        })
+    
+    # Convertir en format liste finale priorisée
+    final_recommendations = []
+    
+    # Ordre de priorité
+    for category in ["critical_safety", "hydraulic_optimization", "energy_efficiency", "installation_guidance", "maintenance_prevention"]:
+        final_recommendations.extend(organized_recommendations[category])
+    
+    # Limiter à 10 recommandations max (augmenté pour le contenu détaillé)
+    return final_recommendations[:10]
+
+def get_specialized_equipment_recommendations(fluid_type, temperature):
+    """Retourne les équipements spécialisés requis selon le fluide"""
+    equipment = []
+    
+    if fluid_type in ["acid", "base"]:
+        equipment.extend([
+            "🚿 Douche de décontamination d'urgence (EN 15154)",
+            "👁️ Lave-œil d'urgence (< 10m du poste)",
+            "📞 Système d'alarme chimique",
+            "🌡️ Sonde pH en continu si T>50°C",
+            "💨 Ventilation forcée (20 vol/h min)"
+        ])
+    
+    elif fluid_type in ["gasoline", "diesel"]:
+        equipment.extend([
+            "⚡ Équipements ATEX Zone 1 (moteur antidéflagrant)",
+            "🔥 Détecteur vapeurs hydrocarbures", 
+            "⚡ Mise à la terre obligatoire (< 10Ω)",
+            "🌪️ Récupérateur vapeurs en bout de ligne",
+            "🔧 Soupape de sécurité tarage 1.1x pression service"
+        ])
+    
+    elif fluid_type in ["milk", "wine", "honey", "fruit_juice"]:
+        equipment.extend([
+            "🧽 Raccords démontables pour nettoyage CIP",
+            "🌡️ Purgeur manuel points hauts (éviter stagnation)",
+            "🔄 Vanne échantillonnage contrôle qualité",
+            "📊 Débitmètre magnétique (pas d'obstruction)",
+            "🌡️ Compensation température si T variable"
+        ])
+    
+    elif fluid_type == "seawater":
+        equipment.extend([
+            "⚗️ Anode sacrificielle magnésium (renouvellement annuel)",
+            "🔬 Analyseur chlore résiduel en continu",
+            "🌊 Filtre 100µm avant pompe (protection particules)",
+            "💧 Purge manuelle dessalage (maintenance)"
+        ])
+    
+    return equipment
+
+def get_safety_equipment_recommendations(fluid_type):
+    """Retourne les équipements de sécurité obligatoires selon le fluide"""
+    safety = []
+    
+    if fluid_type in ["acid", "base"]:
+        safety.extend([
+            "EPI: Combinaison chimique + gants nitrile + lunettes étanches",
+            "Neutralisant d'urgence (calcaire si acide, acide si base)",
+            "Kit anti-pollution (absorbants chimiques)"
+        ])
+    elif fluid_type in ["gasoline", "diesel"]:
+        safety.extend([
+            "Extincteur CO2 ou poudre BC (pas d'eau !)",
+            "Détecteur portable vapeurs (LEL/LIE)",
+            "Kit anti-pollution hydrocarbures"
+        ])
+    elif fluid_type == "seawater":
+        safety.extend([
+            "Protection cathodique si présence autres métaux",
+            "Rinçage eau douce après arrêt prolongé"
+        ])
+    
+    return safety
+
+def get_hydraulic_equipment_recommendations(npshd_result, hmt_result, overall_efficiency):
+    """Retourne les équipements d'optimisation hydraulique"""
+    equipment = []
+    
+    # Variateur si efficacité faible
+    if overall_efficiency < 70:
+        equipment.append("🔧 Variateur de vitesse (économie 20-40% si débit variable)")
+    
+    # Surpresseur si HMT très élevée
+    if hmt_result.hmt > 100:
+        equipment.append("📈 Pompe surpresseur étagée (> 100m HMT)")
+    
+    # Réservoir d'aspiration si NPSH critique
+    if npshd_result.cavitation_risk:
+        equipment.extend([
+            "🏗️ Bâche d'aspiration (amélioration NPSH)",
+            "🌪️ Dégazeur si fluide aéré"
+        ])
+    
+    return equipment
+
+def get_singularity_recommendations(npshd_result, hmt_result):
+    """Retourne les modifications de singularités"""
+    modifications = []
+    
+    if npshd_result.velocity > 2.0:
+        modifications.extend([
+            "❌ SUPPRIMER: Coudes 90° non essentiels (remplacer par courbes)",
+            "❌ SUPPRIMER: Vannes d'isolement redondantes aspiration",
+            "✅ AJOUTER: Crépine large maillage (éviter obstruction)"
+        ])
+    
+    if hmt_result.discharge_velocity > 3.0:
+        modifications.extend([
+            "✅ AJOUTER: Clapet anti-retour à battant (pas à bille)",
+            "✅ AJOUTER: Compensateur de dilatation si L>50m"
+        ])
+    
+    return modifications
+
+def get_control_equipment_recommendations(fluid_type, annual_energy_cost, overall_efficiency):
+    """Retourne l'instrumentation recommandée"""
+    control = []
+    
+    # Instrumentation énergétique si coût élevé
+    if annual_energy_cost > 5000:
+        control.extend([
+            "📊 Wattmètre permanent (suivi consommation)",
+            "📈 Enregistreur débit/pression (optimisation)"
+        ])
+    
+    # Instrumentation process selon fluide
+    if fluid_type in ["acid", "base"]:
+        control.append("🧪 pH-mètre continu (alarme haut/bas)")
+    elif fluid_type in ["milk", "wine"]:
+        control.append("🌡️ Thermomètre contact alimentaire")
+    
+    return control
+
+# ============================================================================
+# EXPERT ANALYSIS PIPELINE
+# ============================================================================
+# L'analyse expert est décrite comme un graphe d'étapes nommées (EXPERT_ANALYSIS_STAGES),
+# évaluées à la demande et une seule fois par requête: la compatibilité chimique, les
+# courbes de performance et les recommandations de diamètre sont partagées entre les
+# calculs NPSHd, HMT, performance et l'organisation des recommandations.
+
+def build_expert_fittings(input_data: ExpertAnalysisInput) -> Dict[str, List[Dict[str, Any]]]:
+    """Construit les raccords aspiration / refoulement à partir des compteurs de singularités"""
+    # Construction des raccords ASPIRATION
+    suction_fittings = []
+    
+    # Coudes
+    if input_data.suction_elbow_90 > 0:
+        suction_fittings.append({"fitting_type": "elbow_90", "quantity": input_data.suction_elbow_90})
+    if input_data.suction_elbow_45 > 0:
+        suction_fittings.append({"fitting_type": "elbow_45", "quantity": input_data.suction_elbow_45})
+    if input_data.suction_elbow_30 > 0:
+        suction_fittings.append({"fitting_type": "elbow_30", "quantity": input_data.suction_elbow_30})
+    
+    # Tés
+    if input_data.suction_tee_flow > 0:
+        suction_fittings.append({"fitting_type": "tee_flow", "quantity": input_data.suction_tee_flow})
+    if input_data.suction_tee_branch > 0:
+        suction_fittings.append({"fitting_type": "tee_branch", "quantity": input_data.suction_tee_branch})
+    
+    # Réductions
+    if input_data.suction_reducer_gradual > 0:
+        suction_fittings.append({"fitting_type": "reducer_gradual", "quantity": input_data.suction_reducer_gradual})
+    if input_data.suction_reducer_sudden > 0:
+        suction_fittings.append({"fitting_type": "reducer_sudden", "quantity": input_data.suction_reducer_sudden})
+    
+    # Vannes
+    if input_data.suction_gate_valve > 0:
+        suction_fittings.append({"fitting_type": "gate_valve", "quantity": input_data.suction_gate_valve})
+    if input_data.suction_globe_valve > 0:
+        suction_fittings.append({"fitting_type": "globe_valve", "quantity": input_data.suction_globe_valve})
+    if input_data.suction_ball_valve > 0:
+        suction_fittings.append({"fitting_type": "ball_valve", "quantity": input_data.suction_ball_valve})
+    if input_data.suction_butterfly_valve > 0:
+        suction_fittings.append({"fitting_type": "butterfly_valve", "quantity": input_data.suction_butterfly_valve})
+    
+    # Accessoires
+    if input_data.suction_check_valve > 0:
+        suction_fittings.append({"fitting_type": "check_valve", "quantity": input_data.suction_check_valve})
+    if input_data.suction_strainer > 0:
+        suction_fittings.append({"fitting_type": "strainer", "quantity": input_data.suction_strainer})
+    if input_data.suction_foot_valve > 0:
+        suction_fittings.append({"fitting_type": "foot_valve", "quantity": input_data.suction_foot_valve})
+    
+    # Construction des raccords REFOULEMENT
+    discharge_fittings = []
+    
+    # Coudes
+    if input_data.discharge_elbow_90 > 0:
+        discharge_fittings.append({"fitting_type": "elbow_90", "quantity": input_data.discharge_elbow_90})
+    if input_data.discharge_elbow_45 > 0:
+        discharge_fittings.append({"fitting_type": "elbow_45", "quantity": input_data.discharge_elbow_45})
+    if input_data.discharge_elbow_30 > 0:
+        discharge_fittings.append({"fitting_type": "elbow_30", "quantity": input_data.discharge_elbow_30})
+    
+    # Tés
+    if input_data.discharge_tee_flow > 0:
+        discharge_fittings.append({"fitting_type": "tee_flow", "quantity": input_data.discharge_tee_flow})
+    if input_data.discharge_tee_branch > 0:
+        discharge_fittings.append({"fitting_type": "tee_branch", "quantity": input_data.discharge_tee_branch})
+    
+    # Réductions
+    if input_data.discharge_reducer_gradual > 0:
+        discharge_fittings.append({"fitting_type": "reducer_gradual", "quantity": input_data.discharge_reducer_gradual})
+    if input_data.discharge_reducer_sudden > 0:
+        discharge_fittings.append({"fitting_type": "reducer_sudden", "quantity": input_data.discharge_reducer_sudden})
+    
+    # Vannes
+    if input_data.discharge_gate_valve > 0:
+        discharge_fittings.append({"fitting_type": "gate_valve", "quantity": input_data.discharge_gate_valve})
+    if input_data.discharge_globe_valve > 0:
+        discharge_fittings.append({"fitting_type": "globe_valve", "quantity": input_data.discharge_globe_valve})
+    if input_data.discharge_ball_valve > 0:
+        discharge_fittings.append({"fitting_type": "ball_valve", "quantity": input_data.discharge_ball_valve})
+    if input_data.discharge_butterfly_valve > 0:
+        discharge_fittings.append({"fitting_type": "butterfly_valve", "quantity": input_data.discharge_butterfly_valve})
+    
+    # Accessoires
+    if input_data.discharge_check_valve > 0:
+        discharge_fittings.append({"fitting_type": "check_valve", "quantity": input_data.discharge_check_valve})
+    if input_data.discharge_strainer > 0:
+        discharge_fittings.append({"fitting_type": "strainer", "quantity": input_data.discharge_strainer})
+    if input_data.discharge_flow_meter > 0:
+        discharge_fittings.append({"fitting_type": "flow_meter", "quantity": input_data.discharge_flow_meter})
+    if input_data.discharge_pressure_gauge > 0:
+        discharge_fittings.append({"fitting_type": "pressure_gauge", "quantity": input_data.discharge_pressure_gauge})
+    
+    return {"suction": suction_fittings, "discharge": discharge_fittings}
+
+def get_expert_compatibility(graph: ComputationGraph, suction_material: str, discharge_material: str,
+                             temperature: float) -> Dict[str, Any]:
+    """Analyse de compatibilité chimique mémoïsée par (matériaux, température) pour la requête"""
+    return graph.call(
+        "chemical_compatibility", analyze_chemical_compatibility,
+        graph.inputs["input_data"].fluid_type, suction_material, discharge_material, temperature
+    )
+
+def expert_stage_npshd(graph: ComputationGraph) -> NPSHdResult:
+    """Calcul NPSHd"""
+    input_data = graph.inputs["input_data"]
+    fittings = graph.get("fittings")
+    npshd_input = NPSHdCalculationInput(
+        suction_type=input_data.suction_type,
+        hasp=abs(input_data.suction_height),
+        flow_rate=input_data.flow_rate,
+        fluid_type=input_data.fluid_type,
+        temperature=input_data.temperature,
+        pipe_diameter=input_data.suction_pipe_diameter,
+        pipe_material=input_data.suction_material,
+        pipe_length=input_data.suction_length,
+        suction_fittings=[FittingInput(**f) for f in fittings["suction"]],
+        npsh_required=input_data.npsh_required,
+        friction_factor_mode=input_data.friction_factor_mode
+    )
+    compatibility_analysis = get_expert_compatibility(
+        graph, input_data.suction_material, input_data.suction_material, input_data.temperature
+    )
+    return calculate_npshd_enhanced(npshd_input, compatibility_analysis, graph)
+
+def expert_stage_hmt(graph: ComputationGraph) -> HMTResult:
+    """Calcul HMT avec pression utile"""
+    input_data = graph.inputs["input_data"]
+    fittings = graph.get("fittings")
+    hmt_input = HMTCalculationInput(
+        installation_type=input_data.installation_type,
+        suction_type=input_data.suction_type,
+        hasp=abs(input_data.suction_height),
+        discharge_height=input_data.discharge_height,
+        useful_pressure=input_data.useful_pressure,  # Pression utile intégrée
+        suction_pipe_diameter=input_data.suction_pipe_diameter,
+        discharge_pipe_diameter=input_data.discharge_pipe_diameter,
+        suction_pipe_length=input_data.suction_length,
+        discharge_pipe_length=input_data.discharge_length,
+        suction_pipe_material=input_data.suction_material,
+        discharge_pipe_material=input_data.discharge_material,
+        suction_fittings=[FittingInput(**f) for f in fittings["suction"]],
+        discharge_fittings=[FittingInput(**f) for f in fittings["discharge"]],
+        fluid_type=input_data.fluid_type,
+        temperature=input_data.temperature,
+        flow_rate=input_data.flow_rate,
+        friction_factor_mode=input_data.friction_factor_mode
+    )
+    compatibility_analysis = get_expert_compatibility(
+        graph, input_data.suction_material, input_data.discharge_material, input_data.temperature
+    )
+    return calculate_hmt_enhanced(hmt_input, compatibility_analysis, graph)
+
+def expert_stage_performance_input(graph: ComputationGraph) -> PerformanceAnalysisInput:
+    """Entrée de l'analyse de performance (HMT issue de l'étape hmt)"""
+    input_data = graph.inputs["input_data"]
+    return PerformanceAnalysisInput(
+        flow_rate=input_data.flow_rate,
+        hmt=graph.get("hmt").hmt,
+        pipe_diameter=input_data.suction_pipe_diameter,
+        fluid_type=input_data.fluid_type,
+        pipe_material=input_data.suction_material,
+        pump_efficiency=input_data.pump_efficiency,
+        motor_efficiency=input_data.motor_efficiency,
+        starting_method=input_data.starting_method,
+        power_factor=input_data.power_factor,
+        cable_length=input_data.cable_length,
+        cable_material=input_data.cable_material,
+        voltage=input_data.voltage,
+        friction_factor_mode=input_data.friction_factor_mode
+    )
+
+def expert_stage_performance(graph: ComputationGraph) -> PerformanceAnalysisResult:
+    """Calcul Performance (courbes et compatibilité partagées)"""
+    input_data = graph.inputs["input_data"]
+    compatibility_analysis = get_expert_compatibility(
+        graph, input_data.suction_material, input_data.suction_material, 20  # Température par défaut pour Performance
+    )
+    return calculate_performance_analysis(
+        graph.get("performance_input"), compatibility_analysis, graph.get("performance_curves"), graph
+    )
+
+def expert_stage_energy_balance(graph: ComputationGraph) -> Dict[str, Any]:
+    """Analyse globale: rendement, pertes totales, stabilité, consommation et coût énergétique"""
+    input_data = graph.inputs["input_data"]
+    npshd_result = graph.get("npshd")
+    hmt_result = graph.get("hmt")
+    perf_result = graph.get("performance")
+    
+    # Analyse globale
+    overall_efficiency = perf_result.overall_efficiency
+    total_head_loss = npshd_result.total_head_loss + hmt_result.total_head_loss
+    
+    # Stabilité du système
+    system_stability = not npshd_result.cavitation_risk and overall_efficiency > 60
+    
+    # Consommation énergétique (kWh/m³)
+    hydraulic_power = perf_result.power_calculations.get("hydraulic_power", 0)
+    energy_consumption = hydraulic_power / input_data.flow_rate if input_data.flow_rate > 0 else 0
+    
+    # Coût énergétique annuel
+    annual_energy_consumption = hydraulic_power * input_data.operating_hours
+    annual_energy_cost = annual_energy_consumption * input_data.electricity_cost
+    
+    return {
+        "overall_efficiency": overall_efficiency,
+        "total_head_loss": total_head_loss,
+        "system_stability": system_stability,
+        "hydraulic_power": hydraulic_power,
+        "energy_consumption": energy_consumption,
+        "annual_energy_cost": annual_energy_cost
+    }
+
+def expert_stage_recommendations(graph: ComputationGraph) -> Dict[str, Any]:
+    """Recommandations d'expert détaillées et potentiel d'optimisation"""
+    input_data = graph.inputs["input_data"]
+    suction_type = input_data.suction_type
+    hasp = abs(input_data.suction_height)
+    npshd_result = graph.get("npshd")
+    hmt_result = graph.get("hmt")
+    perf_result = graph.get("performance")
+    energy_balance = graph.get("energy_balance")
+    overall_efficiency = energy_balance["overall_efficiency"]
+    total_head_loss = energy_balance["total_head_loss"]
+    annual_energy_cost = energy_balance["annual_energy_cost"]
+    
+    # Recommandations d'expert enrichies
+    expert_recommendations = []
+    
+    # Analyse critique de cavitation
+    if npshd_result.cavitation_risk:
+        # Calculer diamètre optimal pour éviter la cavitation
+        optimal_suction_diameter_cavitation = input_data.suction_pipe_diameter * 1.3
+        current_suction_dn = get_closest_dn(input_data.suction_pipe_diameter)
+        recommended_suction_dn_cavitation = get_closest_dn(optimal_suction_diameter_cavitation)
+        
+        logger.debug(
+            "cavitation_diameters suction_mm=%s suction_dn=%s recommended_mm=%.1f recommended_dn=%s npshd=%.2f npsh_required=%.2f",
+            input_data.suction_pipe_diameter, input_data.suction_dn or current_suction_dn,
+            optimal_suction_diameter_cavitation, recommended_suction_dn_cavitation,
+            npshd_result.npshd, input_data.npsh_required
+        )
+        
+        # Utiliser la valeur DN sélectionnée par l'utilisateur si disponible
+        current_suction_dn_selected = input_data.suction_dn if input_data.suction_dn is not None else get_closest_dn(input_data.suction_pipe_diameter)
+        
+        solutions = [
+            f"Réduire hauteur d'aspiration de {hasp:.1f}m à {max(0, hasp - abs(npshd_result.npsh_margin) - 0.5):.1f}m",
+        ]
+        
+        # NOUVELLES RECOMMANDATIONS GRADUÉES POUR CAVITATION
+        if current_suction_dn_selected < recommended_suction_dn_cavitation:
+            # Utiliser les recommandations graduées pour la cavitation
+            cavitation_diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.suction_pipe_diameter,
+                input_data.flow_rate,
+                npshd_result.velocity,
+                input_data.suction_length,
+                is_suction_pipe=True
+            )
+            
+            if cavitation_diameter_options and len(cavitation_diameter_options) > 1:
+                solutions.append("DIAMÈTRE ASPIRATION - Options graduées anti-cavitation:")
+                # Prendre les 3 meilleures options pour cavitation critique
+                solutions.extend([f"  {option}" for option in cavitation_diameter_options[1:4]])
+            else:
+                # Fallback vers ancienne méthode si pas d'options
+                solutions.append(f"Augmenter diamètre aspiration: DN{current_suction_dn_selected} → DN{recommended_suction_dn_cavitation}")
+        else:
+            solutions.append(f"Diamètre aspiration DN{current_suction_dn_selected} approprié - optimiser autre paramètres")
+            
+        solutions.extend([
+            f"Réduire longueur aspiration de {input_data.suction_length:.0f}m à {input_data.suction_length * 0.7:.0f}m",
+            "Supprimer raccords non essentiels sur aspiration",
+            "Installer pompe en charge si possible",
+            "Augmenter température pour réduire pression vapeur",
+            "Installer pompe plus proche du réservoir"
+        ])
+        
+        expert_recommendations.append({
+            "type": "critical",
+            "priority": 1,
+            "title": "🚨 CAVITATION CRITIQUE",
+            "description": f"NPSHd ({npshd_result.npshd:.2f}m) ≤ NPSH requis ({input_data.npsh_required:.2f}m)",
+            "impact": "DESTRUCTION DE LA POMPE - Arrêt immédiat requis",
+            "solutions": solutions,
+            "urgency": "IMMÉDIATE",
+            "cost_impact": "ÉLEVÉ"
+        })
+    
+    # Recommandations d'installation hydraulique spécifiques
+    installation_recommendations = []
+    
+    # Recommandations selon le type d'aspiration
+    if suction_type == "suction_lift":
+        installation_recommendations.extend([
+            "Configuration aspiration en dépression détectée",
+            "Installer crépine foot valve pour maintenir l'amorçage",
+            "Prévoir système d'amorçage automatique",
+            "Éviter les points hauts sur la ligne d'aspiration",
+            "Installer clapet anti-retour sur aspiration",
+            "Hauteur aspiration maximale: 7m en pratique",
+            "Prévoir purgeur d'air en point haut"
+        ])
+    else:  # flooded
+        installation_recommendations.extend([
+            "Configuration aspiration en charge optimale",
+            "Vanne d'arrêt sur aspiration pour maintenance",
+            "Prévoir by-pass pour continuité de service",
+            "Éviter réduction de section sur aspiration",
+            "Installer manomètre aspiration pour surveillance"
+        ])
+    
+    # Recommandations pour les vitesses d'écoulement
+    velocity_recommendations = []
+    if npshd_result.velocity > 3.0:
+        # Calculer diamètre optimal pour vitesse raisonnable
+        optimal_suction_diameter_velocity = input_data.suction_pipe_diameter * 1.2
+        current_suction_dn_velocity = get_closest_dn(input_data.suction_pipe_diameter)
+        recommended_suction_dn_velocity = get_closest_dn(optimal_suction_diameter_velocity)
+        
+        logger.debug(
+            "suction_velocity_diameters suction_mm=%s suction_dn=%s recommended_mm=%.1f recommended_dn=%s velocity=%.2f",
+            input_data.suction_pipe_diameter, input_data.suction_dn or current_suction_dn_velocity,
+            optimal_suction_diameter_velocity, recommended_suction_dn_velocity, npshd_result.velocity
+        )
+        
+        # Utiliser la valeur DN sélectionnée par l'utilisateur si disponible
+        current_suction_dn_selected = input_data.suction_dn if input_data.suction_dn is not None else get_closest_dn(input_data.suction_pipe_diameter)
+        
+        velocity_solutions = [f"Vitesse aspiration excessive: {npshd_result.velocity:.2f} m/s"]
+        
+        # NOUVELLES RECOMMANDATIONS GRADUÉES POUR OPTIMISATION VITESSES
+        if current_suction_dn_selected < recommended_suction_dn_velocity:
+            # Utiliser les recommandations graduées pour l'optimisation des vitesses
+            velocity_diameter_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.suction_pipe_diameter,
+                input_data.flow_rate,
+                npshd_result.velocity,
+                input_data.suction_length,
+                is_suction_pipe=True
+            )
+            
+            if velocity_diameter_options and len(velocity_diameter_options) > 1:
+                velocity_solutions.append("OPTIMISATION DIAMÈTRE - Options graduées:")
+                # Prendre les 3 meilleures options pour optimisation vitesses
+                velocity_solutions.extend([f"  {option}" for option in velocity_diameter_options[1:4]])
+            else:
+                # Fallback vers ancienne méthode
+                velocity_solutions.append(f"Augmenter diamètre aspiration: DN{current_suction_dn_selected} → DN{recommended_suction_dn_velocity}")
+        else:
+            velocity_solutions.append(f"Diamètre aspiration DN{current_suction_dn_selected} adapté - optimiser tracé")
+            
+        velocity_solutions.extend([
+            "Utiliser courbes à grand rayon (3D minimum)",
+            "Installer supports anti-vibratoires",
+            "Prévoir isolation acoustique"
+        ])
+        
+        velocity_recommendations.extend(velocity_solutions)
+    elif npshd_result.velocity < 0.8:
+        velocity_recommendations.extend([
+            f"Vitesse aspiration faible: {npshd_result.velocity:.2f} m/s",
+            "Risque de sédimentation et dépôts",
+            "Prévoir nettoyage périodique des conduites",
+            "Considérer réduction de diamètre si possible"
+        ])
+    
+    # Recommandations pour les pertes de charge
+    head_loss_recommendations = []
+    if npshd_result.total_head_loss > 5.0:
+        head_loss_recommendations.extend([
+            f"Pertes de charge aspiration élevées: {npshd_result.total_head_loss:.2f} m",
+            "Optimiser tracé hydraulique (éviter coudes)",
+            "Utiliser raccords progressive au lieu de brusques",
+            "Vérifier état intérieur des conduites",
+            "Considérer matériau plus lisse",
+            "Réduire nombre de singularités"
+        ])
+    
+    # Recommandations matériaux selon le fluide - ANALYSE COMPLÈTE DE COMPATIBILITÉ CHIMIQUE
+    material_recommendations = []
+
+    # ===============================================================================================
+    # ANALYSE CRITIQUE APPROFONDIE DU CHOIX MATÉRIAU-FLUIDE - POINT DE VUE EXPERT
+    # ===============================================================================================
+    
+    critical_analysis = []
+    
+    # Analyse critique spécifique selon le fluide pompé
+    if input_data.fluid_type == "acid":
+        critical_analysis.extend([
+            "🧪 CRITIQUE EXPERT - FLUIDE ACIDE:",
+            "❌ ERREUR FRÉQUENTE: Utiliser l'acier standard (catastrophique - corrosion rapide)",
+            "❌ SOUS-ESTIMATION: PVC standard insuffisant pour acides concentrés >70%",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "steel_galvanized", "cast_iron"]:
+            critical_analysis.extend([
+                "🚨 CHOIX INADÉQUAT: Matériau ferreux avec acide = DÉSASTRE GARANTI",
+                "💀 RISQUE: Corrosion perforante en 3-6 mois maximum",
+                "💰 COÛT: Remplacement complet + décontamination = x10 du prix initial",
+                "🏗️  OBLIGATION: Inox 316L minimum ou PTFE/PFA pour acides forts"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🟡 CHOIX DISCUTABLE: PVC limité à 60°C et pH 2-12",
+                "⚠️  ATTENTION: Fluage du PVC sous pression + température",
+                "📊 RECOMMANDATION: PVDF ou Inox 316L plus fiables",
+                "🔬 VÉRIFICATION: Tester compatibilité avec échantillon fluide réel"
+            ])
+        elif input_data.suction_material in ["stainless_steel_316", "stainless_steel_304"]:
+            critical_analysis.extend([
+                "✅ CHOIX PERTINENT: Inox adapté mais attention aux détails",
+                "⚠️  NUANCE CRITIQUE: 316L > 304L pour résistance chlorures",
+                "🔧 ASSEMBLAGE: Soudures TIG obligatoires, pas de vis acier standard",
+                "💡 OPTIMISATION: Finition électropolie recommandée (rugosité <0.4µm)"
+            ])
+    
+    elif input_data.fluid_type == "seawater":
+        critical_analysis.extend([
+            "🌊 CRITIQUE EXPERT - EAU DE MER:",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "steel":
+            critical_analysis.extend([
+                "🚨 CHOIX CATASTROPHIQUE: Acier + eau de mer = corrosion galvanique massive",
+                "⏱️  DURÉE DE VIE: 2-4 mois avant perforation",
+                "💰 ERREUR COÛTEUSE: Maintenance corrective permanente",
+                "🏗️  OBLIGATION: Duplex 2205 minimum ou revêtement époxy"
+            ])
+        elif input_data.suction_material == "cast_iron":
+            critical_analysis.extend([
+                "❌ ERREUR MAJEURE: Fonte + chlorures marins = destruction rapide",
+                "🧪 RÉALITÉ CHIMIQUE: Piqûres de corrosion en 30-60 jours",
+                "🔧 SOLUTION FORCÉE: Revêtement céramique ou remplacement complet",
+                "💡 CONSEIL: Inox duplex ou PEHD PE100 selon la pression"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🟢 CHOIX ACCEPTABLE mais avec réserves importantes:",
+                "⚠️  LIMITE TEMPÉRATURE: PVC fragile >40°C (climats tropicaux)",
+                "🌡️  DILATATION: Coefficient 8x supérieur à l'acier - prévoir joints",
+                "🔧 ASSEMBLAGE: Collage PVC sensible à la température de mise en œuvre",
+                "💡 AMÉLIORATION: PEHD PE100 plus résistant aux chocs thermiques"
+            ])
+        elif input_data.suction_material == "stainless_steel_316":
+            critical_analysis.extend([
+                "✅ EXCELLENT CHOIX avec optimisations possibles:",
+                "⚙️  DÉTAIL CRITIQUE: Inox 316L supérieur au 316 standard",
+                "🔬 COMPOSITION: Mo >2% obligatoire pour résistance chlorures",
+                "🏗️  ASSEMBLAGE: Éviter contact galvanique avec autres métaux",
+                "💎 PERFECTION: Duplex 2507 pour conditions extrêmes"
+            ])
+    
+    elif input_data.fluid_type in ["gasoline", "diesel"]:
+        fuel_name = "Essence" if input_data.fluid_type == "gasoline" else "Diesel"
+        critical_analysis.extend([
+            f"⛽ CRITIQUE EXPERT - {fuel_name.upper()}:",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🚨 ERREUR DANGEREUSE: PVC gonflé et fragilisé par hydrocarbures",
+                "💀 SÉCURITÉ: Risque fuite + incendie/explosion",
+                "📏 DÉFORMATION: Gonflement PVC jusqu'à 15% en volume",
+                "🏗️  OBLIGATION: Acier ou composite spécialisé hydrocarbures"
+            ])
+        elif input_data.suction_material == "steel":
+            critical_analysis.extend([
+                "✅ CHOIX STANDARD mais attention aux détails:",
+                "⚠️  REVÊTEMENT: Acier nu sensible à corrosion par eau contenue",
+                "🔧 ASSEMBLAGE: Soudures continues obligatoires - pas de filetage",
+                "💡 OPTIMISATION: Revêtement époxy ou galvanisation à chaud",
+                "📊 NORME: API 650 pour stockage, ATEX pour pompage"
+            ])
+        elif input_data.suction_material in ["aluminum", "copper"]:
+            critical_analysis.extend([
+                "❌ INCOMPATIBILITÉ CHIMIQUE: Métaux non-ferreux + hydrocarbures",
+                "🧪 PROBLÈME: Formation de composés organométalliques",
+                "⚡ ÉLECTROSTATIQUE: Accumulation charges + risque étincelles",
+                "🏗️  REMPLACEMENT: Acier revêtu ou inox 316L obligatoire"
+            ])
+    
+    elif input_data.fluid_type in ["milk", "honey", "wine", "fruit_juice"]:
+        food_type = {"milk": "LAIT", "honey": "MIEL", "wine": "VIN", "fruit_juice": "JUS DE FRUIT"}[input_data.fluid_type]
+        critical_analysis.extend([
+            f"🍯 CRITIQUE EXPERT - {food_type} (AGRO-ALIMENTAIRE):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "steel_galvanized"]:
+            critical_analysis.extend([
+                "❌ INACCEPTABLE ALIMENTAIRE: Acier standard INTERDIT contact alimentaire",
+                "🦠 CONTAMINATION: Corrosion + développement bactérien",
+                "⚖️  RÉGLEMENTATION: Non-conforme FDA/CE/HACCP",
+                "🏗️  OBLIGATION: Inox 316L poli sanitaire (Ra <0.8µm) minimum"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🟡 CHOIX LIMITÉ: PVC standard inadéquat contact alimentaire",
+                "📜 CERTIFICATION: PVC-U alimentaire obligatoire (sans plomb/cadmium)",
+                "🌡️  LIMITATION: PVC fragile aux nettoyages haute température",
+                "💡 AMÉLIORATION: Inox 316L ou PEHD alimentaire plus adapté"
+            ])
+        elif input_data.suction_material == "stainless_steel_316":
+            critical_analysis.extend([
+                "✅ EXCELLENT CHOIX avec finitions critiques:",
+                "🔬 ÉTAT SURFACE: Polissage électrolytique Ra <0.4µm OBLIGATOIRE",
+                "🧽 NETTOYAGE: Compatible CIP/SIP (150°C max)",
+                "📜 CERTIFICATIONS: 3.1B + FDA/CE alimentaire obligatoires",
+                "💎 PERFECTION: 316L avec finition miroir pour produits sensibles"
+            ])
+    
+    elif input_data.fluid_type == "hydraulic_oil":
+        critical_analysis.extend([
+            "🔧 CRITIQUE EXPERT - HUILE HYDRAULIQUE:",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "❌ INCOMPATIBILITÉ MAJEURE: PVC dégradé par additifs d'huile",
+                "⚗️  RÉACTION CHIMIQUE: Plastifiants PVC dissous dans l'huile",
+                "🔧 CONSÉQUENCE: Durcissement + fissuration du PVC",
+                "🏗️  SOLUTION: Acier inox ou tubes hydrauliques haute pression"
+            ])
+        elif input_data.suction_material == "steel":
+            critical_analysis.extend([
+                "✅ CHOIX ADAPTÉ avec précautions d'usage:",
+                "💧 CONTAMINATION: Éviter traces d'eau (corrosion interne)",
+                "🌡️  TEMPÉRATURE: Prévoir dilatation différentielle acier/huile",
+                "🔧 FILTRATION: Filtre 25µm obligatoire protection pompe",
+                "💡 OPTIMISATION: Passivation acier pour huiles haute performance"
+            ])
+    
+    elif input_data.fluid_type == "bleach":
+        critical_analysis.extend([
+            "🧽 CRITIQUE EXPERT - EAU DE JAVEL (Agent de blanchiment):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "cast_iron", "steel_galvanized"]:
+            critical_analysis.extend([
+                "🚨 CHOIX CATASTROPHIQUE: Métaux ferreux + chlore = corrosion par piqûres",
+                "⚗️  RÉACTION CHIMIQUE: Hypochlorite + fer = formation FeCl3 (rouille active)",
+                "⏱️  DÉGRADATION: Perforations en 15-30 jours selon concentration",
+                "💀 RISQUE SANITAIRE: Contamination par ions ferriques",
+                "🏗️  SOLUTION OBLIGATOIRE: PVC-U ou PEHD exclusivement pour eau de javel"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "✅ CHOIX OPTIMAL: PVC résistant au chlore jusqu'à 1000 ppm",
+                "🔬 CHIMIE: PVC-U non-plastifié obligatoire (pas PVC souple)",
+                "🌡️  TEMPÉRATURE: Limité à 40°C avec eau de javel (dégagement Cl2)",
+                "💡 PRÉCAUTION: Ventilation obligatoire - gaz chloré toxique",
+                "🔧 ASSEMBLAGE: Joints EPDM spécial chlore, éviter NBR"
+            ])
+        elif input_data.suction_material == "stainless_steel_316":
+            critical_analysis.extend([
+                "🟡 CHOIX ACCEPTABLE avec réserves:",
+                "⚠️  CONCENTRATION: Inox 316L limité à 200 ppm chlore libre",
+                "🧪 CORROSION: Piqûres possibles si >500 ppm ou pH <7",
+                "🏗️  ALTERNATIVE: Duplex 2205 ou Hastelloy C-276 pour fortes concentrations",
+                "🔧 JOINTS: PTFE ou FKM obligatoires (pas EPDM standard)"
+            ])
+    
+    elif input_data.fluid_type == "tomato_sauce":
+        critical_analysis.extend([
+            "🍅 CRITIQUE EXPERT - SAUCE TOMATE (Produit alimentaire acide):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "steel_galvanized", "cast_iron"]:
+            critical_analysis.extend([
+                "❌ TRIPLE VIOLATION: Alimentaire + Acide + Température",
+                "🦠 CONTAMINATION: Fer + tomate = goût métallique + noircissement",
+                "⚖️  RÉGLEMENTATION: Interdit FDA/CE contact alimentaire direct",
+                "🧪 pH CRITIQUE: Sauce tomate pH 4.0-4.6 (acide) attaque métaux ferreux",
+                "🏗️  OBLIGATION: Inox 316L poli sanitaire Ra <0.4µm exclusivement"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🟡 CHOIX LIMITÉ: PVC alimentaire possible mais non optimal",
+                "🌡️  TEMPÉRATURE: Sauce chaude >60°C problématique pour PVC",
+                "📜 CERTIFICATION: PVC-U alimentaire sans phtalates obligatoire",
+                "🧽 NETTOYAGE: Difficile - rugosité PVC retient résidus",
+                "💡 RECOMMANDATION: Inox 316L préférable pour viscosité + température"
+            ])
+        elif input_data.suction_material == "stainless_steel_316":
+            critical_analysis.extend([
+                "✅ CHOIX EXCELLENT: Inox 316L optimal produits alimentaires acides",
+                "🔬 RÉSISTANCE: pH 4.0-4.6 + température + viscosité = parfait",
+                "🧽 NETTOYAGE: Surface lisse compatible CIP haute température",
+                "📜 CONFORMITÉ: Certifications 3.1B + FDA alimentaire disponibles",
+                "💎 FINITION: Électropolissage Ra <0.4µm pour viscosité élevée"
+            ])
+    
+    elif input_data.fluid_type == "soap_solution":
+        critical_analysis.extend([
+            "🧴 CRITIQUE EXPERT - SOLUTION SAVONNEUSE (Agent tensioactif):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "cast_iron"]:
+            critical_analysis.extend([
+                "⚠️  PROBLÈME DE SAPONIFICATION: Savon + métaux ferreux",
+                "🧪 RÉACTION: Formation savons métalliques (précipités)",
+                "🔧 ENCRASSEMENT: Dépôts calcaires amplifiés par savons métalliques",
+                "💧 pH ÉLEVÉ: Solutions savonneuses basiques (pH 9-11) attaquent fonte",
+                "🏗️  AMÉLIORATION: Revêtement époxy ou passage inox 304"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "✅ CHOIX ADAPTÉ: PVC résistant tensioactifs et pH basique",
+                "🧽 AVANTAGE: Surface lisse limite adhésion résidus savonneux",
+                "🌡️  TEMPÉRATURE: Attention solutions chaudes >50°C (dégraissage)",
+                "🔧 ENTRETIEN: Rinçage périodique éviter accumulation résidus"
+            ])
+    
+    elif input_data.fluid_type == "yogurt":
+        critical_analysis.extend([
+            "🥛 CRITIQUE EXPERT - YAOURT (Produit laitier fermenté):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material in ["steel", "steel_galvanized"]:
+            critical_analysis.extend([
+                "❌ INACCEPTABLE: Acier standard + acide lactique = contamination",
+                "🦠 BACTÉRIES: Corrosion favorise développement pathogènes",
+                "🧪 pH ACIDE: Yaourt pH 4.0-4.4 attaque métaux ferreux",
+                "⚖️  RÉGLEMENTATION: Non conforme HACCP et FDA/CE",
+                "🏗️  OBLIGATION: Inox 316L poli sanitaire obligatoire"
+            ])
+        elif input_data.suction_material == "stainless_steel_316":
+            critical_analysis.extend([
+                "✅ CHOIX PARFAIT: Inox 316L optimal produits laitiers fermentés",
+                "🔬 RÉSISTANCE: Acide lactique + viscosité + nettoyage vapeur",
+                "🧽 HYGIÈNE: Surface électropolie compatible ferments lactiques",
+                "🌡️  TEMPÉRATURE: Résistant stérilisation 135°C (UHT/CIP)"
+            ])
+    
+    elif input_data.fluid_type == "glycerol":
+        critical_analysis.extend([
+            "🍯 CRITIQUE EXPERT - GLYCÉROL (Viscosité extrême):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🟡 CHOIX DISCUTABLE: PVC + viscosité élevée = contraintes mécaniques",
+                "🔧 PRESSION: Glycérol visqueux génère surpressions - PVC fragile",
+                "🌡️  TEMPÉRATURE: Glycérol chauffé (fluidification) > limite PVC",
+                "💡 AMÉLIORATION: Acier ou inox pour applications glycérol concentré"
+            ])
+        elif input_data.suction_material in ["steel", "stainless_steel_316"]:
+            critical_analysis.extend([
+                "✅ CHOIX OPTIMAL: Métaux résistants viscosité + pression",
+                "🔧 DIMENSIONNEMENT: Prévoir surpressions dues viscosité",
+                "🌡️  CHAUFFAGE: Traçage thermique pour fluidification si nécessaire",
+                "💡 CONSEIL: Pompes volumétriques préférables au centrifuge"
+            ])
+    
+    elif input_data.fluid_type == "methanol":
+        critical_analysis.extend([
+            "🧪 CRITIQUE EXPERT - MÉTHANOL (Alcool toxique):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "❌ INCOMPATIBILITÉ: PVC gonflé par méthanol (solvant)",
+                "💀 SÉCURITÉ: Méthanol + PVC dégradé = fuite toxique",
+                "⚡ ÉLECTROSTATIQUE: Méthanol conducteur + PVC isolant = charges",
+                "🏗️  OBLIGATION: Acier inox ou PTFE exclusivement"
+            ])
+        elif input_data.suction_material in ["steel", "stainless_steel_316"]:
+            critical_analysis.extend([
+                "✅ CHOIX ADAPTÉ: Métaux résistants méthanol",
+                "💀 SÉCURITÉ: Méthanol très toxique - étanchéité parfaite obligatoire",
+                "⚡ ÉLECTROSTATIQUE: Mise à terre complète installation",
+                "🔧 JOINTS: FKM (Viton) exclusivement, pas NBR"
+            ])
+    
+    elif input_data.fluid_type == "ethanol":
+        critical_analysis.extend([
+            "🍺 CRITIQUE EXPERT - ÉTHANOL (Alcool éthylique):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "⚠️  GONFLEMENT: PVC + éthanol = déformation progressive",
+                "🔧 ASSEMBLAGE: Colles PVC dissoutes par éthanol concentré",
+                "🌡️  ÉVAPORATION: Éthanol volatile - pertes par perméation PVC",
+                "🏗️  AMÉLIORATION: Acier inox si éthanol >70% concentration"
+            ])
+        elif input_data.suction_material in ["steel", "stainless_steel_316"]:
+            critical_analysis.extend([
+                "✅ CHOIX EXCELLENT: Métaux parfaitement compatibles éthanol",
+                "🍺 ALIMENTAIRE: Inox 316L si usage alimentaire (spiritueux)",
+                "🔧 JOINTS: NBR acceptable, FKM optimal",
+                "⚡ ATEX: Zone Ex si éthanol >40% - équipements antidéflagrants"
+            ])
+    
+    elif input_data.fluid_type == "palm_oil":
+        critical_analysis.extend([
+            "🌴 CRITIQUE EXPERT - HUILE DE PALME (Huile végétale):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "❌ INCOMPATIBILITÉ: Huile de palme dissout plastifiants PVC",
+                "🔧 DÉGRADATION: Durcissement + fissuration PVC au contact huile",
+                "🌡️  TEMPÉRATURE: Huile de palme chaude (fluidification) détruit PVC",
+                "🏗️  SOLUTION: Acier inox exclusivement pour huiles végétales"
+            ])
+        elif input_data.suction_material in ["steel", "stainless_steel_316"]:
+            critical_analysis.extend([
+                "✅ CHOIX OPTIMAL: Métaux compatibles huiles végétales",
+                "🌡️  CHAUFFAGE: Traçage thermique nécessaire (solidification 35°C)",
+                "🧽 ENTRETIEN: Nettoyage dégraissants alcalins périodique",
+                "📜 ALIMENTAIRE: Inox 316L si usage alimentaire obligatoire"
+            ])
+    
+    elif input_data.fluid_type == "water":
+        critical_analysis.extend([
+            "💧 CRITIQUE EXPERT - EAU (apparemment simple mais...):",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        if input_data.suction_material == "steel":
+            critical_analysis.extend([
+                "🟡 CHOIX CLASSIQUE mais attention aux détails:",
+                "🦠 PROBLÈME SOUS-ESTIMÉ: Corrosion biologique (bactéries sulfato-réductrices)",
+                "📊 QUALITÉ EAU: pH, O2, CO2, chlorures déterminants pour durée de vie",
+                "🔧 PROTECTION: Revêtement époxy ou cathodique selon contexte",
+                "💡 CONSEIL: Analyse eau complète avant dimensionnement définitif"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "✅ CHOIX PERTINENT avec réserves de température:",
+                "🌡️  LIMITE CRITIQUE: PVC ramollit >60°C (eau chaude sanitaire)",
+                "☀️  DÉGRADATION UV: Tubes PVC extérieurs noircissent + fragilisent",
+                "💡 AMÉLIORATION: PVC surdimensionné ou PEHD selon température",
+                "🔧 ASSEMBLAGE: Colle PVC sensible température - respecter temps séchage"
+            ])
+        elif input_data.suction_material == "cast_iron":
+            critical_analysis.extend([
+                "🟡 CHOIX TRADITIONNEL avec surveillance nécessaire:",
+                "🦠 BIOFILM: Fonte rugueuse favorise développement bactéries",
+                "💧 QUALITÉ EAU: Eau douce agressive (pH <7) attaque fonte",
+                "🔧 PROTECTION: Revêtement ciment ou époxy recommandé",
+                "📊 SURVEILLANCE: Contrôle qualité eau et épaisseur fonte régulier"
+            ])
+    
+    # CAS PAR DÉFAUT - ANALYSE OBLIGATOIRE POUR TOUS LES FLUIDES NON COUVERTS
+    else:
+        # S'assurer qu'une analyse apparaît toujours
+        fluid_name_display = input_data.fluid_type.replace('_', ' ').upper()
+        critical_analysis.extend([
+            f"🔬 ANALYSE CRITIQUE - {fluid_name_display}:",
+            f"⚠️  ÉVALUATION MATÉRIAU CHOISI ({input_data.suction_material}):",
+        ])
+        
+        # Analyse générique basée sur les propriétés du matériau
+        if input_data.suction_material in ["steel", "steel_galvanized", "cast_iron"]:
+            critical_analysis.extend([
+                "⚠️  MATÉRIAUX FERREUX: Sensibilité corrosion selon fluide",
+                "💧 HUMIDITÉ: Éviter stagnation - favorise corrosion",
+                "🔧 PROTECTION: Revêtement ou traitement anti-corrosion recommandé",
+                "📊 SURVEILLANCE: Contrôle épaisseur et état surface périodique"
+            ])
+        elif input_data.suction_material == "pvc":
+            critical_analysis.extend([
+                "🌡️  PVC - LIMITATIONS GÉNÉRALES:",
+                "⚠️  TEMPÉRATURE: Limite 60°C - vérifier compatibilité fluide chaud",
+                "🧪 SOLVANTS: PVC sensible hydrocarbures et solvants organiques", 
+                "☀️  UV: Protection nécessaire exposition extérieure",
+                "🔧 ASSEMBLAGE: Technique collage critique pour étanchéité"
+            ])
+        elif input_data.suction_material in ["stainless_steel_316", "stainless_steel_304"]:
+            critical_analysis.extend([
+                "✅ INOX - CHOIX POLYVALENT:",
+                "🔬 NUANCE: 316L supérieur à 304 pour résistance corrosion",
+                "🧽 ÉTAT SURFACE: Polissage améliore résistance et nettoyage",
+                "💰 COÛT: Investissement initial élevé mais durabilité supérieure",
+                "🔧 ASSEMBLAGE: Soudage TIG recommandé pour applications critiques"
+            ])
+        elif input_data.suction_material == "pehd":
+            critical_analysis.extend([
+                "💪 PEHD - PLASTIQUE TECHNIQUE:",
+                "✅ RÉSISTANCE: Chimique supérieure au PVC",
+                "🌡️  TEMPÉRATURE: Meilleure tenue que PVC (-40°C à +80°C)",
+                "🔧 SOUDAGE: Techniques spécialisées (bout à bout, électrosoudage)",
+                "⚡ ÉLECTROSTATIQUE: Mise à terre si fluides conducteurs"
+            ])
+        
+        # Ajouter toujours des recommandations générales
+        critical_analysis.extend([
+            "",  # Ligne vide pour séparation
+            "📋 RECOMMANDATIONS GÉNÉRALES COMPATIBILITÉ:",
+            "🧪 TEST: Essai de compatibilité sur échantillon recommandé",
+            "📊 ANALYSE: Vérifier composition chimique exacte du fluide",
+            "🌡️  TEMPÉRATURE: Considérer variations saisonnières/process",
+            "⚖️  NORMES: Vérifier conformité réglementaire selon application"
+        ])
+    
+    # Analyse critique de la température de fonctionnement
+    if input_data.temperature > 60:
+        critical_analysis.extend([
+            f"🌡️  ANALYSE TEMPÉRATURE CRITIQUE ({input_data.temperature}°C):",
+        ])
+        if input_data.suction_material == "pvc" and input_data.temperature > 60:
+            critical_analysis.extend([
+                f"🚨 DANGER IMMINENT: PVC à {input_data.temperature}°C = RUPTURE PROGRAMMÉE",
+                "📉 PROPRIÉTÉS: Résistance mécanique divisée par 3 à 70°C",
+                "⏱️  DURÉE DE VIE: 50-80% réduite au-delà de 60°C",
+                "🏗️  REMPLACEMENT URGENT: PEHD PE100 ou inox selon pression"
+            ])
+        elif input_data.temperature > 80:
+            critical_analysis.extend([
+                "⚠️  HAUTE TEMPÉRATURE: Tous matériaux affectés >80°C",
+                "🔧 JOINTS: Graphite ou PTFE obligatoires (EPDM insuffisant)",
+                "📏 DILATATION: Calcul des contraintes thermiques obligatoire",
+                "🏗️  SUPPORTS: Compensateurs et guides de dilatation nécessaires"
+            ])
+    
+    # Recommandations d'amélioration critiques
+    improvement_recommendations = []
+    
+    # Analyse du contexte d'installation
+    if input_data.fluid_type in ["acid", "seawater", "gasoline", "diesel"]:
+        improvement_recommendations.extend([
+            "🏗️  RECOMMANDATIONS AMÉLIORATION CRITIQUES:",
+            "🔍 AUDIT: Analyse de défaillance sur installations similaires",
+            "📊 TESTS: Essais de corrosion accélérée sur échantillons",
+            "⚖️  CONFORMITÉ: Vérification réglementaire (ATEX, alimentaire, etc.)",
+            "👷 FORMATION: Personnel sensibilisé aux risques spécifiques du fluide",
+            "📋 MAINTENANCE: Plan préventif adapté à l'agressivité du fluide"
+        ])
+    
+    if input_data.temperature > 40:
+        improvement_recommendations.extend([
+            "🌡️  SPÉCIFICATIONS TEMPÉRATURE:",
+            f"🧪 MATÉRIAU: Coefficient de dilatation critique à {input_data.temperature}°C",
+            "🔧 SUPPORTS: Compensateurs de dilatation tous les 15-20m",
+            "📏 CALCULS: Contraintes thermiques selon Eurocode EN1993",
+            "🌡️  ISOLATION: Réduire déperditions et protéger personnel"
+        ])
+        
+    # Ajouter l'analyse critique aux recommandations (OBLIGATOIRE POUR TOUS LES FLUIDES)
+    if critical_analysis:
+        material_recommendations.extend([""] + critical_analysis)  # Ligne vide pour séparer
+    else:
+        # Cas de sécurité - ne devrait jamais arriver avec le cas par défaut
+        material_recommendations.extend([
+            "⚠️  ANALYSE CRITIQUE: Évaluation de compatibilité requise",
+            "🧪 RECOMMANDATION: Consulter expert matériaux pour cette application"
+        ])
+    
+    if improvement_recommendations:
+        material_recommendations.extend([""] + improvement_recommendations)
+    
+    # Recommandations électriques d'installation
+    electrical_recommendations = []
+    if perf_result.starting_current > 150:
+        electrical_recommendations.extend([
+            f"Courant de démarrage élevé: {perf_result.starting_current:.0f}A",
+            "Démarreur progressif recommandé",
+            "Vérifier capacité du transformateur",
+            "Prévoir compensation d'énergie réactive",
+            "Installer protection thermique renforcée"
+        ])
+    
+    # Recommandations de maintenance préventive
+    maintenance_recommendations = [
+        "Maintenance préventive recommandée:",
+        "- Vérification alignement pompe-moteur (6 mois)",
+        "- Contrôle vibrations et bruit (mensuel)",
+        "- Inspection étanchéité (trimestriel)",
+        "- Analyse d'huile roulement (annuel)",
+        "- Vérification serrage boulonnage (6 mois)",
+        "- Contrôle isolement électrique (annuel)"
+    ]
+    
+    # Ajout des recommandations spécialisées
+    if len(installation_recommendations) > 0:
+        expert_recommendations.append({
+            "type": "installation",
+            "priority": 2,
+            "title": "🏗️ INSTALLATION HYDRAULIQUE",
+            "description": f"Optimisations spécifiques pour configuration {suction_type}",
+            "impact": "Amélioration fiabilité et performance",
+            "solutions": installation_recommendations,
+            "urgency": "MOYENNE",
+            "cost_impact": "MODÉRÉ"
+        })
+    
+    if len(velocity_recommendations) > 0:
+        expert_recommendations.append({
+            "type": "velocity",
+            "priority": 3,
+            "title": "🌊 OPTIMISATION VITESSES",
+            "description": "Ajustement des vitesses d'écoulement",
+            "impact": "Réduction usure et optimisation énergétique",
+            "solutions": velocity_recommendations,
+            "urgency": "MOYENNE",
+            "cost_impact": "MODÉRÉ"
+        })
+    
+    if len(head_loss_recommendations) > 0:
+        expert_recommendations.append({
+            "type": "head_loss",
+            "priority": 4,
+            "title": "⚡ RÉDUCTION PERTES DE CHARGE",
+            "description": "Optimisation circuit hydraulique",
+            "impact": "Économie d'énergie et performance",
+            "solutions": head_loss_recommendations,
+            "urgency": "FAIBLE",
+            "cost_impact": "RENTABLE"
+        })
+    
+    if len(material_recommendations) > 0:
+        expert_recommendations.append({
+            "type": "materials",
+            "priority": 5,
+            "title": "🔧 MATÉRIAUX ET TEMPÉRATURE",
+            "description": "Compatibilité matériaux/fluide/température",
+            "impact": "Durabilité et sécurité installation",
+            "solutions": material_recommendations,
+            "urgency": "MOYENNE",
+            "cost_impact": "VARIABLE"
+        })
+    
+    if len(electrical_recommendations) > 0:
+        expert_recommendations.append({
+            "type": "electrical",
+            "priority": 6,
+            "title": "🔌 OPTIMISATION ÉLECTRIQUE",
+            "description": "Améliorations système électrique",
+            "impact": "Fiabilité démarrage et protection",
+            "solutions": electrical_recommendations,
+            "urgency": "MOYENNE",
+            "cost_impact": "MODÉRÉ"
+        })
+    
+    expert_recommendations.append({
+        "type": "maintenance",
+        "priority": 7,
+        "title": "🔍 MAINTENANCE PRÉVENTIVE",
+        "description": "Plan de maintenance pour fiabilité optimale",
+        "impact": "Prolongation durée de vie équipement",
+        "solutions": maintenance_recommendations,
+        "urgency": "FAIBLE",
+        "cost_impact": "RENTABLE"
+    })
+    
+    # Analyse de performance énergétique
+    if overall_efficiency < 65:
+        potential_savings = (75 - overall_efficiency) * 0.01 * annual_energy_cost
+        expert_recommendations.append({
+            "type": "energy",
+            "priority": 2,
+            "title": "⚡ EFFICACITÉ ÉNERGÉTIQUE FAIBLE",
+            "description": f"Rendement global {overall_efficiency:.1f}% - Potentiel d'économie de {potential_savings:.0f}€/an",
+            "impact": f"Surconsommation: {potential_savings * 10:.0f}€ sur 10 ans",
+            "solutions": [
+                "Pompe haute efficacité (gain 5-10%)",
+                "Moteur haut rendement Premium (gain 2-5%)",
+                "Variateur de vitesse (gain 10-30%)",
+                "Optimisation point de fonctionnement",
+                "Maintenance préventive régulière"
+            ],
+            "urgency": "MOYENNE",
+            "cost_impact": "RENTABLE"
+        })
+    
+    # Analyse hydraulique avancée
+    if npshd_result.velocity > 3.0:
+        # Calculer les diamètres optimaux
+        optimal_suction_diameter = input_data.suction_pipe_diameter * math.sqrt(npshd_result.velocity / 2.5)
+        optimal_discharge_diameter = input_data.discharge_pipe_diameter * math.sqrt(npshd_result.velocity / 3.0)
+        
+        # Convertir en DN normalisés
+        current_suction_dn = get_closest_dn(input_data.suction_pipe_diameter)
+        recommended_suction_dn = get_closest_dn(optimal_suction_diameter)
+        current_discharge_dn = get_closest_dn(input_data.discharge_pipe_diameter)
+        recommended_discharge_dn = get_closest_dn(optimal_discharge_diameter)
+        
+        logger.debug(
+            "velocity_diameters suction_mm=%s suction_dn=%s suction_recommended_mm=%.1f suction_recommended_dn=%s "
+            "discharge_mm=%s discharge_dn=%s discharge_recommended_mm=%.1f discharge_recommended_dn=%s velocity=%.2f",
+            input_data.suction_pipe_diameter, input_data.suction_dn or get_closest_dn(input_data.suction_pipe_diameter),
+            optimal_suction_diameter, recommended_suction_dn,
+            input_data.discharge_pipe_diameter, input_data.discharge_dn or current_discharge_dn,
+            optimal_discharge_diameter, recommended_discharge_dn, npshd_result.velocity
+        )
+        
+        # Utiliser les valeurs DN sélectionnées par l'utilisateur si disponibles
+        current_suction_dn_selected = input_data.suction_dn if input_data.suction_dn is not None else get_closest_dn(input_data.suction_pipe_diameter)
+        current_discharge_dn_selected = input_data.discharge_dn if input_data.discharge_dn is not None else get_closest_dn(input_data.discharge_pipe_diameter)
+        
+        # Vérifier si les recommandations sont vraiment nécessaires
+        # (éviter de recommander un changement si le DN sélectionné est déjà approprié)
+        need_suction_change = current_suction_dn_selected < recommended_suction_dn
+        need_discharge_change = current_discharge_dn_selected < recommended_discharge_dn
+        
+        solutions = []
+        
+        # NOUVELLES RECOMMANDATIONS GRADUÉES POUR VITESSES ÉLEVÉES
+        if need_suction_change:
+            # Recommandations graduées pour l'aspiration
+            suction_velocity_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.suction_pipe_diameter,
+                input_data.flow_rate,
+                hmt_result.suction_velocity,
+                input_data.suction_length,
+                is_suction_pipe=True
+            )
+            
+            if suction_velocity_options and len(suction_velocity_options) > 1:
+                solutions.append("ASPIRATION - Options graduées vitesses élevées:")
+                solutions.extend([f"  {option}" for option in suction_velocity_options[1:3]])  # 2 meilleures options
+            else:
+                solutions.append(f"Diamètre aspiration: DN{current_suction_dn_selected} → DN{recommended_suction_dn}")
+        
+        if need_discharge_change:
+            # Recommandations graduées pour le refoulement
+            discharge_velocity_options = run_stage(graph, "graduated_diameter_recommendations", calculate_graduated_diameter_recommendations,
+                input_data.discharge_pipe_diameter,
+                input_data.flow_rate,
+                hmt_result.discharge_velocity,
+                input_data.discharge_length,
+                is_suction_pipe=False
+            )
+            
+            if discharge_velocity_options and len(discharge_velocity_options) > 1:
+                solutions.append("REFOULEMENT - Options graduées vitesses élevées:")
+                solutions.extend([f"  {option}" for option in discharge_velocity_options[1:3]])  # 2 meilleures options
+            else:
+                solutions.append(f"Diamètre refoulement: DN{current_discharge_dn_selected} → DN{recommended_discharge_dn}")
+            
+        # Ajouter recommandations générales seulement si changement nécessaire
+        if need_suction_change or need_discharge_change:
+            solutions.extend([
+                "Matériaux anti-érosion (inox, fonte)",
+                "Supports anti-vibratoires", 
+                "Réduction débit si possible"
+            ])
+        else:
+            # Pas de changement de diamètre nécessaire mais vitesse encore élevée
+            solutions.extend([
+                f"Diamètres actuels (DN{current_suction_dn_selected}/DN{current_discharge_dn_selected}) appropriés",
+                "Optimiser tracé hydraulique (courbes 3D)",
+                "Matériaux résistants à l'érosion",
+                "Supports anti-vibratoires renforcés"
+            ])
+        
+        expert_recommendations.append({
+            "type": "hydraulic",
+            "priority": 3,
+            "title": "🌊 VITESSE EXCESSIVE",
+            "description": f"Vitesse {npshd_result.velocity:.2f}m/s > 3m/s - Risque d'érosion et cavitation",
+            "impact": "Usure prématurée, bruit, vibrations, perte de performance",
+            "solutions": solutions,
+            "urgency": "MOYENNE",
+            "cost_impact": "MODÉRÉ"
+        })
+    
+    # Analyse des singularités
+    total_singularities = sum([
+        input_data.suction_elbow_90, input_data.suction_elbow_45, input_data.suction_elbow_30,
+        input_data.suction_tee_flow, input_data.suction_tee_branch,
+        input_data.suction_reducer_gradual, input_data.suction_reducer_sudden,
+        input_data.suction_gate_valve, input_data.suction_globe_valve, input_data.suction_ball_valve,
+        input_data.suction_butterfly_valve, input_data.suction_check_valve, input_data.suction_strainer,
+        input_data.suction_foot_valve,
+        input_data.discharge_elbow_90, input_data.discharge_elbow_45, input_data.discharge_elbow_30,
+        input_data.discharge_tee_flow, input_data.discharge_tee_branch,
+        input_data.discharge_reducer_gradual, input_data.discharge_reducer_sudden,
+        input_data.discharge_gate_valve, input_data.discharge_globe_valve, input_data.discharge_ball_valve,
+        input_data.discharge_butterfly_valve, input_data.discharge_check_valve, input_data.discharge_strainer,
+        input_data.discharge_flow_meter, input_data.discharge_pressure_gauge
+    ])
+    
+    if total_singularities > 15:
+        expert_recommendations.append({
+            "type": "complexity",
+            "priority": 4,
+            "title": "🔧 INSTALLATION COMPLEXE",
+            "description": f"{total_singularities} singularités - Pertes de charge élevées",
+            "impact": "Réduction du rendement, maintenance accrue, coûts d'exploitation",
+            "solutions": [
+                "Simplification du circuit hydraulique",
+                "Réduction nombre de raccords",
+                "Tuyauterie rectiligne privilégiée",
+                "Raccords à rayon large",
+                "Maintenance préventive renforcée"
+            ],
+            "urgency": "FAIBLE",
+            "cost_impact": "LONG TERME"
+        })
+    
+    # Potentiel d'optimisation
+    optimization_potential = {
+        "energy_savings": max(0, 80 - overall_efficiency),  # Potentiel d'économie d'énergie
+        "npsh_margin": npshd_result.npsh_margin,
+        "velocity_optimization": max(0, npshd_result.velocity - 2.0),  # Réduction de vitesse possible
+        "head_loss_reduction": max(0, total_head_loss - (total_head_loss * 0.7)),  # Réduction pertes possible
+        "annual_cost_savings": potential_savings if overall_efficiency < 65 else 0
+    }
+    
+    return {"recommendations": expert_recommendations, "optimization_potential": optimization_potential}
+
+def expert_stage_organized_recommendations(graph: ComputationGraph) -> List[Dict[str, Any]]:
+    """Organisation intelligente des recommandations (doublons éliminés, priorisation)"""
+    input_data = graph.inputs["input_data"]
+    energy_balance = graph.get("energy_balance")
+    return organize_expert_recommendations_intelligently(
+        graph.get("recommendations")["recommendations"],  # Recommandations existantes
+        graph.get("npshd"),
+        graph.get("hmt"),
+        graph.get("performance"),
+        get_expert_compatibility(
+            graph, input_data.suction_material, input_data.discharge_material, input_data.temperature
+        ),
+        energy_balance["overall_efficiency"],
+        energy_balance["annual_energy_cost"],
+        input_data,
+        graph=graph
+    )
+
+def expert_stage_system_curves(graph: ComputationGraph) -> Dict[str, Any]:
+    """Courbes système sur les points de débit des courbes de performance"""
+    input_data = graph.inputs["input_data"]
+    performance_curves = graph.get("performance_curves")
+    energy_balance = graph.get("energy_balance")
+    total_head_loss = energy_balance["total_head_loss"]
+    return {
+        "flow_points": performance_curves["flow"],
+        "system_curve": [flow**2 * (total_head_loss / input_data.flow_rate**2) for flow in performance_curves["flow"]],
+        "operating_point": {
+            "flow": input_data.flow_rate,
+            "head": graph.get("hmt").hmt,
+            "efficiency": energy_balance["overall_efficiency"],
+            "power": energy_balance["hydraulic_power"]
+        }
+    }
+
+EXPERT_ANALYSIS_STAGES = {
+    "fittings": lambda graph: build_expert_fittings(graph.inputs["input_data"]),
+    "npshd": expert_stage_npshd,
+    "hmt": expert_stage_hmt,
+    "performance_input": expert_stage_performance_input,
+    "performance_curves": lambda graph: generate_performance_curves(graph.get("performance_input")),
+    "performance": expert_stage_performance,
+    "energy_balance": expert_stage_energy_balance,
+    "recommendations": expert_stage_recommendations,
+    "organized_recommendations": expert_stage_organized_recommendations,
+    "system_curves": expert_stage_system_curves,
+}
+
+def calculate_expert_analysis(input_data: ExpertAnalysisInput) -> ExpertAnalysisResult:
+    """
+    Analyse complète d'expert avec tous les calculs hydrauliques et électriques
+    """
+    graph = ComputationGraph(EXPERT_ANALYSIS_STAGES, input_data=input_data)
+    npshd_result = graph.get("npshd")
+    hmt_result = graph.get("hmt")
+    perf_result = graph.get("performance")
+    energy_balance = graph.get("energy_balance")
+    overall_efficiency = energy_balance["overall_efficiency"]
+    hydraulic_power = energy_balance["hydraulic_power"]
+    annual_energy_cost = energy_balance["annual_energy_cost"]
+    energy_consumption = energy_balance["energy_consumption"]
+    expert_recommendations = graph.get("organized_recommendations")
+    optimization_potential = graph.get("recommendations")["optimization_potential"]
+    performance_curves = graph.get("performance_curves")
+    system_curves = graph.get("system_curves")
+    # Durées par étape: Server-Timing et /metrics, jamais dans le corps (mis en cache, diffusé en direct)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("expert_analysis_stages %s", graph.timings())
+    
+    return ExpertAnalysisResult(
+        input_data=input_data,
+        npshd_analysis={
+            "npshd": npshd_result.npshd,
+            "npsh_required": npshd_result.npsh_required,
+            "npsh_margin": npshd_result.npsh_margin,
+            "cavitation_risk": npshd_result.cavitation_risk,
+            "velocity": npshd_result.velocity,
+            "reynolds_number": npshd_result.reynolds_number,
+            "total_head_loss": npshd_result.total_head_loss,
+            "warnings": npshd_result.warnings,
+            "recommendations": npshd_result.recommendations
+        },
+        hmt_analysis={
+            "hmt": hmt_result.hmt,
+            "static_head": hmt_result.static_head,
+            "total_head_loss": hmt_result.total_head_loss,
+            "suction_velocity": hmt_result.suction_velocity,
+            "discharge_velocity": hmt_result.discharge_velocity,
+            "useful_pressure_head": hmt_result.useful_pressure_head,
+            "warnings": hmt_result.warnings
+        },
+        performance_analysis={
+            "overall_efficiency": perf_result.overall_efficiency,
+            "pump_efficiency": perf_result.pump_efficiency,
+            "motor_efficiency": perf_result.motor_efficiency,
+            "hydraulic_power": hydraulic_power,
+            "electrical_power": perf_result.power_calculations.get("absorbed_power", 0),
+            "nominal_current": perf_result.nominal_current,
+            "starting_current": perf_result.starting_current,
+            "power_calculations": perf_result.power_calculations,
+            "warnings": perf_result.warnings,
+            "alerts": perf_result.alerts
+        },
+        electrical_analysis={
+            "voltage": input_data.voltage,
+            "power_factor": input_data.power_factor,
+            "starting_method": input_data.starting_method,
+            "cable_length": input_data.cable_length,
+            "cable_section": perf_result.recommended_cable_section,
+            "annual_energy_cost": annual_energy_cost,
+            "daily_energy_cost": annual_energy_cost / 365,
+            "energy_consumption_per_m3": energy_consumption,
+            "operating_hours": input_data.operating_hours,
+            "electricity_cost": input_data.electricity_cost
+        },
+        overall_efficiency=overall_efficiency,
+        total_head_loss=energy_balance["total_head_loss"],
+        system_stability=energy_balance["system_stability"],
+        energy_consumption=energy_consumption,
+        expert_recommendations=expert_recommendations,
+        optimization_potential=optimization_potential,
+        performance_curves=performance_curves,
+        system_curves=system_curves
+    )
+
+# Legacy functions for backward compatibility
+def calculate_cable_section(current: float, cable_length: float, voltage: int) -> float:
+    """Calculate required cable section"""
+    if voltage == 230:
+        base_section = current / 6  # A/mm²
+    else:  # 400V
+        base_section = current / 8  # A/mm²
+    
+    length_factor = 1 + (cable_length / 100) * 0.2
+    required_section = base_section * length_factor
+    
+    standard_sections = [1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300]
+    for section in standard_sections:
+        if section >= required_section:
+            return section
+    
+    return 300
+
+def perform_hydraulic_calculation(input_data: CalculationInput) -> CalculationResult:
+    """Legacy hydraulic calculation function"""
+    warnings = []
+    
+    # Get fluid properties
+    fluid_props = get_fluid_properties(input_data.fluid_type, input_data.temperature)
+    
+    # Convert units
+    flow_rate_m3s = input_data.flow_rate / 3600
+    pipe_diameter_m = input_data.pipe_diameter / 1000
+    pipe_area = math.pi * (pipe_diameter_m / 2) ** 2
+    
+    # Calculate flow velocity
+    flow_velocity = flow_rate_m3s / pipe_area
+    
+    # Calculate Reynolds number
+    reynolds_number = calculate_reynolds_number(
+        flow_velocity, pipe_diameter_m, fluid_props.density, fluid_props.viscosity
+    )
+    
+    # Calculate friction factor (commercial steel roughness relative to the actual diameter)
+    friction_factor = calculate_friction_factor(reynolds_number, DEFAULT_PIPE_ROUGHNESS / input_data.pipe_diameter)
+    
+    # Calculate pressure losses
+    linear_pressure_loss = friction_factor * (input_data.pipe_length / pipe_diameter_m) * (fluid_props.density * flow_velocity**2 / 2)
+    total_pressure_loss = linear_pressure_loss * 1.2
+    
+    # Calculate HMT
+    static_head = input_data.suction_height if input_data.suction_height > 0 else 0
+    pressure_head = total_pressure_loss / (fluid_props.density * 9.81)
+    hmt_meters = static_head + pressure_head
+    hmt_bar = hmt_meters * fluid_props.density * 9.81 / 100000
+    
+    # Calculate NPSH
+    npsh_required = 2.0 + (input_data.flow_rate / 100) ** 0.8
+    npsh_available_calc = 10.3 - abs(input_data.suction_height) - (total_pressure_loss / (fluid_props.density * 9.81))
+    cavitation_risk = npsh_available_calc <= npsh_required
+    
+    # Calculate power
+    hydraulic_power = (flow_rate_m3s * hmt_meters * fluid_props.density * 9.81) / 1000
+    total_efficiency = (input_data.pump_efficiency * input_data.motor_efficiency) / 10000
+    absorbed_power = hydraulic_power / total_efficiency
+    
+    # Calculate electrical parameters
+    if input_data.voltage == 230:
+        nominal_current = (absorbed_power * 1000) / (input_data.voltage * 0.8)
+    else:
+        nominal_current = (absorbed_power * 1000) / (input_data.voltage * 1.732 * 0.8)
+    
+    cable_section = calculate_cable_section(nominal_current, input_data.cable_length, input_data.voltage)
+    starting_method = "Direct start" if absorbed_power < 3 else "Star-delta"
+    
+    if cavitation_risk:
+        warnings.append("RISQUE DE CAVITATION: NPSHd ≤ NPSHr")
+    
+    return CalculationResult(
+        input_data=input_data,
+        fluid_properties=fluid_props,
+        flow_velocity=flow_velocity,
+        reynolds_number=reynolds_number,
+        friction_factor=friction_factor,
+        linear_pressure_loss=linear_pressure_loss,
+        total_pressure_loss=total_pressure_loss,
+        hmt_meters=hmt_meters,
+        hmt_bar=hmt_bar,
+        npsh_required=npsh_required,
+        npsh_available_calc=npsh_available_calc,
+        cavitation_risk=cavitation_risk,
+        hydraulic_power=hydraulic_power,
+        absorbed_power=absorbed_power,
+        total_efficiency=total_efficiency * 100,
+        nominal_current=nominal_current,
+        cable_section=cable_section,
+        starting_method=starting_method,
+        warnings=warnings
+    )
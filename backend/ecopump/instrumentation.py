@@ -0,0 +1,111 @@
+"""Histogrammes Prometheus et mesure des étapes de calcul (sans dépendance externe)."""
+
+from typing import List, Dict
+import threading
+import time
+import bisect
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+# Histogrammes au format texte Prometheus (sans dépendance): latence par route, par
+# étape de calcul et par calculateur, retard de la boucle d'événements. Les étapes
+# exécutées dans un worker (processus ou thread) sont collectées localement puis
+# renvoyées avec le résultat et enregistrées dans le processus principal, seul à
+# exposer /metrics.
+
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                           0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def metric_labels(names, values) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+class Histogram:
+    """Thread-safe cumulative histogram rendered in Prometheus text format"""
+    
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=METRICS_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # labels -> [comptes par intervalle..., somme]
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)  # intervalle le plus petit avec le >= valeur
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = [(labels, list(series)) for labels, series in sorted(self._series.items())]
+        for labels, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{metric_labels(self.label_names + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{metric_labels(self.label_names, labels)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{metric_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+def metric_family(name: str, metric_type: str, help_text: str, samples) -> List[str]:
+    """Counter/gauge family from [(labels dict, value), ...]"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{metric_labels(tuple(labels), tuple(labels.values()))} {value!r}")
+    return lines
+
+STAGE_DURATION = Histogram("pump_calculation_stage_duration_seconds",
+                           "Durée des étapes de calcul (NPSHd, HMT, performance, compatibilité, courbes, solaire...)",
+                           ("stage",))
+CALCULATION_DURATION = Histogram("pump_calculation_duration_seconds",
+                                 "Durée d'exécution d'un calculateur dans un worker (hors attente)", ("calculation",))
+
+_stage_collector = threading.local()
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Stage timing: buffered while a worker task collects, recorded directly otherwise"""
+    samples = getattr(_stage_collector, "samples", None)
+    if samples is not None:
+        samples.append((stage, seconds))
+    else:
+        STAGE_DURATION.observe(seconds, stage)
+
+def collect_stage_samples(name: str, function, *args):
+    """Run function(*args) in a worker, returning (result, [(stage, seconds), ...]) for the main process"""
+    previous = getattr(_stage_collector, "samples", None)
+    samples = _stage_collector.samples = []
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    finally:
+        _stage_collector.samples = previous
+    samples.append((None, time.perf_counter() - start))  # durée totale du calculateur
+    return result, samples
+
+def observe_stage_samples(name: str, samples) -> None:
+    for stage, seconds in samples:
+        if stage is None:
+            CALCULATION_DURATION.observe(seconds, name)
+        else:
+            STAGE_DURATION.observe(seconds, stage)
+
+class StageClock:
+    """Successive laps of a sequential calculation, each recorded as a stage"""
+    
+    def __init__(self):
+        self.last = time.perf_counter()
+    
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        record_stage(stage, now - self.last)
+        self.last = now
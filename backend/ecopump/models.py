@@ -0,0 +1,604 @@
+"""Modèles Pydantic des calculs hydrauliques (entrées et résultats des trois onglets,
+balayages, incertitudes, transitoires, réseaux, historique)."""
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any
+import uuid
+from datetime import datetime
+
+# ============================================================================
+# ENHANCED PYDANTIC MODELS FOR THREE TABS
+# ============================================================================
+
+class CalculationModel(BaseModel):
+    """Base of all calculation models: validators are built on first use, not at import"""
+    model_config = ConfigDict(defer_build=True)
+
+class FluidProperties(CalculationModel):
+    name: str
+    density: float  # kg/m³
+    viscosity: float  # Pa·s
+    vapor_pressure: float  # Pa
+
+class FittingInput(CalculationModel):
+    fitting_type: str
+    quantity: int = 1
+
+class NPSHdCalculationInput(CalculationModel):
+    suction_type: str = "flooded"  # "flooded" or "suction_lift"
+    hasp: float  # m (suction height - positive = flooded / negative = suction lift)
+    flow_rate: float  # m³/h
+    fluid_type: str
+    temperature: float = 20  # °C
+    pipe_diameter: float  # mm
+    pipe_material: str
+    pipe_length: float  # m (suction side)
+    suction_fittings: List[FittingInput] = []
+    npsh_required: float = 3.5  # m (NPSH requis from pump manufacturer)
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+
+class HMTCalculationInput(CalculationModel):
+    installation_type: str = "surface"  # "surface" or "submersible"
+    suction_type: str = "flooded"  # "flooded" or "suction_lift" (only for surface installation)
+    hasp: float  # m (suction height - only for surface installation)
+    discharge_height: float  # m
+    useful_pressure: float = 0  # bar (required delivery pressure)
+    suction_pipe_diameter: float  # mm
+    discharge_pipe_diameter: float  # mm
+    suction_pipe_length: float  # m
+    discharge_pipe_length: float  # m
+    suction_pipe_material: str
+    discharge_pipe_material: str
+    suction_fittings: List[FittingInput] = []
+    discharge_fittings: List[FittingInput] = []
+    fluid_type: str
+    temperature: float = 20  # °C
+    flow_rate: float  # m³/h
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+
+class PerformanceAnalysisInput(CalculationModel):
+    flow_rate: float  # m³/h
+    hmt: float  # m
+    pipe_diameter: float  # mm
+    required_npsh: Optional[float] = None  # m (from pump datasheet) - Made optional
+    calculated_npshd: Optional[float] = None  # m (from Tab 1) - Made optional
+    fluid_type: str
+    pipe_material: str
+    pump_efficiency: float  # %
+    motor_efficiency: float  # %
+    absorbed_power: Optional[float] = None  # kW (P1)
+    hydraulic_power: Optional[float] = None  # kW (P2)
+    starting_method: str = "star_delta"  # or "direct_on_line"
+    power_factor: float = 0.8  # cos φ
+    cable_length: float  # m
+    cable_material: str = "copper"  # or "aluminum"
+    cable_section: Optional[float] = None  # mm²
+    voltage: int = 400  # V
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+    curve_resolution: int = 16  # points of the performance curves (0 to 150% of nominal flow)
+
+class NPSHdResult(CalculationModel):
+    input_data: NPSHdCalculationInput
+    fluid_properties: FluidProperties
+    atmospheric_pressure: float  # Pa (constant at sea level)
+    velocity: float  # m/s
+    reynolds_number: float
+    friction_factor: float
+    linear_head_loss: float  # m
+    singular_head_loss: float  # m
+    total_head_loss: float  # m
+    npshd: float  # m
+    npsh_required: float  # m
+    npsh_margin: float  # m (NPSHd - NPSHr)
+    cavitation_risk: bool
+    recommendations: List[str]  # Corrective actions for cavitation
+    warnings: List[str]
+
+class HMTResult(CalculationModel):
+    input_data: HMTCalculationInput
+    fluid_properties: FluidProperties
+    suction_velocity: Optional[float] = None  # m/s - Optional for submersible
+    discharge_velocity: float  # m/s
+    suction_head_loss: Optional[float] = None  # m - Optional for submersible
+    discharge_head_loss: float  # m
+    total_head_loss: float  # m
+    static_head: float  # m
+    useful_pressure_head: float  # m
+    hmt: float  # m
+    warnings: List[str]
+    recommendations: List[str] = []  # Nouvelles recommandations intelligentes
+
+# Calculs par lot - un élément de réponse par variante soumise, sans interrompre le lot
+BATCH_MAX_ITEMS = 10000
+
+class NPSHdBatchItem(CalculationModel):
+    index: int  # position de la variante dans le lot soumis
+    success: bool
+    result: Optional[NPSHdResult] = None
+    error: Optional[str] = None
+
+class NPSHdBatchResult(CalculationModel):
+    results: List[NPSHdBatchItem]
+    total: int
+    succeeded: int
+    failed: int
+
+class HMTBatchItem(CalculationModel):
+    index: int  # position de la variante dans le lot soumis
+    success: bool
+    result: Optional[HMTResult] = None
+    error: Optional[str] = None
+
+class HMTBatchResult(CalculationModel):
+    results: List[HMTBatchItem]
+    total: int
+    succeeded: int
+    failed: int
+    groups: int  # groupes (fluide, température, matériaux) calculés une seule fois
+
+# Balayages paramétriques (grille cartésienne diffusée en NDJSON)
+SWEEP_MAX_POINTS = 2000000
+SWEEP_MAX_CHUNK_SIZE = 100000
+
+class SweepRange(CalculationModel):
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    num: int = 10  # points régulièrement espacés de start à stop inclus
+    values: Optional[List[float]] = None  # valeurs explicites (prioritaires sur start/stop/num)
+
+class SweepInput(CalculationModel):
+    calculation: str = "npshd"  # "npshd" ou "hmt"
+    base: Dict[str, Any]  # entrée NPSHd ou HMT de référence
+    ranges: Dict[str, SweepRange]  # paramètre balayé -> plage (voir SWEEP_PARAMETER_FIELDS)
+    chunk_size: int = 10000  # points par ligne NDJSON
+    outputs: Optional[List[str]] = None  # colonnes de résultat à diffuser (défaut: toutes)
+
+# Analyse d'incertitude Monte Carlo (NPSHd / HMT)
+MONTE_CARLO_MAX_SAMPLES = 2000000
+
+class DistributionInput(CalculationModel):
+    distribution: str = "normal"  # "normal", "uniform", "triangular", "lognormal" ou "constant"
+    mean: Optional[float] = None  # défaut: valeur de l'entrée de référence
+    std: float = 0  # écart-type (normal, lognormal)
+    low: Optional[float] = None  # borne basse (uniform, triangular)
+    high: Optional[float] = None  # borne haute (uniform, triangular)
+    mode: Optional[float] = None  # valeur la plus probable (triangular, défaut: mean)
+
+class UncertaintyAnalysisInput(CalculationModel):
+    base: HMTCalculationInput  # installation de référence
+    npsh_required: float = 3.5  # m
+    # Variables incertaines: flow_rate, temperature, hasp, suction_pipe_length,
+    # discharge_pipe_length, roughness_factor (multiplicateur de rugosité, 1 = conduite neuve)
+    distributions: Dict[str, DistributionInput]
+    samples: int = 100000
+    seed: Optional[int] = None
+    percentiles: List[float] = [5, 25, 50, 75, 95]
+
+class UncertaintyStatistics(CalculationModel):
+    mean: float
+    std: float
+    min: float
+    max: float
+    percentiles: Dict[str, float]  # "p5", "p50", ...
+
+class UncertaintyAnalysisResult(CalculationModel):
+    samples: int
+    seed: Optional[int] = None
+    chunks: int
+    workers: int
+    deterministic_npshd: Optional[float] = None  # m (entrée de référence)
+    deterministic_hmt: float  # m
+    cavitation_probability: Optional[float] = None  # P(NPSHd <= NPSHr), installations en surface
+    npshd: Optional[UncertaintyStatistics] = None
+    npsh_margin: Optional[UncertaintyStatistics] = None
+    hmt: UncertaintyStatistics
+
+# Coup de bélier (méthode des caractéristiques sur la conduite de refoulement)
+class WaterHammerInput(CalculationModel):
+    base: HMTCalculationInput  # conduite de refoulement, fluide et débit de référence
+    scenario: str = "pump_trip"  # "pump_trip" (disjonction pompe + clapet) ou "valve_closure" (vanne aval)
+    closure_time: float = 2.0  # s (arrêt de la pompe jusqu'au débit nul / durée de fermeture de la vanne)
+    valve_closure_exponent: float = 1.5  # loi d'ouverture τ = (1 - t/T)^Em
+    valve_head_loss: float = 1.0  # m (perte de charge de la vanne ouverte)
+    num_nodes: int = 100  # nœuds de calcul le long de la conduite
+    duration: Optional[float] = None  # s (défaut: 10 allers-retours 2L/a)
+    wave_speed: Optional[float] = None  # m/s (défaut: formule de Korteweg)
+    wall_thickness: Optional[float] = None  # mm (défaut: SDR typique du matériau)
+    fluid_bulk_modulus: float = 2.2e9  # Pa (eau)
+    history_points: int = 200  # points des historiques de charge aux extrémités
+
+class WaterHammerResult(CalculationModel):
+    scenario: str
+    wave_speed: float  # m/s
+    time_step: float  # s
+    steps: int
+    nodes: int
+    critical_time: float  # s (2L/a: fermeture plus rapide = fermeture brusque)
+    joukowsky_head: float  # m (a·V0/g)
+    steady_pump_head: float  # m
+    positions: List[float]  # m depuis la pompe
+    max_head: List[float]  # m (enveloppe par nœud)
+    min_head: List[float]  # m
+    max_pressure: List[float]  # bar (enveloppe, charge - cote)
+    min_pressure: List[float]  # bar
+    overall_max_pressure: float  # bar
+    overall_min_pressure: float  # bar
+    max_surge: float  # m (dépassement maximal de la charge permanente)
+    column_separation_risk: bool  # pression minimale < tension de vapeur
+    history_times: List[float]  # s
+    pump_end_head: List[float]  # m
+    outlet_end_head: List[float]  # m
+    warnings: List[str]
+
+class PumpCurveInput(CalculationModel):
+    name: Optional[str] = None
+    nominal_flow: float  # m³/h (point de meilleur rendement)
+    nominal_head: float  # m (HMT au point nominal)
+    nominal_efficiency: float = 75  # % (rendement au point nominal)
+    head_coefficients: Optional[List[float]] = None  # [H0, a, b]: H = H0 - a*Q - b*Q² (défaut: courbe type)
+
+class SystemCurveInput(CalculationModel):
+    static_head: float  # m (hauteur géométrique totale)
+    useful_pressure: float = 0  # bar
+    fluid_type: str = "water"
+    temperature: float = 20  # °C
+    suction_pipe_diameter: float = 0  # mm (0 = pas de conduite d'aspiration, ex. immergée)
+    suction_pipe_length: float = 0  # m
+    suction_pipe_material: str = "pvc"
+    suction_fittings: List[FittingInput] = []
+    discharge_pipe_diameter: float  # mm
+    discharge_pipe_length: float  # m
+    discharge_pipe_material: str = "pvc"
+    discharge_fittings: List[FittingInput] = []
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+
+class OperatingPointInput(CalculationModel):
+    pumps: List[PumpCurveInput]
+    systems: List[SystemCurveInput]  # chaque pompe est croisée avec chaque système
+
+class OperatingPointResult(CalculationModel):
+    pump_index: int
+    system_index: int
+    pump_name: Optional[str] = None
+    status: str  # "ok", "insufficient_head" (H0 < hauteur statique) ou "beyond_curve" (hors courbe pompe)
+    flow: Optional[float] = None  # m³/h
+    head: Optional[float] = None  # m
+    efficiency: Optional[float] = None  # %
+    power: Optional[float] = None  # kW
+    system_head_at_zero_flow: float  # m (hauteur statique + pression utile)
+
+class OperatingPointBatchResult(CalculationModel):
+    results: List[OperatingPointResult]
+    total: int
+    solved: int
+    iterations: int  # itérations de Brent (lot complet)
+
+# Simulation en période étendue (réservoir + pompe, pas horaire ou plus fin)
+class ExtendedPeriodInput(CalculationModel):
+    base: HMTCalculationInput  # installation de remplissage (cote de refoulement = fond du réservoir)
+    pump: Optional[PumpCurveInput] = None  # défaut: courbe type passant par (débit, HMT) de l'installation
+    tank_area: float  # m² (section du réservoir)
+    tank_height: float  # m (hauteur utile, débordement au-delà)
+    initial_level: float  # m
+    start_level: float  # m (démarrage pompe quand niveau <= start_level)
+    stop_level: float  # m (arrêt pompe quand niveau >= stop_level)
+    control: str = "on_off"  # "on_off" ou "vfd" (variateur: débit modulé autour de vfd_setpoint)
+    vfd_setpoint: Optional[float] = None  # m (défaut: milieu entre démarrage et arrêt)
+    vfd_min_flow_ratio: float = 0.3  # débit minimal du variateur / débit nominal
+    vfd_time_constant: float = 1.0  # h (constante de temps de la régulation de niveau)
+    demand_profile: List[float]  # m³/h, répété sur toute la durée
+    demand_profile_step: float = 1.0  # h par valeur du profil
+    duration_hours: float = 8760
+    time_step_minutes: float = 60
+    motor_efficiency: float = 90  # %
+    electricity_cost: float = 0.12  # €/kWh
+
+class ExtendedPeriodResult(CalculationModel):
+    control: str
+    steps: int
+    time_step_minutes: float
+    energy_kwh: float
+    energy_cost: float  # €
+    specific_energy: Optional[float] = None  # kWh/m³ pompé
+    pumped_volume: float  # m³
+    demand_volume: float  # m³
+    unmet_demand_volume: float  # m³ (réservoir vide)
+    overflow_volume: float  # m³ (débordement)
+    pump_running_hours: float
+    pump_starts: int
+    max_starts_per_hour: int  # maximum sur une heure d'horloge
+    mean_starts_per_hour: float  # démarrages / heure de simulation
+    final_level: float  # m
+    level: UncertaintyStatistics  # m (statistiques du niveau sur la période)
+    daily_energy_kwh: List[float]
+    daily_min_level: List[float]
+    daily_max_level: List[float]
+    daily_starts: List[int]
+    warnings: List[str]
+
+# Réseaux maillés (irrigation, adduction villageoise)
+NETWORK_MAX_PIPES = 50000
+
+class NetworkNodeInput(CalculationModel):
+    id: str
+    elevation: float = 0  # m
+    demand: float = 0  # m³/h (soutirage positif, injection négative)
+    fixed_head: Optional[float] = None  # m - charge imposée (réservoir, bâche, château d'eau)
+
+class NetworkPipeInput(CalculationModel):
+    id: str
+    start_node: str
+    end_node: str
+    diameter: float  # mm (diamètre intérieur)
+    length: float  # m
+    material: str = "pvc"
+    fittings: List[FittingInput] = []
+
+class PipeNetworkInput(CalculationModel):
+    nodes: List[NetworkNodeInput]
+    pipes: List[NetworkPipeInput]
+    fluid_type: str = "water"
+    temperature: float = 20  # °C
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+    max_iterations: int = 50
+    head_tolerance: float = 1e-6  # m (résidu de charge par conduite)
+    flow_tolerance: float = 1e-6  # m³/h (résidu de continuité par nœud)
+
+class NetworkNodeResult(CalculationModel):
+    id: str
+    head: float  # m
+    pressure: float  # bar (charge - cote)
+    demand: float  # m³/h (débit fourni par les nœuds à charge imposée: valeur négative)
+
+class NetworkPipeResult(CalculationModel):
+    id: str
+    flow: float  # m³/h (positif de start_node vers end_node)
+    velocity: float  # m/s
+    head_loss: float  # m (toujours positive, dans le sens de l'écoulement)
+    friction_factor: float
+    reynolds_number: float
+
+class PipeNetworkResult(CalculationModel):
+    nodes: List[NetworkNodeResult]
+    pipes: List[NetworkPipeResult]
+    iterations: int
+    converged: bool
+    max_head_residual: float  # m
+    max_flow_residual: float  # m³/h
+
+# Optimisation des DN en coût global (investissement + énergie actualisée)
+class DiameterOptimizationInput(CalculationModel):
+    flow_rate: float  # m³/h
+    fluid_type: str = "water"
+    temperature: float = 20  # °C
+    suction_length: float  # m
+    discharge_length: float  # m
+    suction_fittings: List[FittingInput] = []
+    discharge_fittings: List[FittingInput] = []
+    static_head: float = 0  # m (hauteur géométrique + pression utile)
+    suction_type: str = "flooded"  # "flooded" ou "suction_lift"
+    hasp: float = 0  # m (hauteur d'aspiration)
+    npsh_required: float = 3.5  # m
+    npsh_safety_margin: float = 0.5  # m (marge minimale NPSHd - NPSHr)
+    materials: Optional[List[str]] = None  # défaut: tous les matériaux PIPE_MATERIALS
+    suction_dns: Optional[List[int]] = None  # défaut: tous les DN de DN_TO_DIAMETER
+    discharge_dns: Optional[List[int]] = None
+    max_suction_velocity: float = 1.5  # m/s
+    max_discharge_velocity: float = 2.5  # m/s
+    min_velocity: float = 0.3  # m/s (dépôts)
+    pipe_costs: Optional[Dict[str, float]] = None  # €/m posé en DN100 par matériau (défaut: PIPE_INSTALLED_COSTS)
+    pump_efficiency: float = 75  # %
+    motor_efficiency: float = 90  # %
+    operating_hours: float = 4000  # h/an
+    electricity_cost: float = 0.12  # €/kWh
+    lifetime_years: int = 20
+    discount_rate: float = 0.05  # taux d'actualisation annuel
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) or "precise" (Colebrook-White)
+
+class DiameterOption(CalculationModel):
+    material: str
+    suction_dn: int
+    discharge_dn: int
+    suction_velocity: float  # m/s
+    discharge_velocity: float  # m/s
+    total_head_loss: float  # m
+    total_head: float  # m
+    npsh_margin: float  # m (NPSHd - NPSHr)
+    capital_cost: float  # €
+    annual_energy_cost: float  # €/an
+    lifetime_energy_cost: float  # € actualisés
+    lifecycle_cost: float  # € (investissement + énergie actualisée)
+
+class DiameterOptimizationResult(CalculationModel):
+    pareto_front: List[DiameterOption]  # trié par coût d'investissement croissant
+    best_lifecycle: Optional[DiameterOption] = None  # coût global minimal parmi les options admissibles
+    evaluated: int
+    feasible: int
+    annuity_factor: float
+
+class ExpertAnalysisInput(CalculationModel):
+    # Paramètres hydrauliques
+    flow_rate: float  # m³/h
+    fluid_type: str
+    temperature: float = 20  # °C
+    
+    # Type d'aspiration
+    suction_type: str = "flooded"  # "flooded" ou "suction_lift"
+    
+    # Géométrie
+    suction_pipe_diameter: float  # mm (pour calculs)
+    discharge_pipe_diameter: float  # mm (pour calculs)
+    suction_dn: Optional[int] = None  # DN sélectionné par l'utilisateur (pour recommandations)
+    discharge_dn: Optional[int] = None  # DN sélectionné par l'utilisateur (pour recommandations)
+    suction_height: float  # m
+    discharge_height: float  # m
+    suction_length: float  # m
+    discharge_length: float  # m
+    total_length: float  # m
+    
+    # Pression utile
+    useful_pressure: float = 0  # bar
+    
+    # Matériaux
+    suction_material: str
+    discharge_material: str
+    
+    # Singularités détaillées ASPIRATION
+    suction_elbow_90: int = 0
+    suction_elbow_45: int = 0
+    suction_elbow_30: int = 0
+    suction_tee_flow: int = 0
+    suction_tee_branch: int = 0
+    suction_reducer_gradual: int = 0
+    suction_reducer_sudden: int = 0
+    suction_enlarger_gradual: int = 0
+    suction_enlarger_sudden: int = 0
+    suction_gate_valve: int = 0
+    suction_globe_valve: int = 0
+    suction_ball_valve: int = 0
+    suction_butterfly_valve: int = 0
+    suction_check_valve: int = 0
+    suction_strainer: int = 0
+    suction_foot_valve: int = 0
+    
+    # Singularités détaillées REFOULEMENT
+    discharge_elbow_90: int = 0
+    discharge_elbow_45: int = 0
+    discharge_elbow_30: int = 0
+    discharge_tee_flow: int = 0
+    discharge_tee_branch: int = 0
+    discharge_reducer_gradual: int = 0
+    discharge_reducer_sudden: int = 0
+    discharge_enlarger_gradual: int = 0
+    discharge_enlarger_sudden: int = 0
+    discharge_gate_valve: int = 0
+    discharge_globe_valve: int = 0
+    discharge_ball_valve: int = 0
+    discharge_butterfly_valve: int = 0
+    discharge_check_valve: int = 0
+    discharge_strainer: int = 0
+    discharge_flow_meter: int = 0
+    discharge_pressure_gauge: int = 0
+    
+    # Électrique
+    pump_efficiency: float  # %
+    motor_efficiency: float  # %
+    voltage: int = 400  # V
+    power_factor: float = 0.8
+    starting_method: str = "star_delta"
+    cable_length: float  # m
+    cable_material: str = "copper"
+    
+    # Expert
+    npsh_required: float  # m
+    installation_type: str = "surface"
+    pump_type: str = "centrifugal"
+    operating_hours: float = 8760  # h/an
+    electricity_cost: float = 0.12  # €/kWh
+    friction_factor_mode: str = "swamee_jain"  # "swamee_jain", "fast" (table) ou "precise" (Colebrook-White)
+    
+    # Conditions environnementales
+    altitude: float = 0
+    ambient_temperature: float = 25
+    humidity: float = 60
+
+class ExpertAnalysisResult(CalculationModel):
+    input_data: ExpertAnalysisInput
+    
+    # Résultats combinés
+    npshd_analysis: Dict[str, Any]
+    hmt_analysis: Dict[str, Any]
+    performance_analysis: Dict[str, Any]
+    electrical_analysis: Dict[str, Any]
+    
+    # Analyse globale
+    overall_efficiency: float  # %
+    total_head_loss: float  # m
+    system_stability: bool
+    energy_consumption: float  # kWh/m³
+    
+    # Recommandations d'expert
+    expert_recommendations: List[Dict[str, Any]]
+    optimization_potential: Dict[str, Any]
+    
+    # Données pour graphiques
+    performance_curves: Dict[str, Any]
+    system_curves: Dict[str, Any]
+
+class PerformanceAnalysisResult(CalculationModel):
+    input_data: PerformanceAnalysisInput
+    # Removed NPSH fields as requested
+    pump_efficiency: float  # %
+    motor_efficiency: float  # %
+    overall_efficiency: float  # %
+    velocity: float  # m/s - Added velocity data
+    reynolds_number: float  # Added Reynolds number
+    nominal_current: float  # A
+    starting_current: float  # A
+    recommended_cable_section: float  # mm²
+    power_calculations: Dict[str, float]
+    electrical_data: Dict[str, Any]
+    performance_curves: Dict[str, Any]  # Flow points and corresponding values
+    recommendations: List[str]
+    warnings: List[str]
+    alerts: List[str]  # Added alerts field
+
+# Legacy models for backward compatibility
+class CalculationInput(CalculationModel):
+    flow_rate: float  # m³/h
+    suction_height: float  # m (positive for suction, negative for flooded)
+    pipe_diameter: float  # mm
+    pipe_length: float  # m
+    fluid_type: str
+    temperature: float = 20  # °C
+    npsh_available: Optional[float] = None  # m
+    pump_efficiency: float = 75  # %
+    motor_efficiency: float = 90  # %
+    voltage: int = 400  # V (230 or 400)
+    cable_length: float = 50  # m
+
+class CalculationResult(CalculationModel):
+    # Input parameters
+    input_data: CalculationInput
+    
+    # Fluid properties
+    fluid_properties: FluidProperties
+    
+    # Flow calculations
+    flow_velocity: float  # m/s
+    reynolds_number: float
+    friction_factor: float
+    
+    # Pressure calculations
+    linear_pressure_loss: float  # Pa
+    total_pressure_loss: float  # Pa
+    hmt_meters: float  # m
+    hmt_bar: float  # bar
+    
+    # NPSH calculations
+    npsh_required: float  # m
+    npsh_available_calc: float  # m
+    cavitation_risk: bool
+    
+    # Power calculations
+    hydraulic_power: float  # kW
+    absorbed_power: float  # kW
+    total_efficiency: float  # %
+    
+    # Electrical calculations
+    nominal_current: float  # A
+    cable_section: float  # mm²
+    starting_method: str
+    
+    # Warnings and alerts
+    warnings: List[str]
+
+class PumpHistory(CalculationModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    project_name: str
+    calculation_result: CalculationResult
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class PumpHistoryCreate(CalculationModel):
+    project_name: str
+    calculation_result: CalculationResult
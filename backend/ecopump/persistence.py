@@ -0,0 +1,36 @@
+"""Persistance MongoDB.
+
+Le client motor est créé au premier appel de get_database(): importer le paquet ne lit
+ni MONGO_URL ni DB_NAME et n'ouvre aucune connexion (scripts de calcul sans base).
+"""
+import os
+import threading
+from pathlib import Path
+
+ENV_FILE = Path(__file__).resolve().parent.parent / '.env'
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Shared AsyncIOMotorClient, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from dotenv import load_dotenv
+                from motor.motor_asyncio import AsyncIOMotorClient
+                load_dotenv(ENV_FILE)
+                _client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    return _client
+
+def get_database():
+    """Application database (DB_NAME) on the shared client"""
+    return get_client()[os.environ['DB_NAME']]
+
+def close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
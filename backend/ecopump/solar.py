@@ -0,0 +1,564 @@
+"""Dimensionnement des systèmes de pompage solaire."""
+
+import logging
+from typing import List, Optional, Dict, Any
+import math
+
+from .catalog import (
+    SOLAR_IRRADIATION_DATABASE, SOLAR_PUMP_DATABASE, SOLAR_PANEL_DATABASE,
+    SOLAR_BATTERY_DATABASE, MPPT_CONTROLLER_DATABASE
+)
+from .instrumentation import StageClock
+from .models import CalculationModel
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# EXPERT SOLAIRE - DIMENSIONNEMENT POMPAGE SOLAIRE
+# ============================================================================
+
+# Modèles Pydantic pour le dimensionnement solaire
+class SolarPumpingInput(CalculationModel):
+    # Informations du projet
+    project_name: str = "Système de Pompage Solaire"
+    location_region: str = "france"
+    location_subregion: str = "centre"
+    
+    # Besoins en eau et hydrauliques
+    daily_water_need: float  # m³/jour
+    operating_hours: float = 8.0  # heures de fonctionnement par jour
+    flow_rate: float = 1.25  # m³/h - calculé automatiquement (volume/heures)
+    seasonal_variation: float = 1.2  # coefficient saisonnier (1.0 = constant, 1.5 = +50% en été)
+    peak_months: List[int] = [6, 7, 8]  # mois de pic (juin, juillet, août)
+    
+    # Paramètres hydrauliques pour calcul HMT restructuré
+    dynamic_level: float = 15.0  # Niveau dynamique (profondeur pompage)
+    tank_height: float = 5.0  # Hauteur du château d'eau
+    static_head: float = 20.0  # Hauteur géométrique (calculée auto: niveau + château)
+    dynamic_losses: float = 5.0  # Pertes de charge dynamiques
+    useful_pressure_head: float = 0.0  # Pression utile convertie en hauteur
+    total_head: float  # HMT totale (calculée automatiquement dans le frontend)
+    pipe_diameter: float = 100  # mm
+    pipe_length: float = 50  # mètres
+    
+    # Paramètres solaires
+    panel_peak_power: float = 400  # Wc - nouveau champ puissance crête panneau
+    
+    # Contraintes du système
+    autonomy_days: int = 2  # jours d'autonomie souhaités
+    system_voltage: int = 24  # Volts DC (12, 24, 48 ou 96)
+    installation_type: str = "submersible"  # ou "surface"
+    
+    # Paramètres économiques
+    electricity_cost: float = 0.15  # €/kWh (coût électricité locale)
+    project_lifetime: int = 25  # années
+    maintenance_cost_annual: float = 0.02  # % du coût initial par an
+    
+    # Contraintes d'installation
+    available_surface: Optional[float] = None  # m² disponibles pour panneaux
+    max_budget: Optional[float] = None  # € budget maximum
+    grid_connection_available: bool = False  # connexion réseau disponible
+    
+    # Paramètres environnementaux
+    ambient_temperature_avg: float = 25  # °C température ambiante moyenne
+    dust_factor: float = 0.95  # facteur de réduction dû à la poussière (0.9-1.0)
+    shading_factor: float = 1.0  # facteur d'ombrage (0.8-1.0)
+
+class SolarSystemDimensioning(CalculationModel):
+    # Dimensionnement automatique des composants
+    recommended_pump: Dict[str, Any]
+    solar_panels: Dict[str, Any]
+    batteries: Dict[str, Any]
+    mppt_controller: Dict[str, Any]
+    
+    # Calculs de performance
+    energy_production: Dict[str, float]  # kWh/jour par mois
+    energy_consumption: Dict[str, float]  # kWh/jour requis
+    system_sizing: Dict[str, Any]
+    
+    # Analyse économique
+    economic_analysis: Dict[str, float]
+    
+    # Recommandations
+    technical_recommendations: List[str]
+    optimization_suggestions: List[str]
+    
+class SolarPumpingResult(CalculationModel):
+    input_data: SolarPumpingInput
+    dimensioning: SolarSystemDimensioning
+    
+    # Calculs détaillés
+    solar_irradiation: Dict[str, Any]  # Changé de float vers Any pour accepter les dicts
+    system_efficiency: float
+    pump_operating_hours: Dict[str, float]  # heures/jour par mois
+    
+    # Graphiques et courbes
+    monthly_performance: Dict[str, List[float]]
+    system_curves: Dict[str, Any]
+    
+    # Alertes et warnings
+    warnings: List[str]
+    critical_alerts: List[str]
+
+def calculate_solar_pumping_system(input_data: SolarPumpingInput) -> SolarPumpingResult:
+    """
+    Calcul complet du dimensionnement d'un système de pompage solaire
+    """
+    warnings = []
+    critical_alerts = []
+    clock = StageClock()
+    
+    # 1. Récupération des données d'irradiation solaire
+    try:
+        region_data = SOLAR_IRRADIATION_DATABASE[input_data.location_region]
+        location_data = region_data[input_data.location_subregion]
+        irradiation_annual = location_data["irradiation_annual"]
+        irradiation_peak = location_data["peak_month"]
+        irradiation_min = location_data["min_month"]
+    except KeyError:
+        warnings.append("Région non trouvée, utilisation des valeurs par défaut")
+        irradiation_annual = 4.0
+        irradiation_peak = 6.5
+        irradiation_min = 2.0
+    
+    clock.lap("solar_irradiation")
+    
+    # 2. Calcul des besoins énergétiques hydrauliques
+    # Puissance hydraulique = (Q × H × ρ × g) / 3600  [Watts]
+    # Q en m³/h, H en mètres
+    daily_flow = input_data.daily_water_need  # m³/jour
+    peak_daily_flow = daily_flow * input_data.seasonal_variation
+    
+    # Estimation du débit horaire (fonctionnement sur heures de soleil utile)
+    useful_sun_hours = irradiation_annual  # approximation - conservé pour calculs batteries
+    # CORRECTION: Utiliser directement le débit fourni au lieu de calculer
+    hourly_flow_avg = input_data.flow_rate  # m³/h - débit réel calculé par le frontend
+    hourly_flow_peak = hourly_flow_avg * input_data.seasonal_variation  # m³/h avec variation saisonnière
+    
+    logger.debug("solar_sizing daily_water_need=%s flow_rate=%s hourly_flow_peak=%s",
+                 input_data.daily_water_need, input_data.flow_rate, hourly_flow_peak)
+    
+    # Puissance hydraulique requise
+    hydraulic_power_avg = (hourly_flow_avg * input_data.total_head * 1000 * 9.81) / 3600  # Watts
+    hydraulic_power_peak = (hourly_flow_peak * input_data.total_head * 1000 * 9.81) / 3600  # Watts
+    
+    clock.lap("solar_energy_needs")
+    
+    # 3. Sélection automatique de la pompe optimale
+    suitable_pumps = []
+    
+    for pump_id, pump_data in SOLAR_PUMP_DATABASE.items():
+        if (pump_data["type"] == input_data.installation_type and
+            hydraulic_power_peak <= max(pump_data["power_range"]) and
+            hourly_flow_peak <= max(pump_data["flow_range"]) and
+            input_data.total_head <= max(pump_data["head_range"])):
+            
+            # Calculer l'efficacité du point de fonctionnement
+            power_ratio = hydraulic_power_peak / max(pump_data["power_range"])
+            efficiency_penalty = 1.0 if power_ratio > 0.5 else (0.8 + 0.2 * power_ratio / 0.5)
+            
+            suitable_pumps.append({
+                "id": pump_id,
+                "data": pump_data,
+                "required_power": hydraulic_power_peak / (pump_data["efficiency"] * efficiency_penalty),
+                "efficiency_score": pump_data["efficiency"] * efficiency_penalty,
+                "cost_score": pump_data["price_eur"] / max(pump_data["power_range"])
+            })
+    
+    if not suitable_pumps:
+        logger.info("solar_pump_selection pumps=0 hourly_flow_peak=%s total_head=%s", hourly_flow_peak, input_data.total_head)
+        critical_alerts.append("Aucune pompe compatible trouvée pour ces spécifications. Utilisation de la pompe la plus puissante disponible.")
+        # Sélection de la pompe la plus puissante par défaut (SP 46A-40)
+        selected_pump_id = "sp_46a_40_rsi"
+        selected_pump = SOLAR_PUMP_DATABASE[selected_pump_id]
+        required_electrical_power = max(selected_pump["power_range"])  # Puissance maximale de cette pompe
+    else:
+        logger.debug("solar_pump_selection pumps=%d", len(suitable_pumps))
+        # Sélection de la pompe optimale - ALGORITHME CORRIGÉ
+        def pump_score(pump):
+            # Critères de sélection (plus bas = meilleur)
+            efficiency_score = pump["efficiency_score"]
+            base_cost = pump["data"]["price_eur"]
+            max_flow = max(pump["data"]["flow_range"])
+            
+            # 1. Pénalité forte pour surdimensionnement
+            flow_adequacy = hourly_flow_peak / max_flow
+            if flow_adequacy < 0.1:  # Pompe 10x trop grosse
+                oversizing_penalty = 10.0
+            elif flow_adequacy < 0.2:  # Pompe 5x trop grosse  
+                oversizing_penalty = 5.0
+            elif flow_adequacy < 0.4:  # Pompe 2.5x trop grosse
+                oversizing_penalty = 2.0
+            else:  # Pompe bien dimensionnée
+                oversizing_penalty = 1.0
+            
+            # 2. Score final : coût pénalisé divisé par efficacité (plus bas = meilleur)
+            return (base_cost * oversizing_penalty) / efficiency_score
+        
+        best_pump = min(suitable_pumps, key=pump_score)
+        selected_pump_id = best_pump["id"]
+        selected_pump = best_pump["data"]
+        required_electrical_power = best_pump["required_power"]
+    
+    clock.lap("solar_pump_selection")
+    
+    # 4. Dimensionnement des panneaux solaires
+    # Facteur de dégradation et pertes système
+    system_losses = 0.85  # 15% pertes (câblage, MPPT, température, vieillissement)
+    environmental_factor = input_data.dust_factor * input_data.shading_factor
+    
+    # Puissance crête nécessaire
+    peak_power_needed = required_electrical_power / (system_losses * environmental_factor)
+    
+    # Sélection des panneaux optimaux
+    selected_panels = {}
+    for panel_id, panel_data in SOLAR_PANEL_DATABASE.items():
+        if input_data.system_voltage in [12, 24] and panel_data["voltage_nominal"] <= input_data.system_voltage * 2:
+            nb_panels = math.ceil(peak_power_needed / panel_data["power_nominal"])
+            total_power = nb_panels * panel_data["power_nominal"]
+            total_cost = nb_panels * panel_data["price_eur"]
+            surface_required = nb_panels * (panel_data["size"][0] * panel_data["size"][1])
+            
+            selected_panels[panel_id] = {
+                "panel_data": panel_data,
+                "quantity": nb_panels,
+                "total_power": total_power,
+                "total_cost": total_cost,
+                "surface_required": surface_required,
+                "power_ratio": total_power / peak_power_needed
+            }
+    
+    # Sélection du meilleur compromis
+    if selected_panels:
+        best_panels_id = min(selected_panels.keys(), 
+                           key=lambda x: selected_panels[x]["total_cost"] / selected_panels[x]["total_power"])
+        recommended_panels = selected_panels[best_panels_id]
+    else:
+        warnings.append("Configuration de panneaux par défaut utilisée")
+        recommended_panels = {
+            "panel_data": SOLAR_PANEL_DATABASE["monocristallin_400w"],
+            "quantity": math.ceil(peak_power_needed / 400),
+            "total_power": math.ceil(peak_power_needed / 400) * 400,
+            "total_cost": math.ceil(peak_power_needed / 400) * 280,
+            "surface_required": math.ceil(peak_power_needed / 400) * 2.0,
+            "power_ratio": (math.ceil(peak_power_needed / 400) * 400) / peak_power_needed
+        }
+    
+    clock.lap("solar_panel_sizing")
+    
+    # 5. Dimensionnement des batteries
+    # Énergie requise pour l'autonomie
+    daily_energy_need = required_electrical_power * useful_sun_hours / 1000  # kWh/jour
+    autonomy_energy = daily_energy_need * input_data.autonomy_days  # kWh
+    
+    # Sélection des batteries
+    selected_batteries = {}
+    for battery_id, battery_data in SOLAR_BATTERY_DATABASE.items():
+        if battery_data["voltage"] == 12:  # Standardisation sur 12V
+            usable_energy = battery_data["energy"] * battery_data["discharge_depth"]
+            nb_batteries = math.ceil(autonomy_energy / usable_energy)
+            
+            # Configuration série/parallèle pour atteindre la tension système
+            voltage_multiplier = input_data.system_voltage // battery_data["voltage"]
+            nb_series = voltage_multiplier
+            nb_parallel = math.ceil(nb_batteries / nb_series)
+            total_batteries = nb_series * nb_parallel
+            
+            selected_batteries[battery_id] = {
+                "battery_data": battery_data,
+                "series": nb_series,
+                "parallel": nb_parallel,
+                "total_quantity": total_batteries,
+                "total_capacity": total_batteries * battery_data["capacity"],
+                "total_energy": total_batteries * battery_data["energy"],
+                "usable_energy": total_batteries * usable_energy,
+                "total_cost": total_batteries * battery_data["price_eur"]
+            }
+    
+    # Sélection des meilleures batteries (compromis coût/performance)
+    if selected_batteries:
+        best_battery_id = min(selected_batteries.keys(),
+                            key=lambda x: selected_batteries[x]["total_cost"] / selected_batteries[x]["usable_energy"])
+        recommended_batteries = selected_batteries[best_battery_id]
+    else:
+        warnings.append("Configuration de batteries par défaut utilisée")
+        recommended_batteries = {
+            "battery_data": SOLAR_BATTERY_DATABASE["lithium_100ah"],
+            "series": input_data.system_voltage // 12,
+            "parallel": 2,
+            "total_quantity": 4,
+            "total_capacity": 400,
+            "total_energy": 4.8,
+            "usable_energy": 4.56,
+            "total_cost": 1800
+        }
+    
+    clock.lap("solar_battery_sizing")
+    
+    # 6. Sélection du système de contrôle adapté au type de pompe
+    if selected_pump.get("category") == "sqf_integrated":
+        # Pour les SQF : convertisseur intégré, pas de régulateur séparé
+        recommended_mppt = {
+            "mppt_data": {
+                "name": "Convertisseur intégré SQF",
+                "description": "Convertisseur de fréquence intégré dans la pompe",
+                "max_power": required_electrical_power,
+                "voltage_range": selected_pump.get("voltage", [48]),
+                "price_eur": 0  # Inclus dans le prix de la pompe
+            },
+            "quantity": 1,
+            "total_cost": 0
+        }
+    elif selected_pump.get("category") in ["sp_rsi", "sp_rsi_industrial"]:
+        # Pour les SP + RSI : le RSI EST le régulateur, coût inclus dans la pompe
+        rsi_cost = selected_pump.get("rsi_cost", 0)
+        recommended_mppt = {
+            "mppt_data": {
+                "name": "Convertisseur RSI Grundfos",
+                "description": f"RSI externe pour pompe SP - {required_electrical_power}W",
+                "max_power": required_electrical_power,
+                "voltage_range": selected_pump.get("voltage", [192]),
+                "price_eur": rsi_cost
+            },
+            "quantity": 1,
+            "total_cost": rsi_cost
+        }
+    else:
+        # Pour les autres pompes : régulateur MPPT solaire classique
+        max_pv_current = recommended_panels["quantity"] * recommended_panels["panel_data"]["current_nominal"]
+        max_pv_voltage = recommended_panels["panel_data"]["voltage_nominal"] * 1.25  # facteur de sécurité
+        
+        suitable_mppt = []
+        for mppt_id, mppt_data in MPPT_CONTROLLER_DATABASE.items():
+            if (mppt_data["max_current"] >= max_pv_current * 1.25 and
+                mppt_data["max_pv_voltage"] >= max_pv_voltage):
+                suitable_mppt.append({
+                    "id": mppt_id,
+                    "data": mppt_data,
+                    "cost_efficiency": mppt_data["price_eur"] / mppt_data["max_power"]
+                })
+        
+        if suitable_mppt:
+            best_mppt = min(suitable_mppt, key=lambda x: x["cost_efficiency"])
+            recommended_mppt = {
+                "mppt_data": best_mppt["data"],
+                "quantity": 1,
+                "total_cost": best_mppt["data"]["price_eur"]
+            }
+        else:
+            # Régulateur par défaut adapté à la puissance
+            if required_electrical_power < 1000:
+                default_cost = 180
+            elif required_electrical_power < 3000:
+                default_cost = 450
+            elif required_electrical_power < 8000:
+                default_cost = 850
+            else:
+                default_cost = 1500
+                
+            warnings.append("Régulateur par défaut utilisé - dimensionner selon puissance réelle")
+            recommended_mppt = {
+                "mppt_data": {
+                    "name": f"Régulateur MPPT {required_electrical_power}W",
+                    "description": f"Régulateur adapté à {required_electrical_power}W",
+                    "max_power": required_electrical_power * 1.2,
+                    "price_eur": default_cost
+                },
+                "quantity": 1,
+                "total_cost": default_cost
+            }
+    
+    clock.lap("solar_controller_selection")
+    
+    # 7. Calculs de performance mensuelle
+    monthly_irradiation = []
+    for month in range(12):
+        if month + 1 in input_data.peak_months:
+            irradiation = irradiation_peak - (irradiation_peak - irradiation_annual) * 0.3
+        elif month + 1 in [11, 12, 1, 2]:  # mois d'hiver
+            irradiation = irradiation_min + (irradiation_annual - irradiation_min) * 0.5
+        else:
+            irradiation = irradiation_annual
+        monthly_irradiation.append(irradiation)
+    
+    # Production énergétique mensuelle
+    energy_production = {}
+    energy_consumption = {}
+    pump_hours = {}
+    
+    for month, irradiation in enumerate(monthly_irradiation):
+        monthly_production = (recommended_panels["total_power"] * irradiation * 
+                            system_losses * environmental_factor) / 1000  # kWh/jour
+        
+        # Besoins saisonniers
+        if month + 1 in input_data.peak_months:
+            monthly_need = peak_daily_flow
+        else:
+            monthly_need = daily_flow
+        
+        # Heures de fonctionnement de la pompe
+        available_energy = monthly_production
+        pump_power_kw = required_electrical_power / 1000
+        max_pump_hours = available_energy / pump_power_kw if pump_power_kw > 0 else 0
+        
+        # Limitation par les besoins en eau
+        required_pump_hours = (monthly_need * input_data.total_head * 1000 * 9.81) / (
+            selected_pump["efficiency"] * required_electrical_power * 3600)
+        
+        actual_pump_hours = min(max_pump_hours, required_pump_hours, irradiation)
+        
+        energy_production[f"month_{month+1}"] = monthly_production
+        energy_consumption[f"month_{month+1}"] = actual_pump_hours * pump_power_kw
+        pump_hours[f"month_{month+1}"] = actual_pump_hours
+    
+    clock.lap("solar_monthly_performance")
+    
+    # 8. Analyse économique
+    total_system_cost = (recommended_panels["total_cost"] + 
+                        recommended_batteries["total_cost"] + 
+                        recommended_mppt["total_cost"] + 
+                        selected_pump["price_eur"] + 
+                        1500)  # Installation et accessoires
+    
+    # Économies annuelles (vs pompe électrique)
+    annual_water_production = sum([pump_hours[f"month_{month}"] * 
+                                  (hourly_flow_avg if month not in input_data.peak_months 
+                                   else hourly_flow_avg * input_data.seasonal_variation) * 30.44 
+                                  for month in range(1, 13)])
+    
+    equivalent_electrical_consumption = annual_water_production * input_data.total_head * 1000 * 9.81 / (
+        0.70 * 3600 * 1000)  # kWh/an avec rendement pompe électrique 70%
+    
+    annual_savings = equivalent_electrical_consumption * input_data.electricity_cost
+    
+    # Analyse de rentabilité
+    payback_period = total_system_cost / annual_savings if annual_savings > 0 else float('inf')
+    
+    # Maintenance annuelle
+    annual_maintenance = total_system_cost * input_data.maintenance_cost_annual
+    net_annual_savings = annual_savings - annual_maintenance
+    
+    economic_analysis = {
+        "total_system_cost": total_system_cost,
+        "annual_savings": annual_savings,
+        "annual_maintenance": annual_maintenance,
+        "net_annual_savings": net_annual_savings,
+        "payback_period": payback_period,
+        "project_lifetime": input_data.project_lifetime,
+        "total_lifetime_savings": net_annual_savings * input_data.project_lifetime,
+        "roi_percentage": (net_annual_savings * input_data.project_lifetime / total_system_cost) * 100
+    }
+    
+    clock.lap("solar_economics")
+    
+    # 9. Recommandations techniques
+    technical_recommendations = []
+    optimization_suggestions = []
+    
+    if payback_period > 10:
+        optimization_suggestions.append(f"Période de retour élevée ({payback_period:.1f} ans) - Considérer l'optimisation du système")
+    
+    if recommended_panels["surface_required"] > 100:
+        technical_recommendations.append(f"Surface importante requise ({recommended_panels['surface_required']:.1f} m²)")
+    
+    if input_data.autonomy_days > 3:
+        technical_recommendations.append("Autonomie élevée - Système de stockage important requis")
+    
+    if irradiation_annual < 3.5:
+        warnings.append("Irradiation faible pour cette région - Performance réduite")
+    
+    # Vérifications critiques
+    if required_electrical_power > recommended_panels["total_power"] * 0.8:
+        critical_alerts.append("Puissance des panneaux juste suffisante - Prévoir une marge de sécurité")
+    
+    if autonomy_energy > recommended_batteries["usable_energy"] * 0.9:
+        critical_alerts.append("Capacité de stockage limite atteinte")
+    
+    clock.lap("solar_recommendations")
+    
+    # 10. Compilation des résultats
+    dimensioning = SolarSystemDimensioning(
+        recommended_pump={
+            "model": selected_pump["name"],
+            "power": required_electrical_power,
+            "efficiency": selected_pump["efficiency"],
+            "type": selected_pump["type"],
+            "cost": selected_pump["price_eur"],
+            "specifications": selected_pump
+        },
+        solar_panels={
+            "model": recommended_panels["panel_data"]["name"],
+            "quantity": recommended_panels["quantity"],
+            "total_power": recommended_panels["total_power"],
+            "surface_required": recommended_panels["surface_required"],
+            "cost": recommended_panels["total_cost"],
+            "specifications": recommended_panels
+        },
+        batteries={
+            "model": recommended_batteries["battery_data"]["name"],
+            "configuration": f"{recommended_batteries['series']}S{recommended_batteries['parallel']}P",
+            "total_quantity": recommended_batteries["total_quantity"],
+            "total_capacity": recommended_batteries["total_capacity"],
+            "usable_energy": recommended_batteries["usable_energy"],
+            "cost": recommended_batteries["total_cost"],
+            "specifications": recommended_batteries
+        },
+        mppt_controller={
+            "model": recommended_mppt["mppt_data"]["name"],
+            "quantity": recommended_mppt["quantity"],
+            "cost": recommended_mppt["total_cost"],
+            "specifications": recommended_mppt
+        },
+        energy_production=energy_production,
+        energy_consumption=energy_consumption,
+        system_sizing={
+            "total_power": recommended_panels["total_power"],
+            "system_efficiency": system_losses * environmental_factor,
+            "autonomy_days": input_data.autonomy_days,
+            "daily_water_capacity": daily_flow,
+            "peak_water_capacity": peak_daily_flow
+        },
+        economic_analysis=economic_analysis,
+        technical_recommendations=technical_recommendations,
+        optimization_suggestions=optimization_suggestions
+    )
+    
+    # Courbes de performance pour graphiques
+    monthly_performance = {
+        "months": list(range(1, 13)),
+        "irradiation": monthly_irradiation,
+        "production": [energy_production[f"month_{m}"] for m in range(1, 13)],
+        "consumption": [energy_consumption[f"month_{m}"] for m in range(1, 13)],
+        "pump_hours": [pump_hours[f"month_{m}"] for m in range(1, 13)],
+        "water_production": [pump_hours[f"month_{m}"] * hourly_flow_avg * 
+                           (input_data.seasonal_variation if m in input_data.peak_months else 1.0) 
+                           for m in range(1, 13)]
+    }
+    
+    system_curves = {
+        "power_curve": {
+            "irradiation_points": [i for i in range(1, 11)],
+            "power_output": [i * recommended_panels["total_power"] * system_losses / 10 for i in range(1, 11)]
+        },
+        "pump_curve": {
+            "flow_points": [i * hourly_flow_peak / 10 for i in range(1, 11)],
+            "head_points": [input_data.total_head + (i * input_data.total_head * 0.1) for i in range(1, 11)]
+        }
+    }
+    
+    return SolarPumpingResult(
+        input_data=input_data,
+        dimensioning=dimensioning,
+        solar_irradiation={
+            "annual": irradiation_annual,
+            "peak_month": irradiation_peak,
+            "min_month": irradiation_min,
+            "monthly": {f"month_{i+1}": monthly_irradiation[i] for i in range(12)}
+        },
+        system_efficiency=system_losses * environmental_factor,
+        pump_operating_hours=pump_hours,
+        monthly_performance=monthly_performance,
+        system_curves=system_curves,
+        warnings=warnings,
+        critical_alerts=critical_alerts
+    )
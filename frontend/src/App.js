@@ -8518,6 +8518,25 @@ const HMTCalculator = ({ fluids, pipeMaterials, fittings }) => {
   );
 };
 
+// Application d'un JSON Patch (RFC 6902) renvoyé par le recalcul en direct, sans muter l'original
+const applyJsonPatch = (target, patch) => patch.reduce((doc, { op, path, value }) => {
+  if (path === '') return value;
+  const keys = path.split('/').slice(1).map(key => key.replace(/~1/g, '/').replace(/~0/g, '~'));
+  const update = (node, depth) => {
+    const copy = Array.isArray(node) ? [...node] : { ...node };
+    const key = keys[depth];
+    if (depth < keys.length - 1) {
+      copy[key] = update(node[key], depth + 1);
+    } else if (op === 'remove') {
+      if (Array.isArray(copy)) copy.splice(Number(key), 1); else delete copy[key];
+    } else {
+      copy[key] = value;
+    }
+    return copy;
+  };
+  return update(doc, 0);
+}, target);
+
 // Component pour Tab Expert - Analyse Complète Professionnelle
 const ExpertCalculator = ({ fluids, pipeMaterials, fittings }) => {
   // Fonction universelle pour calculer les propriétés des fluides
@@ -8679,6 +8698,12 @@ const ExpertCalculator = ({ fluids, pipeMaterials, fittings }) => {
   const [showSingularities, setShowSingularities] = useState(false); // État pour les singularités collapsibles
   const chartRef = useRef(null);
   const chartInstance = useRef(null);
+  // Recalcul en direct: le serveur garde la dernière entrée et le dernier résultat de la session
+  const liveSocket = useRef(null);
+  const liveSentPayload = useRef({});
+  const liveResult = useRef(null);
+  const liveSeq = useRef(0);
+  const liveLastData = useRef(null);
 
   const handleInputChange = (field, value) => {
     // Permettre les valeurs 0, 0.5, les chaînes vides, et toutes les autres valeurs numériques valides
@@ -9295,46 +9320,70 @@ const ExpertCalculator = ({ fluids, pipeMaterials, fittings }) => {
     URL.revokeObjectURL(url);
   };
 
+  const buildExpertPayload = (data) => {
+    // Convertir les valeurs vides en 0 pour les calculs (sans affecter l'affichage)
+    const cleanedData = {
+      ...data,
+      suction_height: data.suction_height === '' ? 0 : data.suction_height,
+      discharge_height: data.discharge_height === '' ? 0 : data.discharge_height,
+      suction_length: data.suction_length === '' ? 0 : data.suction_length,
+      discharge_length: data.discharge_length === '' ? 0 : data.discharge_length,
+      npsh_required: data.npsh_required === '' ? 0 : data.npsh_required
+    };
+    
+    return {
+      ...cleanedData,
+      // Formatage des raccords
+      suction_fittings: [
+        { fitting_type: 'elbow_90', quantity: data.suction_elbow_90 },
+        { fitting_type: 'elbow_45', quantity: data.suction_elbow_45 },
+        { fitting_type: 'tee', quantity: data.suction_tee },
+        { fitting_type: 'reducer', quantity: data.suction_reducer },
+        { fitting_type: 'valve', quantity: data.suction_valve },
+        { fitting_type: 'check_valve', quantity: data.suction_check_valve },
+        { fitting_type: 'strainer', quantity: data.suction_strainer }
+      ].filter(f => f.quantity > 0),
+      discharge_fittings: [
+        { fitting_type: 'elbow_90', quantity: data.discharge_elbow_90 },
+        { fitting_type: 'elbow_45', quantity: data.discharge_elbow_45 },
+        { fitting_type: 'tee', quantity: data.discharge_tee },
+        { fitting_type: 'reducer', quantity: data.discharge_reducer },
+        { fitting_type: 'valve', quantity: data.discharge_valve },
+        { fitting_type: 'check_valve', quantity: data.discharge_check_valve }
+      ].filter(f => f.quantity > 0),
+      elbow_90_qty: data.suction_elbow_90 + data.discharge_elbow_90,
+      elbow_45_qty: data.suction_elbow_45 + data.discharge_elbow_45,
+      valve_qty: data.suction_valve + data.discharge_valve,
+      check_valve_qty: data.suction_check_valve + data.discharge_check_valve
+    };
+  };
+
   const calculateExpertAnalysis = async (data = inputData) => {
     if (!autoCalculate && data === inputData) return;
     
+    const payload = buildExpertPayload(data);
+    const socket = liveSocket.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      // Canal en direct ouvert: n'envoyer que les champs modifiés, le serveur répond par un patch
+      const previous = liveSentPayload.current;
+      const changes = {};
+      Object.keys({ ...previous, ...payload }).forEach(key => {
+        if (JSON.stringify(payload[key]) !== JSON.stringify(previous[key])) {
+          changes[key] = payload[key] === undefined ? null : payload[key];
+        }
+      });
+      liveLastData.current = data;
+      if (Object.keys(changes).length === 0) return;
+      liveSentPayload.current = payload;
+      liveSeq.current += 1;
+      setLoading(true);
+      socket.send(JSON.stringify({ seq: liveSeq.current, changes }));
+      return;
+    }
+    
     setLoading(true);
     try {
-      // Convertir les valeurs vides en 0 pour les calculs (sans affecter l'affichage)
-      const cleanedData = {
-        ...data,
-        suction_height: data.suction_height === '' ? 0 : data.suction_height,
-        discharge_height: data.discharge_height === '' ? 0 : data.discharge_height,
-        suction_length: data.suction_length === '' ? 0 : data.suction_length,
-        discharge_length: data.discharge_length === '' ? 0 : data.discharge_length,
-        npsh_required: data.npsh_required === '' ? 0 : data.npsh_required
-      };
-      
-      const response = await axios.post(`${API}/expert-analysis`, {
-        ...cleanedData,
-        // Formatage des raccords
-        suction_fittings: [
-          { fitting_type: 'elbow_90', quantity: data.suction_elbow_90 },
-          { fitting_type: 'elbow_45', quantity: data.suction_elbow_45 },
-          { fitting_type: 'tee', quantity: data.suction_tee },
-          { fitting_type: 'reducer', quantity: data.suction_reducer },
-          { fitting_type: 'valve', quantity: data.suction_valve },
-          { fitting_type: 'check_valve', quantity: data.suction_check_valve },
-          { fitting_type: 'strainer', quantity: data.suction_strainer }
-        ].filter(f => f.quantity > 0),
-        discharge_fittings: [
-          { fitting_type: 'elbow_90', quantity: data.discharge_elbow_90 },
-          { fitting_type: 'elbow_45', quantity: data.discharge_elbow_45 },
-          { fitting_type: 'tee', quantity: data.discharge_tee },
-          { fitting_type: 'reducer', quantity: data.discharge_reducer },
-          { fitting_type: 'valve', quantity: data.discharge_valve },
-          { fitting_type: 'check_valve', quantity: data.discharge_check_valve }
-        ].filter(f => f.quantity > 0),
-        elbow_90_qty: data.suction_elbow_90 + data.discharge_elbow_90,
-        elbow_45_qty: data.suction_elbow_45 + data.discharge_elbow_45,
-        valve_qty: data.suction_valve + data.discharge_valve,
-        check_valve_qty: data.suction_check_valve + data.discharge_check_valve
-      });
+      const response = await axios.post(`${API}/expert-analysis`, payload);
       
       setResults(response.data);
       updateExpertCharts(response.data);
@@ -9765,6 +9814,38 @@ const ExpertCalculator = ({ fluids, pipeMaterials, fittings }) => {
     }
   }, []);
 
+  // Canal de recalcul en direct (WebSocket); en son absence, calculateExpertAnalysis repasse par le POST complet
+  React.useEffect(() => {
+    if (typeof WebSocket === 'undefined') return undefined;
+    const socket = new WebSocket(`${API.replace(/^http/, 'ws')}/ws/expert-analysis`);
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      const current = message.seq === liveSeq.current;
+      if (message.type === 'result') {
+        liveResult.current = applyJsonPatch(liveResult.current, message.patch);
+        setResults(liveResult.current);
+        updateExpertCharts(liveResult.current);
+      } else if (current) {
+        console.error('Erreur analyse expert (direct):', message.detail);
+        if (liveLastData.current) calculateFallbackAnalysis(liveLastData.current);
+      }
+      if (current) setLoading(false);
+    };
+    socket.onclose = () => {
+      // La session serveur est perdue: tout renvoyer à la prochaine connexion
+      liveSocket.current = null;
+      liveSentPayload.current = {};
+      liveResult.current = null;
+      setLoading(false);
+    };
+    liveSocket.current = socket;
+    return () => {
+      socket.onclose = null;
+      socket.close();
+      liveSocket.current = null;
+    };
+  }, []);
+
   return (
     <div className="space-y-4">
       {/* Header Expert - Plus compact */}
@@ -0,0 +1,25 @@
+"""Configuration pytest: le backend est importé directement (sans serveur ni MongoDB)."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Calculs dans un pool de threads: pas de démarrage de processus à chaque session de test
+os.environ.setdefault("CALC_EXECUTOR_MODE", "thread")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "ecopump_tests")
+
+@pytest.fixture(scope="session")
+def server():
+    import server as server_module
+    return server_module
+
+@pytest.fixture(scope="session")
+def client(server):
+    from fastapi.testclient import TestClient
+    with TestClient(server.app) as test_client:
+        yield test_client
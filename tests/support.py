@@ -0,0 +1,88 @@
+"""Entrées de référence et comparaisons partagées entre les fichiers de test."""
+import json
+import math
+from pathlib import Path
+
+from ecopump.catalog import PIPE_MATERIALS
+
+NPSHD_INPUT = {
+    "suction_type": "flooded", "hasp": 2, "flow_rate": 50, "fluid_type": "water", "temperature": 20,
+    "pipe_diameter": 114.3, "pipe_material": "pvc", "pipe_length": 10,
+    "suction_fittings": [{"fitting_type": "elbow_90", "quantity": 2}], "npsh_required": 3.5
+}
+HMT_INPUT = {
+    "installation_type": "surface", "suction_type": "flooded", "hasp": 2, "discharge_height": 30,
+    "useful_pressure": 1.5, "suction_pipe_diameter": 114.3, "discharge_pipe_diameter": 88.9,
+    "suction_pipe_length": 10, "discharge_pipe_length": 100, "suction_pipe_material": "pvc",
+    "discharge_pipe_material": "steel", "suction_fittings": [{"fitting_type": "elbow_90", "quantity": 2}],
+    "discharge_fittings": [{"fitting_type": "check_valve", "quantity": 1}],
+    "fluid_type": "water", "temperature": 20, "flow_rate": 50
+}
+PERFORMANCE_INPUT = {
+    "flow_rate": 50, "hmt": 25, "pipe_diameter": 114.3, "fluid_type": "water", "pipe_material": "pvc",
+    "pump_efficiency": 75, "motor_efficiency": 90, "voltage": 400, "power_factor": 0.8,
+    "starting_method": "star_delta", "cable_length": 50, "cable_material": "copper"
+}
+EXPERT_INPUT = {
+    "flow_rate": 50, "fluid_type": "water", "temperature": 20, "suction_pipe_diameter": 114.3,
+    "discharge_pipe_diameter": 88.9, "suction_height": 2, "discharge_height": 30, "suction_length": 10,
+    "discharge_length": 100, "total_length": 110, "suction_material": "pvc", "discharge_material": "pvc",
+    "pump_efficiency": 75, "motor_efficiency": 90, "cable_length": 50, "npsh_required": 3.5,
+    "suction_elbow_90": 2, "discharge_check_valve": 1
+}
+SOLAR_INPUT = {"daily_water_need": 20, "operating_hours": 8, "flow_rate": 2.5, "total_head": 40}
+AUDIT_INPUT = {
+    "current_flow_rate": 40, "required_flow_rate": 50, "original_design_flow": 55, "current_hmt": 35,
+    "required_hmt": 30, "original_design_hmt": 32, "measured_current": 25, "rated_current": 20,
+    "measured_power": 12, "rated_power": 11, "vibration_level": 6, "noise_level": 85, "motor_temperature": 90,
+    "bearing_temperature": 80, "leakage_present": True, "corrosion_level": "moderate", "alignment_status": "poor",
+    "operating_hours_daily": 16, "operating_days_yearly": 300, "reported_issues": ["bruit", "vibrations"],
+    "performance_degradation": True
+}
+
+def assert_json_close(actual, expected, rel=1e-9, path="", ignore=()):
+    """Deep comparison of decoded JSON documents, floats compared with a relative tolerance"""
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict), path
+        keys = set(expected) - set(ignore)
+        assert set(actual) - set(ignore) == keys, f"{path}: {sorted(set(actual) ^ set(expected))}"
+        for key in keys:
+            assert_json_close(actual[key], expected[key], rel, f"{path}/{key}", ignore)
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected), path
+        for index, (left, right) in enumerate(zip(actual, expected)):
+            assert_json_close(left, right, rel, f"{path}/{index}", ignore)
+    elif isinstance(expected, float) and isinstance(actual, (int, float)) and not isinstance(actual, bool):
+        assert math.isclose(actual, expected, rel_tol=rel, abs_tol=1e-12), f"{path}: {actual} != {expected}"
+    else:
+        assert actual == expected, f"{path}: {actual!r} != {expected!r}"
+
+# Réponses de l'application monolithique d'origine (avant découpage et optimisations)
+BASELINE = json.loads((Path(__file__).parent / "data" / "baseline_responses.json").read_text(encoding="utf-8"))
+# Écarts volontaires depuis le monolithe: paramètres d'entrée ajoutés (renvoyés dans input_data),
+# durées par étape sorties du corps de réponse, identifiants d'audit générés à chaque appel
+BASELINE_IGNORED_KEYS = ("friction_factor_mode", "curve_resolution", "computation_stages", "audit_id", "audit_date")
+
+def baseline_cases(endpoint):
+    """Recorded (input, status, response) cases of one POST endpoint"""
+    return [case for case in BASELINE["post"] if case["endpoint"] == endpoint]
+
+# Formules scalaires d'origine, références des tests d'équivalence
+def legacy_friction_factor(reynolds_number, relative_roughness):
+    """Swamee-Jain tel qu'écrit dans les fonctions scalaires d'origine"""
+    if reynolds_number < 2300:
+        return 64 / reynolds_number
+    term1 = (relative_roughness / 3.7) ** 1.11
+    term2 = 6.9 / reynolds_number
+    return 0.25 / (math.log10(term1 + term2) ** 2)
+
+def legacy_darcy_head_loss(flow_rate, pipe_diameter, pipe_length, pipe_material, density, viscosity):
+    """calculate_darcy_head_loss d'origine (boucle scalaire)"""
+    if flow_rate <= 0 or pipe_diameter <= 0:
+        return 0
+    diameter_m = pipe_diameter / 1000
+    velocity = (flow_rate / 3600) / (math.pi * (diameter_m / 2) ** 2)
+    reynolds_number = (density * velocity * diameter_m) / viscosity
+    roughness = PIPE_MATERIALS[pipe_material]["roughness"] if pipe_material in PIPE_MATERIALS else 0.045
+    friction_factor = legacy_friction_factor(reynolds_number, roughness / pipe_diameter)
+    return friction_factor * (pipe_length / diameter_m) * (velocity ** 2) / (2 * 9.81)
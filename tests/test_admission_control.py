@@ -0,0 +1,70 @@
+"""Contrôle d'admission: file bornée par route, délestage 503 avec Retry-After, routes légères non bloquées."""
+import asyncio
+
+import pytest
+
+from tests.support import EXPERT_INPUT, NPSHD_INPUT
+
+def test_slots_are_handed_to_waiters_in_order(server):
+    gate = server.AdmissionGate("/test", "analysis", concurrency=1, queue_depth=2, queue_timeout=5)
+    order = []
+
+    async def request(name):
+        await gate.acquire()
+        order.append(name)
+        await asyncio.sleep(0.01)
+        gate.release(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(request(name) for name in "abc"))
+    asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert gate.active == 0 and gate.waiting == 0
+    assert (gate.admitted, gate.queued) == (3, 2)
+
+def test_full_queue_is_shed_with_retry_after(server):
+    gate = server.AdmissionGate("/test", "analysis", concurrency=1, queue_depth=1, queue_timeout=5)
+    gate.service_time = 3.0
+
+    async def scenario():
+        await gate.acquire()
+        waiting = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(server.AdmissionRejected) as rejection:
+            await gate.acquire()
+        gate.release()
+        await waiting
+        return rejection.value
+    rejection = asyncio.run(scenario())
+    assert rejection.reason == "queue_full"
+    assert rejection.retry_after == 6  # 2 requêtes × 3 s sur une place
+    assert gate.shed == {"queue_full": 1, "deadline": 0}
+
+def test_queue_deadline_and_cancellation_leave_no_waiter(server):
+    gate = server.AdmissionGate("/test", "analysis", concurrency=1, queue_depth=4, queue_timeout=0.05)
+
+    async def scenario():
+        await gate.acquire()
+        with pytest.raises(server.AdmissionRejected) as rejection:
+            await gate.acquire()
+        abandoned = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.gather(abandoned, return_exceptions=True)
+        return rejection.value
+    assert asyncio.run(scenario()).reason == "deadline"
+    assert gate.waiting == 0 and gate.active == 1
+
+def test_busy_route_answers_503_and_leaves_others_untouched(client, server, monkeypatch):
+    gate = server.ADMISSION_GATES["/api/expert-analysis"]
+    monkeypatch.setattr(gate, "concurrency", 1)
+    monkeypatch.setattr(gate, "queue_depth", 0)
+    monkeypatch.setattr(gate, "active", 1)  # place occupée par un calcul en cours
+    response = client.post("/api/expert-analysis", json=EXPERT_INPUT)
+    assert response.status_code == 503
+    assert 1 <= int(response.headers["retry-after"]) <= server.ADMISSION_RETRY_AFTER_MAX
+    assert "réessayer" in response.json()["detail"]
+    assert client.get("/api/fluids").status_code == 200
+    assert client.post("/api/calculate-npshd", json=NPSHD_INPUT).status_code == 200
+    assert gate.shed["queue_full"] >= 1
+    assert 'pump_admission_shed_total{route="/api/expert-analysis",class="analysis",reason="queue_full"}' in client.get("/metrics").text
@@ -0,0 +1,62 @@
+"""POST /api/calculate-hmt/batch: regroupement des parties partagées, réponses de l'application d'origine."""
+import pytest
+
+from ecopump.catalog import FITTING_COEFFICIENTS
+from ecopump.hydraulics import get_fluid_properties
+from tests.support import (
+    BASELINE_IGNORED_KEYS, HMT_INPUT, assert_json_close, baseline_cases, legacy_darcy_head_loss
+)
+
+VARIANTS = [
+    HMT_INPUT,
+    {**HMT_INPUT, "flow_rate": 80, "discharge_height": 45},
+    {**HMT_INPUT, "flow_rate": 20, "discharge_pipe_length": 250},
+    {**HMT_INPUT, "fluid_type": "oil", "temperature": 60, "friction_factor_mode": "precise"},
+    {"installation_type": "submersible", "hasp": 0, "discharge_height": 60, "suction_pipe_diameter": 60.3,
+     "discharge_pipe_diameter": 48.3, "suction_pipe_length": 0, "discharge_pipe_length": 300,
+     "suction_pipe_material": "pehd", "discharge_pipe_material": "pehd", "fluid_type": "gasoline",
+     "temperature": 35, "flow_rate": 30},
+]
+
+def test_batch_items_match_the_monolith(client):
+    cases = baseline_cases("/api/calculate-hmt")
+    # cas d'origine mêlés aux variantes: chaque résultat reste à sa place dans son groupe
+    body = [cases[0]["input"]] + VARIANTS[1:4] + [cases[1]["input"]]
+    response = client.post("/api/calculate-hmt/batch", json=body)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    for item, case in zip((results[0], results[4]), cases):
+        assert_json_close(item["result"], case["response"], ignore=BASELINE_IGNORED_KEYS)
+
+def test_discharge_losses_follow_the_scalar_darcy_formula(client):
+    water = get_fluid_properties("water", 20)
+    k_check_valve = FITTING_COEFFICIENTS["check_valve"]["k"]
+    results = client.post("/api/calculate-hmt/batch", json=VARIANTS[:3]).json()["results"]
+    for item, variant in zip(results, VARIANTS[:3]):
+        result = item["result"]
+        linear = legacy_darcy_head_loss(variant["flow_rate"], variant["discharge_pipe_diameter"],
+                                        variant["discharge_pipe_length"], "steel", water.density, water.viscosity)
+        singular = k_check_valve * result["discharge_velocity"] ** 2 / (2 * 9.81)
+        assert result["discharge_head_loss"] == pytest.approx(linear + singular, rel=1e-9)
+
+def test_shared_lookups_are_grouped_by_fluid_and_materials(client):
+    batch = client.post("/api/calculate-hmt/batch", json=VARIANTS).json()
+    # eau/pvc/acier (3 variantes), huile à 60 °C, essence/pehd
+    assert batch["groups"] == 3
+
+def test_submersible_variant_has_no_suction_side(client):
+    result = client.post("/api/calculate-hmt/batch", json=VARIANTS).json()["results"][4]["result"]
+    assert result["suction_velocity"] is None
+    assert result["suction_head_loss"] == 0
+
+def test_invalid_variants_fail_alone(client):
+    variants = [HMT_INPUT, {**HMT_INPUT, "discharge_pipe_diameter": 0}, {**HMT_INPUT, "fluid_type": "unobtainium"},
+                {**HMT_INPUT, "friction_factor_mode": "guess"}]
+    batch = client.post("/api/calculate-hmt/batch", json=variants).json()
+    assert [item["success"] for item in batch["results"]] == [True, False, False, False]
+    assert all(item["error"] for item in batch["results"][1:])
+
+@pytest.mark.parametrize("body, status", [(VARIANTS, 400), (HMT_INPUT, 422), ([HMT_INPUT, "variante"], 422)])
+def test_malformed_batches_are_rejected_whole(client, server, monkeypatch, body, status):
+    monkeypatch.setattr(server, "BATCH_MAX_ITEMS", 2)
+    assert client.post("/api/calculate-hmt/batch", json=body).status_code == status
@@ -0,0 +1,31 @@
+"""POST /api/calculate-npshd/batch: réponses de l'application d'origine, erreurs isolées par variante."""
+import pytest
+
+from tests.support import BASELINE_IGNORED_KEYS, NPSHD_INPUT, assert_json_close, baseline_cases
+
+def test_batch_items_match_the_monolith(client):
+    cases = baseline_cases("/api/calculate-npshd")
+    response = client.post("/api/calculate-npshd/batch", json=[case["input"] for case in cases])
+    assert response.status_code == 200
+    batch = response.json()
+    assert (batch["total"], batch["succeeded"], batch["failed"]) == (len(cases), len(cases), 0)
+    for item, case in zip(batch["results"], cases):
+        # friction_factor: coefficient corrigé depuis (mode de frottement commun à tous les calculs)
+        assert_json_close(item["result"], case["response"], ignore=BASELINE_IGNORED_KEYS + ("friction_factor",))
+
+def test_invalid_variant_fails_alone(client):
+    variants = [NPSHD_INPUT, {**NPSHD_INPUT, "fluid_type": "unobtainium"}, {**NPSHD_INPUT, "pipe_diameter": 0},
+                {"flow_rate": "beaucoup"}, {**NPSHD_INPUT, "friction_factor_mode": "guess"}]
+    batch = client.post("/api/calculate-npshd/batch", json=variants).json()
+    assert (batch["succeeded"], batch["failed"]) == (1, 4)
+    assert [item["index"] for item in batch["results"]] == list(range(5))
+    assert batch["results"][0]["success"]
+    assert all(not item["success"] and item["error"] for item in batch["results"][1:])
+
+@pytest.mark.parametrize("body, status", [
+    ([NPSHD_INPUT] * 3, 400),  # au-delà de BATCH_MAX_ITEMS (ramené à 2)
+    (NPSHD_INPUT, 422),  # objet seul au lieu d'une liste
+])
+def test_malformed_batches_are_rejected_whole(client, server, monkeypatch, body, status):
+    monkeypatch.setattr(server, "BATCH_MAX_ITEMS", 2)
+    assert client.post("/api/calculate-npshd/batch", json=body).status_code == status
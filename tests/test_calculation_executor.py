@@ -0,0 +1,99 @@
+"""Couche d'exécution des calculs: file bornée (503), délai (504), modes process/thread/inline."""
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from tests.support import HMT_INPUT
+
+def blocking_task(release, value):
+    release.wait(5)
+    return value
+
+def test_thread_executor_returns_results_and_releases_slots(server):
+    executor = server.CalculationExecutor("test", "thread", 2, 0, timeout=5)
+
+    async def scenario():
+        return await asyncio.gather(*(executor.run(math.sqrt, n) for n in (4, 9)))
+
+    try:
+        assert asyncio.run(scenario()) == [2, 3]
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+def test_full_queue_is_rejected_with_503(server):
+    executor = server.CalculationExecutor("test", "thread", 1, 0, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(blocking_task, release, "ok"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as rejected:
+            await executor.run(math.sqrt, 4)
+        release.set()
+        return rejected.value.status_code, await first
+
+    try:
+        assert asyncio.run(scenario()) == (503, "ok")
+        assert executor.rejected == 1 and executor.pending == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+def test_slow_task_times_out_with_504(server):
+    executor = server.CalculationExecutor("test", "thread", 1, 1, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(HTTPException) as timed_out:
+            await executor.run(blocking_task, release, "late", timeout=0.05)
+        return timed_out.value.status_code
+
+    try:
+        assert asyncio.run(scenario()) == 504
+        assert executor.timeouts == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+def test_inline_mode_runs_in_the_calling_thread(server):
+    executor = server.CalculationExecutor("test", "inline", 1, 0, timeout=5)
+    assert asyncio.run(executor.run(threading.get_ident)) == threading.get_ident()
+    assert executor._executor is None
+
+def test_process_mode_runs_in_a_worker_process(server):
+    import os
+    executor = server.CalculationExecutor("test", "process", 1, 0, timeout=30)
+    try:
+        assert asyncio.run(executor.run(os.getpid)) != os.getpid()
+    finally:
+        executor.shutdown()
+    assert executor._executor is None
+
+def test_catalog_stays_responsive_during_a_slow_calculation(client, server, monkeypatch):
+    release = threading.Event()
+    water_hammer = server.calculate_water_hammer
+
+    def slow_water_hammer(input_data):
+        release.wait(5)
+        return water_hammer(input_data)
+
+    monkeypatch.setattr(server, "calculate_water_hammer", slow_water_hammer)
+    responses = []
+    worker = threading.Thread(target=lambda: responses.append(
+        client.post("/api/water-hammer", json={"base": HMT_INPUT, "num_nodes": 20})))
+    worker.start()
+    try:
+        time.sleep(0.05)
+        started = time.perf_counter()
+        assert client.get("/api/fluids").status_code == 200
+        assert time.perf_counter() - started < 1.0
+        assert not responses  # le calcul lent est toujours en cours
+    finally:
+        release.set()
+        worker.join(10)
+    assert responses[0].status_code == 200
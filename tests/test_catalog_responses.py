@@ -0,0 +1,43 @@
+"""Catalogues pré-sérialisés: même contenu qu'avant, ETag fort, Cache-Control et 304."""
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from ecopump import catalog
+
+CATALOGS = {
+    "fluids": catalog.build_fluids_catalog,
+    "pipe-materials": catalog.build_pipe_materials_catalog,
+    "fittings": catalog.build_fittings_catalog,
+    "solar-regions": catalog.build_solar_regions_catalog,
+    "solar-equipment": catalog.build_solar_equipment_catalog,
+}
+
+@pytest.mark.parametrize("name", CATALOGS)
+def test_catalog_body_and_cache_headers(client, name):
+    response = client.get(f"/api/{name}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == jsonable_encoder(CATALOGS[name]())
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"') and not etag.startswith("W/")
+    assert "max-age" in response.headers["cache-control"]
+    # ETag stable d'une requête à l'autre
+    assert client.get(f"/api/{name}").headers["etag"] == etag
+
+@pytest.mark.parametrize("name", CATALOGS)
+def test_matching_etag_returns_304_without_body(client, name):
+    etag = client.get(f"/api/{name}").headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        response = client.get(f"/api/{name}", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+def test_stale_etag_returns_the_full_body(client):
+    response = client.get("/api/fluids", headers={"If-None-Match": '"0000"'})
+    assert response.status_code == 200
+    assert response.json() == jsonable_encoder(catalog.build_fluids_catalog())
+
+def test_catalogs_have_distinct_etags(client):
+    etags = {client.get(f"/api/{name}").headers["etag"] for name in CATALOGS}
+    assert len(etags) == len(CATALOGS)
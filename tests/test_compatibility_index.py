@@ -0,0 +1,43 @@
+"""Index de compatibilité chimique compilé au démarrage: équivalence avec l'analyse d'origine."""
+import json
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.catalog import FLUID_PROPERTIES
+
+# Réponses de l'analyse d'origine (20 fluides × 2 bandes de température, paires de matériaux variées)
+BASELINE_CASES = json.loads((Path(__file__).parent / "data" / "compatibility_baseline.json").read_text(encoding="utf-8"))
+
+@pytest.mark.parametrize("case", BASELINE_CASES,
+                         ids=lambda case: f"{case['fluid_type']}-{case['temperature']}")
+def test_analysis_matches_legacy_output(case):
+    result = hydraulics.analyze_chemical_compatibility(
+        case["fluid_type"], case["suction_material"], case["discharge_material"], case["temperature"])
+    assert result == case["expected"]
+
+def test_high_temperature_recommendations_are_appended():
+    result = hydraulics.analyze_chemical_compatibility("water", "pvc", "steel", 120)
+    assert any("HAUTE TEMPÉRATURE (120°C)" in line for line in result["recommendations"])
+
+def test_unknown_fluid_status():
+    assert hydraulics.analyze_chemical_compatibility("unobtainium", "pvc", "pvc", 20)["status"] == "unknown_fluid"
+
+def test_index_is_immutable_and_shared():
+    index = hydraulics.chemical_compatibility_index()
+    assert index is hydraulics.chemical_compatibility_index()
+    entry = index["fluids"][("water", 0)]
+    assert isinstance(entry, MappingProxyType)
+    with pytest.raises(TypeError):
+        entry["fluid_name"] = "Eau modifiée"
+
+def test_matrix_covers_every_fluid_and_material(client):
+    response = client.get("/api/compatibility-matrix")
+    assert response.status_code == 200
+    matrix = response.json()
+    assert set(matrix["fluids"]) == set(FLUID_PROPERTIES)
+    material_ids = [material["id"] for material in matrix["materials"]]
+    for fluid in matrix["fluids"].values():
+        assert list(fluid["materials"]) == material_ids
@@ -0,0 +1,99 @@
+"""Optimisation des DN en coût global: front de Pareto, optimum et validation des entrées."""
+import math
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.catalog import DN_TO_DIAMETER, FITTING_COEFFICIENTS
+from ecopump.models import DiameterOptimizationInput
+from tests.support import legacy_darcy_head_loss
+
+OPTIMIZATION_INPUT = {
+    "flow_rate": 60, "suction_length": 8, "discharge_length": 250, "static_head": 25,
+    "suction_fittings": [{"fitting_type": "elbow_90", "quantity": 2}],
+    "discharge_fittings": [{"fitting_type": "check_valve", "quantity": 1}],
+    "materials": ["pvc", "steel"], "electricity_cost": 0.15, "lifetime_years": 25
+}
+
+def objectives(option):
+    return (option.capital_cost, option.lifetime_energy_cost, -option.npsh_margin)
+
+def test_pareto_front_is_non_dominated_and_holds_the_optimum():
+    result = hydraulics.optimize_pipe_diameters(DiameterOptimizationInput(**OPTIMIZATION_INPUT))
+    front = result.pareto_front
+    assert front and result.feasible >= len(front)
+    assert result.evaluated == 2 * len(hydraulics.DN_SORTED) ** 2
+    for option in front:
+        assert option.material in ("pvc", "steel")
+        assert option.suction_velocity <= 1.5 and option.discharge_velocity <= 2.5
+        assert option.npsh_margin >= 0.5
+        assert option.lifecycle_cost == pytest.approx(
+            option.capital_cost + option.annual_energy_cost * result.annuity_factor)
+        for other in front:
+            assert not (all(a <= b for a, b in zip(objectives(other), objectives(option)))
+                        and objectives(other) != objectives(option))
+    assert [option.capital_cost for option in front] == sorted(option.capital_cost for option in front)
+    assert result.best_lifecycle.lifecycle_cost == min(option.lifecycle_cost for option in front)
+
+def test_single_combination_matches_hand_calculation():
+    payload = {**OPTIMIZATION_INPUT, "materials": ["steel"], "suction_dns": [125], "discharge_dns": [100],
+               "hasp": 1.5, "pipe_costs": {"steel": 100}, "discount_rate": 0}
+    option = hydraulics.optimize_pipe_diameters(DiameterOptimizationInput(**payload)).best_lifecycle
+    water = hydraulics.get_fluid_properties("water", 20)
+    rho_g = water.density * 9.81
+
+    def side_loss(dn, length, fittings):
+        diameter = DN_TO_DIAMETER[dn]
+        velocity = 60 / 3600 / (math.pi * (diameter / 2000) ** 2)
+        k_total = sum(FITTING_COEFFICIENTS[f["fitting_type"]]["k"] * f["quantity"] for f in fittings)
+        linear = legacy_darcy_head_loss(60, diameter, length, "steel", water.density, water.viscosity)
+        return velocity, linear + k_total * velocity ** 2 / (2 * 9.81)
+
+    suction_velocity, suction_loss = side_loss(125, 8, payload["suction_fittings"])
+    discharge_velocity, discharge_loss = side_loss(100, 250, payload["discharge_fittings"])
+    total_head = 25 + suction_loss + discharge_loss
+    power_kw = rho_g * (60 / 3600) * total_head / (0.75 * 0.90) / 1000
+    assert option.suction_velocity == pytest.approx(suction_velocity, rel=1e-12)
+    assert option.discharge_velocity == pytest.approx(discharge_velocity, rel=1e-12)
+    assert option.total_head == pytest.approx(total_head, rel=1e-9)
+    assert option.npsh_margin == pytest.approx(
+        101325 / rho_g + 1.5 - suction_loss - water.vapor_pressure / rho_g - 3.5, rel=1e-9)
+    assert option.capital_cost == pytest.approx(100 * 1.25 ** 1.3 * 8 + 100 * 250, rel=1e-12)
+    assert option.annual_energy_cost == pytest.approx(power_kw * 4000 * 0.15, rel=1e-9)
+    assert option.lifecycle_cost == pytest.approx(option.capital_cost + 25 * option.annual_energy_cost, rel=1e-12)
+
+def test_annuity_factor_discounts_energy():
+    assert hydraulics.annuity_factor(0.05, 20) == pytest.approx(sum(1.05 ** -t for t in range(1, 21)))
+    assert hydraulics.annuity_factor(0, 20) == 20
+
+def test_dn_lists_restrict_the_search():
+    result = hydraulics.optimize_pipe_diameters(DiameterOptimizationInput(
+        **{**OPTIMIZATION_INPUT, "suction_dns": [100, 125], "discharge_dns": [80, 100, 80]}))
+    assert result.evaluated == 2 * 2 * 2
+    assert {option.suction_dn for option in result.pareto_front} <= {100, 125}
+    assert {option.discharge_dn for option in result.pareto_front} <= {80, 100}
+
+def test_omitted_lists_cover_the_whole_catalog():
+    payload = {key: value for key, value in OPTIMIZATION_INPUT.items() if key != "materials"}
+    result = hydraulics.optimize_pipe_diameters(DiameterOptimizationInput(**payload, suction_dns=[100], discharge_dns=[100]))
+    assert result.evaluated == len(hydraulics.PIPE_MATERIALS)
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"materials": []}, 400),
+    ({"suction_dns": []}, 400),
+    ({"discharge_dns": []}, 400),
+    ({"lifetime_years": 0}, 400),
+    ({"lifetime_years": -5}, 400),
+    ({"materials": ["unobtainium"]}, 400),
+    ({"discharge_dns": [123]}, 400),
+    ({"flow_rate": 0}, 400),
+    ({"friction_factor_mode": "guess"}, 400),
+    ({"suction_dns": ["grand"]}, 422),
+    ({"lifetime_years": "longtemps"}, 422),
+])
+def test_rejected_inputs(client, overrides, status):
+    if status == 400:
+        with pytest.raises(ValueError):
+            hydraulics.optimize_pipe_diameters(DiameterOptimizationInput(**{**OPTIMIZATION_INPUT, **overrides}))
+    response = client.post("/api/diameter-optimization", json={**OPTIMIZATION_INPUT, **overrides})
+    assert response.status_code == status
@@ -0,0 +1,50 @@
+"""Analyse expert: graphe de calcul mémoïsé, corps de réponse sans durées d'exécution."""
+import json
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import ExpertAnalysisInput
+from tests.support import BASELINE_IGNORED_KEYS, EXPERT_INPUT, assert_json_close, baseline_cases
+
+def test_each_stage_is_computed_once_per_request():
+    graph = hydraulics.ComputationGraph(hydraulics.EXPERT_ANALYSIS_STAGES,
+                                        input_data=ExpertAnalysisInput(**EXPERT_INPUT))
+    for stage in hydraulics.EXPERT_ANALYSIS_STAGES:
+        graph.get(stage)
+    timings = graph.timings()
+    assert set(timings) >= set(hydraulics.EXPERT_ANALYSIS_STAGES)
+    for stage in hydraulics.EXPERT_ANALYSIS_STAGES:
+        assert timings[stage]["computed"] == 1, stage
+    # NPSHd et HMT sont réutilisés par les étapes suivantes sans être recalculés
+    assert timings["npshd"]["calls"] > 1
+    assert timings["hmt"]["calls"] > 1
+
+@pytest.mark.parametrize("case", [case for case in baseline_cases("/api/expert-analysis") if case["status"] == 200],
+                         ids=lambda case: str(case["input"]["flow_rate"]))
+def test_graph_result_matches_the_monolith(case):
+    # le graphe mémoïsé doit rendre exactement ce que calculait l'analyse monolithique d'origine
+    result = hydraulics.calculate_expert_analysis(ExpertAnalysisInput(**case["input"]))
+    assert_json_close(json.loads(result.model_dump_json()), case["response"], ignore=BASELINE_IGNORED_KEYS)
+
+def test_response_body_carries_no_timings(client):
+    response = client.post("/api/expert-analysis", json={**EXPERT_INPUT, "flow_rate": 47})
+    assert response.status_code == 200
+    assert "computation_stages" not in response.json()
+    # les durées par étape passent par Server-Timing
+    assert "npshd;dur=" in response.headers["server-timing"]
+
+def test_cache_hit_returns_the_same_body(client):
+    payload = {**EXPERT_INPUT, "flow_rate": 43}
+    first = client.post("/api/expert-analysis", json=payload)
+    second = client.post("/api/expert-analysis", json=payload)
+    assert second.headers["server-timing"] == "cache;desc=hit"
+    assert second.content == first.content
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"flow_rate": "beaucoup"}, 422),
+    # l'analyse expert remonte toute erreur de calcul en 500, comme le monolithe
+    ({"fluid_type": "mercure"}, 500),
+])
+def test_rejected_inputs(client, overrides, status):
+    assert client.post("/api/expert-analysis", json={**EXPERT_INPUT, **overrides}).status_code == status
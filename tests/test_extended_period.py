@@ -0,0 +1,76 @@
+"""Simulation en période étendue: bilan volumique du réservoir, régulation, validation des entrées."""
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import ExtendedPeriodInput
+from tests.support import HMT_INPUT
+
+EPS_INPUT = {
+    "base": HMT_INPUT, "tank_area": 50, "tank_height": 5, "initial_level": 2.5, "start_level": 1,
+    "stop_level": 4, "demand_profile": [15, 30, 45, 40, 20, 8], "demand_profile_step": 4,
+    "duration_hours": 24 * 7, "time_step_minutes": 10
+}
+
+def simulate(**overrides):
+    return hydraulics.calculate_extended_period_simulation(ExtendedPeriodInput(**{**EPS_INPUT, **overrides}))
+
+@pytest.mark.parametrize("control", hydraulics.EPS_CONTROLS)
+def test_default_pump_delivers_the_design_flow_from_an_empty_tank(control):
+    # un pas d'une minute, réservoir vide, sans soutirage: débit à pleine vitesse au niveau 0
+    result = simulate(control=control, initial_level=0, demand_profile=[0], duration_hours=1 / 60,
+                      time_step_minutes=1, vfd_min_flow_ratio=1)
+    assert result.pumped_volume * 60 == pytest.approx(HMT_INPUT["flow_rate"], rel=1e-6)
+
+@pytest.mark.parametrize("control", hydraulics.EPS_CONTROLS)
+def test_tank_volume_balance_closes(control):
+    result = simulate(control=control)
+    stored = (result.final_level - EPS_INPUT["initial_level"]) * EPS_INPUT["tank_area"]
+    delivered = result.demand_volume - result.unmet_demand_volume
+    assert result.pumped_volume - delivered - result.overflow_volume == pytest.approx(stored, abs=1e-6)
+    assert 0 <= result.level.min <= result.level.max <= EPS_INPUT["tank_height"]
+    assert result.steps == 24 * 7 * 6
+    assert len(result.daily_energy_kwh) == 7
+    assert sum(result.daily_energy_kwh) == pytest.approx(result.energy_kwh)
+    assert result.energy_cost == pytest.approx(result.energy_kwh * 0.12)
+
+def test_on_off_control_keeps_the_hysteresis_band():
+    result = simulate(control="on_off")
+    assert result.unmet_demand_volume == 0 and result.overflow_volume == 0
+    assert result.pump_starts > 0
+    assert result.level.min >= EPS_INPUT["start_level"] - 0.5
+
+def test_variable_speed_drive_starts_less_often():
+    on_off, vfd = simulate(control="on_off"), simulate(control="vfd")
+    assert vfd.pump_starts <= on_off.pump_starts
+    assert vfd.pump_running_hours >= on_off.pump_running_hours
+    assert vfd.specific_energy > 0
+
+def test_motor_efficiency_scales_energy():
+    assert simulate(motor_efficiency=45).energy_kwh == pytest.approx(2 * simulate(motor_efficiency=90).energy_kwh)
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"control": "vfd", "vfd_time_constant": 0}, 400),
+    ({"control": "vfd", "vfd_time_constant": -1}, 400),
+    ({"control": "vfd", "vfd_min_flow_ratio": -0.1}, 400),
+    ({"control": "vfd", "vfd_min_flow_ratio": 1.5}, 400),
+    ({"motor_efficiency": 0}, 400),
+    ({"motor_efficiency": 120}, 400),
+    ({"control": "pid"}, 400),
+    ({"tank_area": 0}, 400),
+    ({"start_level": 4, "stop_level": 1}, 400),
+    ({"initial_level": 6}, 400),
+    ({"demand_profile": []}, 400),
+    ({"demand_profile": [10, -5]}, 400),
+    ({"time_step_minutes": 0}, 400),
+    ({"duration_hours": 24 * 365 * 3, "time_step_minutes": 1}, 400),
+    ({"pump": {"nominal_flow": 50, "nominal_head": 40, "head_coefficients": [40, 1]}}, 400),
+    ({"pump": {"nominal_flow": 50, "nominal_head": 2}}, 400),
+    ({"demand_profile": "constant"}, 422),
+    ({"tank_area": "grande"}, 422),
+])
+def test_rejected_inputs(client, overrides, status):
+    if status == 400:
+        with pytest.raises(ValueError):
+            simulate(**overrides)
+    response = client.post("/api/extended-period-simulation", json={**EPS_INPUT, **overrides})
+    assert response.status_code == status
@@ -0,0 +1,60 @@
+"""Tables de propriétés des fluides: équivalence avec le modèle linéaire borné d'origine."""
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from ecopump.catalog import FLUID_PROPERTIES
+from tests.support import NPSHD_INPUT
+
+def legacy_fluid_properties(fluid_type, temperature):
+    """get_fluid_properties d'origine (modèle linéaire en température, valeurs minimales)"""
+    base_props = FLUID_PROPERTIES[fluid_type]
+    temp_diff = temperature - 20
+    density = base_props["density_20c"] + base_props["temp_coeffs"]["density"] * temp_diff
+    viscosity = base_props["viscosity_20c"] + base_props["temp_coeffs"]["viscosity"] * temp_diff
+    vapor_pressure = base_props["vapor_pressure_20c"] + base_props["temp_coeffs"]["vapor_pressure"] * temp_diff
+    return max(density, 500), max(viscosity, 0.0001), max(vapor_pressure, 0)
+
+# Grille, hors grille (pas de 0,5 °C), points de plancher et extrapolation hors table
+TEMPERATURES = [-60, -40, -12.3, 0, 4.25, 20, 37.77, 60, 99.9, 150.2, 200, 250]
+
+@pytest.mark.parametrize("fluid_type", sorted(FLUID_PROPERTIES))
+def test_scalar_lookup_matches_legacy_model(fluid_type):
+    for temperature in TEMPERATURES:
+        props = hydraulics.get_fluid_properties(fluid_type, temperature)
+        expected = legacy_fluid_properties(fluid_type, temperature)
+        assert (props.density, props.viscosity, props.vapor_pressure) == pytest.approx(expected, rel=1e-9, abs=1e-9)
+        assert props.name == FLUID_PROPERTIES[fluid_type]["name"]
+
+@pytest.mark.parametrize("fluid_type", sorted(FLUID_PROPERTIES))
+def test_array_lookup_matches_legacy_model(fluid_type):
+    temperatures = np.linspace(-50, 210, 1001)
+    properties = hydraulics.get_fluid_properties_array(fluid_type, temperatures)
+    expected = np.array([legacy_fluid_properties(fluid_type, t) for t in temperatures])
+    for column, prop in enumerate(("density", "viscosity", "vapor_pressure")):
+        np.testing.assert_allclose(properties[prop], expected[:, column], rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize("temperature, expected", [
+    # eau: 1000 kg/m³, 1 mPa·s, 2340 Pa à 20 °C; -0,2 kg/m³, -50 µPa·s et +100 Pa par °C; planchers
+    (4, (1003.2, 0.0018, 740)),
+    (20, (1000.0, 0.001, 2340)),
+    (60, (992.0, 0.0001, 6340)),
+    (-20, (1008.0, 0.003, 0)),
+])
+def test_water_reference_values(temperature, expected):
+    water = hydraulics.get_fluid_properties("water", temperature)
+    assert (water.density, water.viscosity, water.vapor_pressure) == pytest.approx(expected, rel=1e-9)
+
+def test_lookup_is_memoized():
+    assert hydraulics.get_fluid_properties("water", 25.0) is hydraulics.get_fluid_properties("water", 25)
+
+def test_unknown_fluid_is_rejected():
+    with pytest.raises(ValueError):
+        hydraulics.get_fluid_properties("unobtainium", 20)
+    with pytest.raises(ValueError):
+        hydraulics.get_fluid_properties_array("unobtainium", [20, 30])
+
+@pytest.mark.parametrize("fluid_type, status", [("unobtainium", 400), (42, 422), ("glycerol", 200)])
+def test_fluid_type_status(client, fluid_type, status):
+    response = client.post("/api/calculate-npshd", json={**NPSHD_INPUT, "fluid_type": fluid_type})
+    assert response.status_code == status
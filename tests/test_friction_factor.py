@@ -0,0 +1,90 @@
+"""Moteur de coefficient de frottement: précision de chaque mode face à Colebrook-White."""
+import math
+import time
+
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from tests.support import NPSHD_INPUT
+
+def colebrook_reference(reynolds_number, relative_roughness):
+    """Colebrook-White résolu point par point par substitution successive sur 1/√f"""
+    x = 8.0
+    for _ in range(200):
+        x_next = -2 * math.log10(relative_roughness / 3.7 + 2.51 * x / reynolds_number)
+        if abs(x_next - x) < 1e-14 * abs(x):
+            break
+        x = x_next
+    return 1 / x_next ** 2
+
+def legacy_swamee_jain(reynolds_number, relative_roughness):
+    return 0.25 / math.log10((relative_roughness / 3.7) ** 1.11 + 6.9 / reynolds_number) ** 2
+
+@pytest.fixture(scope="module")
+def turbulent_points():
+    rng = np.random.default_rng(20240601)
+    reynolds_number = 10 ** rng.uniform(math.log10(2300), 9, 2000)
+    relative_roughness = np.concatenate([10 ** rng.uniform(-8, -1, 1990), np.zeros(10)])
+    expected = np.array([colebrook_reference(re, rr) for re, rr in zip(reynolds_number, relative_roughness)])
+    return reynolds_number, relative_roughness, expected
+
+def test_precise_mode_solves_colebrook(turbulent_points):
+    reynolds_number, relative_roughness, expected = turbulent_points
+    np.testing.assert_allclose(hydraulics.friction_factor_array(reynolds_number, relative_roughness, "precise"),
+                               expected, rtol=1e-10)
+
+def test_fast_mode_stays_within_one_percent_of_colebrook(turbulent_points):
+    reynolds_number, relative_roughness, expected = turbulent_points
+    np.testing.assert_allclose(hydraulics.friction_factor_array(reynolds_number, relative_roughness, "fast"),
+                               expected, rtol=0.01)
+
+@pytest.mark.parametrize("reynolds_number, relative_roughness", [
+    (1e5, 0.5), (3e4, 0.2), (1e6, 0.0), (5e9, 1e-4), (2e10, 1e-10),
+])
+def test_fast_mode_is_exact_outside_the_table(reynolds_number, relative_roughness):
+    friction = hydraulics.friction_factor_array([0, 1000, reynolds_number], relative_roughness, "fast")
+    np.testing.assert_allclose(friction, [0, 64 / 1000, colebrook_reference(reynolds_number, relative_roughness)],
+                               rtol=1e-10)
+
+def test_swamee_jain_mode_keeps_the_historical_formula(turbulent_points):
+    reynolds_number, relative_roughness, _ = turbulent_points
+    expected = [legacy_swamee_jain(re, rr) for re, rr in zip(reynolds_number, relative_roughness)]
+    np.testing.assert_allclose(hydraulics.friction_factor_array(reynolds_number, relative_roughness, "swamee_jain"),
+                               expected, rtol=1e-12)
+
+@pytest.mark.parametrize("mode", hydraulics.FRICTION_FACTOR_MODES)
+def test_laminar_and_zero_flow_are_mode_independent(mode):
+    friction = hydraulics.friction_factor_array([0, 500, 2000], 1e-4, mode)
+    np.testing.assert_allclose(friction, [0, 64 / 500, 64 / 2000])
+
+def test_mixed_mode_batch_matches_single_modes(turbulent_points):
+    reynolds_number, relative_roughness, _ = turbulent_points
+    modes = np.array(hydraulics.FRICTION_FACTOR_MODES)[np.arange(len(reynolds_number)) % 3]
+    mixed = hydraulics.friction_factor_array(reynolds_number, relative_roughness, modes)
+    for mode in hydraulics.FRICTION_FACTOR_MODES:
+        selected = modes == mode
+        np.testing.assert_array_equal(
+            mixed[selected], hydraulics.friction_factor_array(reynolds_number[selected], relative_roughness[selected], mode))
+
+def test_fast_mode_is_cheaper_than_the_default():
+    rng = np.random.default_rng(7)
+    reynolds_number = 10 ** rng.uniform(3.4, 8, 300000)
+    relative_roughness = 10 ** rng.uniform(-6, -1.5, 300000)
+
+    def best_time(mode):
+        timings = []
+        for _ in range(7):
+            start = time.perf_counter()
+            hydraulics.friction_factor_array(reynolds_number, relative_roughness, mode)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    hydraulics.friction_factor_table()
+    assert best_time("fast") < best_time("swamee_jain")
+
+def test_unknown_mode_is_rejected(client):
+    with pytest.raises(ValueError):
+        hydraulics.friction_factor_array(1e5, 1e-4, "guess")
+    response = client.post("/api/calculate-npshd", json={**NPSHD_INPUT, "friction_factor_mode": "guess"})
+    assert response.status_code == 400
@@ -0,0 +1,64 @@
+"""Noyau hydraulique vectorisé: équivalence avec les formules scalaires d'origine."""
+
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from ecopump.catalog import PIPE_MATERIALS
+from ecopump.models import FittingInput
+from tests.support import legacy_darcy_head_loss, legacy_friction_factor
+
+OPERATING_POINTS = [
+    # débit m³/h, diamètre mm, longueur m, matériau, ρ, μ
+    (50, 114.3, 10, "pvc", 998.2, 0.001002),
+    (120, 60.3, 40, "cast_iron", 850, 0.05),
+    (0.5, 26.9, 5, "steel", 1400, 2.0),
+    (80, 88.9, 150, "unknown_material", 1025, 0.00108),
+    (300, 200, 1000, "pehd", 998.2, 0.001002),
+]
+
+@pytest.mark.parametrize("point", OPERATING_POINTS)
+def test_darcy_head_loss_matches_legacy_scalar_formula(point):
+    assert hydraulics.calculate_darcy_head_loss(*point) == pytest.approx(legacy_darcy_head_loss(*point), rel=1e-12)
+
+def test_pipe_hydraulics_array_matches_scalar_loop():
+    flow, diameter, length, materials, density, viscosity = (list(column) for column in zip(*OPERATING_POINTS))
+    roughness = hydraulics.get_pipe_roughness_array(materials)
+    result = hydraulics.compute_pipe_hydraulics(flow, diameter, length, roughness, density, viscosity)
+    expected = [legacy_darcy_head_loss(*point) for point in OPERATING_POINTS]
+    np.testing.assert_allclose(result["linear_head_loss"], expected, rtol=1e-12)
+    np.testing.assert_allclose(result["total_head_loss"], result["linear_head_loss"])
+
+def test_linear_head_loss_enhanced_matches_legacy():
+    velocity, length, diameter = 1.8, 120, 88.9
+    reynolds_number = hydraulics.calculate_reynolds_number(velocity, diameter / 1000, 998.2, 0.001002)
+    expected = (legacy_friction_factor(reynolds_number, PIPE_MATERIALS["steel"]["roughness"] / diameter)
+                * (length / (diameter / 1000)) * velocity ** 2 / (2 * 9.81))
+    assert hydraulics.calculate_linear_head_loss_enhanced(
+        velocity, length, diameter, "steel", reynolds_number) == pytest.approx(expected, rel=1e-12)
+
+def test_laminar_flow_follows_hagen_poiseuille():
+    # h = 32·μ·L·V / (ρ·g·D²), indépendant de la rugosité
+    flow, diameter, length, density, viscosity = 0.5, 26.9, 5, 1400, 2.0
+    velocity = flow / 3600 / (np.pi * (diameter / 2000) ** 2)
+    expected = 32 * viscosity * length * velocity / (density * 9.81 * (diameter / 1000) ** 2)
+    for material in ("pvc", "steel", "concrete"):
+        assert hydraulics.calculate_darcy_head_loss(flow, diameter, length, material, density, viscosity) == pytest.approx(expected, rel=1e-12)
+
+def test_singular_head_loss_sums_fitting_coefficients():
+    fittings = [FittingInput(fitting_type="elbow_90", quantity=3), FittingInput(fitting_type="not_a_fitting", quantity=5)]
+    k_total = 3 * hydraulics.FITTING_COEFFICIENTS["elbow_90"]["k"]
+    assert hydraulics.calculate_singular_head_loss(2.0, fittings) == pytest.approx(k_total * 4 / (2 * 9.81))
+
+def test_zero_flow_gives_zero_friction_and_head_loss():
+    result = hydraulics.compute_pipe_hydraulics([0.0, 10.0], 100, 50, 0.045, 998.2, 0.001002)
+    assert result["friction_factor"][0] == 0
+    assert result["linear_head_loss"][0] == 0
+    assert result["linear_head_loss"][1] > 0
+    assert hydraulics.calculate_darcy_head_loss(0, 100, 50, "steel", 998.2, 0.001002) == 0
+
+def test_kernel_broadcasts_scalars_against_arrays():
+    flows = np.linspace(10, 100, 7)
+    result = hydraulics.compute_pipe_hydraulics(flows, 100, 50, 0.045, 998.2, 0.001002, k_total=2.5)
+    assert result["velocity"].shape == flows.shape
+    assert np.all(np.diff(result["total_head_loss"]) > 0)
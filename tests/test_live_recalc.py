@@ -0,0 +1,106 @@
+"""Recalcul en direct par WebSocket: champs modifiés en entrée, JSON Patch en sortie, erreurs par seq."""
+import asyncio
+import copy
+import json
+
+import pytest
+
+from ecopump.models import ExpertAnalysisInput, ExpertAnalysisResult
+from tests.support import EXPERT_INPUT
+
+def apply_patch(document, patch):
+    """Application minimale d'un JSON Patch RFC 6902 (add / remove / replace)"""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        if operation["path"] == "":
+            document = copy.deepcopy(operation["value"])
+            continue
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in operation["path"].split("/")[1:]]
+        target = document
+        for token in tokens[:-1]:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        key = int(tokens[-1]) if isinstance(target, list) else tokens[-1]
+        if operation["op"] == "remove":
+            del target[key]
+        else:
+            target[key] = operation["value"]
+    return document
+
+@pytest.fixture
+def fast_debounce(server, monkeypatch):
+    monkeypatch.setattr(server, "LIVE_RECALC_DEBOUNCE", 0.05)
+
+@pytest.mark.parametrize("old, new", [
+    ({"a": 1, "b": [1, 2, 3], "c/d": {"e~f": 1}}, {"a": 1, "b": [1, 5, 3], "c/d": {"e~f": 2}, "g": None}),
+    ({"curve": list(range(50))}, {"curve": list(range(1, 51))}),
+    ({"a": [1, 2]}, {"a": [1, 2, 3]}),
+    ({"removed": 1, "kept": 2}, {"kept": 2}),
+])
+def test_json_patch_round_trips(server, old, new):
+    assert apply_patch(old, server.json_patch(old, new)) == new
+
+def test_patches_rebuild_the_post_response(client, fast_debounce):
+    with client.websocket_connect("/api/ws/expert-analysis") as websocket:
+        websocket.send_text(json.dumps({"seq": 1, "changes": EXPERT_INPUT}))
+        message = websocket.receive_json()
+        assert (message["type"], message["seq"]) == ("result", 1)
+        document = apply_patch(None, message["patch"])
+        assert document == client.post("/api/expert-analysis", json=EXPERT_INPUT).json()
+
+        websocket.send_text(json.dumps({"seq": 2, "changes": {"flow_rate": 55}}))
+        message = websocket.receive_json()
+        assert message["seq"] == 2 and message["patch"][0]["path"] != ""
+        document = apply_patch(document, message["patch"])
+        assert document == client.post("/api/expert-analysis", json={**EXPERT_INPUT, "flow_rate": 55}).json()
+
+        # rafale de saisies: seul le dernier état est calculé et envoyé
+        for seq in range(3, 8):
+            websocket.send_text(json.dumps({"seq": seq, "changes": {"flow_rate": 55 + seq}}))
+        message = websocket.receive_json()
+        assert (message["type"], message["seq"]) == ("result", 7)
+        document = apply_patch(document, message["patch"])
+        assert document == client.post("/api/expert-analysis", json={**EXPERT_INPUT, "flow_rate": 62}).json()
+
+def test_protocol_and_validation_errors(client, fast_debounce):
+    with client.websocket_connect("/api/ws/expert-analysis") as websocket:
+        websocket.send_text("{pas du json")
+        assert websocket.receive_json()["status"] == 400
+        websocket.send_text(json.dumps({"seq": 1, "fields": ["flow_rate"]}))
+        assert websocket.receive_json()["status"] == 400
+        websocket.send_text(json.dumps({"seq": 2, "changes": {**EXPERT_INPUT, "flow_rate": "beaucoup"}}))
+        error = websocket.receive_json()
+        assert (error["type"], error["seq"], error["status"]) == ("error", 2, 422)
+
+def test_unknown_fields_close_the_connection(client):
+    with client.websocket_connect("/api/ws/expert-analysis?fields=nope") as websocket:
+        assert websocket.receive_json()["status"] == 400
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, text):
+        self.messages.append(json.loads(text))
+
+def live_session(server):
+    return server.LiveRecalcSession(RecordingWebSocket(), "expert-analysis", ExpertAnalysisResult,
+                                    ExpertAnalysisInput, server.calculate_expert_analysis,
+                                    "/api/expert-analysis", None, False)
+
+def test_error_frames_carry_the_seq_of_the_failed_computation(server, fast_debounce):
+    session = live_session(server)
+    session.seq = 9  # saisies plus récentes déjà reçues
+    asyncio.run(session._recalculate(4, {**EXPERT_INPUT, "flow_rate": "beaucoup"}))
+    assert [(message["seq"], message["status"]) for message in session.websocket.messages] == [(4, 422)]
+
+def test_saturated_server_answers_503_for_that_seq(server, fast_debounce, monkeypatch):
+    gate = server.ADMISSION_GATES["/api/expert-analysis"]
+    monkeypatch.setattr(gate, "concurrency", 1)
+    monkeypatch.setattr(gate, "queue_depth", 0)
+    monkeypatch.setattr(gate, "active", 1)
+    session = live_session(server)
+    session.seq = 6
+    asyncio.run(session._recalculate(5, dict(EXPERT_INPUT)))
+    error, = session.websocket.messages
+    assert (error["seq"], error["status"]) == (5, 503)
+    assert error["retry_after"] >= 1
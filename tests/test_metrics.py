@@ -0,0 +1,69 @@
+"""Instrumentation: histogrammes Prometheus, étapes de calcul, /metrics, plus de print() de débogage."""
+import ast
+import re
+from pathlib import Path
+
+import pytest
+
+from ecopump import instrumentation
+from tests.support import EXPERT_INPUT, NPSHD_INPUT, SOLAR_INPUT
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+def metric_value(text, sample):
+    match = re.search(rf"^{re.escape(sample)} (\S+)$", text, re.MULTILINE)
+    assert match, sample
+    return float(match.group(1))
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = instrumentation.Histogram("test_seconds", "Test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, '/a"b')
+    text = "\n".join(histogram.render())
+    assert "# TYPE test_seconds histogram" in text
+    assert metric_value(text, 'test_seconds_bucket{route="/a\\"b",le="0.1"}') == 2
+    assert metric_value(text, 'test_seconds_bucket{route="/a\\"b",le="1.0"}') == 3
+    assert metric_value(text, 'test_seconds_bucket{route="/a\\"b",le="+Inf"}') == 4
+    assert metric_value(text, 'test_seconds_count{route="/a\\"b"}') == 4
+    assert metric_value(text, 'test_seconds_sum{route="/a\\"b"}') == pytest.approx(3.65)
+
+def test_worker_stages_are_collected_and_returned():
+    def calculation():
+        instrumentation.record_stage("inner", 0.25)
+        return "ok"
+
+    result, samples = instrumentation.collect_stage_samples("calculation", calculation)
+    assert result == "ok"
+    assert samples[0] == ("inner", 0.25)
+    assert samples[-1][0] is None and samples[-1][1] >= 0
+
+def test_metrics_endpoint_exposes_routes_stages_and_cache(client):
+    assert client.post("/api/calculate-npshd", json={**NPSHD_INPUT, "flow_rate": 33.3}).status_code == 200
+    assert client.post("/api/solar-pumping", json=SOLAR_INPUT).status_code == 200
+    assert client.post("/api/expert-analysis", json={**EXPERT_INPUT, "flow_rate": 33.3}).status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert metric_value(text, 'pump_http_request_duration_seconds_count'
+                              '{method="POST",route="/api/calculate-npshd",status="200"}') >= 1
+    for stage in ("npshd", "hmt", "performance_curves"):
+        assert f'pump_calculation_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert re.search(r'pump_calculation_stage_duration_seconds_count\{stage="solar_[a-z_]+"\}', text)
+    assert 'pump_calculation_duration_seconds_count{calculation="calculate_npshd_enhanced"}' in text
+    for family in ("pump_result_cache_hits_total", "pump_result_cache_misses_total", "pump_executor_pending",
+                   "pump_event_loop_lag_seconds", "pump_admission_limit"):
+        assert f"# TYPE {family}" in text
+
+def test_unknown_paths_share_one_route_label(client):
+    client.get("/api/does-not-exist/12345")
+    text = client.get("/metrics").text
+    assert "/api/does-not-exist/12345" not in text
+    assert 'route="unmatched"' in text
+
+@pytest.mark.parametrize("module", ["server.py", "ecopump/hydraulics.py", "ecopump/solar.py", "ecopump/audit.py"])
+def test_hot_paths_log_instead_of_printing(module):
+    tree = ast.parse((BACKEND_DIR / module).read_text(encoding="utf-8"))
+    prints = [node.lineno for node in ast.walk(tree)
+              if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "print"]
+    assert prints == []
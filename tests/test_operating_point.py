@@ -0,0 +1,133 @@
+"""Point de fonctionnement: résidu pompe / réseau nul à l'intersection, statuts et erreurs."""
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import OperatingPointInput, SystemCurveInput
+from tests.support import legacy_darcy_head_loss
+
+PUMPS = [
+    {"name": "P1", "nominal_flow": 50, "nominal_head": 40, "nominal_efficiency": 75},
+    {"name": "P2", "nominal_flow": 120, "nominal_head": 25, "nominal_efficiency": 80},
+    {"name": "P3", "nominal_flow": 10, "nominal_head": 60, "head_coefficients": [70, 0.5, 0.08]},
+]
+SYSTEMS = [
+    {"static_head": 20, "discharge_pipe_diameter": 114.3, "discharge_pipe_length": 200},
+    {"static_head": 5, "useful_pressure": 1.5, "suction_pipe_diameter": 114.3, "suction_pipe_length": 10,
+     "discharge_pipe_diameter": 88.9, "discharge_pipe_length": 150, "discharge_pipe_material": "steel",
+     "discharge_fittings": [{"fitting_type": "elbow_90", "quantity": 4}]},
+    {"static_head": 15, "fluid_type": "oil", "temperature": 40, "discharge_pipe_diameter": 60.3,
+     "discharge_pipe_length": 80, "friction_factor_mode": "precise"},
+]
+
+def reference_system_head(system, flow):
+    """Courbe réseau recalculée point par point avec les formules scalaires"""
+    props = hydraulics.get_fluid_properties(system.fluid_type, system.temperature)
+    head = system.static_head + system.useful_pressure * 100000 / (props.density * 9.81)
+    for side in ("suction", "discharge"):
+        diameter = getattr(system, f"{side}_pipe_diameter")
+        if diameter <= 0:
+            continue
+        velocity = (flow / 3600) / (np.pi * (diameter / 2000) ** 2)
+        k_total = hydraulics.calculate_fittings_k_total(getattr(system, f"{side}_fittings"))
+        head += k_total * velocity ** 2 / (2 * 9.81)
+        if system.friction_factor_mode == "swamee_jain":
+            head += legacy_darcy_head_loss(flow, diameter, getattr(system, f"{side}_pipe_length"),
+                                           getattr(system, f"{side}_pipe_material"), props.density, props.viscosity)
+        else:
+            head += hydraulics.calculate_darcy_head_loss(
+                flow, diameter, getattr(system, f"{side}_pipe_length"), getattr(system, f"{side}_pipe_material"),
+                props.density, props.viscosity, system.friction_factor_mode)
+    return head
+
+def reference_pump_head(pump, flow):
+    """Courbe pompe de la spécification: fournie, ou H0 = 1,2 Hn et H(Qn) = Hn (part quadratique 3/4)"""
+    if pump.get("head_coefficients"):
+        h0, a, b = pump["head_coefficients"]
+        return h0 - a * flow - b * flow ** 2
+    ratio = flow / pump["nominal_flow"]
+    return pump["nominal_head"] * (1.2 - 0.05 * ratio - 0.15 * ratio ** 2)
+
+def reference_operating_flow(pump, system):
+    """Intersection cherchée par dichotomie sur les formules scalaires"""
+    low, high = 0.0, 10 * pump["nominal_flow"]
+    for _ in range(200):
+        middle = (low + high) / 2
+        if reference_pump_head(pump, middle) > reference_system_head(system, middle):
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+@pytest.mark.parametrize("flow, head", [(50, 40), (120, 25), (3.6, 87.5)])
+def test_default_curve_passes_through_the_nominal_point(flow, head):
+    coefficients = hydraulics.pump_curve_coefficients(flow, head)
+    assert hydraulics.pump_head_array(flow, *coefficients) == pytest.approx(head, rel=1e-12)
+    assert hydraulics.pump_head_array(0, *coefficients) == pytest.approx(1.2 * head, rel=1e-12)
+
+def test_pump_sized_on_the_system_runs_at_its_nominal_flow():
+    system = SYSTEMS[1]
+    nominal_head = reference_system_head(SystemCurveInput(**system), 50)
+    result = hydraulics.calculate_operating_points(OperatingPointInput(
+        pumps=[{"nominal_flow": 50, "nominal_head": nominal_head}], systems=[system]))
+    point = result.results[0]
+    assert point.status == "ok"
+    assert point.flow == pytest.approx(50, rel=1e-6)
+    assert point.head == pytest.approx(nominal_head, rel=1e-6)
+
+def test_solved_points_match_a_scalar_bisection():
+    input_data = OperatingPointInput(pumps=PUMPS, systems=SYSTEMS)
+    result = hydraulics.calculate_operating_points(input_data)
+    assert result.total == len(PUMPS) * len(SYSTEMS)
+    assert result.solved == result.total
+    for point in result.results:
+        pump, system = PUMPS[point.pump_index], input_data.systems[point.system_index]
+        assert point.flow == pytest.approx(reference_operating_flow(pump, system), rel=1e-6)
+        assert point.head == pytest.approx(reference_pump_head(pump, point.flow), rel=1e-9)
+        assert point.power == pytest.approx(point.flow * point.head / (point.efficiency * 367) * 100)
+
+def test_vectorized_batch_matches_single_pairs():
+    batch = hydraulics.calculate_operating_points(OperatingPointInput(pumps=PUMPS, systems=SYSTEMS))
+    for point in batch.results:
+        single = hydraulics.calculate_operating_points(
+            OperatingPointInput(pumps=[PUMPS[point.pump_index]], systems=[SYSTEMS[point.system_index]])).results[0]
+        assert single.status == point.status
+        if point.status == "ok":
+            assert single.flow == pytest.approx(point.flow, rel=1e-9)
+
+def test_static_head_above_shutoff_is_insufficient_head():
+    result = hydraulics.calculate_operating_points(OperatingPointInput(
+        pumps=[{"nominal_flow": 50, "nominal_head": 10}],
+        systems=[{"static_head": 30, "discharge_pipe_diameter": 114.3, "discharge_pipe_length": 10}]))
+    point = result.results[0]
+    assert point.status == "insufficient_head"
+    assert point.flow is None and point.power is None
+    assert point.system_head_at_zero_flow == 30
+
+def test_flat_system_beyond_linear_curve_is_reported():
+    # Courbe sans terme quadratique ni linéaire: pas de débit de décrochage fini
+    result = hydraulics.calculate_operating_points(OperatingPointInput(
+        pumps=[{"nominal_flow": 50, "nominal_head": 10, "head_coefficients": [12, 0, 0]}],
+        systems=[{"static_head": 2, "discharge_pipe_diameter": 114.3, "discharge_pipe_length": 10}]))
+    assert result.results[0].status == "beyond_curve"
+
+def test_endpoint_returns_the_pair_grid(client):
+    response = client.post("/api/operating-point", json={"pumps": PUMPS, "systems": SYSTEMS})
+    assert response.status_code == 200
+    body = response.json()
+    assert [(r["pump_index"], r["system_index"]) for r in body["results"]] == [
+        (p, s) for p in range(len(PUMPS)) for s in range(len(SYSTEMS))]
+
+@pytest.mark.parametrize("payload", [
+    {"pumps": [], "systems": SYSTEMS},
+    {"pumps": [{**PUMPS[0], "head_coefficients": [40, 0.1]}], "systems": SYSTEMS},
+    {"pumps": PUMPS, "systems": [{**SYSTEMS[0], "discharge_pipe_diameter": 0}]},
+    {"pumps": PUMPS, "systems": [{**SYSTEMS[0], "friction_factor_mode": "guess"}]},
+    {"pumps": PUMPS * 400, "systems": SYSTEMS * 10},
+])
+def test_invalid_batches_are_client_errors(client, payload):
+    assert client.post("/api/operating-point", json=payload).status_code == 400
+
+def test_missing_system_fields_are_validation_errors(client):
+    response = client.post("/api/operating-point", json={"pumps": PUMPS, "systems": [{"static_head": 10}]})
+    assert response.status_code == 422
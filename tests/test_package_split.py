@@ -0,0 +1,34 @@
+"""Découpage de server.py en paquet ecopump: réponses identiques à l'application monolithique, imports sans effet de bord."""
+import json
+
+import pytest
+
+from ecopump import coldstart
+from tests.support import BASELINE, BASELINE_IGNORED_KEYS, assert_json_close
+
+# Coefficient de frottement de la NPSHd corrigé depuis le monolithe
+IGNORED_TOP_LEVEL = {"/api/calculate-npshd": ("friction_factor",)}
+
+def without_top_level(body, keys):
+    return {key: value for key, value in body.items() if key not in keys} if isinstance(body, dict) else body
+
+@pytest.mark.parametrize("case", BASELINE["post"],
+                         ids=lambda case: f"{case['endpoint'].rsplit('/', 1)[-1]}-{json.dumps(case['input'])[:40]}")
+def test_calculation_responses_match_monolith(client, case):
+    response = client.post(case["endpoint"], json=case["input"])
+    assert response.status_code == case["status"]
+    ignored = IGNORED_TOP_LEVEL.get(case["endpoint"], ())
+    assert_json_close(without_top_level(response.json(), ignored), without_top_level(case["response"], ignored),
+                      ignore=BASELINE_IGNORED_KEYS)
+
+@pytest.mark.parametrize("endpoint", sorted(BASELINE["get"]))
+def test_catalog_responses_match_monolith(client, endpoint):
+    response = client.get(endpoint)
+    assert response.status_code == 200
+    assert_json_close(response.json(), BASELINE["get"][endpoint])
+
+@pytest.mark.parametrize("module", coldstart.COLD_START_MODULES + ("ecopump.persistence",))
+def test_calculation_core_imports_without_web_stack_or_database(module):
+    # interpréteur neuf, MONGO_URL et DB_NAME retirés de l'environnement
+    _, loaded = coldstart.measure_import(f"import {module}", runs=1)
+    assert loaded == []
@@ -0,0 +1,69 @@
+"""Courbes de performance vectorisées: équivalence avec la boucle d'origine à 16 points."""
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import PerformanceAnalysisInput
+from tests.support import PERFORMANCE_INPUT, legacy_darcy_head_loss
+
+def legacy_performance_curves(input_data):
+    """generate_performance_curves d'origine: boucle de 0 à 150 % par pas de 10 %"""
+    base_flow, base_hmt, base_efficiency = input_data.flow_rate, input_data.hmt, input_data.pump_efficiency
+    fluid_props = hydraulics.get_fluid_properties(input_data.fluid_type, 20)
+    curves = {"flow": [], "hmt": [], "efficiency": [], "power": [], "head_loss": []}
+    for i in range(0, 151, 10):
+        flow = base_flow * i / 100
+        h0 = base_hmt * 1.2
+        a = 0.2 * base_hmt / base_flow if base_flow > 0 else 0
+        b = 0.5 * base_hmt / (base_flow ** 2) if base_flow > 0 else 0
+        hmt = h0 if flow == 0 else h0 - a * flow - b * flow ** 2
+        if flow == 0:
+            efficiency = 0
+        else:
+            efficiency = base_efficiency * (1 - 0.3 * (flow / base_flow - 1) ** 2)
+            efficiency = max(0, min(100, efficiency))
+        power = 0 if flow == 0 else (((flow * hmt) / (efficiency * 367)) * 100 if efficiency > 0 else 0)
+        if flow == 0:
+            head_loss = 0
+        else:
+            def darcy(q):
+                return legacy_darcy_head_loss(q, input_data.pipe_diameter, 50.0, input_data.pipe_material,
+                                              fluid_props.density, fluid_props.viscosity)
+            base_head_loss = darcy(base_flow)
+            head_loss = darcy(flow) * (base_hmt / base_head_loss if base_head_loss > 0 else 1)
+        for key, value in (("flow", flow), ("hmt", max(0, hmt)), ("efficiency", max(0, efficiency)),
+                           ("power", max(0, power)), ("head_loss", max(0, head_loss))):
+            curves[key].append(value)
+    return curves
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"flow_rate": 150, "hmt": 80, "pipe_diameter": 60.3, "fluid_type": "oil", "pipe_material": "steel",
+     "pump_efficiency": 60},
+    {"flow_rate": 3, "hmt": 12, "pipe_diameter": 26.9, "fluid_type": "glycerol", "pipe_material": "pehd"},
+])
+def test_default_resolution_matches_legacy_loop(overrides):
+    input_data = PerformanceAnalysisInput(**{**PERFORMANCE_INPUT, **overrides})
+    curves = hydraulics.generate_performance_curves(input_data)
+    for key, expected in legacy_performance_curves(input_data).items():
+        np.testing.assert_allclose(curves[key], expected, rtol=1e-12, atol=1e-12, err_msg=key)
+
+def test_resolution_spans_zero_to_150_percent():
+    input_data = PerformanceAnalysisInput(**PERFORMANCE_INPUT)
+    curves = hydraulics.generate_performance_curves(input_data, resolution=301)
+    assert len(curves["flow"]) == 301
+    assert curves["flow"][0] == 0
+    assert curves["flow"][-1] == pytest.approx(1.5 * input_data.flow_rate)
+    # la courbe de pertes coupe la courbe HMT nominale au point de fonctionnement
+    operating_point = int(np.argmin(np.abs(np.array(curves["flow"]) - input_data.flow_rate)))
+    assert curves["head_loss"][operating_point] == pytest.approx(input_data.hmt)
+
+@pytest.mark.parametrize("resolution", [1, 5001])
+def test_out_of_range_resolution_is_rejected(resolution):
+    with pytest.raises(ValueError):
+        hydraulics.generate_performance_curves(PerformanceAnalysisInput(**PERFORMANCE_INPUT), resolution=resolution)
+
+@pytest.mark.parametrize("resolution, status", [(1, 400), (5001, 400), ("fine", 422), (2, 200)])
+def test_endpoint_status(client, resolution, status):
+    response = client.post("/api/calculate-performance", json={**PERFORMANCE_INPUT, "curve_resolution": resolution})
+    assert response.status_code == status
@@ -0,0 +1,161 @@
+"""Réseau maillé: conservation des débits, hiérarchie multigrille sur grille uniforme, erreurs."""
+import numpy as np
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import PipeNetworkInput
+from tests.support import legacy_darcy_head_loss
+
+def grid_network(size, diameter=200.0):
+    """Grille carrée de conduites identiques alimentée par un réservoir dans un coin"""
+    nodes = [{"id": "R", "fixed_head": 100}]
+    pipes = [{"id": "source", "start_node": "R", "end_node": "n0_0", "diameter": 600, "length": 10}]
+    for i in range(size):
+        for j in range(size):
+            nodes.append({"id": f"n{i}_{j}", "demand": 0.5})
+            if i:
+                pipes.append({"id": f"v{i}_{j}", "start_node": f"n{i - 1}_{j}", "end_node": f"n{i}_{j}",
+                              "diameter": diameter, "length": 100})
+            if j:
+                pipes.append({"id": f"h{i}_{j}", "start_node": f"n{i}_{j - 1}", "end_node": f"n{i}_{j}",
+                              "diameter": diameter, "length": 100})
+    return {"nodes": nodes, "pipes": pipes}
+
+LOOPED_NETWORK = {
+    "nodes": [
+        {"id": "R1", "fixed_head": 60, "elevation": 55},
+        {"id": "R2", "fixed_head": 52, "elevation": 50},
+        {"id": "A", "demand": 30, "elevation": 10},
+        {"id": "B", "demand": 45, "elevation": 12},
+        {"id": "C", "demand": 20, "elevation": 8},
+        {"id": "D", "demand": -5, "elevation": 9},
+    ],
+    "pipes": [
+        {"id": "1", "start_node": "R1", "end_node": "A", "diameter": 200, "length": 500},
+        {"id": "2", "start_node": "A", "end_node": "B", "diameter": 150, "length": 300, "material": "steel"},
+        {"id": "3", "start_node": "B", "end_node": "C", "diameter": 100, "length": 250},
+        {"id": "4", "start_node": "C", "end_node": "A", "diameter": 125, "length": 400,
+         "fittings": [{"fitting_type": "elbow_90", "quantity": 2}]},
+        {"id": "5", "start_node": "R2", "end_node": "C", "diameter": 150, "length": 600},
+        {"id": "6", "start_node": "D", "end_node": "B", "diameter": 80, "length": 150, "material": "pehd"},
+    ]
+}
+
+def assert_mass_balance(input_data, result, tolerance):
+    node_position = {node.id: position for position, node in enumerate(input_data.nodes)}
+    inflow = np.zeros(len(input_data.nodes))
+    for pipe, pipe_result in zip(input_data.pipes, result.pipes):
+        inflow[node_position[pipe.end_node]] += pipe_result.flow
+        inflow[node_position[pipe.start_node]] -= pipe_result.flow
+    demand = np.array([node.demand for node in result.nodes])
+    np.testing.assert_allclose(inflow, demand, atol=tolerance)
+    # les réservoirs fournissent exactement la demande nette
+    supplied = -sum(node.demand for node in result.nodes if input_data.nodes[node_position[node.id]].fixed_head is not None)
+    assert supplied == pytest.approx(sum(node.demand for node in input_data.nodes if node.fixed_head is None), abs=tolerance)
+
+@pytest.mark.parametrize("friction_mode", hydraulics.FRICTION_FACTOR_MODES)
+def test_looped_network_conserves_mass_and_energy(friction_mode):
+    input_data = PipeNetworkInput(**LOOPED_NETWORK, friction_factor_mode=friction_mode)
+    result = hydraulics.solve_pipe_network(input_data)
+    assert result.converged
+    assert_mass_balance(input_data, result, 1e-5)
+    heads = {node.id: node.head for node in result.nodes}
+    for pipe, pipe_result in zip(input_data.pipes, result.pipes):
+        head_drop = heads[pipe.start_node] - heads[pipe.end_node]
+        assert np.sign(pipe_result.flow) * pipe_result.head_loss == pytest.approx(head_drop, abs=1e-5)
+
+def water_head_loss(flow, diameter, length):
+    """Perte de charge scalaire (Swamee-Jain) dans une conduite PVC d'eau à 20 °C"""
+    water = hydraulics.get_fluid_properties("water", 20)
+    return legacy_darcy_head_loss(flow, diameter, length, "pvc", water.density, water.viscosity)
+
+def test_single_pipe_between_reservoirs_matches_scalar_darcy():
+    network = {"nodes": [{"id": "amont", "fixed_head": 50}, {"id": "aval", "fixed_head": 40}],
+               "pipes": [{"id": "p", "start_node": "amont", "end_node": "aval", "diameter": 150, "length": 1000}]}
+    result = hydraulics.solve_pipe_network(PipeNetworkInput(**network))
+    # débit de référence: bisection sur h(Q) = 10 m, h croissante en Q
+    low, high = 0.0, 1000.0
+    for _ in range(80):
+        middle = (low + high) / 2
+        low, high = (middle, high) if water_head_loss(middle, 150, 1000) < 10 else (low, middle)
+    assert result.converged
+    assert result.pipes[0].flow == pytest.approx(low, rel=1e-6)
+    assert result.pipes[0].head_loss == pytest.approx(10, rel=1e-6)
+
+def test_identical_parallel_pipes_share_the_flow_equally():
+    network = {"nodes": [{"id": "R", "fixed_head": 80}, {"id": "N", "demand": 120, "elevation": 20}],
+               "pipes": [{"id": name, "start_node": "R", "end_node": "N", "diameter": 200, "length": 750}
+                         for name in ("gauche", "droite")]}
+    result = hydraulics.solve_pipe_network(PipeNetworkInput(**network))
+    assert [pipe.flow for pipe in result.pipes] == pytest.approx([60, 60], rel=1e-9)
+    expected_head = 80 - water_head_loss(60, 200, 750)
+    assert result.nodes[1].head == pytest.approx(expected_head, rel=1e-9)
+    water = hydraulics.get_fluid_properties("water", 20)
+    assert result.nodes[1].pressure == pytest.approx((expected_head - 20) * water.density * 9.81 / 1e5, rel=1e-9)
+
+def test_uniform_grid_coarsens_down_to_the_direct_level():
+    input_data = PipeNetworkInput(**grid_network(71))
+    size = len(input_data.nodes) - 1
+    index = {node.id: position - 1 for position, node in enumerate(input_data.nodes)}
+    start = np.array([index[pipe.start_node] if pipe.start_node != "R" else size for pipe in input_data.pipes])
+    end = np.array([index[pipe.end_node] for pipe in input_data.pipes])
+    # conductances toutes égales: l'agrégation ne doit pas se bloquer sur les ex aequo
+    laplacian = hydraulics._network_laplacian(start, end, np.full(len(start), 3.0), size)
+    levels, coarse_inverse = hydraulics._network_multigrid_hierarchy(laplacian)
+    assert coarse_inverse is not None
+    assert coarse_inverse.shape[0] <= hydraulics.NETWORK_COARSE_SIZE
+    for fine, coarse in zip(levels, levels[1:]):
+        assert len(coarse[0][0]) <= 0.6 * len(fine[0][0])
+
+def test_uniform_grid_never_inverts_a_large_level(monkeypatch):
+    inverted_sizes = []
+    dense_inverse = np.linalg.inv
+
+    def recording_inverse(matrix):
+        inverted_sizes.append(matrix.shape[0])
+        return dense_inverse(matrix)
+
+    monkeypatch.setattr(hydraulics.np.linalg, "inv", recording_inverse)
+    input_data = PipeNetworkInput(**grid_network(41))
+    result = hydraulics.solve_pipe_network(input_data)
+    assert result.converged
+    assert inverted_sizes and max(inverted_sizes) <= hydraulics.NETWORK_COARSE_SIZE
+    assert_mass_balance(input_data, result, 1e-5)
+    # symétrie de la grille par rapport à la diagonale
+    heads = {node.id: node.head for node in result.nodes}
+    assert heads["n40_3"] == pytest.approx(heads["n3_40"], abs=1e-6)
+
+def test_stalled_coarsening_falls_back_to_jacobi(monkeypatch):
+    # nœuds reliés uniquement au réservoir: aucune agrégation possible au-delà de NETWORK_COARSE_SIZE
+    count = hydraulics.NETWORK_COARSE_SIZE + 50
+    nodes = [{"id": "R", "fixed_head": 40}] + [{"id": f"n{i}", "demand": 1 + i % 7} for i in range(count)]
+    pipes = [{"id": f"p{i}", "start_node": "R", "end_node": f"n{i}", "diameter": 50 + i % 40, "length": 100}
+             for i in range(count)]
+    monkeypatch.setattr(hydraulics.np.linalg, "inv", lambda matrix: pytest.fail("inversion dense"))
+    input_data = PipeNetworkInput(nodes=nodes, pipes=pipes)
+    result = hydraulics.solve_pipe_network(input_data)
+    assert result.converged
+    assert_mass_balance(input_data, result, 1e-5)
+
+@pytest.mark.parametrize("change", [
+    lambda network: network["pipes"].clear(),
+    lambda network: network["nodes"].append({"id": "A"}),
+    lambda network: network["pipes"].append({"id": "x", "start_node": "A", "end_node": "Z", "diameter": 100, "length": 1}),
+    lambda network: network["pipes"].append({"id": "x", "start_node": "A", "end_node": "A", "diameter": 100, "length": 1}),
+    lambda network: network["pipes"][0].update(diameter=0),
+    lambda network: [node.pop("fixed_head", None) for node in network["nodes"]],
+    lambda network: network["nodes"].append({"id": "isolé", "demand": 3}),
+])
+def test_invalid_networks_are_client_errors(client, change):
+    network = {"nodes": [dict(node) for node in LOOPED_NETWORK["nodes"]],
+               "pipes": [dict(pipe) for pipe in LOOPED_NETWORK["pipes"]]}
+    change(network)
+    assert client.post("/api/pipe-network", json=network).status_code == 400
+
+@pytest.mark.parametrize("payload, status", [
+    ({**LOOPED_NETWORK, "friction_factor_mode": "guess"}, 400),
+    ({"nodes": LOOPED_NETWORK["nodes"]}, 422),
+    (LOOPED_NETWORK, 200),
+])
+def test_endpoint_status(client, payload, status):
+    assert client.post("/api/pipe-network", json=payload).status_code == status
@@ -0,0 +1,54 @@
+"""Profilage à la demande: réservé aux administrateurs, détail par fonction, Server-Timing."""
+import pytest
+
+from tests.support import EXPERT_INPUT
+
+TOKEN = "secret-admin"
+PROFILE_HEADERS = {"X-Profile": "1", "X-Admin-Token": TOKEN}
+
+@pytest.fixture
+def admin_token(server, monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(server, "profile_store", server.OrderedDict())
+    return TOKEN
+
+def test_profiling_is_disabled_without_configured_token(client, server, monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_ADMIN_TOKEN", "")
+    response = client.post("/api/expert-analysis", json=EXPERT_INPUT, headers=PROFILE_HEADERS)
+    assert response.status_code == 403
+    assert client.get("/api/profiles", headers={"X-Admin-Token": ""}).status_code == 403
+
+def test_wrong_token_is_forbidden(client, admin_token):
+    response = client.post("/api/expert-analysis", json=EXPERT_INPUT,
+                           headers={"X-Profile": "1", "X-Admin-Token": "guess"})
+    assert response.status_code == 403
+    assert client.get("/api/profiles").status_code == 403
+
+def test_profiled_request_bypasses_cache_and_stores_functions(client, admin_token):
+    payload = {**EXPERT_INPUT, "flow_rate": 51}
+    plain = client.post("/api/expert-analysis", json=payload)
+    profiled = client.post("/api/expert-analysis", json=payload, headers=PROFILE_HEADERS)
+    assert profiled.status_code == 200
+    assert profiled.json() == plain.json()
+    assert "npshd;dur=" in profiled.headers["server-timing"]
+    profile_id = profiled.headers["x-profile-id"]
+
+    listing = client.get("/api/profiles", headers={"X-Admin-Token": admin_token}).json()["profiles"]
+    assert [profile["id"] for profile in listing] == [profile_id]
+    assert listing[0]["endpoint"] == "expert-analysis"
+
+    detail = client.get(f"/api/profiles/{profile_id}", headers={"X-Admin-Token": admin_token}).json()
+    functions = {row["function"] for row in detail["functions"]}
+    assert "calculate_expert_analysis" in functions
+    assert "npshd" in detail["stages_ms"] and "total" in detail["stages_ms"]
+    cumulative = [row["cumulative_ms"] for row in detail["functions"]]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+def test_profile_history_is_bounded(client, server, admin_token, monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_HISTORY", 2)
+    ids = [client.post("/api/expert-analysis", json={**EXPERT_INPUT, "flow_rate": 60 + i},
+                       headers=PROFILE_HEADERS).headers["x-profile-id"] for i in range(3)]
+    assert list(server.profile_store) == ids[1:]
+
+def test_unknown_profile_is_not_found(client, admin_token):
+    assert client.get("/api/profiles/doesnotexist", headers={"X-Admin-Token": admin_token}).status_code == 404
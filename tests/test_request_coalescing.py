@@ -0,0 +1,81 @@
+"""Coalescence des analyses identiques concurrentes: un seul calcul partagé, compteur coalesced."""
+import asyncio
+import threading
+
+import pytest
+
+from ecopump.models import NPSHdCalculationInput
+from tests.support import NPSHD_INPUT
+
+def blocking_calculation(server):
+    """Calcul NPSHd qui attend release: les requêtes concurrentes arrivent pendant le calcul"""
+    release = threading.Event()
+
+    def calculation(input_data):
+        calculation.calls += 1
+        assert release.wait(5)
+        if calculation.fail:
+            raise ValueError("diamètre invalide")
+        return server.calculate_npshd_enhanced(input_data)
+    calculation.calls, calculation.fail, calculation.release = 0, False, release
+    return calculation
+
+def run_concurrently(server, cache, calculation, requesters):
+    executor = server.CalculationExecutor("test", "thread", 2, 0, timeout=5)
+    input_data = NPSHdCalculationInput(**NPSHD_INPUT)
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(cache.get_or_compute("npshd", input_data, executor, calculation))
+                 for _ in range(requesters)]
+        await asyncio.sleep(0.05)
+        assert len(cache._in_flight) == 1
+        calculation.release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        return asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+@pytest.mark.parametrize("ttl", [60, 0])
+def test_identical_requests_share_one_computation(server, ttl):
+    cache = server.ResultCache(10, 10 ** 6, ttl)
+    calculation = blocking_calculation(server)
+    results = run_concurrently(server, cache, calculation, 8)
+    assert calculation.calls == 1
+    assert len(set(results)) == 1
+    assert cache.coalesced == 7
+    assert cache._in_flight == {}
+
+def test_error_reaches_every_requester_and_is_not_kept(server):
+    cache = server.ResultCache(10, 10 ** 6, 60)
+    calculation = blocking_calculation(server)
+    calculation.fail = True
+    results = run_concurrently(server, cache, calculation, 4)
+    assert calculation.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache._in_flight == {} and len(cache._entries) == 0
+
+def test_cancelled_requester_does_not_cancel_the_others(server):
+    cache = server.ResultCache(10, 10 ** 6, 60)
+    calculation = blocking_calculation(server)
+    executor = server.CalculationExecutor("test", "thread", 1, 0, timeout=5)
+    input_data = NPSHdCalculationInput(**NPSHD_INPUT)
+
+    async def scenario():
+        first = asyncio.ensure_future(cache.get_or_compute("npshd", input_data, executor, calculation))
+        second = asyncio.ensure_future(cache.get_or_compute("npshd", input_data, executor, calculation))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        calculation.release.set()
+        return await second
+    try:
+        content = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert calculation.calls == 1
+    assert cache.get(cache.key("npshd", input_data)) == content
+
+def test_coalesced_count_is_reported(client):
+    stats = client.get("/api/cache-stats").json()
+    assert {"coalesced", "in_flight"} <= set(stats)
+    assert "pump_result_cache_coalesced_total" in client.get("/metrics").text
@@ -0,0 +1,73 @@
+"""Projection fields= et mode slim: sous-ensembles exacts de la réponse complète, 400 sur champ inconnu."""
+import pytest
+
+from tests.support import AUDIT_INPUT, EXPERT_INPUT, HMT_INPUT, NPSHD_INPUT, PERFORMANCE_INPUT, SOLAR_INPUT
+
+ENDPOINTS = [
+    ("/api/calculate-npshd", NPSHD_INPUT),
+    ("/api/calculate-hmt", HMT_INPUT),
+    ("/api/calculate-performance", PERFORMANCE_INPUT),
+    ("/api/expert-analysis", EXPERT_INPUT),
+    ("/api/solar-pumping", SOLAR_INPUT),
+    ("/api/audit-analysis", AUDIT_INPUT),
+]
+
+def without_audit_identity(body):
+    """L'audit porte un identifiant et une date propres à chaque appel"""
+    return {key: value for key, value in body.items() if key not in ("audit_id", "audit_date")}
+
+@pytest.mark.parametrize("path,payload", ENDPOINTS)
+def test_fields_projects_top_level_keys(client, path, payload):
+    full = client.post(path, json=payload).json()
+    keys = sorted(full)[:2]
+    response = client.post(path, params={"fields": ",".join(keys)}, json=payload)
+    assert response.status_code == 200
+    projected = response.json()
+    assert sorted(projected) == keys
+    assert without_audit_identity(projected) == without_audit_identity({key: full[key] for key in keys})
+
+@pytest.mark.parametrize("path,payload", ENDPOINTS)
+def test_slim_only_removes_keys(client, path, payload):
+    full = without_audit_identity(client.post(path, json=payload).json())
+    slim = without_audit_identity(client.post(path, params={"slim": "true"}, json=payload).json())
+    assert set(slim) <= set(full)
+    assert "input_data" not in slim
+    for key, value in slim.items():
+        if not isinstance(value, (dict, list)):
+            assert value == full[key]
+
+def test_nested_paths_apply_to_list_items(client):
+    full = client.post("/api/expert-analysis", json=EXPERT_INPUT).json()
+    response = client.post("/api/expert-analysis", json=EXPERT_INPUT,
+                           params={"fields": "input_data.flow_rate,expert_recommendations.title"})
+    projected = response.json()
+    assert full["expert_recommendations"]
+    assert projected["input_data"] == {"flow_rate": full["input_data"]["flow_rate"]}
+    assert projected["expert_recommendations"] == [
+        {"title": item["title"]} for item in full["expert_recommendations"]]
+
+def test_slim_drops_verbose_recommendation_text(client):
+    full = client.post("/api/expert-analysis", json=EXPERT_INPUT)
+    slim = client.post("/api/expert-analysis", json=EXPERT_INPUT, params={"slim": "true"})
+    assert len(slim.content) < len(full.content)
+    for item in slim.json()["expert_recommendations"]:
+        assert not {"description", "impact", "solutions"} & set(item)
+    assert "recommendations" not in slim.json()["npshd_analysis"]
+
+def test_fields_and_slim_combine(client):
+    response = client.post("/api/calculate-npshd", json=NPSHD_INPUT, params={"fields": "npshd,input_data", "slim": "true"})
+    assert response.json() == {"npshd": client.post("/api/calculate-npshd", json=NPSHD_INPUT).json()["npshd"]}
+
+@pytest.mark.parametrize("path,payload", ENDPOINTS)
+def test_unknown_field_is_a_client_error(client, path, payload):
+    response = client.post(path, params={"fields": "npshd_typo"}, json=payload)
+    assert response.status_code == 400
+    assert "npshd_typo" in response.json()["detail"]
+
+@pytest.mark.parametrize("params, status", [
+    ({"slim": "peut-être"}, 422),
+    ({"fields": "hmt,"}, 200),
+    ({"fields": ""}, 200),
+])
+def test_query_parameter_status(client, params, status):
+    assert client.post("/api/calculate-hmt", json=HMT_INPUT, params=params).status_code == status
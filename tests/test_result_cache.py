@@ -0,0 +1,93 @@
+"""Cache de résultats: empreinte canonique, éviction LRU / octets / TTL, cache partagé, compteurs."""
+import asyncio
+
+from ecopump.models import NPSHdCalculationInput
+from tests.support import NPSHD_INPUT
+
+class MemoryCollection:
+    """Collection MongoDB minimale en mémoire (find_one / replace_one / create_index)"""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def find_one(self, query):
+        return self.documents.get(query["_id"])
+
+    async def replace_one(self, query, document, upsert=False):
+        self.documents[query["_id"]] = document
+
+    async def create_index(self, *args, **kwargs):
+        return "expires_at_1"
+
+def test_key_is_canonical_over_defaults_and_namespace(server):
+    implicit = NPSHdCalculationInput(**NPSHD_INPUT)
+    explicit = NPSHdCalculationInput(**implicit.model_dump())
+    assert server.ResultCache.key("npshd", implicit) == server.ResultCache.key("npshd", explicit)
+    assert server.ResultCache.key("npshd", implicit) != server.ResultCache.key("hmt", implicit)
+    changed = NPSHdCalculationInput(**{**NPSHD_INPUT, "flow_rate": 51})
+    assert server.ResultCache.key("npshd", implicit) != server.ResultCache.key("npshd", changed)
+
+def test_lru_eviction_by_entries_and_bytes(server):
+    cache = server.ResultCache(max_entries=2, max_bytes=10, ttl=60)
+    cache.put("a", "xxx")
+    cache.put("b", "yyy")
+    assert cache.get("a") == "xxx"  # "a" devient le plus récent
+    cache.put("c", "zzz")
+    assert cache.get("b") is None and cache.get("a") == "xxx"
+    cache.put("d", "wwwwwwww")  # 8 octets: dépasse 10 octets avec les entrées restantes
+    assert cache.size_bytes <= 10
+    assert cache.evictions == 3
+    cache.put("e", "x" * 11)  # plus gros que le cache entier: ignoré
+    assert cache.get("e") is None
+
+def test_entries_expire_after_ttl(server, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: now[0])
+    cache = server.ResultCache(max_entries=10, max_bytes=1000, ttl=5)
+    cache.put("a", "content")
+    now[0] += 4.9
+    assert cache.get("a") == "content"
+    now[0] += 0.2
+    assert cache.get("a") is None
+    assert cache.expirations == 1 and cache.size_bytes == 0
+
+def test_shared_backend_serves_other_workers(server, monkeypatch):
+    collection = MemoryCollection()
+    monkeypatch.setattr(server.ResultCache, "shared_collection", property(lambda self: collection))
+    executor = server.CalculationExecutor("test", "inline", 1, 0, timeout=5)
+    input_data = NPSHdCalculationInput(**NPSHD_INPUT)
+    first_worker = server.ResultCache(10, 10 ** 6, 60, shared_collection="calculation_cache")
+    second_worker = server.ResultCache(10, 10 ** 6, 60, shared_collection="calculation_cache")
+
+    def calculation(_input_data):
+        calculation.calls += 1
+        return server.calculate_npshd_enhanced(_input_data)
+    calculation.calls = 0
+
+    first = asyncio.run(first_worker.get_or_compute("npshd", input_data, executor, calculation))
+    second = asyncio.run(second_worker.get_or_compute("npshd", input_data, executor, calculation))
+    assert first == second and calculation.calls == 1
+    assert (first_worker.misses, second_worker.shared_hits) == (1, 1)
+    assert asyncio.run(second_worker.get_or_compute("npshd", input_data, executor, calculation)) == first
+    assert second_worker.hits == 1
+
+def test_endpoint_hits_are_counted(client, server):
+    payload = {**NPSHD_INPUT, "flow_rate": 61.5}
+    before = client.get("/api/cache-stats").json()
+    first = client.post("/api/calculate-npshd", json=payload)
+    second = client.post("/api/calculate-npshd", json=payload)
+    after = client.get("/api/cache-stats").json()
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert 0 < after["hit_ratio"] <= 1
+
+def test_errors_are_never_cached(client):
+    payload = {**NPSHD_INPUT, "fluid_type": "unobtainium"}
+    before = client.get("/api/cache-stats").json()
+    assert client.post("/api/calculate-npshd", json=payload).status_code == 400
+    assert client.post("/api/calculate-npshd", json=payload).status_code == 400
+    after = client.get("/api/cache-stats").json()
+    assert after["misses"] == before["misses"] + 2
+    assert after["entries"] == before["entries"]
@@ -0,0 +1,84 @@
+"""Balayage paramétrique NDJSON: chaque point égale le calcul unitaire, erreurs de plan."""
+import json
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import HMTCalculationInput, NPSHdCalculationInput
+from tests.support import HMT_INPUT, NPSHD_INPUT, baseline_cases
+
+def read_sweep(client, payload):
+    response = client.post("/api/sweep", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["type"] == "header" and lines[-1]["type"] == "end"
+    rows = []
+    for chunk in lines[1:-1]:
+        assert chunk["type"] == "chunk" and chunk["offset"] == len(rows)
+        names = list(chunk["columns"])
+        rows.extend(dict(zip(names, values)) for values in zip(*chunk["columns"].values()))
+    assert len(rows) == lines[0]["total"] == lines[-1]["total"]
+    return lines[0], rows
+
+@pytest.mark.parametrize("case", [case for case in baseline_cases("/api/calculate-npshd") if case["status"] == 200],
+                         ids=lambda case: str(case["input"]["flow_rate"]))
+def test_sweep_point_matches_the_monolith(client, case):
+    # un balayage réduit au point d'entrée rend la réponse enregistrée du monolithe
+    _, (row,) = read_sweep(client, {"calculation": "npshd", "base": case["input"],
+                                    "ranges": {"flow_rate": {"values": [case["input"]["flow_rate"]]}}})
+    for key in ("npshd", "total_head_loss", "cavitation_risk"):
+        assert row[key] == pytest.approx(case["response"][key], rel=1e-9), key
+
+def test_npshd_sweep_matches_single_calculations(client):
+    header, rows = read_sweep(client, {
+        "calculation": "npshd", "base": NPSHD_INPUT, "chunk_size": 7,
+        "ranges": {"flow_rate": {"start": 10, "stop": 90, "num": 5}, "temperature": {"values": [10, 45, 80]},
+                   "diameter": {"values": [88.9, 114.3]}}
+    })
+    assert header["shape"] == [5, 3, 2]
+    for row in rows:
+        single = hydraulics.calculate_npshd_enhanced(NPSHdCalculationInput(**{
+            **NPSHD_INPUT, "flow_rate": row["flow_rate"], "temperature": row["temperature"],
+            "pipe_diameter": row["diameter"]}))
+        assert row["npshd"] == pytest.approx(single.npshd, rel=1e-9)
+        assert row["total_head_loss"] == pytest.approx(single.total_head_loss, rel=1e-9)
+        assert row["cavitation_risk"] == single.cavitation_risk
+
+@pytest.mark.parametrize("installation_type", ["surface", "submersible"])
+def test_hmt_sweep_matches_single_calculations(client, installation_type):
+    base = {**HMT_INPUT, "installation_type": installation_type}
+    _, rows = read_sweep(client, {
+        "calculation": "hmt", "base": base,
+        "ranges": {"flow_rate": {"values": [20, 50, 80]}, "discharge_length": {"values": [50, 300]}}
+    })
+    for row in rows:
+        single = hydraulics.calculate_hmt_enhanced(HMTCalculationInput(**{
+            **base, "flow_rate": row["flow_rate"], "discharge_pipe_length": row["discharge_length"]}))
+        assert row["hmt"] == pytest.approx(single.hmt, rel=1e-9)
+        assert row["suction_head_loss"] == pytest.approx(single.suction_head_loss, abs=1e-12)
+        # vitesse d'aspiration absente (null) en immergé, comme le calcul unitaire
+        assert row["suction_velocity"] == pytest.approx(single.suction_velocity, rel=1e-9)
+
+def test_outputs_select_streamed_columns(client):
+    _, rows = read_sweep(client, {"calculation": "hmt", "base": HMT_INPUT, "outputs": ["hmt"],
+                                  "ranges": {"flow_rate": {"values": [20, 50]}}})
+    assert [set(row) for row in rows] == [{"flow_rate", "hmt"}] * 2
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"calculation": "power"}, 400),
+    ({"ranges": {}}, 400),
+    ({"ranges": {"pump_speed": {"values": [1, 2]}}}, 400),
+    ({"ranges": {"flow_rate": {"start": 10}}}, 400),
+    ({"ranges": {"flow_rate": {"values": []}}}, 400),
+    ({"ranges": {"diameter": {"values": [0, 100]}}}, 400),
+    ({"outputs": ["npshd", "bogus"]}, 400),
+    ({"chunk_size": 0}, 400),
+    ({"ranges": {"flow_rate": {"start": 1, "stop": 2, "num": 2000}, "temperature": {"start": 5, "stop": 90, "num": 2000}}}, 400),
+    ({"base": {**NPSHD_INPUT, "fluid_type": "unobtainium"}}, 400),
+    ({"base": {**NPSHD_INPUT, "friction_factor_mode": "guess"}}, 400),
+    ({"ranges": {"flow_rate": {"num": "dix"}}}, 422),
+])
+def test_rejected_plans(client, overrides, status):
+    payload = {"calculation": "npshd", "base": NPSHD_INPUT, "ranges": {"flow_rate": {"values": [10, 20]}}, **overrides}
+    assert client.post("/api/sweep", json=payload).status_code == status
@@ -0,0 +1,99 @@
+"""Analyse d'incertitude Monte Carlo: reproductibilité par graine, répartition sur le pool de calcul."""
+import math
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import UncertaintyAnalysisInput
+from tests.support import HMT_INPUT
+
+DISTRIBUTIONS = {
+    "flow_rate": {"std": 5},
+    "temperature": {"distribution": "uniform", "low": 10, "high": 40},
+    "hasp": {"distribution": "triangular", "low": 1, "high": 3},
+    "roughness_factor": {"distribution": "lognormal", "std": 0.3},
+}
+
+def analysis(**overrides):
+    payload = {"base": HMT_INPUT, "samples": 20000, "seed": 7, "distributions": DISTRIBUTIONS, **overrides}
+    return hydraulics.calculate_uncertainty_analysis(UncertaintyAnalysisInput(**payload))
+
+def test_same_seed_gives_identical_results():
+    assert analysis().model_dump() == analysis().model_dump()
+    assert analysis(seed=8).hmt.mean != analysis().hmt.mean
+
+def test_samples_beyond_one_block_extend_the_same_stream():
+    # blocs à graines dérivées: les premiers blocs ne dépendent pas du nombre total de tirages
+    plan = hydraulics.prepare_uncertainty_analysis(UncertaintyAnalysisInput(
+        base=HMT_INPUT, samples=2 * hydraulics.MONTE_CARLO_CHUNK_SIZE + 10, seed=3, distributions=DISTRIBUTIONS))
+    shorter = hydraulics.prepare_uncertainty_analysis(UncertaintyAnalysisInput(
+        base=HMT_INPUT, samples=hydraulics.MONTE_CARLO_CHUNK_SIZE, seed=3, distributions=DISTRIBUTIONS))
+    assert plan["sizes"] == [hydraulics.MONTE_CARLO_CHUNK_SIZE] * 2 + [10]
+    first, = hydraulics.run_monte_carlo_chunks(shorter["base_data"], shorter["distributions"],
+                                               shorter["seed_sequences"], shorter["sizes"])
+    chunks = hydraulics.run_monte_carlo_chunks(plan["base_data"], plan["distributions"],
+                                               plan["seed_sequences"], plan["sizes"])
+    assert (chunks[0]["hmt"] == first["hmt"]).all()
+
+def test_constant_inputs_reproduce_the_deterministic_point():
+    result = analysis(samples=100, distributions={"flow_rate": {"distribution": "constant"}})
+    assert result.hmt.std == pytest.approx(0, abs=1e-9)
+    assert result.hmt.mean == pytest.approx(result.deterministic_hmt)
+    assert result.npshd.mean == pytest.approx(result.deterministic_npshd)
+    assert result.cavitation_probability in (0.0, 1.0)
+
+def test_normal_suction_height_gives_analytic_statistics():
+    # en charge, NPSHd = cste + hasp et HMT = cste - hasp: les deux suivent la loi de hasp
+    sigma = 0.5
+    deterministic = analysis(samples=1, distributions={"hasp": {"distribution": "constant"}})
+    required = deterministic.deterministic_npshd - sigma
+    result = analysis(distributions={"hasp": {"std": sigma}}, npsh_required=required)
+    assert result.npshd.std == pytest.approx(sigma, rel=0.03)
+    assert result.hmt.std == pytest.approx(sigma, rel=0.03)
+    assert result.npshd.mean - result.deterministic_npshd == pytest.approx(
+        result.deterministic_hmt - result.hmt.mean, abs=1e-3)
+    assert result.npshd.percentiles["p95"] - result.npshd.percentiles["p5"] == pytest.approx(2 * 1.6449 * sigma, rel=0.05)
+    # P(NPSHd <= NPSHd0 - σ) = Φ(-1)
+    assert result.cavitation_probability == pytest.approx(0.5 * math.erfc(1 / math.sqrt(2)), abs=0.01)
+
+def test_submersible_installation_has_no_npshd():
+    result = analysis(base={**HMT_INPUT, "installation_type": "submersible"})
+    assert result.npshd is None and result.cavitation_probability is None
+
+def test_parallel_dispatch_matches_sequential_result(client, server, monkeypatch):
+    monkeypatch.setattr(server, "MONTE_CARLO_MAX_WORKERS", 3)
+    samples = hydraulics.MONTE_CARLO_PARALLEL_THRESHOLD + 1
+    payload = {"base": HMT_INPUT, "samples": samples, "seed": 11, "distributions": DISTRIBUTIONS}
+    response = client.post("/api/uncertainty-analysis", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["workers"] == 3
+    # les blocs passent par le pool de calcul partagé, pas par un pool propre au module
+    assert server.heavy_executor.pending == 0
+    assert not hasattr(hydraulics, "_monte_carlo_pool")
+    expected = hydraulics.calculate_uncertainty_analysis(UncertaintyAnalysisInput(**payload)).model_dump()
+    assert {**body, "workers": 1} == expected
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"samples": 0}, 400),
+    ({"samples": hydraulics.MONTE_CARLO_MAX_SAMPLES + 1}, 400),
+    ({"percentiles": [5, 150]}, 400),
+    ({"distributions": {"pump_speed": {"std": 1}}}, 400),
+    ({"distributions": {"flow_rate": {"distribution": "cauchy"}}}, 400),
+    ({"distributions": {"flow_rate": {"std": -1}}}, 400),
+    ({"distributions": {"hasp": {"distribution": "uniform", "low": 3, "high": 1}}}, 400),
+    ({"distributions": {"hasp": {"distribution": "lognormal", "mean": 0, "std": 1}}}, 400),
+    ({"base": {**HMT_INPUT, "fluid_type": "unobtainium"}}, 400),
+    ({"samples": "many"}, 422),
+])
+def test_rejected_inputs(client, overrides, status):
+    payload = {"base": HMT_INPUT, "samples": 1000, "distributions": DISTRIBUTIONS, **overrides}
+    assert client.post("/api/uncertainty-analysis", json=payload).status_code == status
+
+def test_sampling_never_occupies_the_light_pool(client, server, monkeypatch):
+    async def refuse(*args, **kwargs):
+        raise AssertionError("Monte Carlo sur le pool des calculs légers")
+    monkeypatch.setattr(server.light_executor, "run", refuse)
+    for samples in (2000, hydraulics.MONTE_CARLO_PARALLEL_THRESHOLD + 1):
+        payload = {"base": HMT_INPUT, "samples": samples, "seed": 5, "distributions": DISTRIBUTIONS}
+        assert client.post("/api/uncertainty-analysis", json=payload).status_code == 200
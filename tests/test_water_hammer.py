@@ -0,0 +1,82 @@
+"""Coup de bélier (méthode des caractéristiques): borne de Joukowsky, limites de calcul, erreurs."""
+import math
+
+import pytest
+
+from ecopump import hydraulics
+from ecopump.models import WaterHammerInput
+from tests.support import HMT_INPUT
+
+# Refoulement PVC de 500 m sans singularités: frottement faible devant a·V0/g
+BASE = {**HMT_INPUT, "discharge_pipe_material": "pvc", "discharge_fittings": [],
+        "discharge_pipe_length": 500, "discharge_pipe_diameter": 150}
+
+def water_hammer(**overrides):
+    return hydraulics.calculate_water_hammer(WaterHammerInput(**{"base": BASE, "valve_head_loss": 0.5, **overrides}))
+
+def steady_head_loss(result):
+    """Pertes de charge permanentes pompe -> réservoir (frottement + vanne ouverte)"""
+    density = hydraulics.get_fluid_properties(BASE["fluid_type"], BASE["temperature"]).density
+    return result.steady_pump_head - BASE["discharge_height"] - BASE["useful_pressure"] * 100000 / (density * 9.81)
+
+def test_wave_speed_and_joukowsky_head():
+    result = water_hammer(scenario="valve_closure", closure_time=0)
+    # Korteweg, PVC SDR 17 (E = 3 GPa, D/e = 17), eau à 20 °C (K = 2,2 GPa, ρ = 998,2 kg/m³)
+    wave_speed = math.sqrt(2.2e9 / 998.2 / (1 + 2.2e9 * 17 / 3.0e9))
+    assert wave_speed == pytest.approx(404.5, abs=0.1)
+    assert result.wave_speed == pytest.approx(wave_speed, rel=1e-3)
+    # ΔH = a·V0/g, V0 = 50 m³/h dans un DN 150
+    velocity = 50 / 3600 / (math.pi * 0.15 ** 2 / 4)
+    assert result.joukowsky_head == pytest.approx(wave_speed * velocity / 9.81, rel=1e-3)
+    assert result.critical_time == pytest.approx(2 * 500 / wave_speed, rel=1e-3)
+
+@pytest.mark.parametrize("closure_time", [0, 0.05])
+def test_sudden_valve_closure_reaches_joukowsky_within_line_packing(closure_time):
+    result = water_hammer(scenario="valve_closure", closure_time=closure_time)
+    # a·V0/g atteint, dépassé au plus des pertes permanentes (effet de « line packing »)
+    assert result.joukowsky_head <= result.max_surge <= result.joukowsky_head + steady_head_loss(result)
+    assert any(warning.startswith("⚠️ Arrêt/fermeture brusque") for warning in result.warnings)
+
+def test_slow_valve_closure_stays_well_below_joukowsky():
+    result = water_hammer(scenario="valve_closure", closure_time=20)
+    assert 0 < result.max_surge < 0.5 * result.joukowsky_head
+    assert not any(warning.startswith("⚠️ Arrêt/fermeture brusque") for warning in result.warnings)
+
+@pytest.mark.parametrize("closure_time", [0, 1, 20])
+def test_pump_trip_downsurge_is_bounded_by_joukowsky(closure_time):
+    result = water_hammer(scenario="pump_trip", closure_time=closure_time)
+    downsurge = result.steady_pump_head - min(result.pump_end_head)
+    assert downsurge <= result.joukowsky_head + steady_head_loss(result) + 1e-9
+    if closure_time == 0:
+        assert downsurge >= result.joukowsky_head
+
+def test_envelopes_bracket_the_steady_profile():
+    result = water_hammer(scenario="pump_trip", num_nodes=51)
+    assert len(result.positions) == len(result.max_head) == len(result.min_head) == 51
+    assert all(low <= high for low, high in zip(result.min_head, result.max_head))
+    assert result.history_times[0] == 0 and len(result.history_times) == len(result.pump_end_head)
+
+def test_step_count_is_capped_even_on_a_coarse_mesh(client):
+    # 2 nœuds: la limite nœuds × pas n'est pas atteinte, le nombre de pas doit l'être
+    payload = {"base": BASE, "num_nodes": 2, "duration": 1e6}
+    with pytest.raises(ValueError):
+        hydraulics.calculate_water_hammer(WaterHammerInput(**payload))
+    assert client.post("/api/water-hammer", json=payload).status_code == 400
+    assert water_hammer(num_nodes=2).steps <= hydraulics.WATER_HAMMER_MAX_STEPS
+
+@pytest.mark.parametrize("overrides, status", [
+    ({"duration": 0}, 400),
+    ({"duration": -5}, 400),
+    ({"scenario": "earthquake"}, 400),
+    ({"num_nodes": 1}, 400),
+    ({"num_nodes": hydraulics.WATER_HAMMER_MAX_NODES + 1}, 400),
+    ({"closure_time": -1}, 400),
+    ({"wave_speed": 0}, 400),
+    ({"scenario": "valve_closure", "valve_head_loss": 0}, 400),
+    ({"num_nodes": 5000, "duration": 3600}, 400),
+    ({"base": {**BASE, "flow_rate": 0}}, 400),
+    ({"num_nodes": "beaucoup"}, 422),
+])
+def test_rejected_inputs(client, overrides, status):
+    response = client.post("/api/water-hammer", json={"base": BASE, **overrides})
+    assert response.status_code == status